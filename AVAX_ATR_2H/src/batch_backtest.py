@@ -0,0 +1,159 @@
+"""
+Batched backtest for grid searches.
+
+This is the canonical copy. The ATR bots (AVAX_ATR_2H, ENA_ATR, FET_ATR_2H,
+PIPPIN_ATR_2H, SOL, XRP_ATR) are deployed on their own, so each ships an
+identical copy as src/batch_backtest.py. Edit this file and copy it over;
+LLM/tests/test_batch_backtest_copies.py fails when the copies differ.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List
+
+from src.infer import predict_proba, decide_side, tp_sl_from_pct
+from src.models.transformer import SeqClassifier
+from src.utils import calculate_profit_factor, calculate_drawdown
+
+
+def run_backtest_batch(
+    model: SeqClassifier,
+    df: pd.DataFrame,
+    feature_cols: list,
+    window: int,
+    tp_pct: float,
+    settings: np.ndarray,
+    fee: float,
+    slippage: float,
+    funding_rate: float = 0.0001,  # Default 0.01% per 8h
+    include_funding: bool = True,
+) -> List[Dict]:
+    """
+    Run backtests of many (sl_pct, thr_long, thr_short) settings in one pass.
+
+    Model probabilities are computed once per bar and shared by all K
+    settings. Each bar then opens a trade for every setting whose thresholds
+    fire, and the exits of all those trades are found together from running
+    highs/lows of the look-ahead window. Metrics equal K separate
+    ``run_backtest`` calls.
+
+    Args:
+        model: Trained model
+        df: DataFrame with features and close prices
+        feature_cols: List of feature column names
+        window: Window length
+        tp_pct: Take-profit percentage
+        settings: (K, 3) array of (sl_pct, thr_long, thr_short) rows
+        fee: Commission fee (0.0005 = 0.05%)
+        slippage: Slippage percentage (does not affect PnL, as in run_backtest)
+        funding_rate: Funding rate per 8h period (default 0.0001 = 0.01%)
+        include_funding: Whether to include funding costs in PnL (off for
+            a project whose run_backtest has none)
+
+    Returns:
+        List of K result dictionaries (without trades_df)
+    """
+    settings = np.asarray(settings, dtype=float).reshape(-1, 3)
+    sl_pcts = settings[:, 0]
+    
+    # Each distinct threshold pair is decided once per bar
+    pairs = sorted({(thr_long, thr_short) for thr_long, thr_short in settings[:, 1:]})
+    pair_idx = np.array([pairs.index((thr_long, thr_short)) for thr_long, thr_short in settings[:, 1:]],
+                        dtype=int)
+    side_codes = {"LONG": 1, "SHORT": -1, "FLAT": 0}
+    
+    features = df[feature_cols].to_numpy()
+    opens = df["open"].to_numpy()
+    highs = df["high"].to_numpy()
+    lows = df["low"].to_numpy()
+    closes = df["close"].to_numpy()
+    n = len(df)
+    
+    pnls = [[] for _ in range(len(settings))]
+    
+    # The last bar has no next bar to enter on
+    for i in range(window, n - 1):
+        probs = predict_proba(model, features[i-window:i])
+        pair_sides = np.array([side_codes[decide_side(probs, thr_long, thr_short)[0]]
+                               for thr_long, thr_short in pairs])
+        sides = pair_sides[pair_idx]
+        
+        entry_price = opens[i+1]
+        end = min(i+1+200, n)
+        run_high = np.maximum.accumulate(highs[i+1:end])
+        run_low = np.minimum.accumulate(lows[i+1:end])
+        horizon = end - (i+1)
+        
+        for code, side in ((1, "LONG"), (-1, "SHORT")):
+            runs = np.flatnonzero(sides == code)
+            if len(runs) == 0:
+                continue
+            
+            tp, sl = tp_sl_from_pct(entry_price, tp_pct, sl_pcts[runs], side)
+            
+            # First look-ahead bar reaching TP / SL (horizon if never)
+            if side == "LONG":
+                tp_at = np.searchsorted(run_high, tp)
+                sl_at = np.searchsorted(-run_low, -sl)
+            else:
+                tp_at = np.searchsorted(-run_low, -tp)
+                sl_at = np.searchsorted(run_high, sl)
+            
+            # TP is checked first on a bar that reaches both
+            exit_at = np.minimum(tp_at, sl_at)
+            exit_price = np.where(tp_at <= sl_at, tp, sl)
+            exit_price = np.where(exit_at < horizon, exit_price, closes[end-1])
+            
+            if side == "LONG":
+                pnl = (exit_price - entry_price) / entry_price
+            else:
+                pnl = (entry_price - exit_price) / entry_price
+            pnl -= (fee * 2)  # Entry + exit
+            
+            # Apply funding costs (if enabled), 160 bars per 8h period as in run_backtest
+            if include_funding:
+                bars_held = np.minimum(exit_at, horizon - 1)
+                funding_cost = funding_rate * (bars_held / 160.0)
+                if side == "LONG":
+                    pnl -= funding_cost  # Long pays funding
+                else:
+                    pnl += funding_cost  # Short receives funding (if rate positive)
+            
+            for run, trade_pnl in zip(runs, pnl):
+                pnls[run].append(trade_pnl)
+    
+    return [_pnl_metrics(np.array(run_pnls)) for run_pnls in pnls]
+
+
+def _pnl_metrics(pnl_array: np.ndarray) -> Dict:
+    """Equity curve and metrics of a sequence of trade returns."""
+    if len(pnl_array) == 0:
+        return {
+            "trades": 0,
+            "equity": [1.0],
+            "final_equity": 1.0,
+            "profit_factor": 0.0,
+            "win_rate": 0.0,
+            "max_drawdown": 0.0,
+        }
+    
+    # Equity curve
+    equity = 1.0 + np.cumsum(pnl_array)
+    
+    # Profit factor
+    pf = calculate_profit_factor(pnl_array)
+    
+    # Win rate
+    win_rate = (pnl_array > 0).sum() / len(pnl_array) * 100
+    
+    # Drawdown
+    dd_result = calculate_drawdown(equity)
+    
+    return {
+        "trades": len(pnl_array),
+        "equity": equity.tolist(),
+        "final_equity": float(equity[-1]),
+        "profit_factor": float(pf),
+        "win_rate": float(win_rate),
+        "max_drawdown": float(dd_result["max_dd_pct"]),
+    }
@@ -5,7 +5,7 @@ import numpy as np
 from typing import List, Dict
 from itertools import product
 
-from src.backtest_core import run_backtest
+from src.batch_backtest import run_backtest_batch
 from src.models.transformer import SeqClassifier
 
 
@@ -48,23 +48,21 @@ def run_grid_search(
     ))
     
     total = len(combinations)
+    print(f"Testing {total} combinations in one pass over the data")
     
-    for idx, (sl_pct, thr_long, thr_short) in enumerate(combinations):
-        print(f"Testing {idx+1}/{total}: SL={sl_pct}, thr_long={thr_long}, thr_short={thr_short}")
-        
-        result = run_backtest(
-            model=model,
-            df=df,
-            feature_cols=feature_cols,
-            window=window,
-            tp_pct=tp_pct,
-            sl_pct=sl_pct,
-            thr_long=thr_long,
-            thr_short=thr_short,
-            fee=fee,
-            slippage=slippage,
-        )
-        
+    # One model inference per bar, shared by all combinations
+    batch = run_backtest_batch(
+        model=model,
+        df=df,
+        feature_cols=feature_cols,
+        window=window,
+        tp_pct=tp_pct,
+        settings=np.array(combinations, dtype=float),
+        fee=fee,
+        slippage=slippage,
+    )
+    
+    for (sl_pct, thr_long, thr_short), result in zip(combinations, batch):
         results.append({
             "sl_pct": sl_pct,
             "thr_long": thr_long,
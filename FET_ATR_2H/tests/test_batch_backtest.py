@@ -0,0 +1,47 @@
+"""Test batched backtest against single runs."""
+
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import torch
+
+from src.backtest_core import run_backtest
+from src.batch_backtest import run_backtest_batch
+
+
+class LastBarLogits(torch.nn.Module):
+    """Model whose logits are the first three features of the last bar."""
+
+    def forward(self, x):
+        return x[:, -1, :3] * 2.5
+
+
+def test_backtest_batch_matches_single_runs():
+    """Each batched setting reproduces its own run_backtest result."""
+    rng = np.random.default_rng(0)
+    n = 400
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+    
+    df = pd.DataFrame({
+        "open": close * (1 + rng.normal(0, 0.001, n)),
+        "high": close * 1.004,
+        "low": close * 0.996,
+        "close": close,
+    })
+    feature_cols = ["f0", "f1", "f2", "f3"]
+    for col in feature_cols:
+        df[col] = rng.normal(0, 1, n)
+    
+    model = LastBarLogits()
+    combinations = list(product([0.003, 0.01], [0.5, 0.7], [0.5, 0.7]))
+    
+    batch = run_backtest_batch(model, df, feature_cols, 16, 0.005, np.array(combinations), 0.0005, 0.0002)
+    
+    assert len(batch) == len(combinations)
+    for (sl_pct, thr_long, thr_short), result in zip(combinations, batch):
+        single = run_backtest(model, df, feature_cols, 16, 0.005, sl_pct, thr_long, thr_short, 0.0005, 0.0002)
+        single.pop("trades_df", None)
+        
+        assert single["trades"] > 0
+        assert result == single
@@ -0,0 +1,20 @@
+"""Test that the ATR bots ship the canonical batched backtest unchanged."""
+
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+CANONICAL = ROOT / "LLM" / "src" / "batch_backtest.py"
+BOTS = ["AVAX_ATR_2H", "ENA_ATR", "FET_ATR_2H", "PIPPIN_ATR_2H", "SOL", "XRP_ATR"]
+
+
+@pytest.mark.parametrize("bot", BOTS)
+def test_copy_matches_canonical_module(bot):
+    """Each bot's src/batch_backtest.py is a byte copy of the LLM module."""
+    copy = ROOT / bot / "src" / "batch_backtest.py"
+    if not copy.exists():
+        pytest.skip(f"{bot} is not next to LLM")
+    
+    assert copy.read_bytes() == CANONICAL.read_bytes(), f"{copy} differs from {CANONICAL}; copy the canonical module over"
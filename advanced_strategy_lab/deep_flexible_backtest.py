@@ -6,10 +6,11 @@ Daha esnek parametrelerle kar/zarar analizi
 
 import pandas as pd
 import numpy as np
-import pandas_ta as pta
 import json
 from datetime import datetime
 
+from src.strategy.indicators import rsi, supertrend
+
 class DeepSupertrendRSIStrategy:
     def __init__(self, params):
         self.rsi_length = params.get('rsi_length', 14)
@@ -25,18 +26,19 @@ class DeepSupertrendRSIStrategy:
         """Teknik indikatörleri hesapla"""
         result_df = df.copy()
         
+        close = df['Close'].to_numpy(dtype=np.float64)
+        
         # RSI hesaplama
-        result_df['rsi'] = pta.rsi(df['Close'], length=self.rsi_length)
+        result_df['rsi'] = rsi(close, self.rsi_length)
         
         # Supertrend hesaplama
-        supertrend_data = pta.supertrend(
-            df['High'], 
-            df['Low'], 
-            df['Close'], 
-            length=self.supertrend_length,
-            multiplier=self.supertrend_multiplier
+        result_df['supertrend'], _ = supertrend(
+            df['High'].to_numpy(dtype=np.float64),
+            df['Low'].to_numpy(dtype=np.float64),
+            close,
+            float(self.supertrend_multiplier),
+            self.supertrend_length
         )
-        result_df['supertrend'] = supertrend_data[f'SUPERT_{self.supertrend_length}_{self.supertrend_multiplier}']
         
         # Support/Resistance seviyeleri
         result_df['max_level'] = df['High'].rolling(window=self.support_resistance_period).max()
@@ -3,187 +3,77 @@
 DEEP Supertrend RSI Strategy - Standalone Optimizer Test
 """
 
+import os
+import sys
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-import pandas_ta as pta
 from itertools import product
 import json
 
-class DeepSupertrendRSIStrategy:
-    def __init__(self, params):
-        self.rsi_length = params.get('rsi_length', 14)
-        self.rsi_oversold = params.get('rsi_oversold', 30)
-        self.rsi_overbought = params.get('rsi_overbought', 70)
-        self.rsi_long_exit = params.get('rsi_long_exit', 65)
-        self.rsi_short_exit = params.get('rsi_short_exit', 35)
-        self.supertrend_length = params.get('supertrend_length', 1)
-        self.supertrend_multiplier = params.get('supertrend_multiplier', 3.0)
-        self.support_resistance_period = params.get('support_resistance_period', 22)
-    
-    def calculate_indicators(self, df):
-        """Teknik indikatörleri hesapla"""
-        result_df = df.copy()
-        
-        # RSI hesaplama
-        result_df['rsi'] = pta.rsi(df['Close'], length=self.rsi_length)
-        
-        # Supertrend hesaplama
-        supertrend_data = pta.supertrend(
-            df['High'], 
-            df['Low'], 
-            df['Close'], 
-            length=self.supertrend_length,
-            multiplier=self.supertrend_multiplier
-        )
-        result_df['supertrend'] = supertrend_data[f'SUPERT_{self.supertrend_length}_{self.supertrend_multiplier}']
-        
-        # Support/Resistance seviyeleri
-        result_df['max_level'] = df['High'].rolling(window=self.support_resistance_period).max()
-        result_df['min_level'] = df['Low'].rolling(window=self.support_resistance_period).min()
-        
-        return result_df
-    
-    def generate_signals(self, df):
-        """Trading sinyalleri üret"""
-        result_df = df.copy()
-        
-        # State variables
-        long_status = 0
-        short_status = 0
-        long_position = 0
-        short_position = 0
-        dip_level = 0.0
-        tepe_level = 0.0
-        long_boyun = 0.0
-        short_boyun = 0.0
-        
-        # Signal arrays
-        buy_signals = []
-        sell_signals = []
-        close_long_signals = []
-        close_short_signals = []
-        
-        for i in range(len(result_df)):
-            current_price = result_df.iloc[i]['Close']
-            current_high = result_df.iloc[i]['High']
-            current_low = result_df.iloc[i]['Low']
-            rsi = result_df.iloc[i]['rsi']
-            supertrend = result_df.iloc[i]['supertrend']
-            min_level = result_df.iloc[i]['min_level']
-            max_level = result_df.iloc[i]['max_level']
-            
-            # Skip if indicators are NaN
-            if pd.isna(rsi) or pd.isna(supertrend) or pd.isna(min_level) or pd.isna(max_level):
-                buy_signals.append(False)
-                sell_signals.append(False)
-                close_long_signals.append(False)
-                close_short_signals.append(False)
-                continue
-            
-            # LONG Signal Logic (5 stages)
-            if long_status == 0 and rsi < self.rsi_oversold:
-                if long_position == 0 and short_position == 0:
-                    long_status = 1
-                    dip_level = min_level
-            
-            elif long_status == 1 and supertrend < current_price:
-                long_status = 2
-                long_boyun = current_high
-            
-            elif long_status == 2:
-                if current_high > long_boyun:
-                    long_boyun = current_high
-                
-                if supertrend > current_price and current_price < long_boyun:
-                    long_status = 3
-            
-            elif long_status == 3 and supertrend < current_price and current_price > long_boyun:
-                long_status = 4
-            
-            elif long_status == 4 and supertrend > current_price and current_price < long_boyun:
-                long_status = 5
-            
-            # SHORT Signal Logic (5 stages)
-            if short_status == 0 and rsi > self.rsi_overbought:
-                if long_position == 0 and short_position == 0:
-                    short_status = 1
-                    tepe_level = max_level
-            
-            elif short_status == 1 and supertrend > current_price:
-                short_status = 2
-                short_boyun = current_low
-            
-            elif short_status == 2:
-                if current_low < short_boyun:
-                    short_boyun = current_low
-                
-                if supertrend < current_price and current_price > short_boyun:
-                    short_status = 3
-            
-            elif short_status == 3 and supertrend > current_price and current_price < short_boyun:
-                short_status = 4
-            
-            elif short_status == 4 and supertrend < current_price and current_price > short_boyun:
-                short_status = 5
-            
-            # Reset conditions
-            if long_status in [2, 4] and rsi > self.rsi_long_exit:
-                long_status = 0
-            
-            if long_status in [2, 3, 4, 5] and rsi < self.rsi_oversold:
-                long_status = 1
-                dip_level = min_level
-            
-            if short_status in [2, 4] and rsi < self.rsi_short_exit:
-                short_status = 0
-            
-            if short_status in [2, 3, 4, 5] and rsi > self.rsi_overbought:
-                short_status = 1
-                tepe_level = max_level
-            
-            # Position management
-            buy_signal = False
-            sell_signal = False
-            close_long_signal = False
-            close_short_signal = False
-            
-            if long_position == 0 and short_position == 0:
-                if long_status == 5 and current_price > long_boyun:
-                    long_position = 1
-                    buy_signal = True
-                elif short_status == 5 and current_price < short_boyun:
-                    short_position = 1
-                    sell_signal = True
-            
-            if long_position == 1 and current_price < min_level:
-                long_position = 0
-                long_status = 0
-                short_status = 0
-                close_long_signal = True
-            
-            if short_position == 1 and current_price > max_level:
-                short_position = 0
-                long_status = 0
-                short_status = 0
-                close_short_signal = True
-            
-            buy_signals.append(buy_signal)
-            sell_signals.append(sell_signal)
-            close_long_signals.append(close_long_signal)
-            close_short_signals.append(close_short_signal)
-        
-        result_df['buy_signal'] = buy_signals
-        result_df['sell_signal'] = sell_signals
-        result_df['close_long'] = close_long_signals
-        result_df['close_short'] = close_short_signals
-        
-        return result_df
-    
-    def get_signals(self, df):
-        """Ana sinyal üretme fonksiyonu"""
-        df_with_indicators = self.calculate_indicators(df)
-        df_with_signals = self.generate_signals(df_with_indicators)
-        return df_with_signals
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.strategy.deep_supertrend_rsi import DeepSupertrendRSIStrategy
+
+# Parameters that change the indicators; the others only change the status machine
+INDICATOR_PARAMS = ('rsi_length', 'supertrend_length', 'supertrend_multiplier', 'support_resistance_period')
+
+# Test data of the current optimization, set once per worker process
+_DF = None
+
+
+def _init_worker(df):
+    """Keep the test data in the worker so only parameters are sent per task"""
+    global _DF
+    _DF = df
+
+
+def _score_signals(param_dict, signals_df):
+    """Sinyal skorunu hesapla"""
+    buy_signals = int(signals_df['buy_signal'].sum())
+    sell_signals = int(signals_df['sell_signal'].sum())
+    total_signals = buy_signals + sell_signals
+    
+    # Basit skor: sinyal sıklığı + dengeli sinyal dağılımı
+    if total_signals > 0:
+        signal_frequency = total_signals / len(signals_df) * 100
+        signal_balance = min(buy_signals, sell_signals) / max(buy_signals, sell_signals) if max(buy_signals, sell_signals) > 0 else 0
+        score = signal_frequency * signal_balance
+    else:
+        score = 0
+    
+    return {
+        'params': param_dict,
+        'score': score,
+        'buy_signals': buy_signals,
+        'sell_signals': sell_signals,
+        'total_signals': total_signals,
+        'signal_frequency': signal_frequency if total_signals > 0 else 0
+    }
+
+
+def _run_group(param_dicts):
+    """
+    Evaluate parameter sets sharing the same indicator parameters in a worker.
+    
+    Indicators are calculated once per group; each parameter set only runs
+    the compiled status machine. Failed sets are returned as error strings.
+    """
+    outcomes = []
+    try:
+        indicators_df = DeepSupertrendRSIStrategy(param_dicts[0]).calculate_indicators(_DF)
+    except Exception as e:
+        return [f"{e}"] * len(param_dicts)
+    
+    for param_dict in param_dicts:
+        try:
+            signals_df = DeepSupertrendRSIStrategy(param_dict).generate_signals(indicators_df)
+            outcomes.append(_score_signals(param_dict, signals_df))
+        except Exception as e:
+            outcomes.append(f"{e}")
+    return outcomes
+
 
 def create_test_data():
     """Test verisi oluştur"""
@@ -260,8 +150,13 @@ def test_strategy():
     
     return signals_df
 
-def optimize_strategy():
-    """Stratejiyi optimize et"""
+def optimize_strategy(workers=None):
+    """
+    Stratejiyi optimize et
+    
+    Args:
+        workers: Paralel işlem sayısı (varsayılan: tüm çekirdekler)
+    """
     print("\n🔧 DEEP Supertrend RSI Strategy Optimizasyonu")
     print("=" * 50)
     
@@ -285,52 +180,40 @@ def optimize_strategy():
     # Test verisi
     test_df = create_test_data()
     
-    # Optimizasyon
-    best_params = None
-    best_score = -np.inf
-    results = []
-    
-    print(f"\n🔄 Optimizasyon başlıyor...")
-    
-    for i, params in enumerate(product(*param_grid.values())):
+    # Optimizasyon: indikatör parametreleri aynı olan kombinasyonlar tek görevde
+    groups = {}
+    for position, params in enumerate(product(*param_grid.values())):
         param_dict = dict(zip(param_grid.keys(), params))
-        
-        try:
-            strategy = DeepSupertrendRSIStrategy(param_dict)
-            signals_df = strategy.get_signals(test_df)
-            
-            # Skor hesaplama
-            buy_signals = signals_df['buy_signal'].sum()
-            sell_signals = signals_df['sell_signal'].sum()
-            total_signals = buy_signals + sell_signals
-            
-            # Basit skor: sinyal sıklığı + dengeli sinyal dağılımı
-            if total_signals > 0:
-                signal_frequency = total_signals / len(signals_df) * 100
-                signal_balance = min(buy_signals, sell_signals) / max(buy_signals, sell_signals) if max(buy_signals, sell_signals) > 0 else 0
-                score = signal_frequency * signal_balance
-            else:
-                score = 0
-            
-            results.append({
-                'params': param_dict,
-                'score': score,
-                'buy_signals': buy_signals,
-                'sell_signals': sell_signals,
-                'total_signals': total_signals,
-                'signal_frequency': signal_frequency if total_signals > 0 else 0
-            })
-            
-            if score > best_score:
-                best_score = score
-                best_params = param_dict
-            
-            if (i + 1) % 20 == 0:
-                print(f"   🔄 {i + 1}/{total_combinations} kombinasyon test edildi...")
+        indicator_key = tuple(param_dict.get(name) for name in INDICATOR_PARAMS)
+        groups.setdefault(indicator_key, []).append((position, param_dict))
+    
+    workers = workers or os.cpu_count() or 1
+    
+    print(f"\n🔄 Optimizasyon başlıyor... ({len(groups)} indikatör seti, {workers} işlem)")
+    
+    scored = []
+    tested = 0
+    tasks = [[param_dict for _, param_dict in group] for group in groups.values()]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(test_df,)) as pool:
+        for group, outcomes in zip(groups.values(), pool.map(_run_group, tasks)):
+            for (position, param_dict), outcome in zip(group, outcomes):
+                tested += 1
+                if isinstance(outcome, str):
+                    print(f"   ❌ Parametre hatası: {param_dict} - {outcome}")
+                else:
+                    scored.append((position, outcome))
                 
-        except Exception as e:
-            print(f"   ❌ Parametre hatası: {param_dict} - {e}")
-            continue
+                if tested % 20 == 0:
+                    print(f"   🔄 {tested}/{total_combinations} kombinasyon test edildi...")
+    
+    # Grid sırasına göre (eşit skorlarda ilk kombinasyon kazanır)
+    results = [outcome for _, outcome in sorted(scored, key=lambda item: item[0])]
+    best_params = None
+    best_score = -np.inf
+    for result in results:
+        if result['score'] > best_score:
+            best_score = result['score']
+            best_params = result['params']
     
     # Sonuçları sırala
     results.sort(key=lambda x: x['score'], reverse=True)
@@ -349,7 +232,7 @@ def optimize_strategy():
         print(f"      Parametreler: {result['params']}")
         print()
     
-    return best_params, results
+    return best_params, best_score, results
 
 if __name__ == "__main__":
     print("🎯 DEEP Supertrend RSI Strategy Optimizer")
@@ -359,7 +242,7 @@ if __name__ == "__main__":
     signals_df = test_strategy()
     
     # Optimizasyon yap
-    best_params, results = optimize_strategy()
+    best_params, best_score, results = optimize_strategy()
     
     print(f"\n🎉 Optimizasyon tamamlandı!")
     print(f"🏆 En iyi parametreler kaydediliyor...")
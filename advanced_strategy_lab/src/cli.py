@@ -14,13 +14,11 @@ from datetime import datetime, timedelta
 import json
 
 from .config import get_config, validate_symbols, validate_timeframes
-from .data.loader import create_data_loader
-from .optimize.grid_search import run_grid_search
-from .optimize.walk_forward import run_walk_forward
-from .reporting.reporter import create_reporter
-from .reporting.plots import create_visualizer
-from .strategy.nasdaq_atr_supertrend import create_strategy, create_nasdaq_strategy
-from .data.nasdaq_provider import NASDAQDataProvider, get_nasdaq_symbols, get_high_volume_symbols
+
+# Commands import the data, strategy, optimization and reporting modules they
+# use when they run, so light commands (config-info, clear-cache,
+# list-symbols, --help) start without loading ccxt, yfinance, numba, scipy or
+# the plotting libraries.
 
 # Initialize Typer app
 app = typer.Typer(
@@ -92,6 +90,8 @@ def fetch(
     """
     Fetch OHLCV data for specified coins and timeframes.
     """
+    from .data.loader import create_data_loader
+    
     config = get_config()
     
     # Parse inputs
@@ -197,6 +197,10 @@ def optimize(
     """
     Run grid search optimization.
     """
+    from .data.loader import create_data_loader
+    from .optimize.grid_search import run_grid_search
+    from .strategy.nasdaq_atr_supertrend import create_strategy
+    
     config = get_config()
     
     # Parse inputs
@@ -314,6 +318,9 @@ def walk_forward(
     """
     Run walk-forward analysis.
     """
+    from .data.loader import create_data_loader
+    from .optimize.walk_forward import run_walk_forward
+    
     config = get_config()
     
     # Parse inputs
@@ -422,6 +429,8 @@ def report(
     """
     Generate reports and visualizations from optimization results.
     """
+    from .reporting.reporter import create_reporter
+    
     if input_dir is None:
         input_dir = "./reports/grid"
     
@@ -473,6 +482,8 @@ def report(
         typer.echo("Summary tables generated")
         
         if plots:
+            from .reporting.plots import create_visualizer
+            
             visualizer = create_visualizer(str(output_path))
             visualizer.save_all_plots(results, wf_results, "optimization_plots")
             typer.echo("Plots generated")
@@ -537,6 +548,9 @@ def clear_cache(
     """
     Clear cached data.
     """
+    # The cache alone; a data loader would also connect to the exchange
+    from .data.cache import DataCache
+    
     config = get_config()
     
     if cache_dir is None:
@@ -545,8 +559,7 @@ def clear_cache(
     typer.echo(f"Clearing cache in {cache_dir}")
     
     try:
-        loader = create_data_loader(cache_dir)
-        loader.clear_cache(symbol, timeframe)
+        DataCache(cache_dir).clear_cache(symbol, timeframe)
         
         if symbol and timeframe:
             typer.echo(f"Cleared cache for {symbol} {timeframe}")
@@ -563,6 +576,8 @@ def nasdaq_symbols():
     """
     List available NASDAQ symbols.
     """
+    from .data.nasdaq_provider import get_nasdaq_symbols, get_high_volume_symbols
+    
     symbols = get_nasdaq_symbols()
     high_volume = get_high_volume_symbols()
     
@@ -591,6 +606,8 @@ def nasdaq_optimize(
     """
     Optimize ATR SuperTrend strategy for NASDAQ stocks.
     """
+    from .data.nasdaq_provider import get_high_volume_symbols
+    
     optimizer = NASDAQOptimizer()
     
     # Determine symbols to optimize
@@ -668,6 +685,8 @@ def nasdaq_data(
     """
     Fetch NASDAQ stock data.
     """
+    from .data.nasdaq_provider import NASDAQDataProvider
+    
     provider = NASDAQDataProvider()
     
     if info and symbol:
@@ -735,6 +754,8 @@ def optimize_nasdaq(
     top_n: int = typer.Option(10, help="Number of top results to keep")
 ):
     """Optimize NASDAQ stocks with ATR SuperTrend strategy."""
+    from .data.loader import create_data_loader
+    from .optimize.grid_search import run_grid_search
     
     logger.info("🚀 Starting NASDAQ optimization")
     
@@ -808,6 +829,8 @@ def test_strategy(
     days: int = typer.Option(180, help="Number of days of data to use")
 ):
     """Test strategy on a single NASDAQ symbol."""
+    from .data.loader import create_data_loader
+    from .strategy.nasdaq_atr_supertrend import create_nasdaq_strategy
     
     logger.info(f"🧪 Testing {strategy} on {symbol} {timeframe}")
     
@@ -864,6 +887,7 @@ def list_symbols(
     limit: int = typer.Option(20, help="Maximum number of symbols to show")
 ):
     """List available NASDAQ symbols."""
+    from .data.nasdaq_provider import NASDAQDataProvider
     
     nasdaq_provider = NASDAQDataProvider()
     
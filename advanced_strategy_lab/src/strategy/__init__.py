@@ -6,6 +6,7 @@ This module provides the core strategy implementation and backtesting functional
 
 from .atr_st_core import ATRSuperTrendStrategy, create_strategy, validate_strategy_params
 from .volensy_macd_trend import VolensyMacdTrendStrategy, create_strategy as create_volensy_strategy
+from .signal_filters import filter_alternating_signals
 from .atr_supertrend import ATRSuperTrendStrategy as ATRSuperTrendStrategyNew, create_strategy as create_atr_supertrend_strategy
 from .backtester import Backtester, run_backtest, Trade, BacktestResult
 
@@ -16,6 +17,7 @@ __all__ = [
     'create_strategy',
     'create_volensy_strategy',
     'create_atr_supertrend_strategy',
+    'filter_alternating_signals',
     'validate_strategy_params',
     'Backtester',
     'run_backtest',
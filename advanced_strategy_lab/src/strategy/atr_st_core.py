@@ -11,6 +11,8 @@ from typing import Dict, Any, Tuple, Optional, List
 from numba import jit
 import logging
 
+from .indicators import atr, atr_trailing_stop, ema
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +21,9 @@ def calculate_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period:
     """
     Calculate ATR (Average True Range) using Numba for performance.
     
+    Wilder ATR from the indicator library with the warm-up bars set to
+    zero, which the trailing stop below relies on.
+    
     Args:
         high: High prices
         low: Low prices
@@ -28,30 +33,12 @@ def calculate_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period:
     Returns:
         ATR values
     """
-    n = len(close)
-    atr = np.zeros(n)
-    
-    if n < period:
-        return atr
-    
-    # Calculate True Range
-    tr = np.zeros(n)
-    tr[0] = high[0] - low[0]
-    
-    for i in range(1, n):
-        tr[i] = max(
-            high[i] - low[i],
-            abs(high[i] - close[i-1]),
-            abs(low[i] - close[i-1])
-        )
-    
-    # Calculate ATR using Wilder's smoothing
-    atr[period-1] = np.mean(tr[:period])
-    
-    for i in range(period, n):
-        atr[i] = (atr[i-1] * (period - 1) + tr[i]) / period
+    values = atr(high, low, close, period)
+    for i in range(len(values)):
+        if np.isnan(values[i]):
+            values[i] = 0.0
     
-    return atr
+    return values
 
 
 @jit(nopython=True)
@@ -98,34 +85,7 @@ def calculate_atr_trailing_stop(close: np.ndarray, atr: np.ndarray, a: float) ->
     Returns:
         ATR trailing stop values
     """
-    n = len(close)
-    trailing_stop = np.zeros(n)
-    nloss = atr * a
-    
-    # Initialize first value
-    trailing_stop[0] = close[0] - nloss[0]
-    
-    for i in range(1, n):
-        prev_trailing = trailing_stop[i-1]
-        current_close = close[i]
-        prev_close = close[i-1]
-        current_nloss = nloss[i]
-        
-        # Pine Script v6 logic for trailing stop update
-        if current_close > prev_trailing and prev_close > prev_trailing:
-            # Both current and previous close above trailing stop
-            trailing_stop[i] = max(prev_trailing, current_close - current_nloss)
-        elif current_close < prev_trailing and prev_close < prev_trailing:
-            # Both current and previous close below trailing stop
-            trailing_stop[i] = min(prev_trailing, current_close + current_nloss)
-        elif current_close > prev_trailing:
-            # Current close above trailing stop
-            trailing_stop[i] = current_close - current_nloss
-        else:
-            # Current close below trailing stop
-            trailing_stop[i] = current_close + current_nloss
-    
-    return trailing_stop
+    return atr_trailing_stop(close, atr * a)
 
 
 @jit(nopython=True)
@@ -248,9 +208,9 @@ class ATRSuperTrendStrategy:
         df = data.copy()
         
         # Convert to numpy arrays for Numba functions
-        high = df['high'].values
-        low = df['low'].values
-        close = df['close'].values
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
         
         # Calculate ATR
         atr = calculate_atr(high, low, close, self.c)
@@ -261,7 +221,7 @@ class ATRSuperTrendStrategy:
         df['trailing_stop'] = trailing_stop
         
         # Calculate EMA(1) for crossover detection
-        ema1 = calculate_ema(close, 1)
+        ema1 = ema(close, 1)
         df['ema1'] = ema1
         
         # Calculate SuperTrend
@@ -409,8 +369,9 @@ class ATRSuperTrendStrategy:
         df = data.copy()
         
         # Calculate EMA Fast and Slow
-        df['ema_fast'] = df['close'].ewm(span=self.ema_fast_len).mean()
-        df['ema_slow'] = df['close'].ewm(span=self.ema_slow_len).mean()
+        close = df['close'].to_numpy(dtype=np.float64)
+        df['ema_fast'] = ema(close, self.ema_fast_len)
+        df['ema_slow'] = ema(close, self.ema_slow_len)
         
         # EMA crossovers
         df['ema_cross_up'] = (df['ema_fast'] > df['ema_slow']) & (df['ema_fast'].shift(1) <= df['ema_slow'].shift(1))
@@ -9,6 +9,8 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any, Tuple, Optional
 
+from .indicators import atr, atr_trailing_stop, ema, heikin_ashi, supertrend
+
 class ATRSuperTrendStrategy:
     def __init__(self, params: Dict[str, Any]):
         """
@@ -40,51 +42,32 @@ class ATRSuperTrendStrategy:
     def calculate_heikin_ashi(self, df: pd.DataFrame) -> pd.DataFrame:
         """Heikin Ashi mumları hesapla"""
         ha_df = df.copy()
-        
-        # İlk Heikin Ashi değerleri
-        first_idx = ha_df.index[0]
-        ha_df.loc[first_idx, 'ha_close'] = (df.loc[first_idx, 'Open'] + df.loc[first_idx, 'High'] + 
-                                           df.loc[first_idx, 'Low'] + df.loc[first_idx, 'Close']) / 4
-        ha_df.loc[first_idx, 'ha_open'] = (df.loc[first_idx, 'Open'] + df.loc[first_idx, 'Close']) / 2
-        
-        # Sonraki Heikin Ashi değerleri
-        for i in range(1, len(df)):
-            current_idx = ha_df.index[i]
-            prev_idx = ha_df.index[i-1]
-            
-            # Heikin Ashi Close
-            ha_df.loc[current_idx, 'ha_close'] = (df.loc[current_idx, 'Open'] + df.loc[current_idx, 'High'] + 
-                                                df.loc[current_idx, 'Low'] + df.loc[current_idx, 'Close']) / 4
-            
-            # Heikin Ashi Open
-            ha_df.loc[current_idx, 'ha_open'] = (ha_df.loc[prev_idx, 'ha_open'] + ha_df.loc[prev_idx, 'ha_close']) / 2
-            
-            # Heikin Ashi High
-            ha_df.loc[current_idx, 'ha_high'] = max(df.loc[current_idx, 'High'], ha_df.loc[current_idx, 'ha_open'], ha_df.loc[current_idx, 'ha_close'])
-            
-            # Heikin Ashi Low
-            ha_df.loc[current_idx, 'ha_low'] = min(df.loc[current_idx, 'Low'], ha_df.loc[current_idx, 'ha_open'], ha_df.loc[current_idx, 'ha_close'])
+        ha_open, ha_high, ha_low, ha_close = heikin_ashi(
+            df['Open'].to_numpy(dtype=np.float64),
+            df['High'].to_numpy(dtype=np.float64),
+            df['Low'].to_numpy(dtype=np.float64),
+            df['Close'].to_numpy(dtype=np.float64)
+        )
+        ha_df['ha_open'] = ha_open
+        ha_df['ha_high'] = ha_high
+        ha_df['ha_low'] = ha_low
+        ha_df['ha_close'] = ha_close
         
         return ha_df
     
     def calculate_atr(self, df: pd.DataFrame) -> pd.Series:
-        """ATR hesapla"""
-        high = df['High']
-        low = df['Low']
-        close = df['Close']
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        
-        atr = tr.rolling(window=self.c).mean()
-        return atr
+        """ATR hesapla (Wilder, TradingView ta.atr)"""
+        values = atr(
+            df['High'].to_numpy(dtype=np.float64),
+            df['Low'].to_numpy(dtype=np.float64),
+            df['Close'].to_numpy(dtype=np.float64),
+            self.c
+        )
+        return pd.Series(values, index=df.index)
     
     def calculate_atr_trailing_stop(self, df: pd.DataFrame) -> pd.Series:
         """ATR Trailing Stop hesapla"""
-        atr = self.calculate_atr(df)
-        n_loss = self.a * atr
+        n_loss = self.a * self.calculate_atr(df)
         
         # Source: Heikin Ashi veya normal close
         if self.h:
@@ -93,56 +76,19 @@ class ATRSuperTrendStrategy:
         else:
             src = df['Close']
         
-        # ATR Trailing Stop hesaplama
-        trailing_stop = pd.Series(index=df.index, dtype=float)
-        trailing_stop.iloc[0] = src.iloc[0] - n_loss.iloc[0]
-        
-        for i in range(1, len(df)):
-            prev_trailing = trailing_stop.iloc[i-1]
-            current_src = src.iloc[i]
-            prev_src = src.iloc[i-1]
-            current_n_loss = n_loss.iloc[i]
-            
-            if current_src > prev_trailing and prev_src > prev_trailing:
-                # Uptrend - trailing stop'u yukarı çek
-                trailing_stop.iloc[i] = max(prev_trailing, current_src - current_n_loss)
-            elif current_src < prev_trailing and prev_src < prev_trailing:
-                # Downtrend - trailing stop'u aşağı çek
-                trailing_stop.iloc[i] = min(prev_trailing, current_src + current_n_loss)
-            elif current_src > prev_trailing:
-                # Trend değişimi: bearish -> bullish
-                trailing_stop.iloc[i] = current_src - current_n_loss
-            else:
-                # Trend değişimi: bullish -> bearish
-                trailing_stop.iloc[i] = current_src + current_n_loss
-        
-        return trailing_stop
+        trailing_stop = atr_trailing_stop(src.to_numpy(dtype=np.float64), n_loss.to_numpy())
+        return pd.Series(trailing_stop, index=df.index)
     
     def calculate_supertrend(self, df: pd.DataFrame) -> pd.Series:
-        """SuperTrend hesapla"""
-        atr = self.calculate_atr(df)
-        high = df['High']
-        low = df['Low']
-        close = df['Close']
-        
-        # SuperTrend hesaplama
-        hl2 = (high + low) / 2
-        super_trend = atr * self.factor
-        
-        trend_up = hl2 - super_trend
-        trend_down = hl2 + super_trend
-        
-        # SuperTrend line
-        super_trend_line = pd.Series(index=df.index, dtype=float)
-        super_trend_line.iloc[0] = trend_down.iloc[0]
-        
-        for i in range(1, len(df)):
-            if close.iloc[i] > super_trend_line.iloc[i-1]:
-                super_trend_line.iloc[i] = max(trend_up.iloc[i], super_trend_line.iloc[i-1])
-            else:
-                super_trend_line.iloc[i] = min(trend_down.iloc[i], super_trend_line.iloc[i-1])
-        
-        return super_trend_line
+        """SuperTrend hesapla (TradingView ta.supertrend)"""
+        super_trend_line, _ = supertrend(
+            df['High'].to_numpy(dtype=np.float64),
+            df['Low'].to_numpy(dtype=np.float64),
+            df['Close'].to_numpy(dtype=np.float64),
+            self.factor,
+            self.c
+        )
+        return pd.Series(super_trend_line, index=df.index)
     
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Tüm indikatörleri hesapla"""
@@ -164,7 +110,7 @@ class ATRSuperTrendStrategy:
         else:
             src = df['Close']
         
-        df['ema1'] = src.ewm(span=1).mean()
+        df['ema1'] = ema(src.to_numpy(dtype=np.float64), 1)
         
         return df
     
@@ -10,6 +10,8 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import logging
 
+from .indicators import atr, atr_trailing_stop, ema, heikin_ashi, supertrend_from_atr
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -38,41 +40,29 @@ class ATRSuperTrendStrategy:
         self.logger = logging.getLogger(f"{__name__}.{config.symbol}")
         
     def calculate_atr(self, df: pd.DataFrame) -> pd.Series:
-        """ATR hesaplama"""
-        high = df['high']
-        low = df['low']
-        close = df['close']
-        
-        # True Range hesaplama
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
-        
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        
-        # ATR hesaplama (EMA ile)
-        atr = true_range.ewm(span=self.config.atr_period).mean()
-        
-        return atr
+        """ATR hesaplama (Wilder, TradingView ta.atr)"""
+        values = atr(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            self.config.atr_period
+        )
+        return pd.Series(values, index=df.index)
     
     def calculate_heikin_ashi(self, df: pd.DataFrame) -> pd.DataFrame:
         """Heikin Ashi mumları hesaplama"""
-        ha_close = (df['open'] + df['high'] + df['low'] + df['close']) / 4
-        ha_open = pd.Series(index=df.index, dtype=float)
-        ha_open.iloc[0] = (df['open'].iloc[0] + df['close'].iloc[0]) / 2
-        
-        for i in range(1, len(df)):
-            ha_open.iloc[i] = (ha_open.iloc[i-1] + ha_close.iloc[i-1]) / 2
-        
-        ha_high = pd.concat([df['high'], ha_open, ha_close], axis=1).max(axis=1)
-        ha_low = pd.concat([df['low'], ha_open, ha_close], axis=1).min(axis=1)
-        
+        ha_open, ha_high, ha_low, ha_close = heikin_ashi(
+            df['open'].to_numpy(dtype=np.float64),
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64)
+        )
         return pd.DataFrame({
             'open': ha_open,
             'high': ha_high,
             'low': ha_low,
             'close': ha_close
-        })
+        }, index=df.index)
     
     def calculate_trailing_stop(self, df: pd.DataFrame, atr: pd.Series) -> pd.Series:
         """ATR Trailing Stop hesaplama"""
@@ -82,26 +72,8 @@ class ATRSuperTrendStrategy:
             src = ha_df['close']
         
         n_loss = self.config.key_value * atr
-        
-        x_atr_trailing_stop = pd.Series(index=df.index, dtype=float)
-        x_atr_trailing_stop.iloc[0] = src.iloc[0] - n_loss.iloc[0]
-        
-        for i in range(1, len(df)):
-            prev_stop = x_atr_trailing_stop.iloc[i-1]
-            current_src = src.iloc[i]
-            prev_src = src.iloc[i-1]
-            current_n_loss = n_loss.iloc[i]
-            
-            if current_src > prev_stop and prev_src > prev_stop:
-                x_atr_trailing_stop.iloc[i] = max(prev_stop, current_src - current_n_loss)
-            elif current_src < prev_stop and prev_src < prev_stop:
-                x_atr_trailing_stop.iloc[i] = min(prev_stop, current_src + current_n_loss)
-            elif current_src > prev_stop:
-                x_atr_trailing_stop.iloc[i] = current_src - current_n_loss
-            else:
-                x_atr_trailing_stop.iloc[i] = current_src + current_n_loss
-        
-        return x_atr_trailing_stop
+        x_atr_trailing_stop = atr_trailing_stop(src.to_numpy(dtype=np.float64), n_loss.to_numpy())
+        return pd.Series(x_atr_trailing_stop, index=df.index)
     
     def calculate_position(self, df: pd.DataFrame, trailing_stop: pd.Series) -> pd.Series:
         """Pozisyon hesaplama"""
@@ -129,26 +101,15 @@ class ATRSuperTrendStrategy:
         return pos
     
     def calculate_supertrend(self, df: pd.DataFrame, atr: pd.Series) -> pd.Series:
-        """SuperTrend çizgisi hesaplama"""
-        super_trend = atr * self.config.multiplier
-        trend_up = (df['high'] + df['low']) / 2 - super_trend
-        trend_down = (df['high'] + df['low']) / 2 + super_trend
-        
-        super_trend_line = pd.Series(index=df.index, dtype=float)
-        super_trend_line.iloc[0] = trend_down.iloc[0]
-        
-        for i in range(1, len(df)):
-            prev_line = super_trend_line.iloc[i-1]
-            current_close = df['close'].iloc[i]
-            
-            if pd.isna(prev_line):
-                super_trend_line.iloc[i] = trend_down.iloc[i]
-            elif current_close > prev_line:
-                super_trend_line.iloc[i] = max(trend_up.iloc[i], prev_line)
-            else:
-                super_trend_line.iloc[i] = min(trend_down.iloc[i], prev_line)
-        
-        return super_trend_line
+        """SuperTrend çizgisi hesaplama (TradingView ta.supertrend)"""
+        super_trend_line, _ = supertrend_from_atr(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            atr.to_numpy(dtype=np.float64),
+            self.config.multiplier
+        )
+        return pd.Series(super_trend_line, index=df.index)
     
     def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         """Sinyal üretimi"""
@@ -171,7 +132,7 @@ class ATRSuperTrendStrategy:
             src = ha_df['close']
         
         # EMA(1) hesaplama
-        ema_1 = src.ewm(span=1).mean()
+        ema_1 = pd.Series(ema(src.to_numpy(dtype=np.float64), 1), index=df.index)
         
         # Crossover sinyalleri
         above = (ema_1 > trailing_stop) & (ema_1.shift(1) <= trailing_stop.shift(1))
@@ -6,8 +6,145 @@ Orijinal DEEP stratejisinin optimize edilmiş versiyonu
 
 import pandas as pd
 import numpy as np
-import pandas_ta as pta
 from typing import Dict, Any, Tuple, Optional
+from numba import jit
+
+from .indicators import rsi, supertrend
+
+
+@jit(nopython=True)
+def deep_state_machine(close: np.ndarray, high: np.ndarray, low: np.ndarray, rsi: np.ndarray,
+                       supertrend: np.ndarray, min_level: np.ndarray, max_level: np.ndarray,
+                       rsi_oversold: float, rsi_overbought: float,
+                       rsi_long_exit: float, rsi_short_exit: float):
+    """
+    DEEP dip/tepe status machine over indicator arrays using Numba.
+    
+    Bars with a NaN indicator keep the running state but are stored as 0.
+    
+    Returns:
+        Tuple of (long_status, short_status, long_position, short_position,
+        dip_level, tepe_level, long_boyun, short_boyun) arrays
+    """
+    n = len(close)
+    long_status_out = np.zeros(n, dtype=np.int64)
+    short_status_out = np.zeros(n, dtype=np.int64)
+    long_position_out = np.zeros(n, dtype=np.int64)
+    short_position_out = np.zeros(n, dtype=np.int64)
+    dip_level_out = np.zeros(n)
+    tepe_level_out = np.zeros(n)
+    long_boyun_out = np.zeros(n)
+    short_boyun_out = np.zeros(n)
+    
+    long_status = 0
+    short_status = 0
+    long_position = 0
+    short_position = 0
+    dip_level = 0.0
+    tepe_level = 0.0
+    long_boyun = 0.0
+    short_boyun = 0.0
+    
+    for i in range(n):
+        current_price = close[i]
+        current_high = high[i]
+        current_low = low[i]
+        
+        # Skip if indicators are NaN
+        if np.isnan(rsi[i]) or np.isnan(supertrend[i]) or np.isnan(min_level[i]) or np.isnan(max_level[i]):
+            continue
+        
+        # LONG Signal Logic (5 stages)
+        if long_status == 0 and rsi[i] < rsi_oversold:
+            if long_position == 0 and short_position == 0:
+                long_status = 1
+                dip_level = min_level[i]
+        
+        elif long_status == 1 and supertrend[i] < current_price:
+            long_status = 2
+            long_boyun = current_high
+        
+        elif long_status == 2:
+            if current_high > long_boyun:
+                long_boyun = current_high
+            
+            if supertrend[i] > current_price and current_price < long_boyun:
+                long_status = 3
+        
+        elif long_status == 3 and supertrend[i] < current_price and current_price > long_boyun:
+            long_status = 4
+        
+        elif long_status == 4 and supertrend[i] > current_price and current_price < long_boyun:
+            long_status = 5
+        
+        # SHORT Signal Logic (5 stages)
+        if short_status == 0 and rsi[i] > rsi_overbought:
+            if long_position == 0 and short_position == 0:
+                short_status = 1
+                tepe_level = max_level[i]
+        
+        elif short_status == 1 and supertrend[i] > current_price:
+            short_status = 2
+            short_boyun = current_low
+        
+        elif short_status == 2:
+            if current_low < short_boyun:
+                short_boyun = current_low
+            
+            if supertrend[i] < current_price and current_price > short_boyun:
+                short_status = 3
+        
+        elif short_status == 3 and supertrend[i] > current_price and current_price < short_boyun:
+            short_status = 4
+        
+        elif short_status == 4 and supertrend[i] < current_price and current_price > short_boyun:
+            short_status = 5
+        
+        # Reset conditions
+        if (long_status == 2 or long_status == 4) and rsi[i] > rsi_long_exit:
+            long_status = 0
+        
+        if long_status >= 2 and rsi[i] < rsi_oversold:
+            long_status = 1
+            dip_level = min_level[i]
+        
+        if (short_status == 2 or short_status == 4) and rsi[i] < rsi_short_exit:
+            short_status = 0
+        
+        if short_status >= 2 and rsi[i] > rsi_overbought:
+            short_status = 1
+            tepe_level = max_level[i]
+        
+        # Position management
+        if long_position == 0 and short_position == 0:
+            if long_status == 5 and current_price > long_boyun:
+                long_position = 1
+            elif short_status == 5 and current_price < short_boyun:
+                short_position = 1
+        
+        if long_position == 1 and current_price < min_level[i]:
+            long_position = 0
+            long_status = 0
+            short_status = 0
+        
+        if short_position == 1 and current_price > max_level[i]:
+            short_position = 0
+            long_status = 0
+            short_status = 0
+        
+        # Store state
+        long_status_out[i] = long_status
+        short_status_out[i] = short_status
+        long_position_out[i] = long_position
+        short_position_out[i] = short_position
+        dip_level_out[i] = dip_level
+        tepe_level_out[i] = tepe_level
+        long_boyun_out[i] = long_boyun
+        short_boyun_out[i] = short_boyun
+    
+    return (long_status_out, short_status_out, long_position_out, short_position_out,
+            dip_level_out, tepe_level_out, long_boyun_out, short_boyun_out)
+
 
 class DeepSupertrendRSIStrategy:
     def __init__(self, params: Dict[str, Any]):
@@ -55,18 +192,19 @@ class DeepSupertrendRSIStrategy:
         """Teknik indikatörleri hesapla"""
         result_df = df.copy()
         
+        close = df['Close'].to_numpy(dtype=np.float64)
+        
         # RSI hesaplama
-        result_df['rsi'] = pta.rsi(df['Close'], length=self.rsi_length)
-        
-        # Supertrend hesaplama
-        supertrend_data = pta.supertrend(
-            df['High'], 
-            df['Low'], 
-            df['Close'], 
-            length=self.supertrend_length,
-            multiplier=self.supertrend_multiplier
+        result_df['rsi'] = rsi(close, self.rsi_length)
+        
+        # Supertrend hesaplama (TradingView ta.supertrend)
+        result_df['supertrend'], _ = supertrend(
+            df['High'].to_numpy(dtype=np.float64),
+            df['Low'].to_numpy(dtype=np.float64),
+            close,
+            float(self.supertrend_multiplier),
+            self.supertrend_length
         )
-        result_df['supertrend'] = supertrend_data[f'SUPERT_{self.supertrend_length}_{self.supertrend_multiplier}']
         
         # Support/Resistance seviyeleri (rolling window)
         result_df['max_level'] = df['High'].rolling(window=self.support_resistance_period).max()
@@ -78,127 +216,19 @@ class DeepSupertrendRSIStrategy:
         """Trading sinyalleri üret"""
         result_df = df.copy()
         
-        # State variables initialization
-        result_df['long_status'] = 0
-        result_df['short_status'] = 0
-        result_df['long_position'] = 0
-        result_df['short_position'] = 0
-        result_df['dip_level'] = 0.0
-        result_df['tepe_level'] = 0.0
-        result_df['long_boyun'] = 0.0
-        result_df['short_boyun'] = 0.0
-        
-        # Initialize state variables
-        long_status = 0
-        short_status = 0
-        long_position = 0
-        short_position = 0
-        dip_level = 0.0
-        tepe_level = 0.0
-        long_boyun = 0.0
-        short_boyun = 0.0
-        
-        # Signal generation logic
-        for i in range(len(result_df)):
-            current_price = result_df.iloc[i]['Close']
-            current_high = result_df.iloc[i]['High']
-            current_low = result_df.iloc[i]['Low']
-            rsi = result_df.iloc[i]['rsi']
-            supertrend = result_df.iloc[i]['supertrend']
-            min_level = result_df.iloc[i]['min_level']
-            max_level = result_df.iloc[i]['max_level']
-            
-            # Skip if indicators are NaN
-            if pd.isna(rsi) or pd.isna(supertrend) or pd.isna(min_level) or pd.isna(max_level):
-                continue
-            
-            # LONG Signal Logic (5 stages)
-            if long_status == 0 and rsi < self.rsi_oversold:
-                if long_position == 0 and short_position == 0:
-                    long_status = 1
-                    dip_level = min_level
-            
-            elif long_status == 1 and supertrend < current_price:
-                long_status = 2
-                long_boyun = current_high
-            
-            elif long_status == 2:
-                if current_high > long_boyun:
-                    long_boyun = current_high
-                
-                if supertrend > current_price and current_price < long_boyun:
-                    long_status = 3
-            
-            elif long_status == 3 and supertrend < current_price and current_price > long_boyun:
-                long_status = 4
-            
-            elif long_status == 4 and supertrend > current_price and current_price < long_boyun:
-                long_status = 5
-            
-            # SHORT Signal Logic (5 stages)
-            if short_status == 0 and rsi > self.rsi_overbought:
-                if long_position == 0 and short_position == 0:
-                    short_status = 1
-                    tepe_level = max_level
-            
-            elif short_status == 1 and supertrend > current_price:
-                short_status = 2
-                short_boyun = current_low
-            
-            elif short_status == 2:
-                if current_low < short_boyun:
-                    short_boyun = current_low
-                
-                if supertrend < current_price and current_price > short_boyun:
-                    short_status = 3
-            
-            elif short_status == 3 and supertrend > current_price and current_price < short_boyun:
-                short_status = 4
-            
-            elif short_status == 4 and supertrend < current_price and current_price > short_boyun:
-                short_status = 5
-            
-            # Reset conditions
-            if long_status in [2, 4] and rsi > self.rsi_long_exit:
-                long_status = 0
-            
-            if long_status in [2, 3, 4, 5] and rsi < self.rsi_oversold:
-                long_status = 1
-                dip_level = min_level
-            
-            if short_status in [2, 4] and rsi < self.rsi_short_exit:
-                short_status = 0
-            
-            if short_status in [2, 3, 4, 5] and rsi > self.rsi_overbought:
-                short_status = 1
-                tepe_level = max_level
-            
-            # Position management
-            if long_position == 0 and short_position == 0:
-                if long_status == 5 and current_price > long_boyun:
-                    long_position = 1
-                elif short_status == 5 and current_price < short_boyun:
-                    short_position = 1
-            
-            if long_position == 1 and current_price < min_level:
-                long_position = 0
-                long_status = 0
-                short_status = 0
-            
-            if short_position == 1 and current_price > max_level:
-                short_position = 0
-                long_status = 0
-                short_status = 0
-            
-            # Store state
-            result_df.iloc[i, result_df.columns.get_loc('long_status')] = long_status
-            result_df.iloc[i, result_df.columns.get_loc('short_status')] = short_status
-            result_df.iloc[i, result_df.columns.get_loc('long_position')] = long_position
-            result_df.iloc[i, result_df.columns.get_loc('short_position')] = short_position
-            result_df.iloc[i, result_df.columns.get_loc('dip_level')] = dip_level
-            result_df.iloc[i, result_df.columns.get_loc('tepe_level')] = tepe_level
-            result_df.iloc[i, result_df.columns.get_loc('long_boyun')] = long_boyun
-            result_df.iloc[i, result_df.columns.get_loc('short_boyun')] = short_boyun
+        def values(column: str) -> np.ndarray:
+            return result_df[column].to_numpy(dtype=np.float64)
+        
+        # Status machine runs compiled over the indicator arrays
+        states = deep_state_machine(
+            values('Close'), values('High'), values('Low'), values('rsi'),
+            values('supertrend'), values('min_level'), values('max_level'),
+            float(self.rsi_oversold), float(self.rsi_overbought),
+            float(self.rsi_long_exit), float(self.rsi_short_exit)
+        )
+        for column, state in zip(('long_status', 'short_status', 'long_position', 'short_position',
+                                  'dip_level', 'tepe_level', 'long_boyun', 'short_boyun'), states):
+            result_df[column] = state
         
         # Generate buy/sell signals
         result_df['buy_signal'] = (result_df['long_position'] == 1) & (result_df['long_position'].shift(1) == 0)
@@ -8,6 +8,8 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple
 import logging
 
+from .indicators import bollinger, ema, heikin_ashi, macd, rsi
+
 class ETHBollingerStrategy:
     """ETH Bollinger Bands Strategy with Heiken Ashi integration"""
     
@@ -24,69 +26,36 @@ class ETHBollingerStrategy:
     def calculate_heiken_ashi(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate Heiken Ashi candles"""
         ha_df = df.copy()
-        
-        # Initialize HA values
-        ha_df['ha_close'] = (df['open'] + df['high'] + df['low'] + df['close']) / 4
-        ha_df['ha_open'] = 0.0
-        ha_df['ha_high'] = 0.0
-        ha_df['ha_low'] = 0.0
-        
-        # Calculate HA Open (smoothed)
-        for i in range(len(ha_df)):
-            if i == 0:
-                ha_df.iloc[i, ha_df.columns.get_loc('ha_open')] = df.iloc[i]['open']
-            else:
-                ha_df.iloc[i, ha_df.columns.get_loc('ha_open')] = (
-                    ha_df.iloc[i-1]['ha_open'] + ha_df.iloc[i-1]['ha_close']
-                ) / 2
-        
-        # Calculate HA High and Low
-        ha_df['ha_high'] = np.maximum(
-            df['high'],
-            np.maximum(ha_df['ha_open'], ha_df['ha_close'])
-        )
-        ha_df['ha_low'] = np.minimum(
-            df['low'],
-            np.minimum(ha_df['ha_open'], ha_df['ha_close'])
+        ha_df['ha_open'], ha_df['ha_high'], ha_df['ha_low'], ha_df['ha_close'] = heikin_ashi(
+            df['open'].to_numpy(dtype=np.float64),
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64)
         )
         
         return ha_df
     
     def calculate_bollinger_bands(self, df: pd.DataFrame, period: int, std_dev: float) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """Calculate Bollinger Bands"""
-        middle = df['ha_close'].rolling(window=period).mean()
-        std = df['ha_close'].rolling(window=period).std()
+        middle, upper, lower = bollinger(df['ha_close'].to_numpy(dtype=np.float64), period, std_dev)
         
-        upper = middle + (std * std_dev)
-        lower = middle - (std * std_dev)
-        
-        return upper, middle, lower
+        return (pd.Series(upper, index=df.index), pd.Series(middle, index=df.index),
+                pd.Series(lower, index=df.index))
     
     def calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
         """Calculate RSI"""
-        delta = df['ha_close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        return pd.Series(rsi(df['ha_close'].to_numpy(dtype=np.float64), period), index=df.index)
     
     def calculate_macd(self, df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """Calculate MACD"""
-        ema_fast = df['ha_close'].ewm(span=fast).mean()
-        ema_slow = df['ha_close'].ewm(span=slow).mean()
-        
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal).mean()
-        histogram = macd_line - signal_line
+        macd_line, signal_line, histogram = macd(df['ha_close'].to_numpy(dtype=np.float64), fast, slow, signal)
         
-        return macd_line, signal_line, histogram
+        return (pd.Series(macd_line, index=df.index), pd.Series(signal_line, index=df.index),
+                pd.Series(histogram, index=df.index))
     
     def calculate_ema(self, df: pd.DataFrame, period: int) -> pd.Series:
         """Calculate EMA"""
-        return df['ha_close'].ewm(span=period).mean()
+        return pd.Series(ema(df['ha_close'].to_numpy(dtype=np.float64), period), index=df.index)
     
     def check_entry_conditions(self, df: pd.DataFrame, idx: int) -> Dict[str, bool]:
         """Check all entry conditions"""
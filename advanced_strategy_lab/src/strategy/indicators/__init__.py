@@ -0,0 +1,23 @@
+"""
+Compiled indicator library for the strategy lab.
+
+All kernels operate on float64 numpy arrays and follow TradingView's Pine
+Script semantics, returning NaN where TradingView would show ``na``.
+"""
+
+from .moving_averages import sma, ema, rma, wma, var_ma, moving_average
+from .momentum import rsi, cci, macd, qqe
+from .volatility import (
+    true_range, atr, stdev, bollinger, supertrend, supertrend_from_atr, atr_trailing_stop
+)
+from .trend import ott_line, ott, tott
+from .candles import heikin_ashi
+
+__all__ = [
+    'sma', 'ema', 'rma', 'wma', 'var_ma', 'moving_average',
+    'rsi', 'cci', 'macd', 'qqe',
+    'true_range', 'atr', 'stdev', 'bollinger', 'supertrend', 'supertrend_from_atr',
+    'atr_trailing_stop',
+    'ott_line', 'ott', 'tott',
+    'heikin_ashi'
+]
@@ -0,0 +1,42 @@
+"""
+Candle transform kernels.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from numba import jit
+
+
+@jit(nopython=True)
+def heikin_ashi(open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Heikin-Ashi candles as drawn by TradingView.
+
+    The first open is the midpoint of the first real candle's open and close.
+
+    Args:
+        open_: Open prices
+        high: High prices
+        low: Low prices
+        close: Close prices
+
+    Returns:
+        Tuple of (ha_open, ha_high, ha_low, ha_close)
+    """
+    n = len(close)
+    ha_open = np.empty(n)
+    ha_high = np.empty(n)
+    ha_low = np.empty(n)
+    ha_close = (open_ + high + low + close) / 4.0
+
+    for i in range(n):
+        if i == 0:
+            ha_open[i] = (open_[0] + close[0]) / 2.0
+        else:
+            ha_open[i] = (ha_open[i - 1] + ha_close[i - 1]) / 2.0
+        ha_high[i] = max(high[i], ha_open[i], ha_close[i])
+        ha_low[i] = min(low[i], ha_open[i], ha_close[i])
+
+    return ha_open, ha_high, ha_low, ha_close
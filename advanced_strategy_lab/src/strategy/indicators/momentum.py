@@ -0,0 +1,161 @@
+"""
+Momentum oscillator kernels with TradingView semantics.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from numba import jit
+
+from .moving_averages import ema, rma, sma
+
+
+@jit(nopython=True)
+def rsi(src: np.ndarray, length: int) -> np.ndarray:
+    """
+    Relative strength index (``ta.rsi``).
+
+    Args:
+        src: Source values
+        length: RSI period
+
+    Returns:
+        RSI values in [0, 100], NaN during warm-up
+    """
+    n = len(src)
+    gains = np.full(n, np.nan)
+    losses = np.full(n, np.nan)
+
+    for i in range(1, n):
+        change = src[i] - src[i - 1]
+        if not np.isnan(change):
+            gains[i] = max(change, 0.0)
+            losses[i] = max(-change, 0.0)
+
+    up = rma(gains, length)
+    down = rma(losses, length)
+    out = np.full(n, np.nan)
+
+    for i in range(n):
+        if np.isnan(up[i]) or np.isnan(down[i]):
+            continue
+        if down[i] == 0:
+            out[i] = 100.0
+        elif up[i] == 0:
+            out[i] = 0.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + up[i] / down[i])
+
+    return out
+
+
+@jit(nopython=True)
+def cci(src: np.ndarray, length: int) -> np.ndarray:
+    """
+    Commodity channel index (``ta.cci``).
+
+    Args:
+        src: Source values (usually hlc3)
+        length: Window length
+
+    Returns:
+        CCI values, NaN during warm-up and on flat windows
+    """
+    n = len(src)
+    basis = sma(src, length)
+    out = np.full(n, np.nan)
+
+    for i in range(length - 1, n):
+        if np.isnan(basis[i]):
+            continue
+        dev = 0.0
+        for j in range(i - length + 1, i + 1):
+            dev += abs(src[j] - basis[i])
+        dev /= length
+        if dev != 0:
+            out[i] = (src[i] - basis[i]) / (0.015 * dev)
+
+    return out
+
+
+@jit(nopython=True)
+def macd(src: np.ndarray, fast_length: int, slow_length: int,
+         signal_length: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD line, signal line and histogram (``ta.macd``).
+
+    Args:
+        src: Source values
+        fast_length: Fast EMA period
+        slow_length: Slow EMA period
+        signal_length: Signal EMA period
+
+    Returns:
+        Tuple of (macd, signal, histogram)
+    """
+    line = ema(src, fast_length) - ema(src, slow_length)
+    signal = ema(line, signal_length)
+    return line, signal, line - signal
+
+
+@jit(nopython=True)
+def _crosses(a_now: float, a_prev: float, b_now: float, b_prev: float) -> bool:
+    """Pine ``ta.cross``: the two series swapped sides on this bar."""
+    return ((a_now > b_now and a_prev <= b_prev) or
+            (a_now < b_now and a_prev >= b_prev))
+
+
+@jit(nopython=True)
+def qqe(src: np.ndarray, rsi_length: int = 14, smoothing: int = 5,
+        factor: float = 4.238) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    QQE as published by Glaz for MT4/TradingView.
+
+    Args:
+        src: Source values
+        rsi_length: RSI period
+        smoothing: EMA smoothing applied to the RSI
+        factor: Multiplier for the smoothed RSI ATR
+
+    Returns:
+        Tuple of (smoothed RSI, fast trailing line, trend) where trend is
+        1 while the smoothed RSI holds above the long band and -1 otherwise
+    """
+    n = len(src)
+    wilders = rsi_length * 2 - 1
+    rsi_ma = ema(rsi(src, rsi_length), smoothing)
+
+    atr_rsi = np.full(n, np.nan)
+    for i in range(1, n):
+        atr_rsi[i] = abs(rsi_ma[i - 1] - rsi_ma[i])
+    dar = ema(ema(atr_rsi, wilders), wilders) * factor
+
+    long_band = np.full(n, np.nan)
+    short_band = np.full(n, np.nan)
+    trend = np.ones(n, dtype=np.int64)
+    fast_tl = np.full(n, np.nan)
+
+    for i in range(n):
+        new_long = rsi_ma[i] - dar[i]
+        new_short = rsi_ma[i] + dar[i]
+
+        if i > 0 and rsi_ma[i - 1] > long_band[i - 1] and rsi_ma[i] > long_band[i - 1]:
+            long_band[i] = max(long_band[i - 1], new_long) if not np.isnan(new_long) else np.nan
+        else:
+            long_band[i] = new_long
+
+        if i > 0 and rsi_ma[i - 1] < short_band[i - 1] and rsi_ma[i] < short_band[i - 1]:
+            short_band[i] = min(short_band[i - 1], new_short) if not np.isnan(new_short) else np.nan
+        else:
+            short_band[i] = new_short
+
+        if i >= 2 and _crosses(rsi_ma[i], rsi_ma[i - 1], short_band[i - 1], short_band[i - 2]):
+            trend[i] = 1
+        elif i >= 2 and _crosses(long_band[i - 1], long_band[i - 2], rsi_ma[i], rsi_ma[i - 1]):
+            trend[i] = -1
+        elif i > 0:
+            trend[i] = trend[i - 1]
+
+        fast_tl[i] = long_band[i] if trend[i] == 1 else short_band[i]
+
+    return rsi_ma, fast_tl, trend
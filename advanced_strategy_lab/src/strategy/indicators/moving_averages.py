@@ -0,0 +1,196 @@
+"""
+Moving average kernels with TradingView semantics.
+
+Every kernel takes float64 arrays and returns NaN wherever the matching
+Pine Script built-in would return ``na`` (warm-up bars and windows that
+contain missing values).
+"""
+
+import numpy as np
+from numba import jit
+
+
+@jit(nopython=True)
+def sma(src: np.ndarray, length: int) -> np.ndarray:
+    """
+    Simple moving average (``ta.sma``).
+
+    Args:
+        src: Source values
+        length: Window length
+
+    Returns:
+        SMA values, NaN until ``length`` consecutive valid values are seen
+    """
+    n = len(src)
+    out = np.full(n, np.nan)
+    total = 0.0
+    missing = 0
+
+    for i in range(n):
+        if np.isnan(src[i]):
+            missing += 1
+        else:
+            total += src[i]
+
+        if i >= length:
+            old = src[i - length]
+            if np.isnan(old):
+                missing -= 1
+            else:
+                total -= old
+
+        if i >= length - 1 and missing == 0:
+            out[i] = total / length
+
+    return out
+
+
+@jit(nopython=True)
+def _seeded_average(src: np.ndarray, length: int, alpha: float) -> np.ndarray:
+    """Exponential smoothing seeded with the SMA of the first full window."""
+    n = len(src)
+    out = np.full(n, np.nan)
+    prev = np.nan
+    run = 0
+
+    for i in range(n):
+        value = src[i]
+        if np.isnan(value):
+            run = 0
+            continue
+
+        if np.isnan(prev):
+            run += 1
+            if run >= length:
+                prev = np.mean(src[i - length + 1:i + 1])
+                out[i] = prev
+        else:
+            prev = alpha * value + (1.0 - alpha) * prev
+            out[i] = prev
+
+    return out
+
+
+@jit(nopython=True)
+def ema(src: np.ndarray, length: int) -> np.ndarray:
+    """
+    Exponential moving average (``ta.ema``).
+
+    Args:
+        src: Source values
+        length: EMA period
+
+    Returns:
+        EMA values seeded with the SMA of the first ``length`` valid values
+    """
+    return _seeded_average(src, length, 2.0 / (length + 1))
+
+
+@jit(nopython=True)
+def rma(src: np.ndarray, length: int) -> np.ndarray:
+    """
+    Wilder's moving average (``ta.rma``).
+
+    Args:
+        src: Source values
+        length: RMA period
+
+    Returns:
+        RMA values seeded with the SMA of the first ``length`` valid values
+    """
+    return _seeded_average(src, length, 1.0 / length)
+
+
+@jit(nopython=True)
+def wma(src: np.ndarray, length: int) -> np.ndarray:
+    """
+    Linearly weighted moving average (``ta.wma``).
+
+    Args:
+        src: Source values
+        length: Window length
+
+    Returns:
+        WMA values, NaN while the window holds a missing value
+    """
+    n = len(src)
+    out = np.full(n, np.nan)
+    norm = length * (length + 1) / 2.0
+
+    for i in range(length - 1, n):
+        total = 0.0
+        for j in range(length):
+            total += src[i - j] * (length - j)
+        out[i] = total / norm
+
+    return out
+
+
+@jit(nopython=True)
+def var_ma(src: np.ndarray, length: int) -> np.ndarray:
+    """
+    Variable index dynamic average (VAR) as used by OTT/TOTT.
+
+    Transcribes the Pine function: a 9-bar CMO scales the EMA alpha and the
+    recursion starts from zero, so the first bars are defined but biased.
+
+    Args:
+        src: Source values
+        length: VAR period
+
+    Returns:
+        VAR values
+    """
+    n = len(src)
+    out = np.zeros(n)
+    alpha = 2.0 / (length + 1)
+    ups = np.zeros(n)
+    downs = np.zeros(n)
+
+    for i in range(1, n):
+        diff = src[i] - src[i - 1]
+        if diff > 0:
+            ups[i] = diff
+        elif diff < 0:
+            downs[i] = -diff
+
+    prev = 0.0
+    for i in range(n):
+        cmo = 0.0
+        if i >= 8:
+            up = 0.0
+            down = 0.0
+            for j in range(i - 8, i + 1):
+                up += ups[j]
+                down += downs[j]
+            if up + down != 0:
+                cmo = abs((up - down) / (up + down))
+
+        step = alpha * cmo * src[i]
+        if np.isnan(step):
+            step = 0.0
+        prev = step + (1.0 - alpha * cmo) * prev
+        out[i] = prev
+
+    return out
+
+
+def moving_average(src: np.ndarray, length: int, ma_type: str = 'EMA') -> np.ndarray:
+    """
+    Dispatch to a moving average kernel by its TradingView name.
+
+    Args:
+        src: Source values
+        length: Period
+        ma_type: One of ``SMA``, ``EMA``, ``RMA``, ``WMA`` or ``VAR``
+
+    Returns:
+        Moving average values
+    """
+    kernels = {'SMA': sma, 'EMA': ema, 'RMA': rma, 'WMA': wma, 'VAR': var_ma}
+    try:
+        kernel = kernels[ma_type.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown moving average type: {ma_type}")
+    return kernel(np.asarray(src, dtype=np.float64), length)
@@ -0,0 +1,102 @@
+"""
+Trend tracker kernels (OTT/TOTT) with TradingView semantics.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from numba import jit
+
+from .moving_averages import moving_average
+
+
+@jit(nopython=True)
+def ott_line(mavg: np.ndarray, percent: float) -> np.ndarray:
+    """
+    Optimized Trend Tracker line for a precomputed moving average.
+
+    Args:
+        mavg: Moving average the tracker follows
+        percent: Trailing distance in percent
+
+    Returns:
+        OTT values
+    """
+    n = len(mavg)
+    out = np.full(n, np.nan)
+    long_stop = np.full(n, np.nan)
+    short_stop = np.full(n, np.nan)
+    direction = 1
+
+    for i in range(n):
+        fark = mavg[i] * percent * 0.01
+        long_now = mavg[i] - fark
+        short_now = mavg[i] + fark
+
+        long_prev = long_now
+        short_prev = short_now
+        if i > 0:
+            if not np.isnan(long_stop[i - 1]):
+                long_prev = long_stop[i - 1]
+            if not np.isnan(short_stop[i - 1]):
+                short_prev = short_stop[i - 1]
+
+        if mavg[i] > long_prev:
+            long_now = max(long_now, long_prev)
+        if mavg[i] < short_prev:
+            short_now = min(short_now, short_prev)
+        long_stop[i] = long_now
+        short_stop[i] = short_now
+
+        if direction == -1 and mavg[i] > short_prev:
+            direction = 1
+        elif direction == 1 and mavg[i] < long_prev:
+            direction = -1
+
+        trail = long_now if direction == 1 else short_now
+        if mavg[i] > trail:
+            out[i] = trail * (200 + percent) / 200
+        else:
+            out[i] = trail * (200 - percent) / 200
+
+    return out
+
+
+def ott(src: np.ndarray, length: int, percent: float,
+        ma_type: str = 'VAR') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Optimized Trend Tracker (Anil Ozeksi).
+
+    Args:
+        src: Source values
+        length: Moving average period
+        percent: Trailing distance in percent
+        ma_type: Moving average type, see ``moving_average``
+
+    Returns:
+        Tuple of (moving average, OTT)
+    """
+    mavg = moving_average(src, length, ma_type)
+    return mavg, ott_line(mavg, percent)
+
+
+def tott(src: np.ndarray, length: int, percent: float, coeff: float,
+         ma_type: str = 'VAR') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Twin Optimized Trend Tracker.
+
+    The bands are returned unshifted; the published script compares the
+    moving average against ``OTTup[2]`` and ``OTTdn[2]``.
+
+    Args:
+        src: Source values
+        length: Moving average period
+        percent: Trailing distance in percent
+        coeff: Twin band offset as a fraction of OTT
+        ma_type: Moving average type, see ``moving_average``
+
+    Returns:
+        Tuple of (moving average, upper OTT, lower OTT)
+    """
+    mavg, line = ott(src, length, percent, ma_type)
+    return mavg, line * (1 + coeff), line * (1 - coeff)
@@ -0,0 +1,219 @@
+"""
+Volatility and band kernels with TradingView semantics.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from numba import jit
+
+from .moving_averages import rma, sma
+
+
+@jit(nopython=True)
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    True range (``ta.tr(true)``); the first bar uses high - low.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+
+    Returns:
+        True range values
+    """
+    n = len(close)
+    out = np.empty(n)
+    if n == 0:
+        return out
+
+    out[0] = high[0] - low[0]
+    for i in range(1, n):
+        out[i] = max(
+            high[i] - low[i],
+            abs(high[i] - close[i - 1]),
+            abs(low[i] - close[i - 1])
+        )
+
+    return out
+
+
+@jit(nopython=True)
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int) -> np.ndarray:
+    """
+    Average true range (``ta.atr``), Wilder smoothed.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        length: ATR period
+
+    Returns:
+        ATR values, NaN for the first ``length - 1`` bars
+    """
+    return rma(true_range(high, low, close), length)
+
+
+@jit(nopython=True)
+def stdev(src: np.ndarray, length: int) -> np.ndarray:
+    """
+    Population standard deviation over a rolling window (``ta.stdev``).
+
+    Args:
+        src: Source values
+        length: Window length
+
+    Returns:
+        Standard deviation values
+    """
+    n = len(src)
+    mean = sma(src, length)
+    out = np.full(n, np.nan)
+
+    for i in range(length - 1, n):
+        if np.isnan(mean[i]):
+            continue
+        total = 0.0
+        for j in range(i - length + 1, i + 1):
+            total += (src[j] - mean[i]) ** 2
+        out[i] = np.sqrt(total / length)
+
+    return out
+
+
+@jit(nopython=True)
+def bollinger(src: np.ndarray, length: int,
+              mult: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands (``ta.bb``).
+
+    Args:
+        src: Source values
+        length: Basis SMA length
+        mult: Standard deviation multiplier
+
+    Returns:
+        Tuple of (basis, upper, lower)
+    """
+    basis = sma(src, length)
+    dev = mult * stdev(src, length)
+    return basis, basis + dev, basis - dev
+
+
+@jit(nopython=True)
+def supertrend(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+               factor: float, atr_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    SuperTrend (``ta.supertrend``).
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        factor: ATR multiplier
+        atr_length: ATR period
+
+    Returns:
+        Tuple of (supertrend, direction) where direction is -1 in an
+        uptrend and 1 in a downtrend, as in TradingView
+    """
+    return supertrend_from_atr(high, low, close, atr(high, low, close, atr_length), factor)
+
+
+@jit(nopython=True)
+def supertrend_from_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                        atr_values: np.ndarray, factor: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    SuperTrend for a precomputed ATR series.
+
+    Follows the Pine reference implementation, including its ``nz`` of the
+    previous bands and the downtrend default while ATR is warming up.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        atr_values: ATR values
+        factor: ATR multiplier
+
+    Returns:
+        Tuple of (supertrend, direction) as returned by ``supertrend``
+    """
+    n = len(close)
+    lower_band = np.full(n, np.nan)
+    upper_band = np.full(n, np.nan)
+    line = np.full(n, np.nan)
+    direction = np.ones(n, dtype=np.int64)
+
+    for i in range(n):
+        mid = (high[i] + low[i]) / 2.0
+        upper = mid + factor * atr_values[i]
+        lower = mid - factor * atr_values[i]
+
+        prev_lower = 0.0
+        prev_upper = 0.0
+        prev_close = np.nan
+        if i > 0:
+            prev_close = close[i - 1]
+            if not np.isnan(lower_band[i - 1]):
+                prev_lower = lower_band[i - 1]
+            if not np.isnan(upper_band[i - 1]):
+                prev_upper = upper_band[i - 1]
+
+        if not (lower > prev_lower or prev_close < prev_lower):
+            lower = prev_lower
+        if not (upper < prev_upper or prev_close > prev_upper):
+            upper = prev_upper
+        lower_band[i] = lower
+        upper_band[i] = upper
+
+        if i == 0 or np.isnan(atr_values[i - 1]):
+            direction[i] = 1
+        elif line[i - 1] == prev_upper:
+            direction[i] = -1 if close[i] > upper else 1
+        else:
+            direction[i] = 1 if close[i] < lower else -1
+
+        line[i] = lower if direction[i] == -1 else upper
+
+    return line, direction
+
+
+@jit(nopython=True)
+def atr_trailing_stop(src: np.ndarray, n_loss: np.ndarray) -> np.ndarray:
+    """
+    ATR trailing stop from the UT Bot alert script.
+
+    Args:
+        src: Source values (close or Heikin-Ashi close)
+        n_loss: Stop distance per bar, usually ``key_value * atr``
+
+    Returns:
+        Trailing stop values
+    """
+    n = len(src)
+    out = np.full(n, np.nan)
+
+    for i in range(n):
+        if np.isnan(src[i]) or np.isnan(n_loss[i]):
+            continue
+
+        prev = 0.0
+        prev_src = np.nan
+        if i > 0:
+            prev_src = src[i - 1]
+            if not np.isnan(out[i - 1]):
+                prev = out[i - 1]
+
+        if src[i] > prev and prev_src > prev:
+            out[i] = max(prev, src[i] - n_loss[i])
+        elif src[i] < prev and prev_src < prev:
+            out[i] = min(prev, src[i] + n_loss[i])
+        elif src[i] > prev:
+            out[i] = src[i] - n_loss[i]
+        else:
+            out[i] = src[i] + n_loss[i]
+
+    return out
@@ -12,6 +12,8 @@ import logging
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
+from .indicators import atr, atr_trailing_stop, ema, heikin_ashi, supertrend_from_atr
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -131,8 +133,9 @@ class NASDAQATRSuperTrendStrategy(BaseNASDAQStrategy):
         
         # Calculate EMAs for confirmation
         if self.use_ema_confirmation:
-            df['ema_fast'] = df['close'].ewm(span=self.ema_fast_len).mean()
-            df['ema_slow'] = df['close'].ewm(span=self.ema_slow_len).mean()
+            close = df['close'].to_numpy(dtype=np.float64)
+            df['ema_fast'] = ema(close, self.ema_fast_len)
+            df['ema_slow'] = ema(close, self.ema_slow_len)
         
         # Calculate volume indicators
         if self.use_volume_filter:
@@ -244,114 +247,41 @@ class NASDAQATRSuperTrendStrategy(BaseNASDAQStrategy):
         return min(confidence, 1.0)
     
     def _calculate_atr(self, df: pd.DataFrame, period: int) -> pd.Series:
-        """Calculate Average True Range."""
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        atr = true_range.rolling(window=period).mean()
-        
-        return atr
+        """Calculate Average True Range (Wilder, as TradingView ta.atr)."""
+        values = atr(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            period
+        )
+        return pd.Series(values, index=df.index)
     
     def _calculate_atr_trailing_stop(self, df: pd.DataFrame) -> pd.Series:
         """Calculate ATR Trailing Stop."""
-        atr = df['atr']
-        close = df['close']
-        
-        # Initialize arrays
-        atr_trailing_stop = np.zeros(len(df))
-        trend = np.zeros(len(df))
-        
-        # First value
-        atr_trailing_stop[0] = close.iloc[0] - (self.atr_multiplier * atr.iloc[0])
-        trend[0] = 1
-        
-        for i in range(1, len(df)):
-            if trend[i-1] == 1:  # Uptrend
-                if close.iloc[i] > atr_trailing_stop[i-1]:
-                    atr_trailing_stop[i] = max(atr_trailing_stop[i-1], close.iloc[i] - (self.atr_multiplier * atr.iloc[i]))
-                    trend[i] = 1
-                else:
-                    atr_trailing_stop[i] = close.iloc[i] + (self.atr_multiplier * atr.iloc[i])
-                    trend[i] = -1
-            else:  # Downtrend
-                if close.iloc[i] < atr_trailing_stop[i-1]:
-                    atr_trailing_stop[i] = min(atr_trailing_stop[i-1], close.iloc[i] + (self.atr_multiplier * atr.iloc[i]))
-                    trend[i] = -1
-                else:
-                    atr_trailing_stop[i] = close.iloc[i] - (self.atr_multiplier * atr.iloc[i])
-                    trend[i] = 1
-        
-        return pd.Series(atr_trailing_stop, index=df.index)
+        n_loss = self.atr_multiplier * df['atr'].to_numpy(dtype=np.float64)
+        stop = atr_trailing_stop(df['close'].to_numpy(dtype=np.float64), n_loss)
+        return pd.Series(stop, index=df.index)
     
     def _calculate_super_trend(self, df: pd.DataFrame) -> pd.Series:
         """Calculate SuperTrend indicator."""
-        atr = df['atr']
-        high = df['high']
-        low = df['low']
-        close = df['close']
-        
-        # Calculate basic upper and lower bands
-        hl2 = (high + low) / 2
-        upper_band = hl2 + (self.st_factor * atr)
-        lower_band = hl2 - (self.st_factor * atr)
-        
-        # Initialize arrays
-        super_trend = np.zeros(len(df))
-        trend = np.zeros(len(df))
-        
-        # First value
-        super_trend[0] = lower_band.iloc[0]
-        trend[0] = 1
-        
-        for i in range(1, len(df)):
-            if trend[i-1] == 1:  # Uptrend
-                if close.iloc[i] <= lower_band.iloc[i]:
-                    super_trend[i] = upper_band.iloc[i]
-                    trend[i] = -1
-                else:
-                    super_trend[i] = lower_band.iloc[i]
-                    trend[i] = 1
-            else:  # Downtrend
-                if close.iloc[i] >= upper_band.iloc[i]:
-                    super_trend[i] = lower_band.iloc[i]
-                    trend[i] = 1
-                else:
-                    super_trend[i] = upper_band.iloc[i]
-                    trend[i] = -1
-        
+        super_trend, _ = supertrend_from_atr(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            df['atr'].to_numpy(dtype=np.float64),
+            self.st_factor
+        )
         return pd.Series(super_trend, index=df.index)
     
     def _calculate_heikin_ashi(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate Heikin Ashi candles."""
+        """Calculate Heikin Ashi candles and replace the original OHLC."""
         ha_df = df.copy()
-        
-        # First HA candle
-        ha_df.loc[ha_df.index[0], 'ha_close'] = (df['open'].iloc[0] + df['high'].iloc[0] + df['low'].iloc[0] + df['close'].iloc[0]) / 4
-        ha_df.loc[ha_df.index[0], 'ha_open'] = (df['open'].iloc[0] + df['close'].iloc[0]) / 2
-        
-        for i in range(1, len(df)):
-            # HA Close
-            ha_df.loc[ha_df.index[i], 'ha_close'] = (df['open'].iloc[i] + df['high'].iloc[i] + df['low'].iloc[i] + df['close'].iloc[i]) / 4
-            
-            # HA Open
-            ha_df.loc[ha_df.index[i], 'ha_open'] = (ha_df['ha_open'].iloc[i-1] + ha_df['ha_close'].iloc[i-1]) / 2
-            
-            # HA High
-            ha_df.loc[ha_df.index[i], 'ha_high'] = max(df['high'].iloc[i], ha_df['ha_open'].iloc[i], ha_df['ha_close'].iloc[i])
-            
-            # HA Low
-            ha_df.loc[ha_df.index[i], 'ha_low'] = min(df['low'].iloc[i], ha_df['ha_open'].iloc[i], ha_df['ha_close'].iloc[i])
-        
-        # Replace original OHLC with HA OHLC
-        ha_df['open'] = ha_df['ha_open']
-        ha_df['high'] = ha_df['ha_high']
-        ha_df['low'] = ha_df['ha_low']
-        ha_df['close'] = ha_df['ha_close']
-        
-        # Drop HA columns
-        ha_df = ha_df.drop(['ha_open', 'ha_high', 'ha_low', 'ha_close'], axis=1)
+        ha_df['open'], ha_df['high'], ha_df['low'], ha_df['close'] = heikin_ashi(
+            df['open'].to_numpy(dtype=np.float64),
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64)
+        )
         
         return ha_df
     
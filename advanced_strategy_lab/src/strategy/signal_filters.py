@@ -0,0 +1,51 @@
+"""
+Signal filters shared by the trading applications and the optimizers
+Pine Script signal filtreleri (numpy, bar döngüsü olmadan)
+
+This is the canonical copy. advanced_strategy_lab, strategy_optimizer_v2 and
+nasdaq_strategy_optimizer are deployed on their own, so each ships an
+identical copy as src/strategy/signal_filters.py. Edit this file and copy it
+over; advanced_strategy_lab/tests/test_signal_filters.py fails when the
+copies differ.
+"""
+
+from typing import Tuple
+import numpy as np
+
+
+def filter_alternating_signals(raw_buy, raw_sell) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep only signals that change direction from the previous signal
+    
+    Same as Pine's lastDir filter (buyOK = rawBuy and lastDir != 1). The
+    last direction is the forward-filled direction of the raw signals, so
+    no bar loop is needed. raw_buy and raw_sell must not be True on the
+    same bar.
+    
+    Args:
+        raw_buy: Boolean buy candidates per bar
+        raw_sell: Boolean sell candidates per bar
+        
+    Returns:
+        Tuple of (buy_signal, sell_signal) boolean arrays
+        
+    Raises:
+        ValueError: If a bar is both a buy and a sell candidate
+    """
+    raw_buy = np.asarray(raw_buy, dtype=bool)
+    raw_sell = np.asarray(raw_sell, dtype=bool)
+    # A bar with both candidates has no single direction to forward-fill
+    both = np.flatnonzero(raw_buy & raw_sell)
+    if len(both):
+        raise ValueError(f"{len(both)} bars are both buy and sell candidates (first at position {both[0]})")
+    direction = np.where(raw_buy, 1, np.where(raw_sell, -1, 0))
+    
+    # Index of the last candidate up to each bar, then shifted to the previous bar
+    last_idx = np.maximum.accumulate(np.where(direction != 0, np.arange(len(direction)), -1))
+    prev_idx = np.empty_like(last_idx)
+    prev_idx[:1] = -1
+    prev_idx[1:] = last_idx[:-1]
+    last_dir = np.where(prev_idx >= 0, direction[np.maximum(prev_idx, 0)], 0)
+    
+    emit = (direction != 0) & (direction != last_dir)
+    return emit & (direction == 1), emit & (direction == -1)
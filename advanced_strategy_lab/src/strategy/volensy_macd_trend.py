@@ -8,77 +8,12 @@ with EMA trend filter, MACD momentum, and RSI confirmation.
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, Tuple, Optional, List
-from numba import jit
 import logging
 
-logger = logging.getLogger(__name__)
-
-
-@jit(nopython=True)
-def calculate_ema(prices: np.ndarray, period: int) -> np.ndarray:
-    """Calculate EMA using Numba for performance."""
-    n = len(prices)
-    ema = np.zeros(n)
-    
-    if n < period:
-        return ema
-    
-    # Calculate initial SMA
-    sma = np.mean(prices[:period])
-    ema[period-1] = sma
-    
-    # Calculate EMA
-    multiplier = 2.0 / (period + 1)
-    for i in range(period, n):
-        ema[i] = (prices[i] * multiplier) + (ema[i-1] * (1 - multiplier))
-    
-    return ema
+from .indicators import atr, ema, macd, rsi
+from .signal_filters import filter_alternating_signals
 
-
-@jit(nopython=True)
-def calculate_rsi(prices: np.ndarray, period: int) -> np.ndarray:
-    """Calculate RSI using Numba for performance."""
-    n = len(prices)
-    rsi = np.zeros(n)
-    
-    if n < period + 1:
-        return rsi
-    
-    # Calculate price changes
-    deltas = np.zeros(n)
-    for i in range(1, n):
-        deltas[i] = prices[i] - prices[i-1]
-    
-    # Separate gains and losses
-    gains = np.zeros(n)
-    losses = np.zeros(n)
-    
-    for i in range(1, n):
-        if deltas[i] > 0:
-            gains[i] = deltas[i]
-        else:
-            losses[i] = -deltas[i]
-    
-    # Calculate initial average gain and loss
-    avg_gain = np.mean(gains[1:period+1])
-    avg_loss = np.mean(losses[1:period+1])
-    
-    # Calculate RSI
-    for i in range(period, n):
-        if i == period:
-            avg_gain = avg_gain
-            avg_loss = avg_loss
-        else:
-            avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-            avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-        
-        if avg_loss == 0:
-            rsi[i] = 100
-        else:
-            rs = avg_gain / avg_loss
-            rsi[i] = 100 - (100 / (1 + rs))
-    
-    return rsi
+logger = logging.getLogger(__name__)
 
 
 class VolensyMacdTrendStrategy:
@@ -135,18 +70,18 @@ class VolensyMacdTrendStrategy:
         """
         df = df.copy()
         
+        close = df['close'].to_numpy(dtype=np.float64)
+        
         # Calculate EMA trend
-        df['ema_trend'] = calculate_ema(df['close'].values, self.ema_len)
+        df['ema_trend'] = ema(close, self.ema_len)
         
         # Calculate MACD
-        ema_fast = calculate_ema(df['close'].values, self.macd_fast)
-        ema_slow = calculate_ema(df['close'].values, self.macd_slow)
-        df['macd'] = ema_fast - ema_slow
-        df['macd_signal'] = calculate_ema(df['macd'].values, self.macd_signal)
-        df['macd_hist'] = df['macd'] - df['macd_signal']
+        df['macd'], df['macd_signal'], df['macd_hist'] = macd(
+            close, self.macd_fast, self.macd_slow, self.macd_signal
+        )
         
         # Calculate RSI
-        df['rsi'] = calculate_rsi(df['close'].values, self.rsi_len)
+        df['rsi'] = rsi(close, self.rsi_len)
         
         # Calculate ATR (for information)
         df['atr'] = self._calculate_atr(df)
@@ -154,15 +89,14 @@ class VolensyMacdTrendStrategy:
         return df
     
     def _calculate_atr(self, df: pd.DataFrame) -> pd.Series:
-        """Calculate ATR using pandas."""
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift(1))
-        low_close = np.abs(df['low'] - df['close'].shift(1))
-        
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = tr.rolling(window=self.atr_len).mean()
-        
-        return atr
+        """Calculate Wilder ATR with the compiled indicator library."""
+        values = atr(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            self.atr_len
+        )
+        return pd.Series(values, index=df.index)
     
     def run_strategy(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -229,20 +163,10 @@ class VolensyMacdTrendStrategy:
         else:
             df['can_signal'] = True
         
-        # Prevent duplicate signals
-        df['buy_signal'] = False
-        df['sell_signal'] = False
-        
-        # Track last direction to prevent duplicates
-        last_dir = 0
-        
-        for i in range(len(df)):
-            if df.iloc[i]['can_signal'] and df.iloc[i]['raw_buy'] and last_dir != 1:
-                df.iloc[i, df.columns.get_loc('buy_signal')] = True
-                last_dir = 1
-            elif df.iloc[i]['can_signal'] and df.iloc[i]['raw_sell'] and last_dir != -1:
-                df.iloc[i, df.columns.get_loc('sell_signal')] = True
-                last_dir = -1
+        # Prevent duplicate signals (alternate BUY/SELL direction)
+        df['buy_signal'], df['sell_signal'] = filter_alternating_signals(
+            df['can_signal'] & df['raw_buy'], df['can_signal'] & df['raw_sell']
+        )
         
         # Convert signals to backtester format
         df['buy_final'] = df['buy_signal']
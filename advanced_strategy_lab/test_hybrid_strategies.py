@@ -6,6 +6,7 @@ Hybrid Strategy Testing - Combining Best Strategies
 import pandas as pd
 import numpy as np
 from src.data.nasdaq_provider import NASDAQDataProvider
+from src.strategy.indicators import bollinger, ema, rsi
 from typing import Dict, List, Any
 
 class HybridRSIEMAStrategy:
@@ -26,23 +27,17 @@ class HybridRSIEMAStrategy:
         # Confirmation requirements
         self.require_both_signals = params.get('require_both_signals', True)
     
-    def calculate_rsi(self, src: pd.Series, period: int) -> pd.Series:
-        delta = src.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         df = df.copy()
         
+        close = df['close'].to_numpy(dtype=np.float64)
+        
         # Calculate RSI
-        df['rsi'] = self.calculate_rsi(df['close'], self.rsi_period)
+        df['rsi'] = rsi(close, self.rsi_period)
         
         # Calculate EMAs
-        df['ema_fast'] = df['close'].ewm(span=self.ema_fast).mean()
-        df['ema_slow'] = df['close'].ewm(span=self.ema_slow).mean()
+        df['ema_fast'] = ema(close, self.ema_fast)
+        df['ema_slow'] = ema(close, self.ema_slow)
         
         # Calculate EMA difference
         df['ema_diff'] = df['ema_fast'] - df['ema_slow']
@@ -131,25 +126,16 @@ class HybridRSIBollingerStrategy:
         # Confirmation requirements
         self.require_both_signals = params.get('require_both_signals', True)
     
-    def calculate_rsi(self, src: pd.Series, period: int) -> pd.Series:
-        delta = src.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         df = df.copy()
         
+        close = df['close'].to_numpy(dtype=np.float64)
+        
         # Calculate RSI
-        df['rsi'] = self.calculate_rsi(df['close'], self.rsi_period)
+        df['rsi'] = rsi(close, self.rsi_period)
         
         # Calculate Bollinger Bands
-        df['bb_middle'] = df['close'].rolling(window=self.bb_period).mean()
-        bb_std = df['close'].rolling(window=self.bb_period).std()
-        df['bb_upper'] = df['bb_middle'] + (bb_std * self.bb_std_dev)
-        df['bb_lower'] = df['bb_middle'] - (bb_std * self.bb_std_dev)
+        df['bb_middle'], df['bb_upper'], df['bb_lower'] = bollinger(close, self.bb_period, self.bb_std_dev)
         
         # Calculate BB position
         df['bb_position'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
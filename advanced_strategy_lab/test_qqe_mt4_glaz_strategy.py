@@ -6,6 +6,7 @@ QQE MT4 Glaz Strategy Implementation and Testing
 import pandas as pd
 import numpy as np
 from src.data.nasdaq_provider import NASDAQDataProvider
+from src.strategy.indicators import qqe, rsi
 from typing import Dict, List, Any
 
 class QQEMT4GlazStrategy:
@@ -15,83 +16,17 @@ class QQEMT4GlazStrategy:
         self.sf = params.get('sf', 5)  # RSI Smoothing
         self.qqe = params.get('qqe', 4.238)  # Fast QQE Factor
         self.threshold = params.get('threshold', 10)  # Threshold
-        
-        # Calculate Wilders Period
-        self.wilders_period = self.rsi_period * 2 - 1
-    
-    def calculate_rsi(self, src: pd.Series, period: int) -> pd.Series:
-        """Calculate RSI"""
-        delta = src.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
-    def calculate_ema(self, src: pd.Series, period: int) -> pd.Series:
-        """Calculate EMA"""
-        return src.ewm(span=period).mean()
     
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate all indicators for QQE MT4 Glaz strategy"""
         df = df.copy()
+        close = df['close'].to_numpy(dtype=np.float64)
         
         # Calculate RSI
-        df['rsi'] = self.calculate_rsi(df['close'], self.rsi_period)
-        
-        # Calculate RSI MA (smoothed RSI)
-        df['rsi_ma'] = self.calculate_ema(df['rsi'], self.sf)
-        
-        # Calculate ATR RSI
-        df['atr_rsi'] = abs(df['rsi_ma'].shift(1) - df['rsi_ma'])
-        
-        # Calculate MA ATR RSI
-        df['ma_atr_rsi'] = self.calculate_ema(df['atr_rsi'], self.wilders_period)
-        
-        # Calculate DAR (Dynamic Adaptive Range)
-        df['dar'] = self.calculate_ema(df['ma_atr_rsi'], self.wilders_period) * self.qqe
-        
-        # Initialize bands and trend
-        df['longband'] = 0.0
-        df['shortband'] = 0.0
-        df['trend'] = 0
-        
-        # Calculate QQE bands and trend
-        for i in range(1, len(df)):
-            delta_fast_atr_rsi = df['dar'].iloc[i]
-            rsi_index = df['rsi_ma'].iloc[i]
-            
-            new_shortband = rsi_index + delta_fast_atr_rsi
-            new_longband = rsi_index - delta_fast_atr_rsi
-            
-            # Update longband
-            if (df['rsi_ma'].iloc[i-1] > df['longband'].iloc[i-1] and 
-                rsi_index > df['longband'].iloc[i-1]):
-                df['longband'].iloc[i] = max(df['longband'].iloc[i-1], new_longband)
-            else:
-                df['longband'].iloc[i] = new_longband
-            
-            # Update shortband
-            if (df['rsi_ma'].iloc[i-1] < df['shortband'].iloc[i-1] and 
-                rsi_index < df['shortband'].iloc[i-1]):
-                df['shortband'].iloc[i] = min(df['shortband'].iloc[i-1], new_shortband)
-            else:
-                df['shortband'].iloc[i] = new_shortband
-            
-            # Update trend
-            prev_trend = df['trend'].iloc[i-1] if i > 0 else 1
-            
-            if (rsi_index > df['shortband'].iloc[i-1] and 
-                df['rsi_ma'].iloc[i-1] <= df['shortband'].iloc[i-1]):
-                df['trend'].iloc[i] = 1
-            elif (df['longband'].iloc[i-1] > rsi_index and 
-                  df['longband'].iloc[i-1] >= df['rsi_ma'].iloc[i-1]):
-                df['trend'].iloc[i] = -1
-            else:
-                df['trend'].iloc[i] = prev_trend
+        df['rsi'] = rsi(close, self.rsi_period)
         
-        # Calculate Fast ATR RSI Trend Line
-        df['fast_atr_rsi_tl'] = np.where(df['trend'] == 1, df['longband'], df['shortband'])
+        # Smoothed RSI, Fast ATR RSI Trend Line and trend (Glaz QQE)
+        df['rsi_ma'], df['fast_atr_rsi_tl'], df['trend'] = qqe(close, self.rsi_period, self.sf, self.qqe)
         
         # Calculate signals
         df['qqe_signal'] = np.where(df['rsi_ma'] > df['fast_atr_rsi_tl'], 1, -1)
@@ -7,6 +7,7 @@ Based on Pine Script: rsi_ultra_agresif_strategy.pine
 import pandas as pd
 import numpy as np
 from src.data.nasdaq_provider import NASDAQDataProvider
+from src.strategy.indicators import rsi
 from typing import Dict, List, Any
 import time
 
@@ -18,21 +19,12 @@ class RSIUltraAgresifStrategy:
         self.stop_loss = params.get('stop_loss', 0.01)  # 1.0%
         self.take_profit = params.get('take_profit', 0.02)  # 2.0%
     
-    def calculate_rsi(self, src: pd.Series, period: int) -> pd.Series:
-        """Calculate RSI indicator"""
-        delta = src.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate all indicators"""
         df = df.copy()
         
         # Calculate RSI
-        df['rsi'] = self.calculate_rsi(df['close'], self.rsi_period)
+        df['rsi'] = rsi(df['close'].to_numpy(dtype=np.float64), self.rsi_period)
         
         return df
     
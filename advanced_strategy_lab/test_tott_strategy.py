@@ -6,6 +6,7 @@ TOTT (Twin Optimized Trend Tracker) Strategy Implementation and Testing
 import pandas as pd
 import numpy as np
 from src.data.nasdaq_provider import NASDAQDataProvider
+from src.strategy.indicators import tott
 from typing import Dict, List, Any, Tuple
 
 class TOTTStrategy:
@@ -16,91 +17,15 @@ class TOTTStrategy:
         self.coeff = params.get('coeff', 0.001)
         self.mav = params.get('mav', 'VAR')
     
-    def calculate_var(self, src: pd.Series, length: int) -> pd.Series:
-        """Calculate VAR (Variable Adaptive Rate) moving average"""
-        valpha = 2 / (length + 1)
-        
-        vud1 = np.where(src > src.shift(1), src - src.shift(1), 0)
-        vdd1 = np.where(src < src.shift(1), src.shift(1) - src, 0)
-        
-        vUD = pd.Series(vud1).rolling(window=9).sum()
-        vDD = pd.Series(vdd1).rolling(window=9).sum()
-        
-        vCMO = (vUD - vDD) / (vUD + vDD)
-        vCMO = vCMO.fillna(0)
-        
-        VAR = pd.Series(index=src.index, dtype=float)
-        VAR.iloc[0] = src.iloc[0]
-        
-        for i in range(1, len(src)):
-            VAR.iloc[i] = valpha * abs(vCMO.iloc[i]) * src.iloc[i] + (1 - valpha * abs(vCMO.iloc[i])) * VAR.iloc[i-1]
-        
-        return VAR
-    
-    def calculate_ma(self, src: pd.Series, length: int) -> pd.Series:
-        """Calculate moving average based on type"""
-        if self.mav == "SMA":
-            return src.rolling(window=length).mean()
-        elif self.mav == "EMA":
-            return src.ewm(span=length).mean()
-        elif self.mav == "WMA":
-            weights = np.arange(1, length + 1)
-            return src.rolling(window=length).apply(lambda x: np.average(x, weights=weights), raw=True)
-        elif self.mav == "VAR":
-            return self.calculate_var(src, length)
-        else:
-            return src.rolling(window=length).mean()  # Default to SMA
-    
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate all indicators for TOTT strategy"""
         df = df.copy()
         
-        # Calculate moving average
-        df['MAvg'] = self.calculate_ma(df['close'], self.length)
-        
-        # Calculate fark (difference)
-        df['fark'] = df['MAvg'] * self.percent * 0.01
-        
-        # Calculate long and short stops
-        df['longStop'] = df['MAvg'] - df['fark']
-        df['shortStop'] = df['MAvg'] + df['fark']
-        
-        # Calculate trailing stops
-        df['longStopPrev'] = df['longStop'].shift(1)
-        df['shortStopPrev'] = df['shortStop'].shift(1)
-        
-        # Update stops based on trend
-        for i in range(1, len(df)):
-            if df['MAvg'].iloc[i] > df['longStopPrev'].iloc[i]:
-                df['longStop'].iloc[i] = max(df['longStop'].iloc[i], df['longStopPrev'].iloc[i])
-            if df['MAvg'].iloc[i] < df['shortStopPrev'].iloc[i]:
-                df['shortStop'].iloc[i] = min(df['shortStop'].iloc[i], df['shortStopPrev'].iloc[i])
-        
-        # Calculate direction
-        df['dir'] = 1
-        for i in range(1, len(df)):
-            prev_dir = df['dir'].iloc[i-1]
-            if prev_dir == -1 and df['MAvg'].iloc[i] > df['shortStopPrev'].iloc[i]:
-                df['dir'].iloc[i] = 1
-            elif prev_dir == 1 and df['MAvg'].iloc[i] < df['longStopPrev'].iloc[i]:
-                df['dir'].iloc[i] = -1
-            else:
-                df['dir'].iloc[i] = prev_dir
-        
-        # Calculate MT (Moving Trend)
-        df['MT'] = np.where(df['dir'] == 1, df['longStop'], df['shortStop'])
-        
-        # Calculate OTT (Optimized Trend Tracker)
-        df['OTT'] = np.where(
-            df['MAvg'] > df['MT'],
-            df['MT'] * (200 + self.percent) / 200,
-            df['MT'] * (200 - self.percent) / 200
+        # Moving average and twin OTT bands
+        df['MAvg'], df['OTTup'], df['OTTdn'] = tott(
+            df['close'].to_numpy(dtype=np.float64), self.length, self.percent, self.coeff, self.mav
         )
         
-        # Calculate OTT up and down
-        df['OTTup'] = df['OTT'] * (1 + self.coeff)
-        df['OTTdn'] = df['OTT'] * (1 - self.coeff)
-        
         # Shift OTT for signal calculation
         df['OTTup_shifted'] = df['OTTup'].shift(2)
         df['OTTdn_shifted'] = df['OTTdn'].shift(2)
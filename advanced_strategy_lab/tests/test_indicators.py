@@ -0,0 +1,361 @@
+"""
+TradingView parity tests for the compiled indicator library.
+
+Each reference below is a bar-by-bar transcription of the Pine Script
+definition (``na``/``nz`` included) and the kernels must match it exactly.
+"""
+
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from strategy.indicators import (
+    sma, ema, rma, wma, var_ma, moving_average, rsi, cci, macd, qqe,
+    true_range, atr, stdev, bollinger, supertrend, atr_trailing_stop,
+    ott, tott, heikin_ashi
+)
+
+
+na = float('nan')
+
+
+def is_na(x):
+    return x is None or (isinstance(x, float) and math.isnan(x))
+
+
+def nz(x, default=0.0):
+    return default if is_na(x) else x
+
+
+def at(series, i):
+    """Pine history reference ``series[offset]`` resolved to a bar index."""
+    return series[i] if 0 <= i < len(series) else na
+
+
+def pine_sma(src, length):
+    out = []
+    for i in range(len(src)):
+        window = [at(src, j) for j in range(i - length + 1, i + 1)]
+        out.append(na if any(is_na(x) for x in window) else sum(window) / length)
+    return out
+
+
+def pine_rma(src, length, alpha=None):
+    alpha = 1.0 / length if alpha is None else alpha
+    seed = pine_sma(src, length)
+    out = []
+    for i in range(len(src)):
+        prev = at(out, i - 1)
+        if is_na(prev):
+            out.append(seed[i])
+        else:
+            out.append(na if is_na(src[i]) else alpha * src[i] + (1 - alpha) * prev)
+    return out
+
+
+def pine_ema(src, length):
+    return pine_rma(src, length, alpha=2.0 / (length + 1))
+
+
+def pine_rsi(src, length):
+    change = [na] + [src[i] - src[i - 1] for i in range(1, len(src))]
+    up = pine_rma([na if is_na(c) else max(c, 0.0) for c in change], length)
+    down = pine_rma([na if is_na(c) else max(-c, 0.0) for c in change], length)
+    out = []
+    for u, d in zip(up, down):
+        if is_na(u) or is_na(d):
+            out.append(na)
+        else:
+            out.append(100.0 if d == 0 else 0.0 if u == 0 else 100 - 100 / (1 + u / d))
+    return out
+
+
+def pine_atr(high, low, close, length):
+    tr = [high[0] - low[0]] + [
+        max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        for i in range(1, len(close))
+    ]
+    return pine_rma(tr, length)
+
+
+def pine_supertrend(high, low, close, factor, atr_period):
+    atr_ = pine_atr(high, low, close, atr_period)
+    upper_band, lower_band, st, direction = [], [], [], []
+    for i in range(len(close)):
+        src = (high[i] + low[i]) / 2
+        upper = src + factor * atr_[i]
+        lower = src - factor * atr_[i]
+        prev_lower = nz(at(lower_band, i - 1))
+        prev_upper = nz(at(upper_band, i - 1))
+        close_1 = at(close, i - 1)
+        lower = lower if (lower > prev_lower or close_1 < prev_lower) else prev_lower
+        upper = upper if (upper < prev_upper or close_1 > prev_upper) else prev_upper
+        prev_st = at(st, i - 1)
+        if is_na(at(atr_, i - 1)):
+            d = 1
+        elif prev_st == prev_upper:
+            d = -1 if close[i] > upper else 1
+        else:
+            d = 1 if close[i] < lower else -1
+        upper_band.append(upper)
+        lower_band.append(lower)
+        direction.append(d)
+        st.append(lower if d == -1 else upper)
+    return st, direction
+
+
+def pine_qqe(src, rsi_period, sf, factor):
+    wilders = rsi_period * 2 - 1
+    rsi_ma = pine_ema(pine_rsi(src, rsi_period), sf)
+    atr_rsi = [abs(at(rsi_ma, i - 1) - rsi_ma[i]) for i in range(len(src))]
+    dar = [x * factor for x in pine_ema(pine_ema(atr_rsi, wilders), wilders)]
+
+    def cross(x, y, i):
+        x0, x1, y0, y1 = x(i), x(i - 1), y(i), y(i - 1)
+        return (x0 > y0 and x1 <= y1) or (x0 < y0 and x1 >= y1)
+
+    longband, shortband, trend, fast = [], [], [], []
+    for i in range(len(src)):
+        new_short = rsi_ma[i] + dar[i]
+        new_long = rsi_ma[i] - dar[i]
+        lb1, sb1 = at(longband, i - 1), at(shortband, i - 1)
+        r1 = at(rsi_ma, i - 1)
+        if r1 > lb1 and rsi_ma[i] > lb1:
+            longband.append(na if is_na(new_long) else max(lb1, new_long))
+        else:
+            longband.append(new_long)
+        if r1 < sb1 and rsi_ma[i] < sb1:
+            shortband.append(na if is_na(new_short) else min(sb1, new_short))
+        else:
+            shortband.append(new_short)
+
+        rsi_at = lambda k: at(rsi_ma, k)
+        short_1 = lambda k: at(shortband, k - 1)
+        long_1 = lambda k: at(longband, k - 1)
+        if cross(rsi_at, short_1, i):
+            t = 1
+        elif cross(long_1, rsi_at, i):
+            t = -1
+        else:
+            t = nz(at(trend, i - 1), 1)
+        trend.append(t)
+        fast.append(longband[i] if t == 1 else shortband[i])
+    return rsi_ma, fast, trend
+
+
+def pine_var(src, length):
+    valpha = 2 / (length + 1)
+    vud1 = [0.0] + [src[i] - src[i - 1] if src[i] > src[i - 1] else 0.0 for i in range(1, len(src))]
+    vdd1 = [0.0] + [src[i - 1] - src[i] if src[i] < src[i - 1] else 0.0 for i in range(1, len(src))]
+    out = []
+    for i in range(len(src)):
+        if i < 8:
+            cmo = 0.0
+        else:
+            up, down = sum(vud1[i - 8:i + 1]), sum(vdd1[i - 8:i + 1])
+            cmo = (up - down) / (up + down) if up + down != 0 else 0.0
+        out.append(nz(valpha * abs(cmo) * src[i]) + (1 - valpha * abs(cmo)) * nz(at(out, i - 1)))
+    return out
+
+
+def pine_ott(mavg, percent):
+    long_stop, short_stop, direction, out = [], [], [], []
+    for i in range(len(mavg)):
+        fark = mavg[i] * percent * 0.01
+        ls = mavg[i] - fark
+        ls_prev = nz(at(long_stop, i - 1), ls)
+        ls = max(ls, ls_prev) if mavg[i] > ls_prev else ls
+        ss = mavg[i] + fark
+        ss_prev = nz(at(short_stop, i - 1), ss)
+        ss = min(ss, ss_prev) if mavg[i] < ss_prev else ss
+        d = nz(at(direction, i - 1), 1)
+        d = 1 if (d == -1 and mavg[i] > ss_prev) else -1 if (d == 1 and mavg[i] < ls_prev) else d
+        mt = ls if d == 1 else ss
+        long_stop.append(ls)
+        short_stop.append(ss)
+        direction.append(d)
+        out.append(mt * (200 + percent) / 200 if mavg[i] > mt else mt * (200 - percent) / 200)
+    return out
+
+
+def pine_ut_bot(src, n_loss):
+    out = []
+    for i in range(len(src)):
+        prev = nz(at(out, i - 1))
+        src_1 = at(src, i - 1)
+        if src[i] > prev and src_1 > prev:
+            value = na if is_na(n_loss[i]) else max(prev, src[i] - n_loss[i])
+        elif src[i] < prev and src_1 < prev:
+            value = na if is_na(n_loss[i]) else min(prev, src[i] + n_loss[i])
+        elif src[i] > prev:
+            value = src[i] - n_loss[i]
+        else:
+            value = src[i] + n_loss[i]
+        out.append(value)
+    return out
+
+
+def assert_series_equal(actual, expected):
+    np.testing.assert_allclose(np.asarray(actual, dtype=float),
+                               np.asarray(expected, dtype=float),
+                               rtol=1e-10, atol=1e-10, equal_nan=True)
+
+
+@pytest.fixture
+def ohlc():
+    """Random-walk OHLC with enough bars for every warm-up to finish."""
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1.0, 400))
+    open_ = np.concatenate(([close[0]], close[:-1])) + rng.normal(0, 0.2, 400)
+    high = np.maximum(open_, close) + rng.uniform(0, 1.0, 400)
+    low = np.minimum(open_, close) - rng.uniform(0, 1.0, 400)
+    return open_, high, low, close
+
+
+class TestMovingAverages:
+    """Moving average kernels against the Pine definitions."""
+
+    def test_sma_known_values(self):
+        src = np.array([1.0, 2.0, 3.0, 4.0, np.nan, 6.0, 7.0, 8.0])
+        assert_series_equal(sma(src, 3), [na, na, 2.0, 3.0, na, na, na, 7.0])
+
+    @pytest.mark.parametrize('length', [1, 5, 14])
+    def test_ema_and_rma_match_pine(self, ohlc, length):
+        close = ohlc[3]
+        assert_series_equal(ema(close, length), pine_ema(list(close), length))
+        assert_series_equal(rma(close, length), pine_rma(list(close), length))
+
+    def test_ema_seeds_after_leading_na(self):
+        src = np.array([np.nan, np.nan, 2.0, 4.0, 6.0, 8.0])
+        result = ema(src, 3)
+        assert np.isnan(result[:4]).all()
+        assert result[4] == pytest.approx(4.0)
+        assert result[5] == pytest.approx(0.5 * 8.0 + 0.5 * 4.0)
+
+    def test_wma_known_values(self):
+        src = np.array([1.0, 2.0, 3.0, 4.0])
+        assert_series_equal(wma(src, 3), [na, na, (1 + 4 + 9) / 6, (2 + 6 + 12) / 6])
+
+    def test_var_matches_pine(self, ohlc):
+        close = ohlc[3]
+        assert_series_equal(var_ma(close, 20), pine_var(list(close), 20))
+
+    def test_moving_average_dispatch(self, ohlc):
+        close = ohlc[3]
+        assert_series_equal(moving_average(close, 10, 'sma'), sma(close, 10))
+        with pytest.raises(ValueError):
+            moving_average(close, 10, 'HMA')
+
+
+class TestMomentum:
+    """Oscillator kernels against the Pine definitions."""
+
+    def test_rsi_matches_pine(self, ohlc):
+        close = ohlc[3]
+        assert_series_equal(rsi(close, 14), pine_rsi(list(close), 14))
+
+    def test_rsi_extremes(self):
+        rising = np.arange(1.0, 31.0)
+        assert rsi(rising, 14)[-1] == 100.0
+        assert rsi(rising[::-1].copy(), 14)[-1] == 0.0
+
+    def test_cci_matches_definition(self, ohlc):
+        _, high, low, close = ohlc
+        hlc3 = (high + low + close) / 3
+        expected = []
+        for i in range(len(hlc3)):
+            if i < 19:
+                expected.append(na)
+                continue
+            window = hlc3[i - 19:i + 1]
+            mean = window.mean()
+            expected.append((hlc3[i] - mean) / (0.015 * np.abs(window - mean).mean()))
+        assert_series_equal(cci(hlc3, 20), expected)
+
+    def test_macd_chains_emas(self, ohlc):
+        close = ohlc[3]
+        line, signal, hist = macd(close, 12, 26, 9)
+        expected_line = np.asarray(pine_ema(list(close), 12)) - np.asarray(pine_ema(list(close), 26))
+        assert_series_equal(line, expected_line)
+        assert_series_equal(signal, pine_ema(list(expected_line), 9))
+        assert_series_equal(hist, expected_line - np.asarray(pine_ema(list(expected_line), 9)))
+        assert not np.isnan(signal[33])
+
+    def test_qqe_matches_pine(self, ohlc):
+        close = ohlc[3]
+        rsi_ma, fast_tl, trend = qqe(close, 14, 5, 4.238)
+        expected = pine_qqe(list(close), 14, 5, 4.238)
+        assert_series_equal(rsi_ma, expected[0])
+        assert_series_equal(fast_tl, expected[1])
+        assert list(trend) == expected[2]
+        assert set(trend) == {-1, 1}
+
+
+class TestVolatility:
+    """Volatility kernels against the Pine definitions."""
+
+    def test_true_range_known_values(self):
+        high = np.array([10.0, 12.0, 11.0])
+        low = np.array([9.0, 10.5, 8.0])
+        close = np.array([9.5, 11.5, 8.5])
+        assert_series_equal(true_range(high, low, close), [1.0, 2.5, 3.5])
+
+    def test_atr_matches_pine(self, ohlc):
+        _, high, low, close = ohlc
+        assert_series_equal(atr(high, low, close, 14), pine_atr(high, low, close, 14))
+        assert np.isnan(atr(high, low, close, 14)[:13]).all()
+
+    def test_bollinger_uses_population_stdev(self, ohlc):
+        close = ohlc[3]
+        basis, upper, lower = bollinger(close, 20, 2.0)
+        expected_dev = [na] * 19 + [close[i - 19:i + 1].std(ddof=0) for i in range(19, len(close))]
+        assert_series_equal(stdev(close, 20), expected_dev)
+        assert_series_equal(upper - basis, 2.0 * np.asarray(expected_dev))
+        assert_series_equal(basis - lower, 2.0 * np.asarray(expected_dev))
+
+    @pytest.mark.parametrize('factor,period', [(3.0, 10), (1.5, 1)])
+    def test_supertrend_matches_pine(self, ohlc, factor, period):
+        _, high, low, close = ohlc
+        line, direction = supertrend(high, low, close, factor, period)
+        expected_line, expected_dir = pine_supertrend(high, low, close, factor, period)
+        assert_series_equal(line, expected_line)
+        assert list(direction) == expected_dir
+        assert set(direction[period:]) == {-1, 1}
+
+    def test_atr_trailing_stop_matches_ut_bot(self, ohlc):
+        _, high, low, close = ohlc
+        n_loss = 2.0 * atr(high, low, close, 10)
+        assert_series_equal(atr_trailing_stop(close, n_loss), pine_ut_bot(list(close), list(n_loss)))
+
+
+class TestTrendAndCandles:
+    """OTT/TOTT and Heikin-Ashi."""
+
+    @pytest.mark.parametrize('ma_type', ['VAR', 'EMA', 'SMA'])
+    def test_ott_matches_pine(self, ohlc, ma_type):
+        close = ohlc[3]
+        mavg, line = ott(close, 20, 1.4, ma_type)
+        assert_series_equal(line, pine_ott(list(mavg), 1.4))
+
+    def test_tott_bands(self, ohlc):
+        close = ohlc[3]
+        mavg, upper, lower = tott(close, 40, 1.0, 0.001)
+        _, line = ott(close, 40, 1.0)
+        assert_series_equal(mavg, var_ma(close, 40))
+        assert_series_equal(upper, line * 1.001)
+        assert_series_equal(lower, line * 0.999)
+
+    def test_heikin_ashi(self, ohlc):
+        open_, high, low, close = ohlc
+        ha_open, ha_high, ha_low, ha_close = heikin_ashi(open_, high, low, close)
+        assert ha_open[0] == pytest.approx((open_[0] + close[0]) / 2)
+        assert_series_equal(ha_close, (open_ + high + low + close) / 4)
+        assert_series_equal(ha_open[1:], (ha_open[:-1] + ha_close[:-1]) / 2)
+        assert (ha_high >= np.maximum(ha_open, ha_close)).all()
+        assert (ha_low <= np.minimum(ha_open, ha_close)).all()
@@ -0,0 +1,143 @@
+"""
+Tests for the vectorized alternating-direction signal filter.
+
+The reference is the bar-by-bar ``last_dir`` loop the filter replaced. The
+canonical module lives in simple_trader/projects/common; the optimizer
+projects ship identical copies, which are checked here together with the
+Volensy strategies that call them.
+"""
+
+import importlib.util
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from strategy.volensy_macd_trend import filter_alternating_signals
+
+
+ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+CANONICAL_FILTERS = os.path.join(ROOT, 'simple_trader', 'projects', 'common', 'signal_filters.py')
+PROJECTS = ['advanced_strategy_lab', 'strategy_optimizer_v2', 'nasdaq_strategy_optimizer']
+
+
+def filters_path(project):
+    if project == 'common':
+        return CANONICAL_FILTERS
+    return os.path.join(ROOT, project, 'src', 'strategy', 'signal_filters.py')
+
+
+def load_filter(project):
+    path = filters_path(project)
+    if not os.path.exists(path):
+        pytest.skip(f"{project} is not next to the lab")
+    spec = importlib.util.spec_from_file_location(f"signal_filters_{project}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.filter_alternating_signals
+
+
+@pytest.fixture(params=['lab'] + PROJECTS + ['common'])
+def filter_signals(request):
+    return filter_alternating_signals if request.param == 'lab' else load_filter(request.param)
+
+
+def load_strategy(project):
+    if project == 'advanced_strategy_lab':
+        from strategy.volensy_macd_trend import VolensyMacdTrendStrategy
+        return VolensyMacdTrendStrategy
+    if not os.path.exists(os.path.join(ROOT, project)):
+        pytest.skip(f"{project} is not next to the lab")
+    sys.path.insert(0, ROOT)
+    module = importlib.import_module(f"{project}.src.strategy.volensy_macd_trend")
+    return module.VolensyMacdTrendStrategy
+
+
+def reference_filter(raw_buy, raw_sell):
+    """The last_dir loop the strategies used before."""
+    buy = np.zeros(len(raw_buy), dtype=bool)
+    sell = np.zeros(len(raw_sell), dtype=bool)
+    last_dir = 0
+    for i in range(len(raw_buy)):
+        if raw_buy[i] and last_dir != 1:
+            buy[i] = True
+            last_dir = 1
+        elif raw_sell[i] and last_dir != -1:
+            sell[i] = True
+            last_dir = -1
+    return buy, sell
+
+
+def random_candidates(rng, n):
+    """Mutually exclusive candidates with runs of repeated same-side bars."""
+    side = rng.choice([-1, 0, 1], size=n, p=[0.2, 0.6, 0.2])
+    # Stretch some candidates into runs
+    runs = np.repeat(side, rng.integers(1, 6, size=n))[:n]
+    return runs == 1, runs == -1
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_last_dir_loop(filter_signals, seed):
+    rng = np.random.default_rng(seed)
+    raw_buy, raw_sell = random_candidates(rng, int(rng.integers(0, 400)))
+
+    buy, sell = filter_signals(raw_buy, raw_sell)
+    expected_buy, expected_sell = reference_filter(raw_buy, raw_sell)
+
+    np.testing.assert_array_equal(buy, expected_buy)
+    np.testing.assert_array_equal(sell, expected_sell)
+
+
+def test_repeated_candidates_emit_once(filter_signals):
+    raw_buy = np.array([1, 1, 0, 1, 0, 0, 0, 1, 1], dtype=bool)
+    raw_sell = np.array([0, 0, 0, 0, 1, 1, 0, 0, 0], dtype=bool)
+
+    buy, sell = filter_signals(raw_buy, raw_sell)
+
+    assert np.flatnonzero(buy).tolist() == [0, 7]
+    assert np.flatnonzero(sell).tolist() == [4]
+
+
+def test_simultaneous_candidates_are_rejected(filter_signals):
+    with pytest.raises(ValueError, match="both buy and sell"):
+        filter_signals([True, False, True], [False, False, True])
+
+
+@pytest.mark.parametrize("project", PROJECTS)
+def test_copies_match_canonical_module(project):
+    if not os.path.exists(CANONICAL_FILTERS):
+        pytest.skip("simple_trader is not next to the lab")
+    path = filters_path(project)
+    with open(CANONICAL_FILTERS, 'rb') as f:
+        canonical = f.read()
+    with open(path, 'rb') as f:
+        assert f.read() == canonical, f"{path} differs from {CANONICAL_FILTERS}; copy the canonical module over"
+
+
+@pytest.mark.parametrize("project", PROJECTS)
+def test_strategy_signals_match_last_dir_loop(project):
+    strategy_class = load_strategy(project)
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, 1500))
+    df = pd.DataFrame({
+        'open': close + rng.normal(0, 0.2, len(close)),
+        'high': close + np.abs(rng.normal(0, 0.5, len(close))),
+        'low': close - np.abs(rng.normal(0, 0.5, len(close))),
+        'close': close,
+        'volume': rng.uniform(100, 1000, len(close)),
+    })
+
+    signals = strategy_class({'ema_len': 20}).run_strategy(df)
+    expected_buy, expected_sell = reference_filter(
+        (signals['can_signal'] & signals['raw_buy']).to_numpy(),
+        (signals['can_signal'] & signals['raw_sell']).to_numpy(),
+    )
+
+    assert expected_buy.any() and expected_sell.any()
+    np.testing.assert_array_equal(signals['buy_signal'].to_numpy(), expected_buy)
+    np.testing.assert_array_equal(signals['sell_signal'].to_numpy(), expected_sell)
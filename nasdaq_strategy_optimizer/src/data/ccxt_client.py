@@ -2,7 +2,6 @@
 CCXT client for fetching OHLCV data with retry logic and rate limiting.
 """
 
-import ccxt
 import pandas as pd
 import numpy as np
 from typing import List, Optional, Dict, Any, Tuple
@@ -48,6 +47,8 @@ class CCXTClient:
         
     def _init_exchange(self):
         """Initialize the exchange instance."""
+        import ccxt  # Deferred: importing ccxt takes about half a second
+        
         try:
             exchange_class = getattr(ccxt, self.exchange_name)
             
@@ -7,7 +7,6 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-import yfinance as yf
 import logging
 from dataclasses import dataclass
 
@@ -95,7 +94,8 @@ class NASDAQDataProvider:
         try:
             self.logger.info(f"Veri çekiliyor: {symbol} ({period}, {interval})")
             
-            # Yahoo Finance'den veri çek
+            # Yahoo Finance'den veri çek (sembol listeleme yfinance yüklemesin diye burada)
+            import yfinance as yf
             ticker = yf.Ticker(symbol)
             df = ticker.history(period=period, interval=interval)
             
@@ -11,6 +11,8 @@ from typing import Dict, Any, Tuple, Optional, List
 from numba import jit
 import logging
 
+from .signal_filters import filter_alternating_signals
+
 logger = logging.getLogger(__name__)
 
 
@@ -229,20 +231,10 @@ class VolensyMacdTrendStrategy:
         else:
             df['can_signal'] = True
         
-        # Prevent duplicate signals
-        df['buy_signal'] = False
-        df['sell_signal'] = False
-        
-        # Track last direction to prevent duplicates
-        last_dir = 0
-        
-        for i in range(len(df)):
-            if df.iloc[i]['can_signal'] and df.iloc[i]['raw_buy'] and last_dir != 1:
-                df.iloc[i, df.columns.get_loc('buy_signal')] = True
-                last_dir = 1
-            elif df.iloc[i]['can_signal'] and df.iloc[i]['raw_sell'] and last_dir != -1:
-                df.iloc[i, df.columns.get_loc('sell_signal')] = True
-                last_dir = -1
+        # Prevent duplicate signals (alternate BUY/SELL direction)
+        df['buy_signal'], df['sell_signal'] = filter_alternating_signals(
+            df['can_signal'] & df['raw_buy'], df['can_signal'] & df['raw_sell']
+        )
         
         # Convert signals to backtester format
         df['buy_final'] = df['buy_signal']
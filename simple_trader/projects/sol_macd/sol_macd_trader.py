@@ -23,6 +23,7 @@ common_dir = os.path.join(parent_dir, "common")
 sys.path.append(common_dir)
 
 from order_client import IdempotentOrderClient
+from signal_filters import filter_alternating_signals
 
 class HeikinAshiCalculator:
     """Heikin Ashi candle hesaplama sınıfı"""
@@ -139,17 +140,7 @@ class VolensyMacdStrategy:
         df['raw_sell'] = (df['bear_score'] == 3) & df['not_oversold']
         
         # Sinyal filtreleme (yinelenen sinyalleri engelle) - Pine: buyOK = canSignal and rawBuy and (lastDir != 1)
-        df['buy_signal'] = False
-        df['sell_signal'] = False
-        
-        last_dir = 0
-        for i in range(len(df)):
-            if df.iloc[i]['raw_buy'] and last_dir != 1:
-                df.iloc[i, df.columns.get_loc('buy_signal')] = True
-                last_dir = 1
-            elif df.iloc[i]['raw_sell'] and last_dir != -1:
-                df.iloc[i, df.columns.get_loc('sell_signal')] = True
-                last_dir = -1
+        df['buy_signal'], df['sell_signal'] = filter_alternating_signals(df['raw_buy'], df['raw_sell'])
         
         return df
 
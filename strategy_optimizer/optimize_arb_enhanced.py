@@ -5,17 +5,18 @@ Multiple indicators + Risk/Reward optimization
 """
 
 import sys
+import logging
 from pathlib import Path
 import pandas as pd
 from datetime import datetime, timedelta
 import requests
 import time
-from itertools import product
 import json
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.strategy.vwma_arb_enhanced import VWMAARBEnhancedStrategy
+from src.optimize.harness import param_grid, run_optimization
 
 
 def download_binance_futures_klines(symbol: str, interval: str, days: int = 180):
@@ -64,8 +65,62 @@ def download_binance_futures_klines(symbol: str, interval: str, days: int = 180)
     return df
 
 
-def optimize_enhanced_strategy():
-    """Optimize enhanced strategy with multiple indicators"""
+def score_result(params: dict, results: dict):
+    """Score against the win rate required by the risk/reward; None if filtered out"""
+    if results['total_trades'] < 20 or results['total_trades'] > 200:
+        return None
+    
+    if results['win_rate'] < 50:  # Minimum 50% win rate
+        return None
+    
+    if results['profit_factor'] < 1.5:  # Minimum 1.5 profit factor
+        return None
+    
+    # Calculate required win rate for this risk/reward
+    risk_reward = params['sl_pct'] / params['tp_pct']
+    required_wr = (risk_reward / (1 + risk_reward)) * 100
+    
+    # Score: prioritize win rate, profit factor, and meeting required win rate
+    return (
+        results['win_rate'] * 2.0 +  # Win rate is critical
+        results['profit_factor'] * 10.0 +
+        (results['win_rate'] - required_wr) * 5.0 +  # Bonus if exceeds required
+        results['total_return_pct'] * 0.01 -
+        results['max_drawdown_pct'] * 0.3
+    )
+
+
+def flatten_result(entry: dict) -> dict:
+    """Flat result record: parameters, risk/reward, score and backtest results"""
+    p = entry['params']
+    risk_reward = p['sl_pct'] / p['tp_pct']
+    return {
+        'vwma_length': p['vwma_length'],
+        'rsi_oversold': p['rsi_oversold'],
+        'rsi_overbought': p['rsi_overbought'],
+        'tp_pct': p['tp_pct'],
+        'sl_pct': p['sl_pct'],
+        'risk_reward': risk_reward,
+        'required_wr': (risk_reward / (1 + risk_reward)) * 100,
+        'use_macd': p['use_macd'],
+        'use_bollinger': p['use_bollinger'],
+        'use_atr': p['use_atr'],
+        'min_indicators': p['min_indicators'],
+        'trailing_activation_pct': p['trailing_activation_pct'],
+        'trailing_distance_pct': p['trailing_distance_pct'],
+        'score': entry['score'],
+        **entry['results']
+    }
+
+
+def optimize_enhanced_strategy(workers: int = None, checkpoint: str = None):
+    """
+    Optimize enhanced strategy with multiple indicators
+    
+    Args:
+        workers: Parallel backtest processes (default: all cores)
+        checkpoint: JSON-lines checkpoint to resume from / append to
+    """
     print(f"\n{'='*70}")
     print(f"🚀 ARB Enhanced VWMA Strategy Optimizer")
     print(f"{'='*70}")
@@ -80,121 +135,38 @@ def optimize_enhanced_strategy():
     print(f"✅ Downloaded {len(df)} bars from {df.index[0]} to {df.index[-1]}")
     
     # Parameter ranges - Focus on better risk/reward (reduced for speed)
-    vwma_lengths = [25, 30]
-    rsi_oversold = [30]
-    rsi_overbought = [70]
-    
-    # Better risk/reward ratios - Focus on good ratios
-    tp_pcts = [0.8, 1.0, 1.2]
-    sl_pcts = [0.5, 0.6]
-    
-    # Indicator combinations - Test key combinations
-    use_macd_options = [True]
-    use_bollinger_options = [True, False]
-    use_atr_options = [True, False]
-    min_indicators_options = [4, 5]  # Higher threshold for better signals
-    
-    trailing_activation = [0.5]
-    trailing_distance = [0.5]
-    
-    all_results = []
-    best_result = None
-    best_score = -float('inf')
-    
-    combination_count = 0
-    total_combinations = (len(vwma_lengths) * len(rsi_oversold) * len(rsi_overbought) * 
-                         len(tp_pcts) * len(sl_pcts) * len(use_macd_options) * 
-                         len(use_bollinger_options) * len(use_atr_options) * 
-                         len(min_indicators_options) * len(trailing_activation) * len(trailing_distance))
-    
-    print(f"\n📊 Testing {total_combinations} parameter combinations...")
+    space = {
+        'vwma_length': [25, 30],
+        'rsi_oversold': [30],
+        'rsi_overbought': [70],
+        # Better risk/reward ratios - Focus on good ratios
+        'tp_pct': [0.8, 1.0, 1.2],
+        'sl_pct': [0.5, 0.6],
+        # Indicator combinations - Test key combinations
+        'use_macd': [True],
+        'use_bollinger': [True, False],
+        'use_atr': [True, False],
+        'min_indicators': [4, 5],  # Higher threshold for better signals
+        'trailing_activation_pct': [0.5],
+        'trailing_distance_pct': [0.5],
+    }
+    base_params = {
+        'leverage': 5.0,
+        'commission': 0.0004,
+        'slippage': 0.0002,
+    }
+    
+    # Skip bad risk/reward ratios (worse than 1:1.5)
+    grid = param_grid(space, base=base_params, where=lambda p: p['sl_pct'] / p['tp_pct'] <= 1.5)
+    
+    print(f"\n📊 Testing {len(grid)} parameter combinations...")
     print(f"   Focus: Better Risk/Reward + Higher Win Rate\n")
     
-    for (vwma_len, rsi_os, rsi_ob, tp_pct, sl_pct, use_macd, use_bb, use_atr, 
-         min_ind, trail_act, trail_dist) in product(
-        vwma_lengths, rsi_oversold, rsi_overbought, tp_pcts, sl_pcts,
-        use_macd_options, use_bollinger_options, use_atr_options,
-        min_indicators_options, trailing_activation, trailing_distance
-    ):
-        combination_count += 1
-        
-        if combination_count % 100 == 0:
-            print(f"   Progress: {combination_count}/{total_combinations} ({combination_count/total_combinations*100:.1f}%)")
-        
-        # Skip bad risk/reward ratios
-        risk_reward = sl_pct / tp_pct
-        if risk_reward > 1.5:  # Skip if risk/reward worse than 1:1.5
-            continue
-        
-        params = {
-            'vwma_length': vwma_len,
-            'rsi_oversold': rsi_os,
-            'rsi_overbought': rsi_ob,
-            'tp_pct': tp_pct,
-            'sl_pct': sl_pct,
-            'trailing_activation_pct': trail_act,
-            'trailing_distance_pct': trail_dist,
-            'use_macd': use_macd,
-            'use_bollinger': use_bb,
-            'use_atr': use_atr,
-            'min_indicators': min_ind,
-            'leverage': 5.0,
-            'commission': 0.0004,
-            'slippage': 0.0002,
-        }
-        
-        try:
-            strategy = VWMAARBEnhancedStrategy(params)
-            results = strategy.run_backtest(df)
-            
-            if results['total_trades'] < 20 or results['total_trades'] > 200:
-                continue
-            
-            if results['win_rate'] < 50:  # Minimum 50% win rate
-                continue
-            
-            if results['profit_factor'] < 1.5:  # Minimum 1.5 profit factor
-                continue
-            
-            # Calculate required win rate for this risk/reward
-            required_wr = (risk_reward / (1 + risk_reward)) * 100
-            
-            # Score: prioritize win rate, profit factor, and meeting required win rate
-            score = (
-                results['win_rate'] * 2.0 +  # Win rate is critical
-                results['profit_factor'] * 10.0 +
-                (results['win_rate'] - required_wr) * 5.0 +  # Bonus if exceeds required
-                results['total_return_pct'] * 0.01 -
-                results['max_drawdown_pct'] * 0.3
-            )
-            
-            result = {
-                'vwma_length': vwma_len,
-                'rsi_oversold': rsi_os,
-                'rsi_overbought': rsi_ob,
-                'tp_pct': tp_pct,
-                'sl_pct': sl_pct,
-                'risk_reward': risk_reward,
-                'required_wr': required_wr,
-                'use_macd': use_macd,
-                'use_bollinger': use_bb,
-                'use_atr': use_atr,
-                'min_indicators': min_ind,
-                'trailing_activation_pct': trail_act,
-                'trailing_distance_pct': trail_dist,
-                'score': score,
-                **results
-            }
-            all_results.append(result)
-            
-            if score > best_score:
-                best_score = score
-                best_result = result
-        except Exception as e:
-            continue
-    
-    # Sort by score
-    all_results.sort(key=lambda x: x['score'], reverse=True)
+    # Trades are kept since the saved records include the full results
+    entries = run_optimization(VWMAARBEnhancedStrategy, grid, df, score_result,
+                               workers=workers, checkpoint=checkpoint, keep_trades=True)
+    all_results = [flatten_result(entry) for entry in entries]
+    best_result = all_results[0] if all_results else None
     top_results = all_results[:20]
     
     # Print results
@@ -258,5 +230,14 @@ def optimize_enhanced_strategy():
 
 
 if __name__ == "__main__":
-    optimize_enhanced_strategy()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='ARB Enhanced VWMA Strategy Optimizer')
+    parser.add_argument('--workers', type=int, default=None, help='Parallel processes (default: all cores)')
+    parser.add_argument('--checkpoint', type=str, default=None, help='Checkpoint file to resume from')
+    
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    optimize_enhanced_strategy(workers=args.workers, checkpoint=args.checkpoint)
 
@@ -12,11 +12,30 @@ import requests
 import time
 from itertools import product
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.strategy.orb_breakout import ORBBreakoutStrategy
 
+# Price data of the current optimization, set once per worker process
+_DF = None
+
+
+def _init_worker(df: pd.DataFrame):
+    """Keep the price data in the worker so only parameters are sent per task"""
+    global _DF
+    _DF = df
+
+
+def _run_backtest(params: dict):
+    """Backtest one parameter set in a worker (None if it fails)"""
+    try:
+        return ORBBreakoutStrategy(params).run_backtest(_DF)
+    except Exception:
+        return None
+
 
 def download_binance_futures_klines(symbol: str, interval: str, days: int = 180):
     """Download Binance Futures klines"""
@@ -111,45 +130,45 @@ def optimize_orb_avax():
     best_result = None
     best_score = -float('inf')
     
-    combination_count = 0
-    for (orb_min, buf_pct, min_bars, vol_filter, vol_mult, trend_filter, trend_mode,
-         tp1, tp2, tp3, stop_mode, atr_mult) in product(
+    param_grid = [{
+        'orb_minutes': orb_min,
+        'breakout_buffer_pct': buf_pct,
+        'min_bars_outside': min_bars,
+        'enable_volume_filter': vol_filter,
+        'volume_ma_length': 20,
+        'volume_multiplier': vol_mult,
+        'enable_trend_filter': trend_filter,
+        'trend_mode': trend_mode,
+        'trend_ema_length': 12,
+        'tp1_pct': tp1,
+        'tp2_pct': tp2,
+        'tp3_pct': tp3,
+        'stop_mode': stop_mode,
+        'atr_length': 14,
+        'atr_multiplier': atr_mult,
+        'max_stop_loss_pct': 2.5,  # Maksimum %2.5
+        'leverage': 5.0,
+        'commission': 0.0004,
+        'slippage': 0.0002,
+    } for (orb_min, buf_pct, min_bars, vol_filter, vol_mult, trend_filter, trend_mode,
+           tp1, tp2, tp3, stop_mode, atr_mult) in product(
         orb_minutes, breakout_buffer_pcts, min_bars_outside,
         enable_volume_filter, volume_multipliers,
         enable_trend_filter, trend_modes,
         tp1_pcts, tp2_pcts, tp3_pcts,
         stop_modes, atr_multipliers
-    ):
-        combination_count += 1
-        
-        if combination_count % 100 == 0:
-            print(f"Progress: {combination_count}/{total_combinations} ({combination_count/total_combinations*100:.1f}%)")
-        
-        params = {
-            'orb_minutes': orb_min,
-            'breakout_buffer_pct': buf_pct,
-            'min_bars_outside': min_bars,
-            'enable_volume_filter': vol_filter,
-            'volume_ma_length': 20,
-            'volume_multiplier': vol_mult,
-            'enable_trend_filter': trend_filter,
-            'trend_mode': trend_mode,
-            'trend_ema_length': 12,
-            'tp1_pct': tp1,
-            'tp2_pct': tp2,
-            'tp3_pct': tp3,
-            'stop_mode': stop_mode,
-            'atr_length': 14,
-            'atr_multiplier': atr_mult,
-            'max_stop_loss_pct': 2.5,  # Maksimum %2.5
-            'leverage': 5.0,
-            'commission': 0.0004,
-            'slippage': 0.0002,
-        }
-        
-        try:
-            strategy = ORBBreakoutStrategy(params)
-            results = strategy.run_backtest(df)
+    )]
+    
+    # Backtests run on all cores; results come back in grid order
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker, initargs=(df,)) as pool:
+        outcomes = pool.map(_run_backtest, param_grid, chunksize=16)
+        for combination_count, (params, results) in enumerate(zip(param_grid, outcomes), 1):
+            if combination_count % 100 == 0:
+                print(f"Progress: {combination_count}/{total_combinations} ({combination_count/total_combinations*100:.1f}%)")
+            
+            # Silently skip errors
+            if results is None:
+                continue
             
             # Filter: reasonable trade count
             if results['total_trades'] < 3 or results['total_trades'] > 500:
@@ -185,11 +204,8 @@ def optimize_orb_avax():
                 print(f"\n⭐ New Best Score: {score:.2f}")
                 print(f"   Trades: {results['total_trades']} | WR: {results['win_rate']:.1f}% | PF: {results['profit_factor']:.2f}")
                 print(f"   Return: {results['total_return_pct']:.1f}% | DD: {results['max_drawdown_pct']:.1f}%")
-                print(f"   ORB: {orb_min}min | Buffer: {buf_pct}% | TP: {tp1}/{tp2}/{tp3}%")
-        
-        except Exception as e:
-            # Silently skip errors
-            continue
+                print(f"   ORB: {params['orb_minutes']}min | Buffer: {params['breakout_buffer_pct']}% | "
+                      f"TP: {params['tp1_pct']}/{params['tp2_pct']}/{params['tp3_pct']}%")
     
     # Sort results by score
     all_results.sort(key=lambda x: x['score'], reverse=True)
@@ -5,17 +5,33 @@ Tüm parametreleri test et ve en iyi sonuçları bul
 """
 
 import sys
+import logging
 from pathlib import Path
 import pandas as pd
 from datetime import datetime, timedelta
 import requests
 import time
-from itertools import product
-import json
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.strategy.orb_breakout import ORBBreakoutStrategy
+from src.optimize.harness import param_grid, run_optimization, save_results
+
+
+def score_result(params: dict, results: dict):
+    """Score all results, not just profitable ones; None if the trade count is out of range"""
+    # Very lenient filters - we want to see all results
+    if results['total_trades'] < 2 or results['total_trades'] > 500:
+        return None
+    
+    capped_return = min(results['total_return_pct'], 10000)
+    return (
+        results['profit_factor'] * 25 +
+        results['win_rate'] * 1.5 +
+        capped_return * 0.15 -
+        results['max_drawdown_pct'] * 1.0 +
+        (results['total_trades'] / 10) * 0.1  # Bonus for more trades
+    )
 
 
 def download_binance_futures_klines(symbol: str, interval: str, days: int = 180):
@@ -64,8 +80,14 @@ def download_binance_futures_klines(symbol: str, interval: str, days: int = 180)
     return df
 
 
-def optimize_orb_avax_final():
-    """Final comprehensive optimization for AVAX"""
+def optimize_orb_avax_final(workers: int = None, checkpoint: str = None):
+    """
+    Final comprehensive optimization for AVAX
+    
+    Args:
+        workers: Parallel backtest processes (default: all cores)
+        checkpoint: JSON-lines checkpoint to resume from / append to
+    """
     print(f"\n{'='*70}")
     print(f"🚀 ORB Breakout Strategy - Final Optimization for AVAX")
     print(f"{'='*70}")
@@ -79,137 +101,42 @@ def optimize_orb_avax_final():
     
     print(f"✅ Downloaded {len(df)} bars from {df.index[0]} to {df.index[-1]}")
     
-    # Fast optimization - most promising values only
-    orb_minutes = [15, 30]  # ORB periods
-    breakout_buffer_pcts = [0.1, 0.2]  # Reduced
-    min_bars_outside = [1, 2]
-    
-    # Filters - key combinations only
-    enable_volume_filter = [False, True]
-    volume_multipliers = [1.5, 2.0]
-    
-    enable_trend_filter = [False, True]
-    trend_modes = ["VWAP", "EMA"]
-    
-    # Exit parameters - focused ranges
-    tp1_pcts = [1.0, 1.5, 2.0]
-    tp2_pcts = [2.0, 2.5, 3.0]
-    tp3_pcts = [3.0, 4.0, 5.0]
-    stop_modes = ["Smart Adaptive"]  # Only best mode
-    atr_multipliers = [1.0, 1.5]
-    
-    total_combinations = (len(orb_minutes) * len(breakout_buffer_pcts) * len(min_bars_outside) *
-                         len(enable_volume_filter) * len(volume_multipliers) *
-                         len(enable_trend_filter) * len(trend_modes) *
-                         len(tp1_pcts) * len(tp2_pcts) * len(tp3_pcts) *
-                         len(stop_modes) * len(atr_multipliers))
-    
-    print(f"\n📊 Testing {total_combinations:,} parameter combinations...")
-    print(f"⚠️  This will take approximately {total_combinations * 0.1 / 60:.1f} minutes...")
-    
-    all_results = []
-    best_result = None
-    best_score = -float('inf')
-    
-    combination_count = 0
-    start_time = time.time()
-    
-    for (orb_min, buf_pct, min_bars, vol_filter, vol_mult, trend_filter, trend_mode,
-         tp1, tp2, tp3, stop_mode, atr_mult) in product(
-        orb_minutes, breakout_buffer_pcts, min_bars_outside,
-        enable_volume_filter, volume_multipliers,
-        enable_trend_filter, trend_modes,
-        tp1_pcts, tp2_pcts, tp3_pcts,
-        stop_modes, atr_multipliers
-    ):
-        combination_count += 1
-        
-        if combination_count % 50 == 0:
-            elapsed = time.time() - start_time
-            if combination_count > 0:
-                remaining = (total_combinations - combination_count) * (elapsed / combination_count)
-                print(f"Progress: {combination_count}/{total_combinations} ({combination_count/total_combinations*100:.1f}%) | "
-                      f"Elapsed: {elapsed/60:.1f}m | Remaining: {remaining/60:.1f}m | "
-                      f"Best Score: {best_score:.2f} | Results: {len(all_results)}")
-            else:
-                print(f"Progress: {combination_count}/{total_combinations} | Starting...")
-        
-        params = {
-            'orb_minutes': orb_min,
-            'breakout_buffer_pct': buf_pct,
-            'min_bars_outside': min_bars,
-            'enable_volume_filter': vol_filter,
-            'volume_ma_length': 20,
-            'volume_multiplier': vol_mult,
-            'enable_trend_filter': trend_filter,
-            'trend_mode': trend_mode,
-            'trend_ema_length': 12,
-            'tp1_pct': tp1,
-            'tp2_pct': tp2,
-            'tp3_pct': tp3,
-            'stop_mode': stop_mode,
-            'atr_length': 14,
-            'atr_multiplier': atr_mult,
-            'max_stop_loss_pct': 2.5,  # HARD LIMIT: %2.5
-            'leverage': 5.0,
-            'commission': 0.0004,
-            'slippage': 0.0002,
-        }
-        
-        try:
-            strategy = ORBBreakoutStrategy(params)
-            results = strategy.run_backtest(df)
-            
-            # Very lenient filters - we want to see all results
-            if results['total_trades'] < 2 or results['total_trades'] > 500:
-                continue
-            
-            # Score all results, not just profitable ones
-            capped_return = min(results['total_return_pct'], 10000)
-            score = (
-                results['profit_factor'] * 25 +
-                results['win_rate'] * 1.5 +
-                capped_return * 0.15 -
-                results['max_drawdown_pct'] * 1.0 +
-                (results['total_trades'] / 10) * 0.1  # Bonus for more trades
-            )
-            
-            result_entry = {
-                'params': params,
-                'results': results,
-                'score': score
-            }
-            all_results.append(result_entry)
-            
-            if score > best_score:
-                best_score = score
-                best_result = result_entry
-                print(f"\n⭐ New Best Score: {score:.2f}")
-                print(f"   Trades: {results['total_trades']} | WR: {results['win_rate']:.1f}% | PF: {results['profit_factor']:.2f}")
-                print(f"   Return: {results['total_return_pct']:.1f}% | DD: {results['max_drawdown_pct']:.1f}%")
-                print(f"   ORB: {orb_min}min | Buffer: {buf_pct}% | TP: {tp1}/{tp2}/{tp3}% | Stop: {stop_mode}")
-        
-        except Exception as e:
-            continue
-    
-    # Sort results by score
-    all_results.sort(key=lambda x: x['score'], reverse=True)
-    
-    # Save results
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    results_file = f"orb_avax_final_optimization_{timestamp}.json"
+    base_params = {
+        'volume_ma_length': 20,
+        'trend_ema_length': 12,
+        'atr_length': 14,
+        'max_stop_loss_pct': 2.5,  # HARD LIMIT: %2.5
+        'leverage': 5.0,
+        'commission': 0.0004,
+        'slippage': 0.0002,
+    }
     
-    # Convert to JSON-serializable format
-    json_results = []
-    for r in all_results[:100]:  # Top 100
-        json_results.append({
-            'params': r['params'],
-            'results': {k: v for k, v in r['results'].items() if k != 'trades'},
-            'score': r['score']
-        })
-    
-    with open(results_file, 'w') as f:
-        json.dump(json_results, f, indent=2)
+    # Fast optimization - most promising values only
+    grid = param_grid({
+        'orb_minutes': [15, 30],  # ORB periods
+        'breakout_buffer_pct': [0.1, 0.2],  # Reduced
+        'min_bars_outside': [1, 2],
+        # Filters - key combinations only
+        'enable_volume_filter': [False, True],
+        'volume_multiplier': [1.5, 2.0],
+        'enable_trend_filter': [False, True],
+        'trend_mode': ["VWAP", "EMA"],
+        # Exit parameters - focused ranges
+        'tp1_pct': [1.0, 1.5, 2.0],
+        'tp2_pct': [2.0, 2.5, 3.0],
+        'tp3_pct': [3.0, 4.0, 5.0],
+        'stop_mode': ["Smart Adaptive"],  # Only best mode
+        'atr_multiplier': [1.0, 1.5],
+    }, base=base_params)
+    
+    print(f"\n📊 Testing {len(grid):,} parameter combinations...")
+    
+    all_results = run_optimization(ORBBreakoutStrategy, grid, df, score_result,
+                                   workers=workers, checkpoint=checkpoint, progress_every=50)
+    best_result = all_results[0] if all_results else None
+    
+    # Save results (top 100)
+    results_file = save_results(all_results, "orb_avax_final_optimization", top=100)
     
     print(f"\n{'='*70}")
     print(f"✅ Optimization Complete!")
@@ -291,5 +218,14 @@ def optimize_orb_avax_final():
 
 
 if __name__ == "__main__":
-    optimize_orb_avax_final()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='ORB Breakout Strategy - Final Optimization for AVAX')
+    parser.add_argument('--workers', type=int, default=None, help='Parallel processes (default: all cores)')
+    parser.add_argument('--checkpoint', type=str, default=None, help='Checkpoint file to resume from')
+    
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    optimize_orb_avax_final(workers=args.workers, checkpoint=args.checkpoint)
 
@@ -12,8 +12,10 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from itertools import product
 from pathlib import Path
@@ -27,6 +29,23 @@ sys.path.insert(0, str(ROOT))
 
 from src.strategy.orb_breakout import ORBBreakoutStrategy  # noqa: E402
 
+# Price data of the current optimization, set once per worker process
+_DF: pd.DataFrame | None = None
+
+
+def _init_worker(df: pd.DataFrame) -> None:
+    """Keep the price data in the worker so only parameters are sent per task."""
+    global _DF
+    _DF = df
+
+
+def _run_backtest(params: Dict[str, Any]) -> Dict[str, Any] | None:
+    """Backtest one parameter set in a worker (None if it fails)."""
+    try:
+        return ORBBreakoutStrategy(params).run_backtest(_DF)
+    except Exception:
+        return None
+
 
 def _convert_symbol(raw_symbol: str, market_type: str) -> str:
     """
@@ -163,6 +182,7 @@ def optimize_orb_for_symbol(
     exchange: str,
     market_type: str,
     days: int,
+    workers: int | None = None,
 ) -> Dict[str, Any]:
     print(f"\n{'=' * 80}")
     print(f"🚀 ORB Breakout Optimizer for {symbol} ({exchange}, {timeframe})")
@@ -212,71 +232,73 @@ def optimize_orb_for_symbol(
     all_results: List[Dict[str, Any]] = []
     start = time.time()
 
-    for idx, combo in enumerate(param_space, 1):
-        (
-            orb_min,
-            buf_pct,
-            min_bars,
-            vol_filter,
-            vol_mult,
-            trend_filter,
-            trend_mode,
-            tp1,
-            tp2,
-            tp3,
-            stop_mode,
-            atr_mult,
-        ) = combo
-
-        params = {
-            "orb_minutes": orb_min,
-            "breakout_buffer_pct": buf_pct,
-            "min_bars_outside": min_bars,
-            "enable_volume_filter": vol_filter,
-            "volume_ma_length": 20,
-            "volume_multiplier": vol_mult,
-            "enable_trend_filter": trend_filter,
-            "trend_mode": trend_mode,
-            "trend_ema_length": 21,
-            "tp1_pct": tp1,
-            "tp2_pct": tp2,
-            "tp3_pct": tp3,
-            "stop_mode": stop_mode,
-            "atr_length": 14,
-            "atr_multiplier": atr_mult,
-            "max_stop_loss_pct": 1.5,
-            "leverage": 5.0,
-            "commission": 0.0005,
-            "slippage": 0.0003,
-        }
-
-        try:
-            strategy = ORBBreakoutStrategy(params)
-            result = strategy.run_backtest(df)
-        except Exception:
-            continue
-
-        if result["total_trades"] < 3 or result["total_trades"] > 600:
-            continue
-
-        score = score_result(result)
-        entry = {"params": params, "results": result, "score": score}
-        all_results.append(entry)
-
-        if score > best_score:
-            best_score = score
-            best_result = entry
-            print(
-                f"\n⭐ New best (#{idx}/{len(param_space)}): "
-                f"Score {score:.1f} | Trades {result['total_trades']} | "
-                f"WR {result['win_rate']:.1f}% | PF {result['profit_factor']:.2f} | "
-                f"Return {result['total_return_pct']:.1f}%"
-            )
+    param_grid: List[Dict[str, Any]] = []
+    for (
+        orb_min,
+        buf_pct,
+        min_bars,
+        vol_filter,
+        vol_mult,
+        trend_filter,
+        trend_mode,
+        tp1,
+        tp2,
+        tp3,
+        stop_mode,
+        atr_mult,
+    ) in param_space:
+        param_grid.append(
+            {
+                "orb_minutes": orb_min,
+                "breakout_buffer_pct": buf_pct,
+                "min_bars_outside": min_bars,
+                "enable_volume_filter": vol_filter,
+                "volume_ma_length": 20,
+                "volume_multiplier": vol_mult,
+                "enable_trend_filter": trend_filter,
+                "trend_mode": trend_mode,
+                "trend_ema_length": 21,
+                "tp1_pct": tp1,
+                "tp2_pct": tp2,
+                "tp3_pct": tp3,
+                "stop_mode": stop_mode,
+                "atr_length": 14,
+                "atr_multiplier": atr_mult,
+                "max_stop_loss_pct": 1.5,
+                "leverage": 5.0,
+                "commission": 0.0005,
+                "slippage": 0.0003,
+            }
+        )
+
+    # Backtests run on all cores; results come back in grid order
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(df,)) as pool:
+        outcomes = pool.map(_run_backtest, param_grid, chunksize=32)
+        for idx, (params, result) in enumerate(zip(param_grid, outcomes), 1):
+            if result is None:
+                continue
+
+            if result["total_trades"] < 3 or result["total_trades"] > 600:
+                continue
+
+            score = score_result(result)
+            entry = {"params": params, "results": result, "score": score}
+            all_results.append(entry)
+
+            if score > best_score:
+                best_score = score
+                best_result = entry
+                print(
+                    f"\n⭐ New best (#{idx}/{len(param_space)}): "
+                    f"Score {score:.1f} | Trades {result['total_trades']} | "
+                    f"WR {result['win_rate']:.1f}% | PF {result['profit_factor']:.2f} | "
+                    f"Return {result['total_return_pct']:.1f}%"
+                )
 
-        if idx % 150 == 0:
-            elapsed = time.time() - start
-            pct = idx / len(param_space) * 100
-            print(f"Progress {pct:.1f}% | Tested {idx} combos | Best {best_score:.1f} | {elapsed/60:.1f}m elapsed")
+            if idx % 150 == 0:
+                elapsed = time.time() - start
+                pct = idx / len(param_space) * 100
+                print(f"Progress {pct:.1f}% | Tested {idx} combos | Best {best_score:.1f} | {elapsed/60:.1f}m elapsed")
 
     if not all_results:
         raise RuntimeError("No valid optimization results generated.")
@@ -309,6 +331,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--days", type=int, default=120, help="History window in days")
     parser.add_argument("--exchange", default="gate", help="CCXT exchange name (default: gate.io)")
     parser.add_argument("--market-type", default="swap", help="Market type: spot | swap | future")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Parallel backtest processes (default: all cores)")
     return parser.parse_args()
 
 
@@ -320,6 +343,7 @@ def main():
         exchange=args.exchange,
         market_type=args.market_type,
         days=args.days,
+        workers=args.workers,
     )
 
     best = results["best"]
@@ -5,17 +5,17 @@ Volensy - Regresyon Kanalları ve Volatilite Stratejisi (KRIPTO Optimizasyonu)
 """
 
 import sys
+import logging
 from pathlib import Path
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 import requests
 import time
-from itertools import product
-import json
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.strategy.regression_channel import RegressionChannelStrategy
+from src.optimize.harness import param_grid, run_optimization, save_results
 
 
 def download_binance_futures_klines(symbol: str, interval: str, days: int = 180):
@@ -88,13 +88,75 @@ def download_binance_futures_klines(symbol: str, interval: str, days: int = 180)
     return df
 
 
-def optimize_regression_channel_crypto(symbol: str = "BTCUSDT", timeframe: str = "15m"):
+def score_result(params: dict, results: dict):
+    """Score prioritizing win rate above all; None if filtered out"""
+    # Filter results - want reasonable number of trades
+    if results['total_trades'] < 10 or results['total_trades'] > 500:
+        return None
+    
+    # CRITICAL: Minimum win rate must be 75%+
+    if results['win_rate'] < 75:
+        return None
+    
+    # Minimum profit factor (can be lower if win rate is high)
+    if results['profit_factor'] < 0.8:
+        return None
+    
+    # Risk/reward check
+    if results['avg_win_pct'] > 0 and results['avg_loss_pct'] > 0:
+        risk_reward = results['avg_win_pct'] / results['avg_loss_pct']
+        if risk_reward < 0.5:  # At least 0.5:1 risk/reward
+            return None
+    else:
+        return None
+    
+    # Calculate score - PRIORITIZE WIN RATE ABOVE ALL
+    capped_return = min(results['total_return_pct'], 10000)
+    score = (
+        results['win_rate'] * 10.0 +         # Win rate is CRITICAL - highest priority
+        results['profit_factor'] * 5.0 +      # Profit factor is important but secondary
+        capped_return * 0.1 -                 # Return matters less
+        results['max_drawdown_pct'] * 0.3 +  # Penalize drawdown
+        (results['total_trades'] / 20) * 0.05  # Small bonus for more trades
+    )
+    
+    # Extra bonus for very high win rates
+    if results['win_rate'] >= 80:
+        score += 50.0
+    elif results['win_rate'] >= 75:
+        score += 20.0
+    
+    return score
+
+
+def result_record(entry: dict) -> dict:
+    """JSON-serializable result: params, score and headline metrics"""
+    r = entry['results']
+    return {
+        'params': entry['params'],
+        'score': entry['score'],
+        'total_trades': r['total_trades'],
+        'win_rate': r['win_rate'],
+        'profit_factor': r['profit_factor'],
+        'total_return_pct': r['total_return_pct'],
+        'max_drawdown_pct': r['max_drawdown_pct'],
+        'winning_trades': r['winning_trades'],
+        'losing_trades': r['losing_trades'],
+        'avg_win_pct': r['avg_win_pct'],
+        'avg_loss_pct': r['avg_loss_pct'],
+    }
+
+
+def optimize_regression_channel_crypto(symbol: str = "BTCUSDT", timeframe: str = "15m", workers: int = None,
+                                       checkpoint: str = None):
     """
     Optimize Regression Channel Strategy for Crypto
     
     Args:
         symbol: Trading symbol (default: BTCUSDT)
         timeframe: Timeframe (default: 15m)
+        workers: Parallel backtest processes (default: all cores)
+        checkpoint: JSON-lines checkpoint to resume from / append to
     """
     print(f"\n{'='*70}")
     print(f"🚀 Regression Channel Strategy Optimizer (CRYPTO)")
@@ -113,164 +175,37 @@ def optimize_regression_channel_crypto(symbol: str = "BTCUSDT", timeframe: str =
     
     # Parameter ranges for optimization (crypto-focused)
     # FOCUSED ON HIGH WIN RATE - More selective parameters
-    reg_lens = [100, 125, 150]  # Longer periods = more selective
-    inner_mults = [1.0, 1.2]  # Wider inner bands
-    outer_mults = [2.0, 2.5, 3.0]  # Much wider outer bands = more selective
-    sma_lens = [20, 26, 30]  # Longer SMA = stronger trend filter
-    use_trend_filters = [True, False]  # Test both
-    
-    stoch_lens = [14, 20]  # Longer periods = more selective
-    smooth_ks = [3, 5]  # More smoothing = less noise
-    smooth_ds = [3, 5]  # More smoothing = less noise
-    ob_levels = [80, 85, 90]  # Higher overbought = more selective
-    os_levels = [10, 15, 20]  # Lower oversold = more selective
-    
-    tp_pcts = [0.02, 0.025, 0.03]  # Higher TP = better R:R
-    sl_pcts = [0.01, 0.012, 0.015]  # Tighter SL = better R:R
-    
-    total_combinations = (
-        len(reg_lens) * len(inner_mults) * len(outer_mults) * 
-        len(sma_lens) * len(use_trend_filters) *
-        len(stoch_lens) * len(smooth_ks) * len(smooth_ds) *
-        len(ob_levels) * len(os_levels) *
-        len(tp_pcts) * len(sl_pcts)
-    )
-    
-    print(f"\n📊 Testing {total_combinations:,} parameter combinations...")
-    print(f"⚠️  This will take approximately {total_combinations * 0.3 / 60:.1f} minutes...")
-    
-    all_results = []
-    best_result = None
-    best_score = -float('inf')
-    
-    combination_count = 0
-    start_time = time.time()
-    
-    for (reg_len, inner_mult, outer_mult, sma_len, use_trend_filter,
-         stoch_len, smooth_k, smooth_d, ob_level, os_level,
-         tp_pct, sl_pct) in product(
-        reg_lens, inner_mults, outer_mults, sma_lens, use_trend_filters,
-        stoch_lens, smooth_ks, smooth_ds, ob_levels, os_levels,
-        tp_pcts, sl_pcts
-    ):
-        combination_count += 1
-        
-        if combination_count % 50 == 0:
-            elapsed = time.time() - start_time
-            if combination_count > 0:
-                remaining = (total_combinations - combination_count) * (elapsed / combination_count)
-                best_wr = best_result['results']['win_rate'] if best_result else 0
-                best_pf = best_result['results']['profit_factor'] if best_result else 0
-                print(f"Progress: {combination_count}/{total_combinations} ({combination_count/total_combinations*100:.1f}%) | "
-                      f"Elapsed: {elapsed/60:.1f}m | Remaining: {remaining/60:.1f}m | "
-                      f"Best Score: {best_score:.2f} | Best WR: {best_wr:.1f}% | Best PF: {best_pf:.2f}")
-        
-        params = {
-            'reg_len': reg_len,
-            'inner_mult': inner_mult,
-            'outer_mult': outer_mult,
-            'sma_len': sma_len,
-            'use_trend_filter': use_trend_filter,
-            'stoch_len': stoch_len,
-            'smooth_k': smooth_k,
-            'smooth_d': smooth_d,
-            'ob_level': ob_level,
-            'os_level': os_level,
-            'tp_pct': tp_pct,
-            'sl_pct': sl_pct,
-        }
-        
-        backtest_params = {
-            'commission': 0.0005,  # 0.05% for crypto
-            'slippage': 0.0002,    # 0.02% slippage
-        }
-        
-        try:
-            strategy = RegressionChannelStrategy(params)
-            results = strategy.run_backtest(df, **backtest_params)
-            
-            # Filter results - want reasonable number of trades
-            if results['total_trades'] < 10 or results['total_trades'] > 500:
-                continue
-            
-            # CRITICAL: Minimum win rate must be 75%+
-            if results['win_rate'] < 75:
-                continue
-            
-            # Minimum profit factor (can be lower if win rate is high)
-            if results['profit_factor'] < 0.8:
-                continue
-            
-            # Risk/reward check
-            if results['avg_win_pct'] > 0 and results['avg_loss_pct'] > 0:
-                risk_reward = results['avg_win_pct'] / results['avg_loss_pct']
-                if risk_reward < 0.5:  # At least 0.5:1 risk/reward
-                    continue
-            else:
-                continue
-            
-            # Calculate score - PRIORITIZE WIN RATE ABOVE ALL
-            capped_return = min(results['total_return_pct'], 10000)
-            score = (
-                results['win_rate'] * 10.0 +         # Win rate is CRITICAL - highest priority
-                results['profit_factor'] * 5.0 +      # Profit factor is important but secondary
-                capped_return * 0.1 -                 # Return matters less
-                results['max_drawdown_pct'] * 0.3 +  # Penalize drawdown
-                (results['total_trades'] / 20) * 0.05  # Small bonus for more trades
-            )
-            
-            # Extra bonus for very high win rates
-            if results['win_rate'] >= 80:
-                score += 50.0
-            elif results['win_rate'] >= 75:
-                score += 20.0
-            
-            result_entry = {
-                'params': params,
-                'results': results,
-                'score': score
-            }
-            all_results.append(result_entry)
-            
-            if score > best_score:
-                best_score = score
-                best_result = result_entry
-                print(f"\n⭐ New Best Score: {score:.2f}")
-                print(f"   Trades: {results['total_trades']} | WR: {results['win_rate']:.1f}% | PF: {results['profit_factor']:.2f}")
-                print(f"   Return: {results['total_return_pct']:.1f}% | DD: {results['max_drawdown_pct']:.1f}%")
-                print(f"   Params: reg_len={reg_len}, outer_mult={outer_mult}, stoch_len={stoch_len}")
-                print(f"   TP: {tp_pct*100:.1f}% | SL: {sl_pct*100:.1f}% | Trend Filter: {use_trend_filter}")
-        
-        except Exception as e:
-            continue
-    
-    # Sort results by score
-    all_results.sort(key=lambda x: x['score'], reverse=True)
-    
-    # Save results
+    grid = param_grid({
+        'reg_len': [100, 125, 150],  # Longer periods = more selective
+        'inner_mult': [1.0, 1.2],  # Wider inner bands
+        'outer_mult': [2.0, 2.5, 3.0],  # Much wider outer bands = more selective
+        'sma_len': [20, 26, 30],  # Longer SMA = stronger trend filter
+        'use_trend_filter': [True, False],  # Test both
+        'stoch_len': [14, 20],  # Longer periods = more selective
+        'smooth_k': [3, 5],  # More smoothing = less noise
+        'smooth_d': [3, 5],  # More smoothing = less noise
+        'ob_level': [80, 85, 90],  # Higher overbought = more selective
+        'os_level': [10, 15, 20],  # Lower oversold = more selective
+        'tp_pct': [0.02, 0.025, 0.03],  # Higher TP = better R:R
+        'sl_pct': [0.01, 0.012, 0.015],  # Tighter SL = better R:R
+    })
+    
+    backtest_params = {
+        'commission': 0.0005,  # 0.05% for crypto
+        'slippage': 0.0002,    # 0.02% slippage
+    }
+    
+    print(f"\n📊 Testing {len(grid):,} parameter combinations...")
+    
+    all_results = run_optimization(RegressionChannelStrategy, grid, df, score_result,
+                                   backtest_kwargs=backtest_params, workers=workers,
+                                   checkpoint=checkpoint, progress_every=50)
+    best_result = all_results[0] if all_results else None
+    
+    # Save results (top 100); the Pine Script shares the timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    results_file = f"regression_channel_optimization_{symbol}_{timestamp}.json"
-    
-    # Convert to JSON-serializable format
-    json_results = []
-    for r in all_results[:100]:  # Top 100 results
-        json_r = {
-            'params': r['params'],
-            'score': r['score'],
-            'total_trades': r['results']['total_trades'],
-            'win_rate': r['results']['win_rate'],
-            'profit_factor': r['results']['profit_factor'],
-            'total_return_pct': r['results']['total_return_pct'],
-            'max_drawdown_pct': r['results']['max_drawdown_pct'],
-            'winning_trades': r['results']['winning_trades'],
-            'losing_trades': r['results']['losing_trades'],
-            'avg_win_pct': r['results']['avg_win_pct'],
-            'avg_loss_pct': r['results']['avg_loss_pct'],
-        }
-        json_results.append(json_r)
-    
-    with open(results_file, 'w') as f:
-        json.dump(json_results, f, indent=2)
+    results_file = save_results(all_results, f"regression_channel_optimization_{symbol}", top=100,
+                                formatter=result_record, timestamp=timestamp)
     
     print(f"\n{'='*70}")
     print(f"✅ Optimization Complete!")
@@ -466,8 +401,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Optimize Regression Channel Strategy for Crypto')
     parser.add_argument('--symbol', type=str, default='BTCUSDT', help='Trading symbol (default: BTCUSDT)')
     parser.add_argument('--timeframe', type=str, default='15m', help='Timeframe (default: 15m)')
+    parser.add_argument('--workers', type=int, default=None, help='Parallel processes (default: all cores)')
+    parser.add_argument('--checkpoint', type=str, default=None, help='Checkpoint file to resume from')
     
     args = parser.parse_args()
     
-    optimize_regression_channel_crypto(symbol=args.symbol, timeframe=args.timeframe)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    optimize_regression_channel_crypto(symbol=args.symbol, timeframe=args.timeframe, workers=args.workers,
+                                       checkpoint=args.checkpoint)
 
@@ -13,6 +13,13 @@ from .metrics import (
     filter_results_by_metrics,
     get_metric_summary,
 )
+from .harness import (
+    SharedFrames,
+    param_grid,
+    run_optimization,
+    result_json,
+    save_results,
+)
 
 __all__ = [
     'calculate_basic_metrics',
@@ -24,4 +31,9 @@ __all__ = [
     'calculate_portfolio_metrics',
     'filter_results_by_metrics',
     'get_metric_summary',
+    'SharedFrames',
+    'param_grid',
+    'run_optimization',
+    'result_json',
+    'save_results',
 ]
@@ -0,0 +1,373 @@
+"""
+Parallel optimization harness for the strategy scripts.
+
+Runs a strategy class over a parameter grid and one or more datasets on a
+process pool. The OHLCV frames are copied once into shared memory and
+rebuilt in every worker without pickling. Evaluated parameter sets are
+appended to an optional JSON-lines checkpoint so an interrupted sweep
+resumes where it stopped. Results are saved in the timestamped JSON
+format of the optimize_*.py scripts.
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import product
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# score_fn(params, results) -> score, or None to drop the result
+ScoreFn = Callable[[Dict[str, Any], Dict[str, Any]], Optional[float]]
+
+# Per-worker state set by _init_worker
+_WORKER: Dict[str, Any] = {}
+
+
+def param_grid(space: Dict[str, Sequence[Any]],
+               base: Optional[Dict[str, Any]] = None,
+               where: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+    """
+    Cartesian product of a parameter space.
+    
+    Combinations are generated in ``itertools.product`` order over the keys
+    of ``space`` (the last key varies fastest) and merged into ``base``.
+    
+    Args:
+        space: Parameter name -> values to test
+        base: Fixed parameters shared by every combination
+        where: Optional predicate; combinations for which it is False are skipped
+    
+    Returns:
+        List of parameter dictionaries
+    """
+    names = list(space)
+    grid = []
+    for values in product(*(space[name] for name in names)):
+        params = dict(base or {})
+        params.update(zip(names, values))
+        if where is None or where(params):
+            grid.append(params)
+    return grid
+
+
+def params_key(dataset: Optional[str], params: Dict[str, Any]) -> str:
+    """Stable key of a (dataset, params) task for checkpoints."""
+    return json.dumps([dataset, params], sort_keys=True, default=_to_json)
+
+
+def _to_json(value: Any) -> Any:
+    """JSON fallback for numpy values and timestamps."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _strip_trades(results: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in results.items() if k != 'trades'}
+
+
+class SharedFrames:
+    """
+    DataFrames copied into shared memory blocks.
+    
+    Each frame is stored as one float64 block of its columns followed by
+    the int64 nanoseconds of its DatetimeIndex. ``specs`` is a small
+    picklable description that workers pass to ``attach_frames``.
+    """
+    
+    def __init__(self, frames: Dict[Optional[str], pd.DataFrame]):
+        self.blocks: List[shared_memory.SharedMemory] = []
+        self.specs: List[Dict[str, Any]] = []
+        try:
+            for name, df in frames.items():
+                if not isinstance(df.index, pd.DatetimeIndex):
+                    raise ValueError(f"Dataset {name!r} needs a DatetimeIndex")
+                values = np.ascontiguousarray(df.to_numpy(dtype=np.float64))
+                stamps = df.index.as_unit('ns').asi8
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes + stamps.nbytes, 1))
+                self.blocks.append(block)
+                
+                n_rows, n_cols = values.shape
+                shared = np.ndarray((n_rows, n_cols), dtype=np.float64, buffer=block.buf)
+                shared[:] = values
+                shared_index = np.ndarray(n_rows, dtype=np.int64, buffer=block.buf, offset=values.nbytes)
+                shared_index[:] = stamps
+                self.specs.append({
+                    'dataset': name,
+                    'block': block.name,
+                    'shape': (n_rows, n_cols),
+                    'columns': list(df.columns),
+                    'tz': df.index.tz,
+                    'index_name': df.index.name,
+                })
+        except Exception:
+            self.close()
+            raise
+    
+    def close(self):
+        """Release and remove the shared memory blocks."""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def attach_frames(specs: List[Dict[str, Any]]) -> Tuple[Dict[Optional[str], pd.DataFrame], List[shared_memory.SharedMemory]]:
+    """
+    Rebuild DataFrames on top of shared memory blocks (no copy).
+    
+    The values are read-only since every worker sees the same memory;
+    strategies that modify their input must copy it first. The returned
+    blocks must stay referenced as long as the frames are used.
+    """
+    frames, blocks = {}, []
+    for spec in specs:
+        block = shared_memory.SharedMemory(name=spec['block'])
+        blocks.append(block)
+        n_rows, n_cols = spec['shape']
+        values = np.ndarray((n_rows, n_cols), dtype=np.float64, buffer=block.buf)
+        stamps = np.ndarray(n_rows, dtype=np.int64, buffer=block.buf, offset=values.nbytes)
+        values.flags.writeable = False
+        index = pd.DatetimeIndex(stamps.view('datetime64[ns]'), name=spec['index_name'])
+        if spec['tz'] is not None:
+            index = index.tz_localize('UTC').tz_convert(spec['tz'])
+        frames[spec['dataset']] = pd.DataFrame(values, index=index, columns=spec['columns'], copy=False)
+    return frames, blocks
+
+
+def _init_worker(strategy_cls: type, specs: List[Dict[str, Any]], score_fn: ScoreFn,
+                 backtest_kwargs: Dict[str, Any], keep_trades: bool):
+    """Attach the shared datasets once per worker process."""
+    frames, blocks = attach_frames(specs)
+    _WORKER.update(strategy_cls=strategy_cls, frames=frames, blocks=blocks, score_fn=score_fn,
+                   backtest_kwargs=backtest_kwargs, keep_trades=keep_trades)
+
+
+def _evaluate(task: Tuple[Optional[str], Dict[str, Any]]) -> Tuple[Optional[float], Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Backtest and score one (dataset, params) task.
+    
+    Returns:
+        Tuple of (score, results, error); score and results are None when the
+        score function dropped the result or the backtest failed
+    """
+    dataset, params = task
+    try:
+        strategy = _WORKER['strategy_cls'](params)
+        results = strategy.run_backtest(_WORKER['frames'][dataset], **_WORKER['backtest_kwargs'])
+        score = _WORKER['score_fn'](params, results)
+    except Exception as e:
+        return None, None, f"{type(e).__name__}: {e}"
+    if score is None:
+        return None, None, None
+    if not _WORKER['keep_trades']:
+        results = _strip_trades(results)
+    return float(score), results, None
+
+
+def _load_checkpoint(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Evaluated tasks from a JSON-lines checkpoint, keyed by params_key."""
+    done = {}
+    if not path.exists():
+        return done
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Last line of an interrupted run
+                continue
+            done[record['key']] = record
+    return done
+
+
+def _format_results(results: Dict[str, Any]) -> str:
+    parts = []
+    for key, label, fmt in (('total_trades', 'Trades', '{}'), ('win_rate', 'WR', '{:.1f}%'),
+                            ('profit_factor', 'PF', '{:.2f}'), ('total_return_pct', 'Return', '{:.1f}%'),
+                            ('max_drawdown_pct', 'DD', '{:.1f}%')):
+        if key in results:
+            parts.append(f"{label}: {fmt.format(results[key])}")
+    return ' | '.join(parts)
+
+
+def run_optimization(strategy_cls: type,
+                     grid: List[Dict[str, Any]],
+                     datasets: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+                     score_fn: ScoreFn,
+                     backtest_kwargs: Optional[Dict[str, Any]] = None,
+                     workers: Optional[int] = None,
+                     chunksize: Optional[int] = None,
+                     checkpoint: Optional[Union[str, Path]] = None,
+                     keep_trades: bool = False,
+                     progress_every: int = 100) -> List[Dict[str, Any]]:
+    """
+    Backtest every parameter set on every dataset in parallel.
+    
+    ``strategy_cls(params).run_backtest(df, **backtest_kwargs)`` must return
+    a results dictionary. ``score_fn`` must be picklable (a module-level
+    function) and return None for results that should be dropped.
+    Backtests that raise are skipped and counted.
+    
+    Args:
+        strategy_cls: Strategy class taking a params dict
+        grid: Parameter sets (see param_grid)
+        datasets: One DataFrame, or dataset name -> DataFrame
+        score_fn: Score of (params, results), None to drop
+        backtest_kwargs: Extra keyword arguments for run_backtest
+        workers: Worker processes (default: all cores; 1 runs in-process)
+        chunksize: Tasks per worker round trip (default: sized from the grid)
+        checkpoint: JSON-lines file of evaluated tasks; existing entries are
+            reused and new ones appended
+        keep_trades: Keep the 'trades' list in results (dropped by default to
+            keep worker results small)
+        progress_every: Log progress every N evaluated tasks
+    
+    Returns:
+        Entries {'dataset', 'params', 'results', 'score'} sorted by score
+        (descending, grid order for ties); 'dataset' is None for a single
+        DataFrame
+    """
+    frames = {None: datasets} if isinstance(datasets, pd.DataFrame) else dict(datasets)
+    backtest_kwargs = dict(backtest_kwargs or {})
+    workers = workers or os.cpu_count() or 1
+    
+    tasks = [(name, params) for name in frames for params in grid]
+    keys = [params_key(name, params) for name, params in tasks]
+    entries: List[Tuple[int, Dict[str, Any]]] = []
+    
+    checkpoint_file = None
+    pending = list(range(len(tasks)))
+    if checkpoint is not None:
+        checkpoint = Path(checkpoint)
+        done = _load_checkpoint(checkpoint)
+        pending = []
+        for position, key in enumerate(keys):
+            record = done.get(key)
+            if record is None:
+                pending.append(position)
+            elif record['score'] is not None:
+                name, params = tasks[position]
+                entries.append((position, {'dataset': name, 'params': params,
+                                           'results': record['results'], 'score': record['score']}))
+        if len(pending) < len(tasks):
+            logger.info(f"Checkpoint {checkpoint}: {len(tasks) - len(pending)}/{len(tasks)} tasks already evaluated")
+        checkpoint_file = open(checkpoint, 'a')
+    
+    best_score = max((entry['score'] for _, entry in entries), default=-float('inf'))
+    errors = 0
+    start_time = time.time()
+    
+    def collect(position, outcome, count):
+        nonlocal best_score, errors
+        score, results, error = outcome
+        name, params = tasks[position]
+        if error is not None:
+            errors += 1
+            logger.debug(f"Backtest failed for {params}: {error}")
+        elif score is not None:
+            entries.append((position, {'dataset': name, 'params': params, 'results': results, 'score': score}))
+            if score > best_score:
+                best_score = score
+                label = f" [{name}]" if name is not None else ""
+                logger.info(f"New best score{label}: {score:.2f} | {_format_results(results)}")
+        
+        if checkpoint_file is not None and error is None:
+            record = {'key': keys[position], 'score': score,
+                      'results': _strip_trades(results) if results is not None else None}
+            checkpoint_file.write(json.dumps(record, default=_to_json) + '\n')
+            if count % progress_every == 0:
+                checkpoint_file.flush()
+        
+        if count % progress_every == 0:
+            elapsed = time.time() - start_time
+            remaining = (len(pending) - count) * (elapsed / count)
+            logger.info(f"Progress: {count}/{len(pending)} ({count / len(pending) * 100:.1f}%) | "
+                        f"Elapsed: {elapsed / 60:.1f}m | Remaining: {remaining / 60:.1f}m | "
+                        f"Best Score: {best_score:.2f} | Results: {len(entries)}")
+    
+    try:
+        pending_tasks = [tasks[position] for position in pending]
+        if workers <= 1 or len(pending_tasks) <= 1:
+            # In-process: no pool and no shared memory copy
+            _WORKER.update(strategy_cls=strategy_cls, frames=frames, blocks=[], score_fn=score_fn,
+                           backtest_kwargs=backtest_kwargs, keep_trades=keep_trades)
+            try:
+                for count, (position, task) in enumerate(zip(pending, pending_tasks), 1):
+                    collect(position, _evaluate(task), count)
+            finally:
+                _WORKER.clear()
+        else:
+            chunksize = chunksize or max(1, min(64, len(pending_tasks) // (workers * 8)))
+            shared = SharedFrames(frames)
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(strategy_cls, shared.specs, score_fn,
+                                                   backtest_kwargs, keep_trades)) as pool:
+                    outcomes = pool.map(_evaluate, pending_tasks, chunksize=chunksize)
+                    for count, (position, outcome) in enumerate(zip(pending, outcomes), 1):
+                        collect(position, outcome, count)
+            finally:
+                shared.close()
+    finally:
+        if checkpoint_file is not None:
+            checkpoint_file.close()
+    
+    if errors:
+        logger.warning(f"{errors} backtests failed and were skipped")
+    
+    entries.sort(key=lambda item: (-item[1]['score'], item[0]))
+    return [entry for _, entry in entries]
+
+
+def result_json(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Default JSON record of an entry: params, results without trades, score."""
+    record = {
+        'params': entry['params'],
+        'results': _strip_trades(entry['results']),
+        'score': entry['score'],
+    }
+    if entry.get('dataset') is not None:
+        record['dataset'] = entry['dataset']
+    return record
+
+
+def save_results(entries: List[Dict[str, Any]],
+                 prefix: str,
+                 top: int = 100,
+                 formatter: Callable[[Dict[str, Any]], Dict[str, Any]] = result_json,
+                 timestamp: Optional[str] = None) -> str:
+    """
+    Write the top entries to ``{prefix}_{timestamp}.json``.
+    
+    Args:
+        entries: Sorted entries from run_optimization
+        prefix: File name prefix (may include a directory)
+        top: Number of entries to keep
+        formatter: Entry -> JSON record
+        timestamp: File timestamp (default: now, %Y%m%d_%H%M%S)
+    
+    Returns:
+        Path of the written file
+    """
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = f"{prefix}_{timestamp}.json"
+    with open(path, 'w') as f:
+        json.dump([formatter(entry) for entry in entries[:top]], f, indent=2, default=_to_json)
+    return path
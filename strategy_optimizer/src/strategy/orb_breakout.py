@@ -5,12 +5,300 @@ Opening Range Breakout with Multi-Stage Detection
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, List, Optional, Tuple, Any
+from numba import jit
 import logging
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+STOP_MODES = ('ATR', 'ORB %', '% Based', 'Smart Adaptive')
+EXIT_REASONS = ('SL', 'TP1', 'TP2', 'TP3')
+
+# Opening range = first bars of each session (2 x 4h bars = 8 hour range)
+ORB_BARS = 2
+
+
+def session_orb_levels(df: pd.DataFrame, orb_bars: int = ORB_BARS) -> pd.DataFrame:
+    """
+    Per-bar session id and ORB levels of that session.
+    
+    A new session starts on every calendar date change. The opening range
+    is the high/low of the first ``orb_bars`` bars from the session start
+    (fewer at the end of the data), reduced once per session and broadcast
+    back to every bar of the session.
+    
+    Args:
+        df: DataFrame with high/low columns and a DatetimeIndex
+        orb_bars: Number of bars in the opening range
+    
+    Returns:
+        DataFrame with session_start, session_id, orb_high, orb_low, orb_mid
+    """
+    n = len(df)
+    dates = df.index.normalize().to_numpy()
+    session_start = np.ones(n, dtype=np.bool_)
+    session_start[1:] = dates[1:] != dates[:-1]
+    session_id = np.cumsum(session_start) - 1
+    
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    starts = np.flatnonzero(session_start)
+    session_high = np.full(len(starts), np.nan)
+    session_low = np.full(len(starts), np.nan)
+    for k in range(orb_bars):
+        rows = np.minimum(starts + k, n - 1)
+        session_high = np.fmax(session_high, high[rows])
+        session_low = np.fmin(session_low, low[rows])
+    
+    orb_high = session_high[session_id]
+    orb_low = session_low[session_id]
+    return pd.DataFrame({
+        'session_start': session_start,
+        'session_id': session_id,
+        'orb_high': orb_high,
+        'orb_low': orb_low,
+        'orb_mid': (orb_high + orb_low) / 2,
+    }, index=df.index)
+
+
+@jit(nopython=True)
+def _supertrend_kernel(close: np.ndarray, upper_band: np.ndarray, lower_band: np.ndarray):
+    """Final bands and direction (1 / -1, NaN until known) of the SuperTrend."""
+    n = len(close)
+    supertrend = np.full(n, np.nan)
+    direction = np.full(n, np.nan)
+    
+    started = False
+    final_upper = 0.0
+    final_lower = 0.0
+    
+    for i in range(n):
+        if np.isnan(upper_band[i]) or np.isnan(lower_band[i]):
+            continue
+        
+        if not started:
+            final_upper = upper_band[i]
+            final_lower = lower_band[i]
+            started = True
+        else:
+            if close[i - 1] <= final_upper:
+                final_upper = min(upper_band[i], final_upper)
+            else:
+                final_upper = upper_band[i]
+            if close[i - 1] >= final_lower:
+                final_lower = max(lower_band[i], final_lower)
+            else:
+                final_lower = lower_band[i]
+        
+        if i == 0:
+            direction[i] = 1
+        elif close[i] > final_upper:
+            direction[i] = 1
+        elif close[i] < final_lower:
+            direction[i] = -1
+        else:
+            direction[i] = direction[i - 1]
+        
+        supertrend[i] = final_lower if direction[i] == 1 else final_upper
+    
+    return supertrend, direction
+
+
+@jit(nopython=True)
+def _stop_loss(entry: float, orb_high: float, orb_low: float, orb_range: float, atr: float,
+               is_long: bool, stop_mode: int, atr_multiplier: float, max_stop_loss_pct: float) -> float:
+    """Stop loss for ``stop_mode`` (index into STOP_MODES, -1 = % Based) capped at max_stop_loss_pct."""
+    max_sl_long = entry * (1 - max_stop_loss_pct / 100)
+    max_sl_short = entry * (1 + max_stop_loss_pct / 100)
+    
+    if stop_mode == 0:
+        if is_long:
+            sl = entry - (atr * atr_multiplier)
+        else:
+            sl = entry + (atr * atr_multiplier)
+    elif stop_mode == 1:
+        if is_long:
+            sl = orb_low - (orb_range * 0.2)
+        else:
+            sl = orb_high + (orb_range * 0.2)
+    elif stop_mode == 3:
+        atr_pct = (atr / entry) * 100 if entry > 0 else 0.0
+        if atr_pct > 3:
+            multiplier = 1.5
+        elif atr_pct > 1.5:
+            multiplier = 1.0
+        else:
+            multiplier = 0.7
+        
+        if is_long:
+            sl = entry - (atr * multiplier)
+        else:
+            sl = entry + (atr * multiplier)
+    else:
+        if is_long:
+            sl = entry * (1 - max_stop_loss_pct / 100)
+        else:
+            sl = entry * (1 + max_stop_loss_pct / 100)
+    
+    # Apply maximum stop loss limit (a NaN stop stays NaN, like max()/min() did)
+    if is_long:
+        if max_sl_long > sl:
+            sl = max_sl_long
+    else:
+        if max_sl_short < sl:
+            sl = max_sl_short
+    return sl
+
+
+@jit(nopython=True)
+def _backtest_kernel(close: np.ndarray, high: np.ndarray, low: np.ndarray, atr: np.ndarray,
+                     session_start: np.ndarray, orb_high: np.ndarray, orb_low: np.ndarray,
+                     volume_ok: np.ndarray, trend_long_ok: np.ndarray, trend_short_ok: np.ndarray,
+                     start: int, breakout_buffer_pct: float, min_bars_outside: int,
+                     tp1_pct: float, tp2_pct: float, tp3_pct: float, stop_mode: int,
+                     atr_multiplier: float, max_stop_loss_pct: float, leverage: float,
+                     commission: float, slippage: float):
+    """
+    ORB bar loop over precomputed session levels and filter masks.
+    
+    Bars before the first session starting at or after ``start`` have no
+    ORB and are skipped (no equity point). The position is closed fully at
+    the first of SL, TP1, TP2, TP3 that is hit.
+    
+    Returns:
+        Tuple of (trade matrix, number of trades, equity curve, length of the
+        equity curve). Trade matrix columns: entry bar, exit bar, side (+1/-1),
+        entry price, exit price, pnl %, net pnl, exit reason (index into
+        EXIT_REASONS).
+    """
+    n = len(close)
+    trades = np.empty((n + 1, 8))
+    equity_curve = np.empty(n + 1)
+    n_trades = 0
+    
+    equity = 10000.0
+    equity_curve[0] = equity
+    n_equity = 1
+    
+    has_orb = False
+    cur_high = 0.0
+    cur_low = 0.0
+    session_start_idx = 0
+    bars_outside = 0
+    
+    position = 0
+    entry_price = 0.0
+    entry_index = 0
+    stop_loss = 0.0
+    tp1 = 0.0
+    tp2 = 0.0
+    tp3 = 0.0
+    
+    for i in range(start, n):
+        if session_start[i]:
+            session_start_idx = i
+            cur_high = orb_high[i]
+            cur_low = orb_low[i]
+            has_orb = True
+            bars_outside = 0
+        
+        if not has_orb:
+            continue
+        
+        current_price = close[i]
+        
+        # Consecutive closes outside the ORB since the session start
+        if i > session_start_idx:
+            if current_price > cur_high:
+                bars_outside += 1
+            elif current_price < cur_low:
+                bars_outside += 1
+            else:
+                bars_outside = 0
+        
+        # Same guards as the original per-bar loop: the short branch is an
+        # elif on the long branch's guard, so while flat only longs are taken
+        if position == 0 and i > session_start_idx:
+            breakout_level = cur_high + cur_high * (breakout_buffer_pct / 100)
+            if (current_price > breakout_level and bars_outside >= min_bars_outside
+                    and volume_ok[i] and trend_long_ok[i]):
+                entry_price = current_price * (1 + slippage)
+                entry_index = i
+                orb_range = cur_high - cur_low
+                current_atr = atr[i] if not np.isnan(atr[i]) else orb_range * 0.5
+                stop_loss = _stop_loss(entry_price, cur_high, cur_low, orb_range, current_atr, True,
+                                       stop_mode, atr_multiplier, max_stop_loss_pct)
+                tp1 = entry_price * (1 + tp1_pct / 100)
+                tp2 = entry_price * (1 + tp2_pct / 100)
+                tp3 = entry_price * (1 + tp3_pct / 100)
+                position = 1
+                bars_outside = 0
+        elif position == 0 and i > session_start_idx:
+            breakout_level = cur_low - cur_low * (breakout_buffer_pct / 100)
+            if (current_price < breakout_level and bars_outside >= min_bars_outside
+                    and volume_ok[i] and trend_short_ok[i]):
+                entry_price = current_price * (1 - slippage)
+                entry_index = i
+                orb_range = cur_high - cur_low
+                current_atr = atr[i] if not np.isnan(atr[i]) else orb_range * 0.5
+                stop_loss = _stop_loss(entry_price, cur_high, cur_low, orb_range, current_atr, False,
+                                       stop_mode, atr_multiplier, max_stop_loss_pct)
+                tp1 = entry_price * (1 - tp1_pct / 100)
+                tp2 = entry_price * (1 - tp2_pct / 100)
+                tp3 = entry_price * (1 - tp3_pct / 100)
+                position = -1
+                bars_outside = 0
+        
+        # Exit Logic - SL first, then TP1, TP2, TP3 (full close at the first hit)
+        exit_price = 0.0
+        reason = -1
+        if position == 1:
+            if low[i] <= stop_loss:
+                exit_price, reason = stop_loss * (1 + slippage), 0
+            elif high[i] >= tp1:
+                exit_price, reason = tp1 * (1 - slippage), 1
+            elif high[i] >= tp2:
+                exit_price, reason = tp2 * (1 - slippage), 2
+            elif high[i] >= tp3:
+                exit_price, reason = tp3 * (1 - slippage), 3
+        elif position == -1:
+            if high[i] >= stop_loss:
+                exit_price, reason = stop_loss * (1 - slippage), 0
+            elif low[i] <= tp1:
+                exit_price, reason = tp1 * (1 + slippage), 1
+            elif low[i] <= tp2:
+                exit_price, reason = tp2 * (1 + slippage), 2
+            elif low[i] <= tp3:
+                exit_price, reason = tp3 * (1 + slippage), 3
+        
+        if reason >= 0:
+            if position == 1:
+                pnl_pct = ((exit_price - entry_price) / entry_price) * 100
+            else:
+                pnl_pct = ((entry_price - exit_price) / entry_price) * 100
+            pnl = equity * (pnl_pct / 100) * leverage
+            commission_cost = equity * commission * 2  # Entry + Exit
+            net_pnl = pnl - commission_cost
+            equity += net_pnl
+            
+            trades[n_trades, 0] = entry_index
+            trades[n_trades, 1] = i
+            trades[n_trades, 2] = position
+            trades[n_trades, 3] = entry_price
+            trades[n_trades, 4] = exit_price
+            trades[n_trades, 5] = pnl_pct
+            trades[n_trades, 6] = net_pnl
+            trades[n_trades, 7] = reason
+            n_trades += 1
+            position = 0
+        
+        equity_curve[n_equity] = equity
+        n_equity += 1
+    
+    return trades, n_trades, equity_curve, n_equity
+
 
 class ORBBreakoutStrategy:
     """ORB Breakout Strategy - Clean Implementation"""
@@ -70,11 +358,14 @@ class ORBBreakoutStrategy:
     
     def calculate_atr(self, df: pd.DataFrame) -> pd.Series:
         """Calculate Average True Range"""
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = tr.rolling(window=self.atr_length).mean()
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        prev_close = np.empty(len(df))
+        prev_close[:1] = np.nan
+        prev_close[1:] = df['close'].to_numpy(dtype=np.float64)[:-1]
+        # fmax skips the missing previous close like max(axis=1) did
+        tr = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+        atr = pd.Series(tr, index=df.index).rolling(window=self.atr_length).mean()
         return atr
     
     def calculate_vwap(self, df: pd.DataFrame) -> pd.Series:
@@ -88,401 +379,114 @@ class ORBBreakoutStrategy:
         return df['close'].ewm(span=period, adjust=False).mean()
     
     def calculate_supertrend(self, df: pd.DataFrame, atr: pd.Series) -> Tuple[pd.Series, pd.Series]:
-        """Calculate SuperTrend"""
+        """Calculate SuperTrend (direction is 1 / -1, NaN before the first decision)"""
         hl2 = (df['high'] + df['low']) / 2
         upper_band = hl2 + (self.atr_multiplier * atr)
         lower_band = hl2 - (self.atr_multiplier * atr)
         
-        supertrend = pd.Series(index=df.index, dtype=float)
-        direction = pd.Series(index=df.index, dtype=int)
-        
-        final_upper = None
-        final_lower = None
-        
-        for i in range(len(df)):
-            if pd.isna(upper_band.iloc[i]) or pd.isna(lower_band.iloc[i]):
-                continue
-            
-            # Upper band
-            if final_upper is None:
-                final_upper = upper_band.iloc[i]
-            else:
-                if df['close'].iloc[i-1] <= final_upper:
-                    final_upper = min(upper_band.iloc[i], final_upper)
-                else:
-                    final_upper = upper_band.iloc[i]
-            
-            # Lower band
-            if final_lower is None:
-                final_lower = lower_band.iloc[i]
-            else:
-                if df['close'].iloc[i-1] >= final_lower:
-                    final_lower = max(lower_band.iloc[i], final_lower)
-                else:
-                    final_lower = lower_band.iloc[i]
-            
-            # Direction
-            if i == 0:
-                direction.iloc[i] = 1
-            else:
-                if df['close'].iloc[i] > final_upper:
-                    direction.iloc[i] = 1
-                elif df['close'].iloc[i] < final_lower:
-                    direction.iloc[i] = -1
-                else:
-                    direction.iloc[i] = direction.iloc[i-1]
-            
-            # SuperTrend value
-            if direction.iloc[i] == 1:
-                supertrend.iloc[i] = final_lower
-            else:
-                supertrend.iloc[i] = final_upper
-        
-        return supertrend, direction
+        supertrend, direction = _supertrend_kernel(
+            df['close'].to_numpy(dtype=np.float64),
+            upper_band.to_numpy(dtype=np.float64),
+            lower_band.to_numpy(dtype=np.float64)
+        )
+        return pd.Series(supertrend, index=df.index), pd.Series(direction, index=df.index)
     
-    def calculate_orb_levels(self, df: pd.DataFrame, session_start_idx: int, timeframe_minutes: int = 240) -> Tuple[float, float, float]:
-        """Calculate ORB levels for the session"""
+    def calculate_orb_levels(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Calculate per-bar session ORB levels (see session_orb_levels)"""
         # For 4h timeframe, use first 1-2 bars of the day as ORB
         # This gives us a 4-8 hour opening range
-        
-        if session_start_idx >= len(df):
-            return None, None, None
-        
-        # For 4h timeframe, use first 1-2 bars (4-8 hours) as ORB
-        # This simulates daily opening range
-        orb_bars = min(2, len(df) - session_start_idx)  # Use first 2 bars max
-        orb_data = df.iloc[session_start_idx:session_start_idx + orb_bars]
-        
-        if len(orb_data) == 0:
-            return None, None, None
-        
-        orb_high = orb_data['high'].max()
-        orb_low = orb_data['low'].min()
-        orb_mid = (orb_high + orb_low) / 2
-        
-        return orb_high, orb_low, orb_mid
+        return session_orb_levels(df, ORB_BARS)
     
-    def calculate_stop_loss(self, entry: float, orb_high: float, orb_low: float, 
+    def calculate_stop_loss(self, entry: float, orb_high: float, orb_low: float,
                            orb_range: float, atr: float, is_long: bool) -> float:
         """Calculate stop loss with maximum %2.5 limit"""
-        max_sl_long = entry * (1 - self.max_stop_loss_pct / 100)
-        max_sl_short = entry * (1 + self.max_stop_loss_pct / 100)
-        
-        if self.stop_mode == "ATR":
-            if is_long:
-                sl = entry - (atr * self.atr_multiplier)
-            else:
-                sl = entry + (atr * self.atr_multiplier)
-        elif self.stop_mode == "ORB %":
-            if is_long:
-                sl = orb_low - (orb_range * 0.2)
-            else:
-                sl = orb_high + (orb_range * 0.2)
-        elif self.stop_mode == "% Based":
-            if is_long:
-                sl = entry * (1 - self.max_stop_loss_pct / 100)
-            else:
-                sl = entry * (1 + self.max_stop_loss_pct / 100)
-        elif self.stop_mode == "Smart Adaptive":
-            atr_pct = (atr / entry) * 100 if entry > 0 else 0
-            if atr_pct > 3:
-                multiplier = 1.5
-            elif atr_pct > 1.5:
-                multiplier = 1.0
-            else:
-                multiplier = 0.7
-            
-            if is_long:
-                sl = entry - (atr * multiplier)
-            else:
-                sl = entry + (atr * multiplier)
-        else:
-            # Default to % Based
-            if is_long:
-                sl = entry * (1 - self.max_stop_loss_pct / 100)
-            else:
-                sl = entry * (1 + self.max_stop_loss_pct / 100)
-        
-        # Apply maximum stop loss limit
-        if is_long:
-            sl = max(sl, max_sl_long)  # Stop loss can't be lower than max_sl_long
-        else:
-            sl = min(sl, max_sl_short)  # Stop loss can't be higher than max_sl_short
-        
-        return sl
+        stop_mode = STOP_MODES.index(self.stop_mode) if self.stop_mode in STOP_MODES else -1
+        return _stop_loss(float(entry), float(orb_high), float(orb_low), float(orb_range), float(atr),
+                          bool(is_long), stop_mode, float(self.atr_multiplier),
+                          float(self.max_stop_loss_pct))
     
-    def check_volume_filter(self, df: pd.DataFrame, i: int) -> bool:
-        """Check volume filter"""
+    def volume_filter_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Per-bar volume filter: volume >= multiplier x mean of the previous volume_ma_length bars"""
+        n = len(df)
         if not self.enable_volume_filter:
-            return True
-        
-        if i < self.volume_ma_length:
-            return False
-        
-        volume_ma = df['volume'].iloc[i - self.volume_ma_length:i].mean()
-        current_volume = df['volume'].iloc[i]
-        
-        return current_volume >= volume_ma * self.volume_multiplier
+            return np.ones(n, dtype=np.bool_)
+        
+        mask = np.zeros(n, dtype=np.bool_)
+        length = self.volume_ma_length
+        if length < 1 or n <= length:
+            return mask
+        
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        # Window k covers bars k..k+length-1, i.e. the bars before bar k+length
+        volume_ma = sliding_window_view(volume[:-1], length).mean(axis=1)
+        mask[length:] = volume[length:] >= volume_ma * self.volume_multiplier
+        return mask
     
-    def check_trend_filter(self, df: pd.DataFrame, i: int, is_long: bool) -> bool:
-        """Check trend filter"""
-        if not self.enable_trend_filter:
-            return True
+    def trend_filter_masks(self, df: pd.DataFrame, atr: Optional[pd.Series] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-bar (long, short) trend filters; bars where the trend indicator is NaN pass"""
+        n = len(df)
+        if not self.enable_trend_filter or self.trend_mode not in ("VWAP", "EMA", "SuperTrend"):
+            allowed = np.ones(n, dtype=np.bool_)
+            return allowed, allowed
+        
+        if self.trend_mode == "SuperTrend":
+            _, direction = self.calculate_supertrend(df, self.calculate_atr(df) if atr is None else atr)
+            direction = direction.to_numpy()
+            unknown = np.isnan(direction)
+            return unknown | (direction == 1), unknown | (direction == -1)
         
         if self.trend_mode == "VWAP":
-            vwap = self.calculate_vwap(df)
-            if pd.isna(vwap.iloc[i]):
-                return True
-            if is_long:
-                return df['close'].iloc[i] > vwap.iloc[i]
-            else:
-                return df['close'].iloc[i] < vwap.iloc[i]
-        elif self.trend_mode == "EMA":
-            ema = self.calculate_ema(df, self.trend_ema_length)
-            if pd.isna(ema.iloc[i]):
-                return True
-            if is_long:
-                return df['close'].iloc[i] > ema.iloc[i]
-            else:
-                return df['close'].iloc[i] < ema.iloc[i]
-        elif self.trend_mode == "SuperTrend":
-            atr = self.calculate_atr(df)
-            supertrend, direction = self.calculate_supertrend(df, atr)
-            if pd.isna(direction.iloc[i]):
-                return True
-            if is_long:
-                return direction.iloc[i] == 1
-            else:
-                return direction.iloc[i] == -1
-        
-        return True
+            line = self.calculate_vwap(df).to_numpy(dtype=np.float64)
+        else:
+            line = self.calculate_ema(df, self.trend_ema_length).to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        unknown = np.isnan(line)
+        return unknown | (close > line), unknown | (close < line)
     
     def run_backtest(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Run backtest with ORB strategy"""
         df = df.copy()
         df.columns = df.columns.str.lower()
         
-        # Calculate indicators
+        # Precompute indicators, session levels and filter masks
         atr = self.calculate_atr(df)
-        
-        # Initialize
-        position = None
-        entry_price = None
-        entry_index = None
-        stop_loss = None
-        tp1 = None
-        tp2 = None
-        tp3 = None
-        orb_high = None
-        orb_low = None
-        orb_mid = None
-        session_start_idx = 0
-        bars_outside = 0
-        
-        trades = []
-        equity = 10000
-        initial_equity = equity
-        equity_curve = [equity]
-        max_equity = equity
-        
-        # Session detection (simplified - assume new session every day)
-        session_starts = []
-        current_date = None
-        for i, idx in enumerate(df.index):
-            if current_date is None or idx.date() != current_date:
-                session_starts.append(i)
-                current_date = idx.date()
-        
-        # Main loop
-        for i in range(max(self.atr_length, self.volume_ma_length if self.enable_volume_filter else 0) + self.orb_minutes, len(df)):
-            # Check for new session
-            if i in session_starts:
-                # Calculate ORB for new session
-                session_start_idx = i
-                orb_high, orb_low, orb_mid = self.calculate_orb_levels(df, session_start_idx)
-                bars_outside = 0
-                if position is not None:
-                    # Close position at session end (optional)
-                    pass
-            
-            # Skip if ORB not calculated
-            if orb_high is None or orb_low is None:
-                continue
-            
-            current_price = df['close'].iloc[i]
-            current_high = df['high'].iloc[i]
-            current_low = df['low'].iloc[i]
-            
-            # Track bars outside ORB (for entry condition)
-            # Reset when new session starts
-            if i > session_start_idx:
-                # Check if price is outside ORB range
-                if current_price > orb_high:
-                    bars_outside += 1
-                elif current_price < orb_low:
-                    bars_outside += 1
-                else:
-                    # Price back inside ORB - reset counter
-                    bars_outside = 0
-            
-            # LONG Entry: Breakout above ORB High
-            if position is None and orb_high is not None and i > session_start_idx:
-                breakout_buffer = orb_high * (self.breakout_buffer_pct / 100)
-                breakout_level = orb_high + breakout_buffer
-                
-                # Check if price crossed breakout level (close above breakout level)
-                prev_price = df['close'].iloc[i-1] if i > 0 else current_price
-                crossed_above = current_price > breakout_level
-                
-                # Also check if we've been outside ORB for minimum bars
-                if (crossed_above and 
-                    bars_outside >= self.min_bars_outside and
-                    self.check_volume_filter(df, i) and
-                    self.check_trend_filter(df, i, True)):
-                    
-                    entry_price = current_price * (1 + self.slippage)
-                    entry_index = i
-                    
-                    # Calculate stop loss and targets
-                    orb_range = orb_high - orb_low
-                    current_atr = atr.iloc[i] if not pd.isna(atr.iloc[i]) else orb_range * 0.5
-                    stop_loss = self.calculate_stop_loss(entry_price, orb_high, orb_low, orb_range, current_atr, True)
-                    tp1 = entry_price * (1 + self.tp1_pct / 100)
-                    tp2 = entry_price * (1 + self.tp2_pct / 100)
-                    tp3 = entry_price * (1 + self.tp3_pct / 100)
-                    
-                    position = 'LONG'
-                    bars_outside = 0
-            
-            # SHORT Entry: Breakout below ORB Low
-            elif position is None and orb_low is not None and i > session_start_idx:
-                breakout_buffer = orb_low * (self.breakout_buffer_pct / 100)
-                breakout_level = orb_low - breakout_buffer
-                
-                # Check if price crossed breakout level (close below breakout level)
-                prev_price = df['close'].iloc[i-1] if i > 0 else current_price
-                crossed_below = current_price < breakout_level
-                
-                # Also check if we've been outside ORB for minimum bars
-                if (crossed_below and 
-                    bars_outside >= self.min_bars_outside and
-                    self.check_volume_filter(df, i) and
-                    self.check_trend_filter(df, i, False)):
-                    
-                    entry_price = current_price * (1 - self.slippage)
-                    entry_index = i
-                    
-                    # Calculate stop loss and targets
-                    orb_range = orb_high - orb_low
-                    current_atr = atr.iloc[i] if not pd.isna(atr.iloc[i]) else orb_range * 0.5
-                    stop_loss = self.calculate_stop_loss(entry_price, orb_high, orb_low, orb_range, current_atr, False)
-                    tp1 = entry_price * (1 - self.tp1_pct / 100)
-                    tp2 = entry_price * (1 - self.tp2_pct / 100)
-                    tp3 = entry_price * (1 - self.tp3_pct / 100)
-                    
-                    position = 'SHORT'
-                    bars_outside = 0
-            
-            # Exit Logic - Check in priority order: SL first, then TP1, TP2, TP3
-            # Note: In real trading, we'd close position partially, but for backtest we close fully at first TP/SL
-            if position == 'LONG' and entry_price is not None:
-                exit_price = None
-                exit_reason = None
-                
-                # Check Stop Loss first (highest priority)
-                if current_low <= stop_loss:
-                    exit_price = stop_loss * (1 + self.slippage)
-                    exit_reason = 'SL'
-                # Check TP1 first (closest target)
-                elif current_high >= tp1:
-                    exit_price = tp1 * (1 - self.slippage)
-                    exit_reason = 'TP1'
-                # Check TP2 (if TP1 not hit)
-                elif current_high >= tp2:
-                    exit_price = tp2 * (1 - self.slippage)
-                    exit_reason = 'TP2'
-                # Check TP3 (if TP1 and TP2 not hit)
-                elif current_high >= tp3:
-                    exit_price = tp3 * (1 - self.slippage)
-                    exit_reason = 'TP3'
-                
-                if exit_price is not None:
-                    # Calculate P&L
-                    pnl_pct = ((exit_price - entry_price) / entry_price) * 100
-                    pnl = equity * (pnl_pct / 100) * self.leverage
-                    commission_cost = equity * self.commission * 2  # Entry + Exit
-                    net_pnl = pnl - commission_cost
-                    equity += net_pnl
-                    
-                    trades.append({
-                        'entry_time': df.index[entry_index],
-                        'exit_time': df.index[i],
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'position': position,
-                        'pnl_pct': pnl_pct,
-                        'pnl': net_pnl,
-                        'exit_reason': exit_reason
-                    })
-                    
-                    position = None
-                    entry_price = None
-                    entry_index = None
-                    stop_loss = None
-                    tp1 = None
-                    tp2 = None
-                    tp3 = None
-            
-            elif position == 'SHORT' and entry_price is not None:
-                exit_price = None
-                exit_reason = None
-                
-                # Check Stop Loss first (highest priority)
-                if current_high >= stop_loss:
-                    exit_price = stop_loss * (1 - self.slippage)
-                    exit_reason = 'SL'
-                # Check TP1 first (closest target)
-                elif current_low <= tp1:
-                    exit_price = tp1 * (1 + self.slippage)
-                    exit_reason = 'TP1'
-                # Check TP2 (if TP1 not hit)
-                elif current_low <= tp2:
-                    exit_price = tp2 * (1 + self.slippage)
-                    exit_reason = 'TP2'
-                # Check TP3 (if TP1 and TP2 not hit)
-                elif current_low <= tp3:
-                    exit_price = tp3 * (1 + self.slippage)
-                    exit_reason = 'TP3'
-                
-                if exit_price is not None:
-                    # Calculate P&L
-                    pnl_pct = ((entry_price - exit_price) / entry_price) * 100
-                    pnl = equity * (pnl_pct / 100) * self.leverage
-                    commission_cost = equity * self.commission * 2  # Entry + Exit
-                    net_pnl = pnl - commission_cost
-                    equity += net_pnl
-                    
-                    trades.append({
-                        'entry_time': df.index[entry_index],
-                        'exit_time': df.index[i],
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'position': position,
-                        'pnl_pct': pnl_pct,
-                        'pnl': net_pnl,
-                        'exit_reason': exit_reason
-                    })
-                    
-                    position = None
-                    entry_price = None
-                    entry_index = None
-                    stop_loss = None
-                    tp1 = None
-                    tp2 = None
-                    tp3 = None
-            
-            equity_curve.append(equity)
-            max_equity = max(max_equity, equity)
+        orb = self.calculate_orb_levels(df)
+        volume_ok = self.volume_filter_mask(df)
+        trend_long_ok, trend_short_ok = self.trend_filter_masks(df, atr)
+        stop_mode = STOP_MODES.index(self.stop_mode) if self.stop_mode in STOP_MODES else -1
+        start = max(self.atr_length, self.volume_ma_length if self.enable_volume_filter else 0) + self.orb_minutes
+        
+        trade_matrix, n_trades, equity_curve, n_equity = _backtest_kernel(
+            df['close'].to_numpy(dtype=np.float64),
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            atr.to_numpy(dtype=np.float64),
+            orb['session_start'].to_numpy(),
+            orb['orb_high'].to_numpy(),
+            orb['orb_low'].to_numpy(),
+            volume_ok,
+            trend_long_ok,
+            trend_short_ok,
+            int(start), float(self.breakout_buffer_pct), int(self.min_bars_outside),
+            float(self.tp1_pct), float(self.tp2_pct), float(self.tp3_pct), stop_mode,
+            float(self.atr_multiplier), float(self.max_stop_loss_pct), float(self.leverage),
+            float(self.commission), float(self.slippage)
+        )
+        equity_curve = equity_curve[:n_equity]
+        equity = equity_curve[-1]
+        initial_equity = equity_curve[0]
+        
+        index = df.index
+        trades = [{
+            'entry_time': index[int(row[0])],
+            'exit_time': index[int(row[1])],
+            'entry_price': row[3],
+            'exit_price': row[4],
+            'position': 'LONG' if row[2] > 0 else 'SHORT',
+            'pnl_pct': row[5],
+            'pnl': row[6],
+            'exit_reason': EXIT_REASONS[int(row[7])]
+        } for row in trade_matrix[:n_trades].tolist()]
         
         # Calculate metrics
         if not trades:
@@ -497,29 +501,31 @@ class ORBBreakoutStrategy:
                 'trades': []
             }
         
-        trades_df = pd.DataFrame(trades)
-        winning_trades = trades_df[trades_df['pnl'] > 0]
-        losing_trades = trades_df[trades_df['pnl'] < 0]
+        pnl = trade_matrix[:n_trades, 6]
+        pnl_pct = trade_matrix[:n_trades, 5]
+        wins = pnl > 0
+        losses = pnl < 0
+        n_wins = int(wins.sum())
+        n_losses = int(losses.sum())
         
         total_return_pct = ((equity - initial_equity) / initial_equity) * 100
         
-        win_rate = (len(winning_trades) / len(trades_df)) * 100 if len(trades_df) > 0 else 0
+        win_rate = (n_wins / n_trades) * 100
         
-        gross_profit = winning_trades['pnl'].sum() if len(winning_trades) > 0 else 0
-        gross_loss = abs(losing_trades['pnl'].sum()) if len(losing_trades) > 0 else 0.01
+        gross_profit = pnl[wins].sum() if n_wins > 0 else 0
+        gross_loss = abs(pnl[losses].sum()) if n_losses > 0 else 0.01
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
         
-        avg_win_pct = winning_trades['pnl_pct'].mean() if len(winning_trades) > 0 else 0
-        avg_loss_pct = losing_trades['pnl_pct'].mean() if len(losing_trades) > 0 else 0
+        avg_win_pct = pnl_pct[wins].mean() if n_wins > 0 else 0
+        avg_loss_pct = pnl_pct[losses].mean() if n_losses > 0 else 0
         
         # Calculate max drawdown
-        equity_series = pd.Series(equity_curve)
-        running_max = equity_series.expanding().max()
-        drawdown = (equity_series - running_max) / running_max * 100
+        running_max = np.maximum.accumulate(equity_curve)
+        drawdown = (equity_curve - running_max) / running_max * 100
         max_drawdown_pct = abs(drawdown.min()) if len(drawdown) > 0 else 0
         
         return {
-            'total_trades': len(trades_df),
+            'total_trades': n_trades,
             'win_rate': win_rate,
             'profit_factor': profit_factor,
             'total_return_pct': total_return_pct,
@@ -531,4 +537,3 @@ class ORBBreakoutStrategy:
             'final_equity': equity,
             'trades': trades
         }
-
@@ -6,10 +6,211 @@ Volensy - Regresyon Kanalları ve Volatilite Stratejisi
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple, Any
+from numba import jit
 import logging
 
 logger = logging.getLogger(__name__)
 
+EXIT_REASONS = ('sl', 'tp', 'end')
+
+
+@jit(nopython=True)
+def rolling_linreg(values: np.ndarray, length: int) -> np.ndarray:
+    """
+    Rolling least-squares line evaluated at the last bar (``ta.linreg(src, length, 0)``).
+    
+    Keeps running sums of y and x*y over the window (x = 0..length-1, so the
+    x sums are constants) and updates them in O(1) per bar. The sums are
+    rebuilt from scratch once per window length to stop rounding drift, which
+    keeps the total cost O(n). Windows containing NaN yield NaN.
+    
+    Args:
+        values: Input series
+        length: Regression period
+        
+    Returns:
+        Regression value per bar (NaN before the first full window)
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if length < 1 or n < length:
+        return out
+    
+    sum_x = length * (length - 1) / 2.0
+    sum_xx = (length - 1) * length * (2 * length - 1) / 6.0
+    denom = length * sum_xx - sum_x * sum_x
+    
+    sum_y = 0.0
+    sum_xy = 0.0
+    nans = 0
+    for t in range(length - 1, n):
+        start = t - length + 1
+        if start % length == 0:
+            # Rebuild the window sums
+            sum_y = 0.0
+            sum_xy = 0.0
+            nans = 0
+            for k in range(length):
+                y = values[start + k]
+                if np.isnan(y):
+                    nans += 1
+                else:
+                    sum_y += y
+                    sum_xy += k * y
+        else:
+            # Slide by one: every x drops by one, the oldest value leaves at x=0
+            old = values[start - 1]
+            new = values[t]
+            if np.isnan(old):
+                nans -= 1
+                old = 0.0
+            if np.isnan(new):
+                nans += 1
+                new = 0.0
+            sum_y -= old
+            sum_xy += (length - 1) * new - sum_y
+            sum_y += new
+        
+        if nans == 0:
+            if denom == 0:
+                out[t] = sum_y / length
+            else:
+                slope = (length * sum_xy - sum_x * sum_y) / denom
+                intercept = (sum_y - slope * sum_x) / length
+                out[t] = intercept + slope * (length - 1)
+    
+    return out
+
+
+@jit(nopython=True)
+def _backtest_kernel(close: np.ndarray, high: np.ndarray, low: np.ndarray, signal: np.ndarray,
+                     initial_capital: float, sl_pct: float, tp_pct: float, slippage: float):
+    """
+    Bar loop of ``RegressionChannelStrategy.run_backtest``.
+    
+    Returns:
+        Tuple of (trade matrix, number of trades, equity curve, final capital,
+        max drawdown %, winning trades, losing trades). Trade matrix columns:
+        entry bar, exit bar, entry price, exit price, side (+1/-1), pnl
+        fraction, pnl amount, exit reason (index into EXIT_REASONS).
+    """
+    n = len(close)
+    trades = np.empty((n + 1, 8))
+    equity_curve = np.empty(n)
+    n_trades = 0
+    
+    capital = initial_capital
+    max_equity = initial_capital
+    max_drawdown = 0.0
+    winning = 0
+    losing = 0
+    
+    position = 0
+    entry_price = 0.0
+    entry_bar = 0
+    stop_loss = 0.0
+    take_profit = 0.0
+    
+    for i in range(n):
+        current_price = close[i]
+        
+        # Check stop loss / take profit first (SL before TP)
+        exit_price = 0.0
+        reason = -1
+        if position == 1:
+            if low[i] <= stop_loss:
+                exit_price, reason = stop_loss, 0
+            elif high[i] >= take_profit:
+                exit_price, reason = take_profit, 1
+        elif position == -1:
+            if high[i] >= stop_loss:
+                exit_price, reason = stop_loss, 0
+            elif low[i] <= take_profit:
+                exit_price, reason = take_profit, 1
+        
+        if reason >= 0:
+            if position == 1:
+                pnl = (exit_price - entry_price) / entry_price
+            else:
+                pnl = (entry_price - exit_price) / entry_price
+            pnl_amount = capital * pnl
+            capital += pnl_amount
+            
+            trades[n_trades, 0] = entry_bar
+            trades[n_trades, 1] = i
+            trades[n_trades, 2] = entry_price
+            trades[n_trades, 3] = exit_price
+            trades[n_trades, 4] = position
+            trades[n_trades, 5] = pnl
+            trades[n_trades, 6] = pnl_amount
+            trades[n_trades, 7] = reason
+            n_trades += 1
+            
+            # Take profit always counts as a win
+            if reason == 1 or pnl > 0:
+                winning += 1
+            else:
+                losing += 1
+            position = 0
+        
+        # Process new signals
+        if position == 0 and signal[i] != 0:
+            if signal[i] == 1:
+                entry_price = current_price * (1 + slippage)
+                stop_loss = entry_price * (1 - sl_pct)
+                take_profit = entry_price * (1 + tp_pct)
+                position = 1
+            elif signal[i] == -1:
+                entry_price = current_price * (1 - slippage)
+                stop_loss = entry_price * (1 + sl_pct)
+                take_profit = entry_price * (1 - tp_pct)
+                position = -1
+            entry_bar = i
+        
+        # Update equity curve
+        if position == 1:
+            equity = capital * (1 + (current_price - entry_price) / entry_price)
+        elif position == -1:
+            equity = capital * (1 + (entry_price - current_price) / entry_price)
+        else:
+            equity = capital
+        equity_curve[i] = equity
+        
+        # Update max drawdown
+        if equity > max_equity:
+            max_equity = equity
+        drawdown = (max_equity - equity) / max_equity * 100
+        if drawdown > max_drawdown:
+            max_drawdown = drawdown
+    
+    # Close any open position at the end
+    if position != 0 and n > 0:
+        if position == 1:
+            exit_price = close[n - 1] * (1 - slippage)
+            pnl = (exit_price - entry_price) / entry_price
+        else:
+            exit_price = close[n - 1] * (1 + slippage)
+            pnl = (entry_price - exit_price) / entry_price
+        pnl_amount = capital * pnl
+        capital += pnl_amount
+        
+        trades[n_trades, 0] = entry_bar
+        trades[n_trades, 1] = n - 1
+        trades[n_trades, 2] = entry_price
+        trades[n_trades, 3] = exit_price
+        trades[n_trades, 4] = position
+        trades[n_trades, 5] = pnl
+        trades[n_trades, 6] = pnl_amount
+        trades[n_trades, 7] = 2
+        n_trades += 1
+        
+        if pnl > 0:
+            winning += 1
+        else:
+            losing += 1
+    
+    return trades, n_trades, equity_curve, capital, max_drawdown, winning, losing
+
 
 class RegressionChannelStrategy:
     """Regression Channel Strategy with Volatility Oscillator"""
@@ -53,20 +254,9 @@ class RegressionChannelStrategy:
         # Regression line (linear regression) - Pine Script ta.linreg equivalent
         # ta.linreg(src, length, offset) calculates linear regression at offset
         # For offset=0, it's the value at the current bar
-        def calc_regression(series):
-            if len(series) < self.reg_len:
-                return np.nan
-            x = np.arange(len(series))
-            y = series.values
-            # Linear regression: y = ax + b
-            coeffs = np.polyfit(x, y, 1)
-            # Value at the last point (offset=0 in Pine Script)
-            return coeffs[0] * (len(series) - 1) + coeffs[1]
-        
-        # Use rolling apply for regression
-        result['regression_line'] = result['close'].rolling(
-            window=self.reg_len, min_periods=self.reg_len
-        ).apply(calc_regression, raw=False)
+        result['regression_line'] = rolling_linreg(
+            result['close'].to_numpy(dtype=np.float64), int(self.reg_len)
+        )
         
         # StdDev
         result['reg_dev'] = result['close'].rolling(
@@ -115,52 +305,37 @@ class RegressionChannelStrategy:
         result = self.calculate_regression_channel(result)
         result = self.calculate_volatility_oscillator(result)
         
-        # Initialize signal columns
-        result['signal'] = 0  # 0: no signal, 1: long, -1: short
-        result['buy_cond'] = False
-        result['sell_cond'] = False
+        close = result['close'].to_numpy(dtype=np.float64)
+        k = result['k'].to_numpy(dtype=np.float64)
+        d = result['d'].to_numpy(dtype=np.float64)
+        sma = result['sma'].to_numpy(dtype=np.float64)
+        k_prev = np.roll(k, 1)
+        d_prev = np.roll(d, 1)
         
         # Check if we have enough data
         min_periods = max(self.reg_len, self.stoch_len, self.sma_len)
+        valid = np.arange(len(result)) >= min_periods
         
-        for i in range(min_periods, len(result)):
-            # Current values
-            close = result['close'].iloc[i]
-            upper_outer = result['upper_outer'].iloc[i]
-            lower_outer = result['lower_outer'].iloc[i]
-            k = result['k'].iloc[i]
-            d = result['d'].iloc[i]
-            k_prev = result['k'].iloc[i-1] if i > 0 else k
-            d_prev = result['d'].iloc[i-1] if i > 0 else d
-            sma = result['sma'].iloc[i]
-            
-            # Previous values for crossover detection
-            close_prev = result['close'].iloc[i-1] if i > 0 else close
-            
-            # 1) Check if price is in extreme zone
-            in_extreme_low = close <= lower_outer
-            in_extreme_high = close >= upper_outer
-            
-            # 2) Trend filter (for crypto, usually disabled)
-            bull_trend = not self.use_trend_filter or close > sma
-            bear_trend = not self.use_trend_filter or close < sma
-            
-            # 3) Volatility oscillator signals (crypto mode: K and D crossover)
-            # Crypto: K crosses D, with level filter
-            vol_buy = k < self.os_level and k_prev <= d_prev and k > d  # K crosses above D from oversold
-            vol_sell = k > self.ob_level and k_prev >= d_prev and k < d  # K crosses below D from overbought
-            
-            # 4) Final buy/sell conditions
-            buy_cond = in_extreme_low and bull_trend and vol_buy
-            sell_cond = in_extreme_high and bear_trend and vol_sell
-            
-            result.loc[result.index[i], 'buy_cond'] = buy_cond
-            result.loc[result.index[i], 'sell_cond'] = sell_cond
-            
-            if buy_cond:
-                result.loc[result.index[i], 'signal'] = 1
-            elif sell_cond:
-                result.loc[result.index[i], 'signal'] = -1
+        # 1) Check if price is in extreme zone
+        in_extreme_low = close <= result['lower_outer'].to_numpy(dtype=np.float64)
+        in_extreme_high = close >= result['upper_outer'].to_numpy(dtype=np.float64)
+        
+        # 2) Trend filter (for crypto, usually disabled)
+        bull_trend = (not self.use_trend_filter) | (close > sma)
+        bear_trend = (not self.use_trend_filter) | (close < sma)
+        
+        # 3) Volatility oscillator signals (crypto mode: K and D crossover)
+        # Crypto: K crosses D, with level filter
+        vol_buy = (k < self.os_level) & (k_prev <= d_prev) & (k > d)  # K crosses above D from oversold
+        vol_sell = (k > self.ob_level) & (k_prev >= d_prev) & (k < d)  # K crosses below D from overbought
+        
+        # 4) Final buy/sell conditions
+        buy_cond = valid & in_extreme_low & bull_trend & vol_buy
+        sell_cond = valid & in_extreme_high & bear_trend & vol_sell
+        
+        result['signal'] = np.where(buy_cond, 1, np.where(sell_cond, -1, 0))  # 0: no signal, 1: long, -1: short
+        result['buy_cond'] = buy_cond
+        result['sell_cond'] = sell_cond
         
         return result
     
@@ -181,232 +356,27 @@ class RegressionChannelStrategy:
         # Generate signals
         df_signals = self.generate_signals(df)
         
-        # Initialize backtest state
-        capital = 100000.0
-        initial_capital = capital
-        position = None  # None, 'long', or 'short'
-        entry_price = 0.0
-        entry_time = None
-        stop_loss = 0.0
-        take_profit = 0.0
-        
-        trades = []
-        equity_curve = []
-        max_equity = initial_capital
-        max_drawdown = 0.0
-        
-        winning_trades = 0
-        losing_trades = 0
-        total_pnl = 0.0
-        
-        # Process each bar
-        for i, (timestamp, row) in enumerate(df_signals.iterrows()):
-            current_price = row['close']
-            high = row['high']
-            low = row['low']
-            signal = row['signal']
-            
-            # Check stop loss / take profit first
-            if position == 'long':
-                # Check SL
-                if low <= stop_loss:
-                    exit_price = stop_loss
-                    pnl = (exit_price - entry_price) / entry_price
-                    pnl_amount = capital * pnl
-                    capital += pnl_amount
-                    total_pnl += pnl_amount
-                    
-                    trades.append({
-                        'entry_time': entry_time,
-                        'exit_time': timestamp,
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'side': 'long',
-                        'pnl_pct': pnl * 100,
-                        'pnl_amount': pnl_amount,
-                        'exit_reason': 'sl'
-                    })
-                    
-                    if pnl > 0:
-                        winning_trades += 1
-                    else:
-                        losing_trades += 1
-                    
-                    position = None
-                # Check TP
-                elif high >= take_profit:
-                    exit_price = take_profit
-                    pnl = (exit_price - entry_price) / entry_price
-                    pnl_amount = capital * pnl
-                    capital += pnl_amount
-                    total_pnl += pnl_amount
-                    
-                    trades.append({
-                        'entry_time': entry_time,
-                        'exit_time': timestamp,
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'side': 'long',
-                        'pnl_pct': pnl * 100,
-                        'pnl_amount': pnl_amount,
-                        'exit_reason': 'tp'
-                    })
-                    
-                    winning_trades += 1
-                    position = None
-                    
-            elif position == 'short':
-                # Check SL
-                if high >= stop_loss:
-                    exit_price = stop_loss
-                    pnl = (entry_price - exit_price) / entry_price
-                    pnl_amount = capital * pnl
-                    capital += pnl_amount
-                    total_pnl += pnl_amount
-                    
-                    trades.append({
-                        'entry_time': entry_time,
-                        'exit_time': timestamp,
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'side': 'short',
-                        'pnl_pct': pnl * 100,
-                        'pnl_amount': pnl_amount,
-                        'exit_reason': 'sl'
-                    })
-                    
-                    if pnl > 0:
-                        winning_trades += 1
-                    else:
-                        losing_trades += 1
-                    
-                    position = None
-                # Check TP
-                elif low <= take_profit:
-                    exit_price = take_profit
-                    pnl = (entry_price - exit_price) / entry_price
-                    pnl_amount = capital * pnl
-                    capital += pnl_amount
-                    total_pnl += pnl_amount
-                    
-                    trades.append({
-                        'entry_time': entry_time,
-                        'exit_time': timestamp,
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'side': 'short',
-                        'pnl_pct': pnl * 100,
-                        'pnl_amount': pnl_amount,
-                        'exit_reason': 'tp'
-                    })
-                    
-                    winning_trades += 1
-                    position = None
-            
-            # Process new signals
-            if position is None and signal != 0:
-                if signal == 1:  # Buy signal
-                    # Close short if exists
-                    if position == 'short':
-                        exit_price = current_price * (1 - slippage)
-                        pnl = (entry_price - exit_price) / entry_price
-                        pnl_amount = capital * pnl
-                        capital += pnl_amount
-                        total_pnl += pnl_amount
-                        
-                        trades.append({
-                            'entry_time': entry_time,
-                            'exit_time': timestamp,
-                            'entry_price': entry_price,
-                            'exit_price': exit_price,
-                            'side': 'short',
-                            'pnl_pct': pnl * 100,
-                            'pnl_amount': pnl_amount,
-                            'exit_reason': 'signal'
-                        })
-                    
-                    # Open long
-                    entry_price = current_price * (1 + slippage)
-                    entry_time = timestamp
-                    stop_loss = entry_price * (1 - self.sl_pct)
-                    take_profit = entry_price * (1 + self.tp_pct)
-                    position = 'long'
-                    
-                elif signal == -1:  # Sell signal
-                    # Close long if exists
-                    if position == 'long':
-                        exit_price = current_price * (1 - slippage)
-                        pnl = (exit_price - entry_price) / entry_price
-                        pnl_amount = capital * pnl
-                        capital += pnl_amount
-                        total_pnl += pnl_amount
-                        
-                        trades.append({
-                            'entry_time': entry_time,
-                            'exit_time': timestamp,
-                            'entry_price': entry_price,
-                            'exit_price': exit_price,
-                            'side': 'long',
-                            'pnl_pct': pnl * 100,
-                            'pnl_amount': pnl_amount,
-                            'exit_reason': 'signal'
-                        })
-                    
-                    # Open short
-                    entry_price = current_price * (1 - slippage)
-                    entry_time = timestamp
-                    stop_loss = entry_price * (1 + self.sl_pct)
-                    take_profit = entry_price * (1 - self.tp_pct)
-                    position = 'short'
-            
-            # Update equity curve
-            if position == 'long':
-                unrealized_pnl = (current_price - entry_price) / entry_price
-                equity = capital * (1 + unrealized_pnl)
-            elif position == 'short':
-                unrealized_pnl = (entry_price - current_price) / entry_price
-                equity = capital * (1 + unrealized_pnl)
-            else:
-                equity = capital
-            
-            equity_curve.append(equity)
-            
-            # Update max drawdown
-            if equity > max_equity:
-                max_equity = equity
-            drawdown = (max_equity - equity) / max_equity * 100
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
-        
-        # Close any open position at the end
-        if position is not None:
-            final_price = df_signals['close'].iloc[-1]
-            if position == 'long':
-                exit_price = final_price * (1 - slippage)
-                pnl = (exit_price - entry_price) / entry_price
-            else:
-                exit_price = final_price * (1 + slippage)
-                pnl = (entry_price - exit_price) / entry_price
-            
-            pnl_amount = capital * pnl
-            capital += pnl_amount
-            total_pnl += pnl_amount
-            
-            trades.append({
-                'entry_time': entry_time,
-                'exit_time': df_signals.index[-1],
-                'entry_price': entry_price,
-                'exit_price': exit_price,
-                'side': position,
-                'pnl_pct': pnl * 100,
-                'pnl_amount': pnl_amount,
-                'exit_reason': 'end'
-            })
-            
-            if pnl > 0:
-                winning_trades += 1
-            else:
-                losing_trades += 1
+        initial_capital = 100000.0
+        
+        trade_matrix, n_trades, equity_curve, capital, max_drawdown, winning_trades, losing_trades = _backtest_kernel(
+            df_signals['close'].to_numpy(dtype=np.float64),
+            df_signals['high'].to_numpy(dtype=np.float64),
+            df_signals['low'].to_numpy(dtype=np.float64),
+            df_signals['signal'].to_numpy(dtype=np.int64),
+            initial_capital, float(self.sl_pct), float(self.tp_pct), float(slippage)
+        )
+        
+        index = df_signals.index
+        trades = [{
+            'entry_time': index[int(row[0])],
+            'exit_time': index[int(row[1])],
+            'entry_price': row[2],
+            'exit_price': row[3],
+            'side': 'long' if row[4] > 0 else 'short',
+            'pnl_pct': row[5] * 100,
+            'pnl_amount': row[6],
+            'exit_reason': EXIT_REASONS[int(row[7])]
+        } for row in trade_matrix[:n_trades].tolist()]
         
         # Calculate metrics
         total_trades = len(trades)
@@ -435,6 +405,6 @@ class RegressionChannelStrategy:
             'avg_loss_pct': avg_loss / initial_capital * 100 if losing_trades > 0 else 0,
             'final_capital': capital,
             'trades': trades,
-            'equity_curve': equity_curve
+            'equity_curve': equity_curve.tolist()
         }
 
@@ -5,11 +5,301 @@ TWMA (Time Weighted Moving Average) Trend Strategy - Python Implementation
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, List, Optional, Tuple, Any
+from numba import jit
 import logging
 
 logger = logging.getLogger(__name__)
 
+EXIT_REASONS = ('sl', 'tp', 'end')
+
+
+def rolling_twma(values: np.ndarray, length: int) -> np.ndarray:
+    """
+    Time Weighted Moving Average as one linear-weight convolution.
+    
+    The newest value has weight ``length`` and the oldest weight 1. Bars
+    before the first full window are NaN and NaN inputs propagate to
+    every window containing them.
+    
+    Args:
+        values: Input series
+        length: TWMA period
+        
+    Returns:
+        TWMA per bar
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if length < 1 or len(values) < length:
+        return out
+    
+    weights = np.arange(length, 0, -1, dtype=np.float64)
+    out[length - 1:] = np.convolve(values, weights, mode='valid') / weights.sum()
+    return out
+
+
+def pivot_high_low(high: np.ndarray, low: np.ndarray, pivot_len: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pivot highs and lows from sliding-window maxima and minima.
+    
+    A bar is a pivot high when its high is strictly above every high in
+    the ``pivot_len`` bars on each side (pivot low: strictly below every
+    low). The pivot is reported on the pivot bar itself, so it uses the
+    following ``pivot_len`` bars.
+    
+    Args:
+        high: High prices
+        low: Low prices
+        pivot_len: Bars on each side
+        
+    Returns:
+        Tuple of (pivot_high, pivot_low) arrays with NaN where there is no pivot
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    n = len(high)
+    pivot_high = np.full(n, np.nan)
+    pivot_low = np.full(n, np.nan)
+    if n < 2 * pivot_len + 1:
+        return pivot_high, pivot_low
+    
+    centre = slice(pivot_len, n - pivot_len)
+    if pivot_len < 1:
+        pivot_high[centre] = high[centre]
+        pivot_low[centre] = low[centre]
+        return pivot_high, pivot_low
+    
+    # Window k covers bars k..k+pivot_len-1; NaN neighbours are ignored
+    high_max = np.fmax.reduce(sliding_window_view(high, pivot_len), axis=1)
+    low_min = np.fmin.reduce(sliding_window_view(low, pivot_len), axis=1)
+    left, right = slice(0, n - 2 * pivot_len), slice(pivot_len + 1, n - pivot_len + 1)
+    
+    is_high = ~(high_max[left] >= high[centre]) & ~(high_max[right] >= high[centre])
+    is_low = ~(low_min[left] <= low[centre]) & ~(low_min[right] <= low[centre])
+    pivot_high[centre] = np.where(is_high, high[centre], np.nan)
+    pivot_low[centre] = np.where(is_low, low[centre], np.nan)
+    return pivot_high, pivot_low
+
+
+@jit(nopython=True)
+def _backtest_kernel(close: np.ndarray, high: np.ndarray, low: np.ndarray, twma_values: np.ndarray,
+                     atr: np.ndarray, pivot_high: np.ndarray, pivot_low: np.ndarray,
+                     long_ok: np.ndarray, short_ok: np.ndarray, sl_atr_mult: float,
+                     tp_atr_mult: float, leverage: float, commission: float, slippage: float,
+                     max_sl_move: float):
+    """
+    Bar loop shared by the TWMA strategies.
+    
+    Entries need a setup bar two bars ago and a TWMA touch on the previous
+    bar, then pass ``long_ok``/``short_ok`` (entry filters). ``max_sl_move``
+    caps the stop distance as a fraction of the entry price (0 = no cap).
+    
+    Returns:
+        Tuple of (trade matrix, number of trades, equity curve, final equity,
+        entry signals, filtered signals). Trade matrix columns: entry bar,
+        exit bar, side (+1/-1), entry price, exit price, pnl %, exit reason
+        (index into EXIT_REASONS).
+    """
+    n = len(close)
+    trades = np.empty((n + 1, 7))
+    equity_curve = np.empty(max(n, 1))
+    n_trades = 0
+    
+    equity = 100000.0
+    equity_curve[0] = equity
+    
+    has_swing_high = False
+    has_swing_low = False
+    last_swing_high = 0.0
+    last_swing_low = 0.0
+    
+    position = 0
+    entry_price = 0.0
+    stop_loss = 0.0
+    take_profit = 0.0
+    
+    total_signals = 0
+    filtered_signals = 0
+    
+    for i in range(1, n):
+        if np.isnan(twma_values[i]) or np.isnan(twma_values[i - 1]) or np.isnan(atr[i]):
+            equity_curve[i] = equity
+            continue
+        
+        # Update last swing high/low
+        if not np.isnan(pivot_high[i]):
+            has_swing_high = True
+            last_swing_high = pivot_high[i]
+        if not np.isnan(pivot_low[i]):
+            has_swing_low = True
+            last_swing_low = pivot_low[i]
+        
+        prev_twma = twma_values[i - 1]
+        
+        # Entry conditions - Pine: longEntryCond = setupLongBar[1] and touchLongNow[1] and noPos
+        # This means: setup bar was 2 bars ago, touch was 1 bar ago, entry is now
+        long_entry_cond = False
+        short_entry_cond = False
+        if i >= 3 and position == 0:
+            setup_twma = twma_values[i - 2]
+            setup_twma_prev = twma_values[i - 3]
+            prev_setup_long = close[i - 2] > setup_twma and setup_twma > setup_twma_prev
+            prev_setup_short = close[i - 2] < setup_twma and setup_twma < setup_twma_prev
+            
+            prev_touch_long = low[i - 1] <= prev_twma and close[i - 1] >= prev_twma
+            prev_touch_short = high[i - 1] >= prev_twma and close[i - 1] <= prev_twma
+            
+            if prev_setup_long and prev_touch_long:
+                total_signals += 1
+                if long_ok[i]:
+                    long_entry_cond = True
+                else:
+                    filtered_signals += 1
+            if prev_setup_short and prev_touch_short:
+                total_signals += 1
+                if short_ok[i]:
+                    short_entry_cond = True
+                else:
+                    filtered_signals += 1
+        
+        if long_entry_cond or short_entry_cond:
+            prev_atr_val = atr[i - 1] if not np.isnan(atr[i - 1]) else atr[i]
+            if long_entry_cond:
+                position = 1
+                sl_price = prev_twma - sl_atr_mult * prev_atr_val
+                tp_base = last_swing_high if has_swing_high else prev_twma
+                take_profit = tp_base + tp_atr_mult * prev_atr_val
+                entry_price = close[i] * (1 + slippage)
+                stop_loss = max(sl_price, entry_price * (1 - max_sl_move)) if max_sl_move > 0 else sl_price
+            else:
+                position = -1
+                sl_price = prev_twma + sl_atr_mult * prev_atr_val
+                tp_base = last_swing_low if has_swing_low else prev_twma
+                take_profit = tp_base - tp_atr_mult * prev_atr_val
+                entry_price = close[i] * (1 - slippage)
+                stop_loss = min(sl_price, entry_price * (1 + max_sl_move)) if max_sl_move > 0 else sl_price
+            
+            # Commission on 10% of equity with leverage
+            position_value = equity * 0.10 * leverage
+            equity -= position_value * commission
+        
+        # Check exit conditions
+        exit_price = 0.0
+        reason = -1
+        if position == 1:
+            if low[i] <= stop_loss:
+                exit_price, reason = stop_loss * (1 - slippage), 0
+            elif high[i] >= take_profit:
+                exit_price, reason = take_profit * (1 + slippage), 1
+        elif position == -1:
+            if high[i] >= stop_loss:
+                exit_price, reason = stop_loss * (1 + slippage), 0
+            elif low[i] <= take_profit:
+                exit_price, reason = take_profit * (1 - slippage), 1
+        
+        if reason >= 0:
+            if position == 1:
+                pnl_pct = ((exit_price - entry_price) / entry_price) * 100 * leverage
+            else:
+                pnl_pct = ((entry_price - exit_price) / entry_price) * 100 * leverage
+            equity += equity * 0.10 * (pnl_pct / 100)
+            equity -= equity * 0.10 * commission
+            
+            trades[n_trades, 0] = i - 1
+            trades[n_trades, 1] = i
+            trades[n_trades, 2] = position
+            trades[n_trades, 3] = entry_price
+            trades[n_trades, 4] = exit_price
+            trades[n_trades, 5] = pnl_pct
+            trades[n_trades, 6] = reason
+            n_trades += 1
+            position = 0
+        
+        equity_curve[i] = equity
+    
+    # Close any open position at the end
+    if position != 0:
+        exit_price = close[n - 1]
+        if position == 1:
+            pnl_pct = ((exit_price - entry_price) / entry_price) * 100 * leverage
+        else:
+            pnl_pct = ((entry_price - exit_price) / entry_price) * 100 * leverage
+        equity += equity * 0.10 * (pnl_pct / 100)
+        equity -= equity * 0.10 * commission
+        
+        trades[n_trades, 0] = max(n - 2, 0)
+        trades[n_trades, 1] = n - 1
+        trades[n_trades, 2] = position
+        trades[n_trades, 3] = entry_price
+        trades[n_trades, 4] = exit_price
+        trades[n_trades, 5] = pnl_pct
+        trades[n_trades, 6] = 2
+        n_trades += 1
+    
+    return trades, n_trades, equity_curve, equity, total_signals, filtered_signals
+
+
+def run_twma_backtest(df: pd.DataFrame, twma_values: np.ndarray, atr: np.ndarray,
+                      pivot_high: np.ndarray, pivot_low: np.ndarray, params: Dict[str, float],
+                      long_ok: Optional[np.ndarray] = None, short_ok: Optional[np.ndarray] = None,
+                      max_sl_move: float = 0.0) -> Dict[str, Any]:
+    """
+    Run the compiled TWMA bar loop and convert its output to trades.
+    
+    Args:
+        df: DataFrame with OHLCV data
+        twma_values, atr, pivot_high, pivot_low: Indicator arrays
+        params: sl_atr_mult, tp_atr_mult, leverage, commission and slippage
+        long_ok, short_ok: Entry filter masks (all entries allowed if omitted)
+        max_sl_move: Maximum stop distance as a fraction of the entry price
+        
+    Returns:
+        Dictionary with trades, equity curve, final equity and signal counts
+    """
+    n = len(df)
+    allowed = np.ones(n, dtype=np.bool_)
+    trade_matrix, n_trades, equity_curve, equity, total_signals, filtered_signals = _backtest_kernel(
+        df['close'].to_numpy(dtype=np.float64),
+        df['high'].to_numpy(dtype=np.float64),
+        df['low'].to_numpy(dtype=np.float64),
+        np.asarray(twma_values, dtype=np.float64),
+        np.asarray(atr, dtype=np.float64),
+        np.asarray(pivot_high, dtype=np.float64),
+        np.asarray(pivot_low, dtype=np.float64),
+        allowed if long_ok is None else np.asarray(long_ok, dtype=np.bool_),
+        allowed if short_ok is None else np.asarray(short_ok, dtype=np.bool_),
+        float(params['sl_atr_mult']), float(params['tp_atr_mult']), float(params['leverage']),
+        float(params['commission']), float(params['slippage']), float(max_sl_move)
+    )
+    
+    index = df.index
+    trades = [{
+        'entry_time': index[int(row[0])],
+        'exit_time': index[int(row[1])],
+        'side': 'long' if row[2] > 0 else 'short',
+        'entry_price': row[3],
+        'exit_price': row[4],
+        'pnl_pct': row[5],
+        'exit_reason': EXIT_REASONS[int(row[6])]
+    } for row in trade_matrix[:n_trades].tolist()]
+    
+    return {
+        'trades': trades,
+        'equity_curve': equity_curve,
+        'final_equity': equity,
+        'total_signals': total_signals,
+        'filtered_signals': filtered_signals,
+    }
+
+
+def max_drawdown_pct(equity_curve: np.ndarray) -> float:
+    """Maximum drawdown of an equity curve in percent (positive number)."""
+    running_max = np.maximum.accumulate(equity_curve)
+    drawdown = (equity_curve - running_max) / running_max * 100
+    return abs(drawdown.min()) if len(drawdown) > 0 else 0.0
+
 
 class TWMATrendStrategy:
     """TWMA Trend Strategy - 4H Zaman Ağırlıklı Trend Stratejisi"""
@@ -41,6 +331,16 @@ class TWMATrendStrategy:
         self.commission = params.get('commission', 0.0005)
         self.slippage = params.get('slippage', 0.0002)
     
+    def _trade_params(self) -> Dict[str, float]:
+        """Parameters of the compiled bar loop."""
+        return {
+            'sl_atr_mult': self.sl_atr_mult,
+            'tp_atr_mult': self.tp_atr_mult,
+            'leverage': self.leverage,
+            'commission': self.commission,
+            'slippage': self.slippage,
+        }
+    
     def calculate_twma(self, src: pd.Series, length: int) -> pd.Series:
         """
         Calculate Time Weighted Moving Average (TWMA)
@@ -48,24 +348,7 @@ class TWMATrendStrategy:
         TWMA formula: weighted average where recent values have higher weight
         weight = (length - i) for i in range(length)
         """
-        twma = pd.Series(index=src.index, dtype=float)
-        
-        for i in range(len(src)):
-            if i < length - 1:
-                twma.iloc[i] = np.nan
-                continue
-            
-            num = 0.0
-            den = 0.0
-            
-            for j in range(length):
-                w = length - j
-                num += src.iloc[i - j] * w
-                den += w
-            
-            twma.iloc[i] = num / den if den > 0 else np.nan
-        
-        return twma
+        return pd.Series(rolling_twma(src.to_numpy(dtype=np.float64), length), index=src.index)
     
     def calculate_atr(self, df: pd.DataFrame) -> pd.Series:
         """Calculate Average True Range"""
@@ -83,31 +366,9 @@ class TWMATrendStrategy:
         Pivot High: high is higher than 'pivot_len' bars on left and right
         Pivot Low: low is lower than 'pivot_len' bars on left and right
         """
-        pivot_high = pd.Series(index=df.index, dtype=float)
-        pivot_low = pd.Series(index=df.index, dtype=float)
-        
-        for i in range(self.pivot_len, len(df) - self.pivot_len):
-            # Check pivot high
-            high_val = df['high'].iloc[i]
-            is_pivot_high = True
-            for j in range(1, self.pivot_len + 1):
-                if df['high'].iloc[i - j] >= high_val or df['high'].iloc[i + j] >= high_val:
-                    is_pivot_high = False
-                    break
-            if is_pivot_high:
-                pivot_high.iloc[i] = high_val
-            
-            # Check pivot low
-            low_val = df['low'].iloc[i]
-            is_pivot_low = True
-            for j in range(1, self.pivot_len + 1):
-                if df['low'].iloc[i - j] <= low_val or df['low'].iloc[i + j] <= low_val:
-                    is_pivot_low = False
-                    break
-            if is_pivot_low:
-                pivot_low.iloc[i] = low_val
-        
-        return pivot_high, pivot_low
+        pivot_high, pivot_low = pivot_high_low(df['high'].to_numpy(dtype=np.float64),
+                                               df['low'].to_numpy(dtype=np.float64), self.pivot_len)
+        return pd.Series(pivot_high, index=df.index), pd.Series(pivot_low, index=df.index)
     
     def run_backtest(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -124,261 +385,10 @@ class TWMATrendStrategy:
         atr = self.calculate_atr(df)
         pivot_high, pivot_low = self.calculate_pivot_high_low(df)
         
-        # Track last swing high/low
-        last_swing_high = None
-        last_swing_low = None
-        
-        # Track position
-        position = None  # 'long', 'short', or None
-        entry_price = None
-        stop_loss = None
-        take_profit = None
-        
-        # Track trades
-        trades = []
-        equity = 100000.0  # Initial capital
-        equity_curve = [equity]
-        
-        # Track state
-        long_sl = None
-        long_tp = None
-        short_sl = None
-        short_tp = None
-        
-        for i in range(1, len(df)):
-            if pd.isna(twma.iloc[i]) or pd.isna(twma.iloc[i-1]) or pd.isna(atr.iloc[i]):
-                equity_curve.append(equity)
-                continue
-            
-            # Update last swing high/low
-            if not pd.isna(pivot_high.iloc[i]):
-                last_swing_high = pivot_high.iloc[i]
-            if not pd.isna(pivot_low.iloc[i]):
-                last_swing_low = pivot_low.iloc[i]
-            
-            # TWMA direction
-            twma_up = twma.iloc[i] > twma.iloc[i-1]
-            twma_down = twma.iloc[i] < twma.iloc[i-1]
-            
-            # Current bar values
-            curr_close = df['close'].iloc[i]
-            curr_high = df['high'].iloc[i]
-            curr_low = df['low'].iloc[i]
-            curr_twma = twma.iloc[i]
-            curr_atr = atr.iloc[i]
-            
-            # Previous bar values
-            prev_close = df['close'].iloc[i-1]
-            prev_low = df['low'].iloc[i-1]
-            prev_high = df['high'].iloc[i-1]
-            prev_twma = twma.iloc[i-1]
-            
-            # Entry conditions - Pine: longEntryCond = setupLongBar[1] and touchLongNow[1] and noPos
-            # This means: setup bar was 2 bars ago, touch was 1 bar ago, entry is now
-            no_pos = position is None
-            
-            # Check if setup was 2 bars ago and touch was 1 bar ago
-            if i >= 3:
-                # Setup bar (2 bars ago): close > twma and twmaUp
-                setup_bar_close = df['close'].iloc[i-2]
-                setup_bar_twma = twma.iloc[i-2]
-                setup_bar_twma_prev = twma.iloc[i-3]
-                setup_twma_up = setup_bar_twma > setup_bar_twma_prev
-                
-                prev_setup_long = setup_bar_close > setup_bar_twma and setup_twma_up
-                prev_setup_short = setup_bar_close < setup_bar_twma and (setup_bar_twma < setup_bar_twma_prev)
-                
-                # Touch bar (1 bar ago): low <= twma and close >= twma (for long)
-                prev_touch_long = prev_low <= prev_twma and prev_close >= prev_twma
-                prev_touch_short = prev_high >= prev_twma and prev_close <= prev_twma
-                
-                long_entry_cond = prev_setup_long and prev_touch_long and no_pos
-                short_entry_cond = prev_setup_short and prev_touch_short and no_pos
-            else:
-                long_entry_cond = False
-                short_entry_cond = False
-            
-            # LONG ENTRY
-            if long_entry_cond:
-                base_twma = prev_twma
-                prev_atr_val = atr.iloc[i-1] if not pd.isna(atr.iloc[i-1]) else atr.iloc[i]
-                sl_price = base_twma - self.sl_atr_mult * prev_atr_val if not pd.isna(prev_atr_val) else base_twma * 0.98
-                tp_base = last_swing_high if last_swing_high is not None else base_twma
-                tp_price = tp_base + self.tp_atr_mult * prev_atr_val if not pd.isna(prev_atr_val) else base_twma * 1.02
-                
-                long_sl = sl_price
-                long_tp = tp_price
-                
-                # Enter long position
-                position = 'long'
-                entry_price = curr_close * (1 + self.slippage)  # Apply slippage
-                stop_loss = long_sl
-                take_profit = long_tp
-                
-                # Calculate position size (10% of equity with leverage)
-                position_value = equity * 0.10 * self.leverage
-                quantity = position_value / entry_price
-                
-                # Apply commission
-                commission_cost = position_value * self.commission
-                equity -= commission_cost
-            
-            # SHORT ENTRY
-            elif short_entry_cond:
-                base_twma_s = prev_twma
-                prev_atr_val_s = atr.iloc[i-1] if not pd.isna(atr.iloc[i-1]) else atr.iloc[i]
-                sl_price_s = base_twma_s + self.sl_atr_mult * prev_atr_val_s if not pd.isna(prev_atr_val_s) else base_twma_s * 1.02
-                tp_base_s = last_swing_low if last_swing_low is not None else base_twma_s
-                tp_price_s = tp_base_s - self.tp_atr_mult * prev_atr_val_s if not pd.isna(prev_atr_val_s) else base_twma_s * 0.98
-                
-                short_sl = sl_price_s
-                short_tp = tp_price_s
-                
-                # Enter short position
-                position = 'short'
-                entry_price = curr_close * (1 - self.slippage)  # Apply slippage
-                stop_loss = short_sl
-                take_profit = short_tp
-                
-                # Calculate position size (10% of equity with leverage)
-                position_value = equity * 0.10 * self.leverage
-                quantity = position_value / entry_price
-                
-                # Apply commission
-                commission_cost = position_value * self.commission
-                equity -= commission_cost
-            
-            # Check exit conditions
-            if position == 'long' and entry_price is not None:
-                # Check stop loss
-                if curr_low <= stop_loss:
-                    exit_price = stop_loss * (1 - self.slippage)
-                    pnl_pct = ((exit_price - entry_price) / entry_price) * 100 * self.leverage
-                    pnl = equity * 0.10 * (pnl_pct / 100)
-                    equity += pnl
-                    
-                    # Apply commission
-                    commission_cost = equity * 0.10 * self.commission
-                    equity -= commission_cost
-                    
-                    trades.append({
-                        'entry_time': df.index[i-1] if i > 0 else df.index[i],
-                        'exit_time': df.index[i],
-                        'side': 'long',
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'pnl_pct': pnl_pct,
-                        'exit_reason': 'sl'
-                    })
-                    
-                    position = None
-                    entry_price = None
-                    stop_loss = None
-                    take_profit = None
-                
-                # Check take profit
-                elif curr_high >= take_profit:
-                    exit_price = take_profit * (1 + self.slippage)
-                    pnl_pct = ((exit_price - entry_price) / entry_price) * 100 * self.leverage
-                    pnl = equity * 0.10 * (pnl_pct / 100)
-                    equity += pnl
-                    
-                    # Apply commission
-                    commission_cost = equity * 0.10 * self.commission
-                    equity -= commission_cost
-                    
-                    trades.append({
-                        'entry_time': df.index[i-1] if i > 0 else df.index[i],
-                        'exit_time': df.index[i],
-                        'side': 'long',
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'pnl_pct': pnl_pct,
-                        'exit_reason': 'tp'
-                    })
-                    
-                    position = None
-                    entry_price = None
-                    stop_loss = None
-                    take_profit = None
-            
-            elif position == 'short' and entry_price is not None:
-                # Check stop loss
-                if curr_high >= stop_loss:
-                    exit_price = stop_loss * (1 + self.slippage)
-                    pnl_pct = ((entry_price - exit_price) / entry_price) * 100 * self.leverage
-                    pnl = equity * 0.10 * (pnl_pct / 100)
-                    equity += pnl
-                    
-                    # Apply commission
-                    commission_cost = equity * 0.10 * self.commission
-                    equity -= commission_cost
-                    
-                    trades.append({
-                        'entry_time': df.index[i-1] if i > 0 else df.index[i],
-                        'exit_time': df.index[i],
-                        'side': 'short',
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'pnl_pct': pnl_pct,
-                        'exit_reason': 'sl'
-                    })
-                    
-                    position = None
-                    entry_price = None
-                    stop_loss = None
-                    take_profit = None
-                
-                # Check take profit
-                elif curr_low <= take_profit:
-                    exit_price = take_profit * (1 - self.slippage)
-                    pnl_pct = ((entry_price - exit_price) / entry_price) * 100 * self.leverage
-                    pnl = equity * 0.10 * (pnl_pct / 100)
-                    equity += pnl
-                    
-                    # Apply commission
-                    commission_cost = equity * 0.10 * self.commission
-                    equity -= commission_cost
-                    
-                    trades.append({
-                        'entry_time': df.index[i-1] if i > 0 else df.index[i],
-                        'exit_time': df.index[i],
-                        'side': 'short',
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'pnl_pct': pnl_pct,
-                        'exit_reason': 'tp'
-                    })
-                    
-                    position = None
-                    entry_price = None
-                    stop_loss = None
-                    take_profit = None
-            
-            equity_curve.append(equity)
-        
-        # Close any open position at the end
-        if position is not None and entry_price is not None:
-            exit_price = df['close'].iloc[-1]
-            if position == 'long':
-                pnl_pct = ((exit_price - entry_price) / entry_price) * 100 * self.leverage
-            else:
-                pnl_pct = ((entry_price - exit_price) / entry_price) * 100 * self.leverage
-            
-            pnl = equity * 0.10 * (pnl_pct / 100)
-            equity += pnl
-            commission_cost = equity * 0.10 * self.commission
-            equity -= commission_cost
-            
-            trades.append({
-                'entry_time': df.index[-2] if len(df) > 1 else df.index[-1],
-                'exit_time': df.index[-1],
-                'side': position,
-                'entry_price': entry_price,
-                'exit_price': exit_price,
-                'pnl_pct': pnl_pct,
-                'exit_reason': 'end'
-            })
+        result = run_twma_backtest(df, twma.to_numpy(), atr.to_numpy(), pivot_high.to_numpy(),
+                                   pivot_low.to_numpy(), self._trade_params())
+        trades = result['trades']
+        equity = result['final_equity']
         
         # Calculate metrics
         if len(trades) == 0:
@@ -411,18 +421,12 @@ class TWMATrendStrategy:
         
         total_return_pct = ((equity - 100000.0) / 100000.0) * 100
         
-        # Calculate max drawdown
-        equity_series = pd.Series(equity_curve)
-        running_max = equity_series.expanding().max()
-        drawdown = (equity_series - running_max) / running_max * 100
-        max_drawdown_pct = abs(drawdown.min()) if len(drawdown) > 0 else 0.0
-        
         return {
             'total_trades': len(trades),
             'win_rate': win_rate,
             'profit_factor': profit_factor,
             'total_return_pct': total_return_pct,
-            'max_drawdown_pct': max_drawdown_pct,
+            'max_drawdown_pct': max_drawdown_pct(result['equity_curve']),
             'avg_win_pct': avg_win,
             'avg_loss_pct': avg_loss,
             'gross_profit': gross_profit,
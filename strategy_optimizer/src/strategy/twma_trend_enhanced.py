@@ -8,8 +8,13 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple, Any
 import logging
 
+from .twma_trend import rolling_twma, pivot_high_low, run_twma_backtest, max_drawdown_pct
+
 logger = logging.getLogger(__name__)
 
+# Maximum stop distance: 0.3% price move = 1.5% loss at 5x leverage
+MAX_SL_MOVE = 0.003
+
 
 class TWMATrendEnhancedStrategy:
     """TWMA Trend Strategy - Enhanced with Filters"""
@@ -92,26 +97,19 @@ class TWMATrendEnhancedStrategy:
         self.commission = params.get('commission', 0.0005)
         self.slippage = params.get('slippage', 0.0002)
     
+    def _trade_params(self) -> Dict[str, float]:
+        """Parameters of the compiled bar loop."""
+        return {
+            'sl_atr_mult': self.sl_atr_mult,
+            'tp_atr_mult': self.tp_atr_mult,
+            'leverage': self.leverage,
+            'commission': self.commission,
+            'slippage': self.slippage,
+        }
+    
     def calculate_twma(self, src: pd.Series, length: int) -> pd.Series:
         """Calculate Time Weighted Moving Average"""
-        twma = pd.Series(index=src.index, dtype=float)
-        
-        for i in range(len(src)):
-            if i < length - 1:
-                twma.iloc[i] = np.nan
-                continue
-            
-            num = 0.0
-            den = 0.0
-            
-            for j in range(length):
-                w = length - j
-                num += src.iloc[i - j] * w
-                den += w
-            
-            twma.iloc[i] = num / den if den > 0 else np.nan
-        
-        return twma
+        return pd.Series(rolling_twma(src.to_numpy(dtype=np.float64), length), index=src.index)
     
     def calculate_atr(self, df: pd.DataFrame) -> pd.Series:
         """Calculate Average True Range"""
@@ -168,127 +166,86 @@ class TWMATrendEnhancedStrategy:
     
     def calculate_pivot_high_low(self, df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
         """Calculate pivot high and pivot low"""
-        pivot_high = pd.Series(index=df.index, dtype=float)
-        pivot_low = pd.Series(index=df.index, dtype=float)
-        
-        for i in range(self.pivot_len, len(df) - self.pivot_len):
-            # Check pivot high
-            high_val = df['high'].iloc[i]
-            is_pivot_high = True
-            for j in range(1, self.pivot_len + 1):
-                if df['high'].iloc[i - j] >= high_val or df['high'].iloc[i + j] >= high_val:
-                    is_pivot_high = False
-                    break
-            if is_pivot_high:
-                pivot_high.iloc[i] = high_val
-            
-            # Check pivot low
-            low_val = df['low'].iloc[i]
-            is_pivot_low = True
-            for j in range(1, self.pivot_len + 1):
-                if df['low'].iloc[i - j] <= low_val or df['low'].iloc[i + j] <= low_val:
-                    is_pivot_low = False
-                    break
-            if is_pivot_low:
-                pivot_low.iloc[i] = low_val
-        
-        return pivot_high, pivot_low
+        pivot_high, pivot_low = pivot_high_low(df['high'].to_numpy(dtype=np.float64),
+                                               df['low'].to_numpy(dtype=np.float64), self.pivot_len)
+        return pd.Series(pivot_high, index=df.index), pd.Series(pivot_low, index=df.index)
+    
+    def _filters_passed(self, checks: List[pd.Series]) -> np.ndarray:
+        """True on bars where at least 60% of the enabled filter checks pass."""
+        passed = np.sum([check.to_numpy(dtype=bool) for check in checks], axis=0)
+        return passed >= (len(checks) * 0.6)  # En az %60 onay
     
-    def check_filters_long(self, df: pd.DataFrame, i: int, rsi: pd.Series, macd: pd.Series, 
+    def check_filters_long(self, df: pd.DataFrame, rsi: pd.Series, macd: pd.Series,
                           macd_signal: pd.Series, macd_hist: pd.Series, volume_ma: pd.Series,
-                          ema_fast: pd.Series, ema_slow: pd.Series, adx: pd.Series) -> bool:
-        """Check all filters for LONG entry"""
-        filters_passed = 0
-        total_filters = 0
+                          ema_fast: pd.Series, ema_slow: pd.Series, adx: pd.Series) -> np.ndarray:
+        """
+        Check all filters for LONG entry on every bar.
+        
+        A filter whose indicator is NaN on a bar does not pass on that bar.
+        
+        Returns:
+            Boolean array, True where at least 60% of the enabled filters pass
+        """
+        checks = []
         
         # RSI Filter - Long için: RSI aşırı alımda olmamalı
         if self.use_rsi_filter:
-            total_filters += 1
-            if not pd.isna(rsi.iloc[i]):
-                if rsi.iloc[i] < self.rsi_overbought:  # Overbought'tan kaçın
-                    filters_passed += 1
+            checks.append(rsi < self.rsi_overbought)  # Overbought'tan kaçın
         
         # MACD Filter - Long için: MACD > Signal ve histogram pozitif
         if self.use_macd_filter:
-            total_filters += 1
-            if not pd.isna(macd.iloc[i]) and not pd.isna(macd_signal.iloc[i]):
-                if macd.iloc[i] > macd_signal.iloc[i] and macd_hist.iloc[i] > 0:
-                    filters_passed += 1
+            checks.append((macd > macd_signal) & (macd_hist > 0))
         
         # Volume Filter - Long için: Volume ortalamanın üzerinde olmalı
         if self.use_volume_filter:
-            total_filters += 1
-            if not pd.isna(volume_ma.iloc[i]):
-                if df['volume'].iloc[i] > volume_ma.iloc[i] * self.volume_multiplier:
-                    filters_passed += 1
+            checks.append(df['volume'] > volume_ma * self.volume_multiplier)
         
         # EMA Trend Filter - Long için: Fast EMA > Slow EMA (yukarı trend)
         if self.use_ema_filter:
-            total_filters += 1
-            if not pd.isna(ema_fast.iloc[i]) and not pd.isna(ema_slow.iloc[i]):
-                if ema_fast.iloc[i] > ema_slow.iloc[i]:
-                    filters_passed += 1
+            checks.append(ema_fast > ema_slow)
         
         # ADX Filter - Trend gücü yeterli olmalı
         if self.use_adx_filter:
-            total_filters += 1
-            if not pd.isna(adx.iloc[i]):
-                if adx.iloc[i] >= self.adx_threshold:
-                    filters_passed += 1
+            checks.append(adx >= self.adx_threshold)
         
-        # En az %60 filtre geçmeli (veya tüm filtreler aktif değilse)
-        if total_filters == 0:
-            return True
-        
-        return filters_passed >= (total_filters * 0.6)  # En az %60 onay
+        if not checks:
+            return np.ones(len(df), dtype=bool)
+        return self._filters_passed(checks)
     
-    def check_filters_short(self, df: pd.DataFrame, i: int, rsi: pd.Series, macd: pd.Series,
+    def check_filters_short(self, df: pd.DataFrame, rsi: pd.Series, macd: pd.Series,
                            macd_signal: pd.Series, macd_hist: pd.Series, volume_ma: pd.Series,
-                           ema_fast: pd.Series, ema_slow: pd.Series, adx: pd.Series) -> bool:
-        """Check all filters for SHORT entry"""
-        filters_passed = 0
-        total_filters = 0
+                           ema_fast: pd.Series, ema_slow: pd.Series, adx: pd.Series) -> np.ndarray:
+        """
+        Check all filters for SHORT entry on every bar.
+        
+        Returns:
+            Boolean array, True where at least 60% of the enabled filters pass
+        """
+        checks = []
         
         # RSI Filter - Short için: RSI aşırı satımda olmamalı
         if self.use_rsi_filter:
-            total_filters += 1
-            if not pd.isna(rsi.iloc[i]):
-                if rsi.iloc[i] > self.rsi_oversold:  # Oversold'tan kaçın
-                    filters_passed += 1
+            checks.append(rsi > self.rsi_oversold)  # Oversold'tan kaçın
         
         # MACD Filter - Short için: MACD < Signal ve histogram negatif
         if self.use_macd_filter:
-            total_filters += 1
-            if not pd.isna(macd.iloc[i]) and not pd.isna(macd_signal.iloc[i]):
-                if macd.iloc[i] < macd_signal.iloc[i] and macd_hist.iloc[i] < 0:
-                    filters_passed += 1
+            checks.append((macd < macd_signal) & (macd_hist < 0))
         
         # Volume Filter - Short için: Volume ortalamanın üzerinde olmalı
         if self.use_volume_filter:
-            total_filters += 1
-            if not pd.isna(volume_ma.iloc[i]):
-                if df['volume'].iloc[i] > volume_ma.iloc[i] * self.volume_multiplier:
-                    filters_passed += 1
+            checks.append(df['volume'] > volume_ma * self.volume_multiplier)
         
         # EMA Trend Filter - Short için: Fast EMA < Slow EMA (aşağı trend)
         if self.use_ema_filter:
-            total_filters += 1
-            if not pd.isna(ema_fast.iloc[i]) and not pd.isna(ema_slow.iloc[i]):
-                if ema_fast.iloc[i] < ema_slow.iloc[i]:
-                    filters_passed += 1
+            checks.append(ema_fast < ema_slow)
         
         # ADX Filter - Trend gücü yeterli olmalı
         if self.use_adx_filter:
-            total_filters += 1
-            if not pd.isna(adx.iloc[i]):
-                if adx.iloc[i] >= self.adx_threshold:
-                    filters_passed += 1
-        
-        # En az %60 filtre geçmeli
-        if total_filters == 0:
-            return True
+            checks.append(adx >= self.adx_threshold)
         
-        return filters_passed >= (total_filters * 0.6)  # En az %60 onay
+        if not checks:
+            return np.ones(len(df), dtype=bool)
+        return self._filters_passed(checks)
     
     def run_backtest(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Run backtest with filters"""
@@ -305,270 +262,17 @@ class TWMATrendEnhancedStrategy:
         ema_slow = df['close'].ewm(span=self.ema_slow, adjust=False).mean() if self.use_ema_filter else pd.Series(index=df.index, dtype=float)
         adx = self.calculate_adx(df, self.adx_length) if self.use_adx_filter else pd.Series(index=df.index, dtype=float)
         
-        # Track last swing high/low
-        last_swing_high = None
-        last_swing_low = None
-        
-        # Track position
-        position = None
-        entry_price = None
-        stop_loss = None
-        take_profit = None
-        
-        # Track trades
-        trades = []
-        equity = 100000.0
-        equity_curve = [equity]
-        
-        # Track state
-        long_sl = None
-        long_tp = None
-        short_sl = None
-        short_tp = None
-        
-        # Track filtered signals
-        filtered_signals = 0
-        total_signals = 0
-        
-        for i in range(1, len(df)):
-            if pd.isna(twma.iloc[i]) or pd.isna(twma.iloc[i-1]) or pd.isna(atr.iloc[i]):
-                equity_curve.append(equity)
-                continue
-            
-            # Update last swing high/low
-            if not pd.isna(pivot_high.iloc[i]):
-                last_swing_high = pivot_high.iloc[i]
-            if not pd.isna(pivot_low.iloc[i]):
-                last_swing_low = pivot_low.iloc[i]
-            
-            # TWMA direction
-            twma_up = twma.iloc[i] > twma.iloc[i-1]
-            twma_down = twma.iloc[i] < twma.iloc[i-1]
-            
-            # Current bar values
-            curr_close = df['close'].iloc[i]
-            curr_high = df['high'].iloc[i]
-            curr_low = df['low'].iloc[i]
-            curr_twma = twma.iloc[i]
-            curr_atr = atr.iloc[i]
-            
-            # Previous bar values
-            prev_close = df['close'].iloc[i-1]
-            prev_low = df['low'].iloc[i-1]
-            prev_high = df['high'].iloc[i-1]
-            prev_twma = twma.iloc[i-1]
-            
-            # Entry conditions - Pine: longEntryCond = setupLongBar[1] and touchLongNow[1] and noPos
-            no_pos = position is None
-            
-            # Check if setup was 2 bars ago and touch was 1 bar ago
-            if i >= 3:
-                # Setup bar (2 bars ago): close > twma and twmaUp
-                setup_bar_close = df['close'].iloc[i-2]
-                setup_bar_twma = twma.iloc[i-2]
-                setup_bar_twma_prev = twma.iloc[i-3]
-                setup_twma_up = setup_bar_twma > setup_bar_twma_prev
-                
-                prev_setup_long = setup_bar_close > setup_bar_twma and setup_twma_up
-                prev_setup_short = setup_bar_close < setup_bar_twma and (setup_bar_twma < setup_bar_twma_prev)
-                
-                # Touch bar (1 bar ago): low <= twma and close >= twma (for long)
-                prev_touch_long = prev_low <= prev_twma and prev_close >= prev_twma
-                prev_touch_short = prev_high >= prev_twma and prev_close <= prev_twma
-                
-                # Base entry conditions
-                base_long_entry = prev_setup_long and prev_touch_long and no_pos
-                base_short_entry = prev_setup_short and prev_touch_short and no_pos
-                
-                # Apply filters
-                if base_long_entry:
-                    total_signals += 1
-                    if self.check_filters_long(df, i, rsi, macd, macd_signal, macd_hist, volume_ma, ema_fast, ema_slow, adx):
-                        long_entry_cond = True
-                    else:
-                        long_entry_cond = False
-                        filtered_signals += 1
-                else:
-                    long_entry_cond = False
-                
-                if base_short_entry:
-                    total_signals += 1
-                    if self.check_filters_short(df, i, rsi, macd, macd_signal, macd_hist, volume_ma, ema_fast, ema_slow, adx):
-                        short_entry_cond = True
-                    else:
-                        short_entry_cond = False
-                        filtered_signals += 1
-                else:
-                    short_entry_cond = False
-            else:
-                long_entry_cond = False
-                short_entry_cond = False
-            
-            # LONG ENTRY
-            if long_entry_cond:
-                base_twma = prev_twma
-                prev_atr_val = atr.iloc[i-1] if not pd.isna(atr.iloc[i-1]) else atr.iloc[i]
-                sl_price = base_twma - self.sl_atr_mult * prev_atr_val if not pd.isna(prev_atr_val) else base_twma * 0.98
-                tp_base = last_swing_high if last_swing_high is not None else base_twma
-                tp_price = tp_base + self.tp_atr_mult * prev_atr_val if not pd.isna(prev_atr_val) else base_twma * 1.02
-                
-                position = 'long'
-                entry_price = curr_close * (1 + self.slippage)
-                
-                # Stop Loss'u maksimum %1.5 ile sınırla (leverage etkisi: 5x)
-                # %1.5 kayıp için fiyat hareketi: %1.5 / 5 = %0.3
-                max_sl_price = entry_price * (1 - 0.003)  # Maksimum %0.3 fiyat hareketi = %1.5 kayıp (5x leverage)
-                long_sl = max(sl_price, max_sl_price)  # Hesaplanan SL ile max SL'den daha yakın olanı seç
-                stop_loss = long_sl
-                take_profit = tp_price
-                
-                position_value = equity * 0.10 * self.leverage
-                quantity = position_value / entry_price
-                commission_cost = position_value * self.commission
-                equity -= commission_cost
-            
-            # SHORT ENTRY
-            elif short_entry_cond:
-                base_twma_s = prev_twma
-                prev_atr_val_s = atr.iloc[i-1] if not pd.isna(atr.iloc[i-1]) else atr.iloc[i]
-                sl_price_s = base_twma_s + self.sl_atr_mult * prev_atr_val_s if not pd.isna(prev_atr_val_s) else base_twma_s * 1.02
-                tp_base_s = last_swing_low if last_swing_low is not None else base_twma_s
-                tp_price_s = tp_base_s - self.tp_atr_mult * prev_atr_val_s if not pd.isna(prev_atr_val_s) else base_twma_s * 0.98
-                
-                position = 'short'
-                entry_price = curr_close * (1 - self.slippage)
-                
-                # Stop Loss'u maksimum %1.5 ile sınırla (leverage etkisi: 5x)
-                # %1.5 kayıp için fiyat hareketi: %1.5 / 5 = %0.3
-                max_sl_price = entry_price * (1 + 0.003)  # Maksimum %0.3 fiyat hareketi = %1.5 kayıp (5x leverage)
-                short_sl = min(sl_price_s, max_sl_price)  # Hesaplanan SL ile max SL'den daha yakın olanı seç
-                stop_loss = short_sl
-                take_profit = tp_price_s
-                
-                position_value = equity * 0.10 * self.leverage
-                quantity = position_value / entry_price
-                commission_cost = position_value * self.commission
-                equity -= commission_cost
-            
-            # Check exit conditions (same as before)
-            if position == 'long' and entry_price is not None:
-                if curr_low <= stop_loss:
-                    exit_price = stop_loss * (1 - self.slippage)
-                    pnl_pct = ((exit_price - entry_price) / entry_price) * 100 * self.leverage
-                    pnl = equity * 0.10 * (pnl_pct / 100)
-                    equity += pnl
-                    commission_cost = equity * 0.10 * self.commission
-                    equity -= commission_cost
-                    
-                    trades.append({
-                        'entry_time': df.index[i-1] if i > 0 else df.index[i],
-                        'exit_time': df.index[i],
-                        'side': 'long',
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'pnl_pct': pnl_pct,
-                        'exit_reason': 'sl'
-                    })
-                    
-                    position = None
-                    entry_price = None
-                    stop_loss = None
-                    take_profit = None
-                
-                elif curr_high >= take_profit:
-                    exit_price = take_profit * (1 + self.slippage)
-                    pnl_pct = ((exit_price - entry_price) / entry_price) * 100 * self.leverage
-                    pnl = equity * 0.10 * (pnl_pct / 100)
-                    equity += pnl
-                    commission_cost = equity * 0.10 * self.commission
-                    equity -= commission_cost
-                    
-                    trades.append({
-                        'entry_time': df.index[i-1] if i > 0 else df.index[i],
-                        'exit_time': df.index[i],
-                        'side': 'long',
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'pnl_pct': pnl_pct,
-                        'exit_reason': 'tp'
-                    })
-                    
-                    position = None
-                    entry_price = None
-                    stop_loss = None
-                    take_profit = None
-            
-            elif position == 'short' and entry_price is not None:
-                if curr_high >= stop_loss:
-                    exit_price = stop_loss * (1 + self.slippage)
-                    pnl_pct = ((entry_price - exit_price) / entry_price) * 100 * self.leverage
-                    pnl = equity * 0.10 * (pnl_pct / 100)
-                    equity += pnl
-                    commission_cost = equity * 0.10 * self.commission
-                    equity -= commission_cost
-                    
-                    trades.append({
-                        'entry_time': df.index[i-1] if i > 0 else df.index[i],
-                        'exit_time': df.index[i],
-                        'side': 'short',
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'pnl_pct': pnl_pct,
-                        'exit_reason': 'sl'
-                    })
-                    
-                    position = None
-                    entry_price = None
-                    stop_loss = None
-                    take_profit = None
-                
-                elif curr_low <= take_profit:
-                    exit_price = take_profit * (1 - self.slippage)
-                    pnl_pct = ((entry_price - exit_price) / entry_price) * 100 * self.leverage
-                    pnl = equity * 0.10 * (pnl_pct / 100)
-                    equity += pnl
-                    commission_cost = equity * 0.10 * self.commission
-                    equity -= commission_cost
-                    
-                    trades.append({
-                        'entry_time': df.index[i-1] if i > 0 else df.index[i],
-                        'exit_time': df.index[i],
-                        'side': 'short',
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'pnl_pct': pnl_pct,
-                        'exit_reason': 'tp'
-                    })
-                    
-                    position = None
-                    entry_price = None
-                    stop_loss = None
-                    take_profit = None
-            
-            equity_curve.append(equity)
-        
-        # Close any open position at the end
-        if position is not None and entry_price is not None:
-            exit_price = df['close'].iloc[-1]
-            if position == 'long':
-                pnl_pct = ((exit_price - entry_price) / entry_price) * 100 * self.leverage
-            else:
-                pnl_pct = ((entry_price - exit_price) / entry_price) * 100 * self.leverage
-            
-            pnl = equity * 0.10 * (pnl_pct / 100)
-            equity += pnl
-            commission_cost = equity * 0.10 * self.commission
-            equity -= commission_cost
-            
-            trades.append({
-                'entry_time': df.index[-2] if len(df) > 1 else df.index[-1],
-                'exit_time': df.index[-1],
-                'side': position,
-                'entry_price': entry_price,
-                'exit_price': exit_price,
-                'pnl_pct': pnl_pct,
-                'exit_reason': 'end'
-            })
+        long_ok = self.check_filters_long(df, rsi, macd, macd_signal, macd_hist, volume_ma, ema_fast, ema_slow, adx)
+        short_ok = self.check_filters_short(df, rsi, macd, macd_signal, macd_hist, volume_ma, ema_fast, ema_slow, adx)
+        
+        # Stop Loss'u maksimum %1.5 ile sınırla (leverage etkisi: 5x)
+        result = run_twma_backtest(df, twma.to_numpy(), atr.to_numpy(), pivot_high.to_numpy(),
+                                   pivot_low.to_numpy(), self._trade_params(), long_ok, short_ok,
+                                   max_sl_move=MAX_SL_MOVE)
+        trades = result['trades']
+        equity = result['final_equity']
+        filtered_signals = result['filtered_signals']
+        total_signals = result['total_signals']
         
         # Calculate metrics
         if len(trades) == 0:
@@ -603,18 +307,12 @@ class TWMATrendEnhancedStrategy:
         
         total_return_pct = ((equity - 100000.0) / 100000.0) * 100
         
-        # Calculate max drawdown
-        equity_series = pd.Series(equity_curve)
-        running_max = equity_series.expanding().max()
-        drawdown = (equity_series - running_max) / running_max * 100
-        max_drawdown_pct = abs(drawdown.min()) if len(drawdown) > 0 else 0.0
-        
         return {
             'total_trades': len(trades),
             'win_rate': win_rate,
             'profit_factor': profit_factor,
             'total_return_pct': total_return_pct,
-            'max_drawdown_pct': max_drawdown_pct,
+            'max_drawdown_pct': max_drawdown_pct(result['equity_curve']),
             'avg_win_pct': avg_win,
             'avg_loss_pct': avg_loss,
             'gross_profit': gross_profit,
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Per-worker memory of loading cached OHLCV data in parallel workers.
+
+Writes synthetic 15m histories for many symbols into a temporary cache in
+each storage format, then starts worker processes that each load every
+symbol (as a multi-symbol optimization worker does) and reports the memory
+each worker holds afterwards.
+
+PSS (proportional set size) splits shared pages between the processes
+mapping them, so it is the number to compare: with memory-mapped Arrow
+files the OHLCV pages live once in the page cache instead of once per
+worker.
+
+Usage:
+    python benchmarks/bench_cache_memory.py --symbols 100 --workers 4
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.data.cache import DataCache
+
+MODES = [
+    ('parquet', 'float64'),
+    ('parquet', 'float32'),
+    ('feather', 'float64'),
+    ('feather', 'float32'),
+]
+
+
+def read_memory_mb():
+    """RSS, PSS and private memory of this process in MB (Linux)."""
+    values = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if parts[0].rstrip(':') in ('Rss', 'Pss', 'Private_Clean', 'Private_Dirty'):
+                    values[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    except OSError:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return {'rss': rss, 'pss': rss, 'private': rss}
+    return {
+        'rss': values['Rss'],
+        'pss': values['Pss'],
+        'private': values['Private_Clean'] + values['Private_Dirty'],
+    }
+
+
+def make_history(bars, seed):
+    """Random-walk 15m OHLCV history."""
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range('2023-01-01', periods=bars, freq='15min', tz='UTC', name='timestamp')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+    spread = close * 0.001
+    return pd.DataFrame({
+        'open': close,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.uniform(100, 1000, bars),
+    }, index=ts)
+
+
+def load_all(cache_dir, storage_format, dtype, symbols, barrier):
+    """Worker: load every symbol, touch the data, report memory."""
+    cache = DataCache(cache_dir, storage_format=storage_format)
+    before = read_memory_mb()
+    
+    start = time.perf_counter()
+    frames = [cache.get_cached_data(symbol, '15m', dtype=dtype) for symbol in symbols]
+    checksum = sum(float(df['close'].sum()) + float(df['high'].max()) for df in frames)
+    elapsed = time.perf_counter() - start
+    
+    # Measure while every worker still holds its data
+    barrier.wait()
+    after = read_memory_mb()
+    barrier.wait()
+    return before, after, elapsed, checksum
+
+
+def run_mode(cache_dir, storage_format, dtype, symbols, workers):
+    """Run all workers for one storage mode."""
+    ctx = mp.get_context('spawn')
+    with ctx.Manager() as manager:
+        barrier = manager.Barrier(workers)
+        with ctx.Pool(workers) as pool:
+            return pool.starmap(load_all, [(cache_dir, storage_format, dtype, symbols, barrier)] * workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, default=100, help='Number of symbols')
+    parser.add_argument('--bars', type=int, default=96 * 365 * 2, help='15m bars per symbol (default 2 years)')
+    parser.add_argument('--workers', type=int, default=4, help='Worker processes')
+    args = parser.parse_args()
+    
+    symbols = [f'SYM{i:03d}/USDT' for i in range(args.symbols)]
+    raw_mb = args.symbols * args.bars * 6 * 8 / 1024 / 1024
+    print(f"{args.symbols} symbols x {args.bars} bars ({raw_mb:.0f} MB as float64), {args.workers} workers\n")
+    print(f"{'format':<10}{'dtype':<10}{'load s':>8}{'RSS MB':>10}{'PSS MB':>10}{'private MB':>12}")
+    
+    for storage_format, dtype in MODES:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = DataCache(cache_dir, partition_period='all', storage_format=storage_format)
+            for i, symbol in enumerate(symbols):
+                cache.save_data(symbol, '15m', make_history(args.bars, i))
+            
+            results = run_mode(cache_dir, storage_format, dtype, symbols, args.workers)
+        
+        delta = {key: np.mean([after[key] - before[key] for before, after, _, _ in results])
+                 for key in ('rss', 'pss', 'private')}
+        elapsed = np.mean([r[2] for r in results])
+        print(f"{storage_format:<10}{dtype:<10}{elapsed:>8.2f}{delta['rss']:>10.1f}"
+              f"{delta['pss']:>10.1f}{delta['private']:>12.1f}")
+    
+    print("\nMemory columns are the per-worker increase after loading all symbols.")
+
+
+if __name__ == '__main__':
+    main()
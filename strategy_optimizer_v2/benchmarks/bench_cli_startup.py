@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Import cost of the optimizer CLIs' light commands.
+
+Runs each command in a fresh interpreter as ``python -X importtime -m src.cli
+...`` from its project directory and reports the wall time, the total import
+time and which heavy libraries (ccxt, yfinance, numba, scipy, matplotlib,
+plotly, tqdm) it loaded. Light commands are expected to load none of them;
+with --check the script exits non-zero when one does, or when a command's
+imports take longer than --max-import-ms, so it can run as a regression check.
+
+Covers this project and, when they sit next to it, advanced_strategy_lab and
+nasdaq_strategy_optimizer.
+
+Usage:
+    python benchmarks/bench_cli_startup.py --check --max-import-ms 1500
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HEAVY_MODULES = ('ccxt', 'yfinance', 'numba', 'scipy', 'matplotlib', 'plotly', 'tqdm')
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Project -> light commands ({cache} is an empty temporary cache directory)
+COMMANDS = {
+    'strategy_optimizer_v2': ['--help', 'optimize --help', 'config-info', 'nasdaq-symbols',
+                              'clear-cache --cache-dir {cache}'],
+    'advanced_strategy_lab': ['--help', 'optimize --help', 'list-symbols --limit 5', 'nasdaq-symbols',
+                              'clear-cache --cache-dir {cache}'],
+    'nasdaq_strategy_optimizer': ['--help', 'optimize --help', 'list-symbols --limit 5', 'nasdaq-symbols',
+                                  'clear-cache --cache-dir {cache}'],
+}
+
+
+def parse_importtime(stderr):
+    """Total top-level import time in ms and the set of imported module names."""
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        modules.add(name.strip())
+        if not name.startswith('  '):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def run_command(project, command):
+    """Run one CLI command with -X importtime and measure it."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'src.cli', *command.split()],
+                          cwd=ROOT / project, capture_output=True, text=True,
+                          env={**os.environ, 'PYTHONPATH': ''})
+    wall = time.perf_counter() - start
+    import_ms, modules = parse_importtime(proc.stderr)
+    heavy = sorted(m for m in HEAVY_MODULES if m in modules)
+    return proc.returncode, wall * 1000, import_ms, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--projects', nargs='+', default=list(COMMANDS), choices=list(COMMANDS),
+                        help='Projects to measure')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit non-zero if a light command loads a heavy module or is too slow')
+    parser.add_argument('--max-import-ms', type=float, default=None,
+                        help='Import time budget per command for --check')
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as cache:
+        print(f"{'command':<58}{'wall ms':>9}{'import ms':>11}  heavy modules")
+        for project in args.projects:
+            if not (ROOT / project / 'src' / 'cli.py').exists():
+                continue
+            for command in COMMANDS[project]:
+                command = command.format(cache=cache)
+                returncode, wall_ms, import_ms, heavy = run_command(project, command)
+                label = f"{project}: {command.replace(cache, '<tmp>')}"
+                print(f"{label:<58}{wall_ms:>9.0f}{import_ms:>11.0f}  {', '.join(heavy) or '-'}")
+
+                if returncode != 0:
+                    failures.append(f"{label} exited with {returncode}")
+                if heavy:
+                    failures.append(f"{label} imported {', '.join(heavy)}")
+                if args.max_import_ms is not None and import_ms > args.max_import_ms:
+                    failures.append(f"{label} imports took {import_ms:.0f} ms")
+
+    if failures:
+        print("\n" + "\n".join(failures))
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Memory and allocations per combination of full vs compact backtests.
+
+Runs the same synthetic signal sets through the backtester in full mode
+(Trade objects plus a pandas equity curve) and compact mode (metrics only),
+tracing allocations with tracemalloc. For each mode it reports the peak
+traced memory during one backtest, the memory still held by the returned
+result, the number of allocated blocks and the wall time per combination.
+
+Usage:
+    python benchmarks/bench_compact_backtest.py --bars 20000 --combinations 20
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.strategy.backtester import run_backtest
+
+
+def make_data(bars, seed=0):
+    """Random-walk 15m OHLCV history."""
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range('2023-01-01', periods=bars, freq='15min', tz='UTC', name='timestamp')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+    spread = close * 0.002
+    return pd.DataFrame({
+        'open': close,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.uniform(100, 1000, bars),
+    }, index=ts)
+
+
+def make_signals(data, seed):
+    """Random long/short entries with percentage SL/TP, one set per combination."""
+    rng = np.random.default_rng(seed)
+    n = len(data)
+    return pd.DataFrame({
+        'buy_final': rng.random(n) < 0.02,
+        'sell_final': rng.random(n) < 0.02,
+        'atr_sl_mult': rng.uniform(0.002, 0.01),
+        'atr_rr': rng.uniform(0.002, 0.01),
+    }, index=data.index)
+
+
+def measure(data, signal_sets, compact):
+    """Mean peak bytes, retained bytes, allocated blocks and seconds per backtest."""
+    peaks, retained, blocks, seconds = [], [], [], []
+    for signals in signal_sets:
+        gc.collect()
+        tracemalloc.start()
+        start_snapshot = tracemalloc.take_snapshot()
+        baseline = tracemalloc.get_traced_memory()[0]
+        
+        start = time.perf_counter()
+        result = run_backtest(data, signals, fee_bps=10, slippage_bps=5, compact=compact)
+        seconds.append(time.perf_counter() - start)
+        
+        current, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().compare_to(start_snapshot, 'filename')
+        tracemalloc.stop()
+        
+        peaks.append(peak - baseline)
+        retained.append(current - baseline)
+        blocks.append(sum(max(stat.count_diff, 0) for stat in stats))
+        del result
+    return np.mean(peaks), np.mean(retained), np.mean(blocks), np.mean(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, default=20000, help='Bars per backtest')
+    parser.add_argument('--combinations', type=int, default=20, help='Signal sets (combinations) per mode')
+    args = parser.parse_args()
+    
+    data = make_data(args.bars)
+    signal_sets = [make_signals(data, seed) for seed in range(args.combinations)]
+    
+    # The modes must agree before their costs are compared
+    for signals in signal_sets[:3]:
+        full = run_backtest(data, signals, fee_bps=10, slippage_bps=5)
+        compact = run_backtest(data, signals, fee_bps=10, slippage_bps=5, compact=True)
+        for name, value in full.metrics.items():
+            np.testing.assert_allclose(compact.metrics[name], value, rtol=1e-9, err_msg=name)
+    
+    print(f"{args.combinations} combinations x {args.bars} bars (allocations traced)\n")
+    print(f"{'mode':<10}{'peak KB':>10}{'held KB':>10}{'blocks':>10}{'ms':>10}")
+    for mode, compact in (('full', False), ('compact', True)):
+        peak, held, blocks, seconds = measure(data, signal_sets, compact)
+        print(f"{mode:<10}{peak / 1024:>10.1f}{held / 1024:>10.1f}{blocks:>10.0f}{seconds * 1000:>10.1f}")
+    
+    print("\nPer-combination means. 'held' is what the returned result keeps alive;"
+          " 'blocks' counts allocations still live at the end of the run.")
+
+
+if __name__ == '__main__':
+    main()
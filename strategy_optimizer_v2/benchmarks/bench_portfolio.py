@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Wall time of a shared-capital portfolio backtest.
+
+Builds random-walk 15m histories for many symbols (two years by default),
+with staggered listing dates so the timelines do not line up, and runs
+them through the portfolio backtester with position and correlation
+limits. Reports alignment, kernel and metrics time separately; the first
+run includes numba compilation and is reported on its own.
+
+Usage:
+    python benchmarks/bench_portfolio.py --symbols 50 --bars 70080
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.optimize import portfolio
+from strategy_optimizer_v2.src.optimize.portfolio import PortfolioBacktester
+
+
+def make_universe(symbols, bars, seed=0):
+    """Random-walk 15m OHLCV per symbol plus random signals; later symbols list later."""
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range('2023-01-01', periods=bars, freq='15min', tz='UTC', name='timestamp')
+    market = rng.normal(0, 0.0015, bars)
+    data, signals = {}, {}
+    for i in range(symbols):
+        start = int(rng.integers(0, bars // 4)) if i % 3 == 2 else 0
+        n = bars - start
+        close = 100 * np.exp(np.cumsum(market[start:] * rng.uniform(0, 1.5) + rng.normal(0, 0.0015, n)))
+        spread = close * 0.002
+        frame = pd.DataFrame({
+            'open': close,
+            'high': close + spread,
+            'low': close - spread,
+            'close': close,
+            'volume': rng.uniform(100, 1000, n),
+        }, index=ts[start:])
+        data[f"SYM{i}/USDT"] = frame
+        signals[f"SYM{i}/USDT"] = pd.DataFrame({
+            'buy_final': rng.random(n) < 0.003,
+            'sell_final': rng.random(n) < 0.003,
+            'atr_sl_mult': 0.006,
+            'atr_rr': 0.008,
+        }, index=frame.index)
+    return data, signals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, default=50, help='Symbols in the portfolio')
+    parser.add_argument('--bars', type=int, default=70080, help='15m bars per symbol (70080 = 2 years)')
+    parser.add_argument('--max-positions', type=int, default=10, help='Maximum concurrent positions')
+    parser.add_argument('--max-correlated', type=int, default=3, help='Same-direction positions per group')
+    args = parser.parse_args()
+    
+    data, signals = make_universe(args.symbols, args.bars)
+    # Costs off so random signals do not drain the account and stop trading
+    backtester = PortfolioBacktester(max_positions=args.max_positions,
+                                     max_correlated_positions=args.max_correlated,
+                                     correlation_threshold=0.5, fee_bps=0, slippage_bps=0)
+    
+    # Time the kernel separately by wrapping it
+    kernel = portfolio._portfolio_kernel
+    kernel_seconds = []
+    
+    def timed_kernel(*kernel_args):
+        start = time.perf_counter()
+        out = kernel(*kernel_args)
+        kernel_seconds.append(time.perf_counter() - start)
+        return out
+    
+    portfolio._portfolio_kernel = timed_kernel
+    try:
+        start = time.perf_counter()
+        backtester.run_backtest(data, signals)
+        first = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        result = backtester.run_backtest(data, signals)
+        total = time.perf_counter() - start
+    finally:
+        portfolio._portfolio_kernel = kernel
+    
+    print(f"{args.symbols} symbols x {args.bars} bars, {len(result.equity_curve)} timeline bars, "
+          f"{len(set(result.groups.values()))} correlation groups\n")
+    print(f"{'first run (with compile)':<28}{first:>10.2f} s")
+    print(f"{'run':<28}{total:>10.2f} s")
+    print(f"{'  kernel':<28}{kernel_seconds[-1]:>10.2f} s")
+    print(f"{'  alignment + metrics':<28}{total - kernel_seconds[-1]:>10.2f} s")
+    print(f"\n{len(result.trades)} trades, rejected entries: {result.rejected}")
+    print(f"return {result.metrics['total_return_pct']:.1f}%, "
+          f"max drawdown {result.metrics['max_drawdown_pct']:.1f}%, "
+          f"max open positions {result.metrics['max_open_positions']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,10 +14,14 @@ import logging
 from typing import Dict, List, Tuple, Any
 import json
 import os
+import argparse
 from itertools import product
 import warnings
 warnings.filterwarnings('ignore')
 
+from src.optimize.param_space import ParamSpace
+from src.optimize.adaptive_search import AdaptiveSearch, slice_data
+
 # Logging setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -322,8 +326,10 @@ class ONDOBacktester:
 class ONDOOptimizer:
     """ONDO Strategy Optimizer"""
     
-    def __init__(self):
+    def __init__(self, search_mode: str = 'grid'):
         self.logger = logging.getLogger(__name__)
+        self.search_mode = search_mode
+        self.search_stats = {}
         
     def get_ondo_data(self, timeframe: str = '1h', period: str = '6mo') -> pd.DataFrame:
         """Get ONDO data from Yahoo Finance"""
@@ -383,49 +389,34 @@ class ONDOOptimizer:
             'rsi_overbought': [60, 65]
         }
         
-        # Generate combinations
-        param_names = list(param_ranges.keys())
-        param_values = list(param_ranges.values())
-        combinations = list(product(*param_values))
-        
-        self.logger.info(f"📊 Testing {len(combinations)} parameter combinations...")
-        
-        results = []
-        best_result = None
-        best_score = -float('inf')
-        
-        backtester = ONDOBacktester()
-        
-        for i, params in enumerate(combinations):
-            try:
-                param_dict = dict(zip(param_names, params))
-                param_dict.update({
-                    'use_heikin_ashi': True,
-                    'use_volume_filter': True,
-                    'use_rsi_filter': True
-                })
-                
-                strategy = ONDOATRSuperTrendStrategy(param_dict)
-                result = backtester.run_backtest(data, strategy)
-                
-                # Calculate optimization score
-                score = self.calculate_optimization_score(result)
-                result['optimization_score'] = score
-                result['timeframe'] = timeframe
-                result['parameters'] = param_dict
+        if self.search_mode == 'adaptive':
+            results = self.optimize_adaptive(data, param_ranges, timeframe)
+            best_result = max(results, key=lambda x: x['optimization_score']) if results else None
+        else:
+            # Generate combinations
+            param_names = list(param_ranges.keys())
+            param_values = list(param_ranges.values())
+            combinations = list(product(*param_values))
+            
+            self.logger.info(f"📊 Testing {len(combinations)} parameter combinations...")
+            
+            results = []
+            best_result = None
+            best_score = -float('inf')
+            
+            for i, params in enumerate(combinations):
+                result = self.optimize_single_combination(data, dict(zip(param_names, params)), timeframe)
+                if result is None:
+                    continue
                 
                 results.append(result)
                 
-                if score > best_score:
-                    best_score = score
+                if result['optimization_score'] > best_score:
+                    best_score = result['optimization_score']
                     best_result = result
                 
                 if (i + 1) % 100 == 0:
                     self.logger.info(f"📈 Processed {i + 1}/{len(combinations)} combinations")
-                    
-            except Exception as e:
-                self.logger.error(f"❌ Error in optimization {i}: {e}")
-                continue
         
         # Sort results by score
         results.sort(key=lambda x: x['optimization_score'], reverse=True)
@@ -438,6 +429,50 @@ class ONDOOptimizer:
             'all_results': results
         }
     
+    def optimize_single_combination(self, data: pd.DataFrame, param_dict: Dict[str, Any],
+                                    timeframe: str) -> Dict[str, Any]:
+        """Backtest a single parameter combination"""
+        try:
+            param_dict = dict(param_dict)
+            param_dict.update({
+                'use_heikin_ashi': True,
+                'use_volume_filter': True,
+                'use_rsi_filter': True
+            })
+            
+            strategy = ONDOATRSuperTrendStrategy(param_dict)
+            result = ONDOBacktester().run_backtest(data, strategy)
+            
+            # Calculate optimization score
+            result['optimization_score'] = self.calculate_optimization_score(result)
+            result['timeframe'] = timeframe
+            result['parameters'] = param_dict
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"❌ Error in optimization {param_dict}: {e}")
+            return None
+    
+    def optimize_adaptive(self, data: pd.DataFrame, param_ranges: Dict[str, List[Any]],
+                          timeframe: str) -> List[Dict[str, Any]]:
+        """Successive halving + TPE search; returns full-data results only"""
+        space = ParamSpace(param_ranges)
+        self.logger.info(f"📊 Adaptive search over {len(space)} parameter combinations...")
+        
+        def evaluate(params, fraction):
+            return self.optimize_single_combination(slice_data(data, fraction, min_bars=100), params, timeframe)
+        
+        def score(result):
+            return result['optimization_score'] if result else -float('inf')
+        
+        search = AdaptiveSearch(space, evaluate, score)
+        results = [r for r in search.run() if r is not None]
+        
+        self.search_stats[timeframe] = search.stats
+        self.logger.info(f"📈 {search.stats['full_backtests']} full backtests, "
+                         f"{search.stats['reduction_vs_grid']:.1f}x fewer than grid")
+        return results
+    
     def calculate_optimization_score(self, result: Dict[str, Any]) -> float:
         """Calculate optimization score"""
         if result['num_trades'] < 5:  # Minimum trades
@@ -538,7 +573,12 @@ class ONDOOptimizer:
 
 def main():
     """Main function"""
-    optimizer = ONDOOptimizer()
+    parser = argparse.ArgumentParser(description="ONDO ATR SuperTrend Optimizer")
+    parser.add_argument('--search-mode', choices=['grid', 'adaptive'], default='grid',
+                        help="grid (exhaustive) or adaptive (successive halving + TPE)")
+    args = parser.parse_args()
+    
+    optimizer = ONDOOptimizer(search_mode=args.search_mode)
     results = optimizer.run_optimization()
     
     if results:
@@ -13,15 +13,12 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import json
 
-from .config import get_config, validate_coins, validate_timeframes
-from .data.loader import create_data_loader, validate_symbols
-from .optimize.grid_search import run_grid_search
-from .optimize.walk_forward import run_walk_forward
-from .reporting.reporter import create_reporter
-from .reporting.plots import create_visualizer
-from .strategy import create_strategy, create_volensy_strategy, create_atr_supertrend_strategy
-from .optimize.nasdaq_optimizer import NASDAQOptimizer, optimize_nasdaq_symbol, optimize_high_volume_nasdaq
-from .data.nasdaq_provider import NASDAQDataProvider, get_nasdaq_symbols, get_high_volume_symbols
+from .config import get_config, get_param_space, validate_coins, validate_timeframes
+
+# Commands import the data, strategy, optimization and reporting modules they
+# use when they run, so light commands (config-info, clear-cache,
+# nasdaq-symbols, --help) start without loading ccxt, numba, scipy or the
+# plotting libraries. benchmarks/bench_cli_startup.py measures the cost.
 
 # Initialize Typer app
 app = typer.Typer(
@@ -37,6 +34,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Results loaded from a results store for plotting (best by profit factor)
+PLOT_RESULTS_LIMIT = 5000
+
 
 def parse_param_string(param_string: str) -> List[Dict[str, Any]]:
     """
@@ -93,6 +93,8 @@ def fetch(
     """
     Fetch OHLCV data for specified coins and timeframes.
     """
+    from .data.loader import create_data_loader, validate_symbols
+    
     config = get_config()
     
     # Parse inputs
@@ -194,10 +196,30 @@ def optimize(
     csv_dir: str = typer.Option(None, "--csv", help="CSV fallback directory"),
     param_file: str = typer.Option(None, "--params", "-p", help="JSON file with custom parameters"),
     param_string: str = typer.Option(None, "--param-string", help="Parameter string like 'a=1.5,2.0 c=10,14'"),
+    sample: int = typer.Option(None, "--sample", help="Evaluate a subsample of N combinations from the config space"),
+    sampler: str = typer.Option("sobol", "--sampler", help="Subsampling method: sobol or random"),
+    seed: int = typer.Option(42, "--seed", help="Seed for subsampling"),
+    shard: str = typer.Option(None, "--shard", help="Evaluate one shard of the space, as SHARD_ID/NUM_SHARDS (e.g., 0/4)"),
+    chunk_size: int = typer.Option(None, "--chunk-size", help="Parameter combinations per parallel task"),
+    search_mode: str = typer.Option(None, "--search-mode", help="Search mode: grid or adaptive (successive halving + TPE)"),
+    prune_max_dd: float = typer.Option(None, "--prune-max-dd", help="Abort backtests once drawdown exceeds this %"),
+    prune_equity_floor: float = typer.Option(None, "--prune-equity-floor", help="Abort backtests once equity falls below this % of initial capital"),
+    prune_min_trades: int = typer.Option(None, "--prune-min-trades", help="Abort backtests with fewer entries than this per --prune-window-bars"),
+    prune_window_bars: int = typer.Option(None, "--prune-window-bars", help="Bar window for --prune-min-trades"),
+    verify_pruning: int = typer.Option(0, "--verify-pruning", help="Re-run N pruned backtests fully and check the final filters reject them"),
+    stream: bool = typer.Option(True, "--stream/--no-stream", help="Stream results to a SQLite store in the output directory as they complete"),
+    resume: bool = typer.Option(True, "--resume/--no-resume", help="Skip combinations already in the results store for the same data"),
+    plot_top: int = typer.Option(0, "--plot-top", help="Re-run the top N results in full and save their equity/drawdown plots"),
+    robustness_top: int = typer.Option(0, "--robustness-top", help="Monte Carlo robustness analysis (bootstrap, block bootstrap, slippage) of the top N results"),
 ):
     """
     Run grid search optimization.
     """
+    from .data.loader import create_data_loader
+    from .optimize.grid_search import run_grid_search, open_results_store
+    from .strategy import create_strategy, create_volensy_strategy, create_atr_supertrend_strategy
+    from .strategy.backtester import PruningRules
+    
     config = get_config()
     
     # Parse inputs
@@ -243,6 +265,30 @@ def optimize(
         except Exception as e:
             typer.echo(f"Error parsing parameter string: {e}")
             raise typer.Exit(1)
+    else:
+        param_space = get_param_space()
+        typer.echo(f"Parameter space: {param_space.full_size} combinations")
+        
+        if sample:
+            if sampler == "sobol":
+                param_space = param_space.sample_sobol(sample, seed=seed)
+            elif sampler == "random":
+                param_space = param_space.sample_random(sample, seed=seed)
+            else:
+                typer.echo(f"Error: Unknown sampler '{sampler}'. Available: sobol, random")
+                raise typer.Exit(1)
+            typer.echo(f"Subsampled {len(param_space)} combinations ({sampler}, seed={seed})")
+        
+        if shard:
+            try:
+                shard_id, num_shards = (int(x) for x in shard.split("/"))
+                param_space = param_space.shard(shard_id, num_shards)
+            except ValueError as e:
+                typer.echo(f"Error parsing shard '{shard}': {e}")
+                raise typer.Exit(1)
+            typer.echo(f"Shard {shard_id}/{num_shards}: {len(param_space)} combinations")
+        
+        param_combinations = param_space
     
     typer.echo(f"Starting grid search optimization...")
     typer.echo(f"Strategy: {strategy}")
@@ -252,6 +298,24 @@ def optimize(
     typer.echo(f"Parallel: {parallel}")
     typer.echo(f"Output: {output_dir}")
     
+    if search_mode is None:
+        search_mode = config.optimization.search_mode
+    if search_mode not in ("grid", "adaptive"):
+        typer.echo(f"Error: Unknown search mode '{search_mode}'. Available: grid, adaptive")
+        raise typer.Exit(1)
+    typer.echo(f"Search mode: {search_mode}")
+    
+    # Early-abort rules (CLI values override config)
+    opt = config.optimization
+    pruning = PruningRules(
+        max_drawdown_pct=prune_max_dd if prune_max_dd is not None else opt.prune_max_drawdown_pct,
+        equity_floor_pct=prune_equity_floor if prune_equity_floor is not None else opt.prune_equity_floor_pct,
+        min_trades=prune_min_trades if prune_min_trades is not None else opt.prune_min_trades,
+        trades_window_bars=prune_window_bars if prune_window_bars is not None else opt.prune_trades_window_bars,
+    )
+    if pruning.enabled:
+        typer.echo(f"Pruning: {pruning}")
+    
     # Select strategy factory
     if strategy == "atr_st":
         strategy_factory = create_strategy
@@ -277,11 +341,23 @@ def optimize(
             strategy_factory=strategy_factory,
             max_workers=jobs,
             parallel=parallel,
-            output_dir=output_dir
+            output_dir=output_dir,
+            chunk_size=chunk_size,
+            search_mode=search_mode,
+            pruning=pruning,
+            verify_pruning=verify_pruning,
+            stream_results=stream,
+            resume=resume,
+            plot_top=plot_top,
+            robustness_top=robustness_top
         )
         
         typer.echo(f"\nOptimization completed!")
-        typer.echo(f"Total results: {len(results)}")
+        if stream:
+            with open_results_store(output_dir) as store:
+                typer.echo(f"Total results: {store.count()} (stored in {store.path})")
+        else:
+            typer.echo(f"Total results: {len(results)}")
         
         if results:
             # Show top 5 results
@@ -311,10 +387,16 @@ def walk_forward(
     cache_dir: str = typer.Option(None, "--cache-dir", help="Cache directory"),
     csv_dir: str = typer.Option(None, "--csv", help="CSV fallback directory"),
     param_file: str = typer.Option(None, "--params", "-p", help="JSON file with custom parameters"),
+    search_mode: str = typer.Option(None, "--search-mode", help="Training search mode: grid or adaptive (successive halving + TPE)"),
+    jobs: int = typer.Option(None, "--jobs", "-j", help="Number of parallel jobs"),
+    resume: bool = typer.Option(True, "--resume/--no-resume", help="Skip windows already stored in the output directory"),
 ):
     """
     Run walk-forward analysis.
     """
+    from .data.loader import create_data_loader
+    from .optimize.walk_forward import run_walk_forward
+    
     config = get_config()
     
     # Parse inputs
@@ -347,6 +429,9 @@ def walk_forward(
     if output_dir is None:
         output_dir = "./reports/wf"
     
+    if jobs is None:
+        jobs = config.optimization.default_jobs
+    
     # Validate inputs
     coin_list = validate_coins(coin_list)
     timeframe_list = validate_timeframes(timeframe_list)
@@ -378,6 +463,8 @@ def walk_forward(
     typer.echo(f"Train windows: {train_steps}")
     typer.echo(f"Train window: {train_window_days} days")
     typer.echo(f"Test window: {test_window_days} days")
+    typer.echo(f"Jobs: {jobs}")
+    typer.echo(f"Resume: {resume}")
     typer.echo(f"Output: {output_dir}")
     
     # Create data loader
@@ -391,7 +478,10 @@ def walk_forward(
             symbols=coin_list,
             timeframes=timeframe_list,
             param_combinations=param_combinations,
-            output_dir=output_dir
+            output_dir=output_dir,
+            search_mode=search_mode,
+            max_workers=jobs,
+            resume=resume
         )
         
         typer.echo(f"\nWalk-forward analysis completed!")
@@ -412,6 +502,120 @@ def walk_forward(
         raise typer.Exit(1)
 
 
+@app.command()
+def portfolio(
+    coins: str = typer.Option(None, "--coins", "-c", help="Comma-separated list of coins sharing one account"),
+    timeframe: str = typer.Option("15m", "--timeframe", "-t", help="Timeframe of the common timeline"),
+    strategy: str = typer.Option("atr_st", "--strategy", "-s", help="Strategy to use: atr_st, volensy_macd, or atr_supertrend"),
+    param_file: str = typer.Option(None, "--params", "-p", help="JSON file with parameters, either one set or one set per symbol"),
+    param_string: str = typer.Option(None, "--param-string", help="Single parameter set like 'a=1.5 c=10'"),
+    capital: float = typer.Option(None, "--capital", help="Shared account capital"),
+    max_positions: int = typer.Option(None, "--max-positions", help="Maximum concurrent positions (0 = unlimited)"),
+    max_correlated: int = typer.Option(None, "--max-correlated", help="Maximum same-direction positions per correlation group (0 = unlimited)"),
+    correlation_threshold: float = typer.Option(None, "--correlation-threshold", help="Return correlation that puts symbols in one group"),
+    output_dir: str = typer.Option(None, "--out", "-o", help="Output directory"),
+    cache_dir: str = typer.Option(None, "--cache-dir", help="Cache directory"),
+    csv_dir: str = typer.Option(None, "--csv", help="CSV fallback directory"),
+):
+    """
+    Backtest several symbols on one shared account.
+    """
+    from .data.loader import create_data_loader
+    from .optimize.portfolio import PortfolioBacktester, build_portfolio_signals
+    from .strategy import create_strategy, create_volensy_strategy, create_atr_supertrend_strategy
+    
+    config = get_config()
+    opt = config.optimization
+    
+    if coins:
+        coin_list = [c.strip() for c in coins.split(",")]
+    else:
+        coin_list = config.strategy.default_coins
+    
+    if output_dir is None:
+        output_dir = "./reports/portfolio"
+    
+    coin_list = validate_coins(coin_list)
+    if not coin_list or not validate_timeframes([timeframe]):
+        typer.echo("Error: Invalid coins or timeframe")
+        raise typer.Exit(1)
+    
+    # Select strategy factory
+    if strategy == "atr_st":
+        strategy_factory = create_strategy
+    elif strategy == "volensy_macd":
+        strategy_factory = create_volensy_strategy
+    elif strategy == "atr_supertrend":
+        strategy_factory = create_atr_supertrend_strategy
+    else:
+        typer.echo(f"Error: Unknown strategy '{strategy}'. Available: atr_st, volensy_macd, atr_supertrend")
+        raise typer.Exit(1)
+    
+    params: Dict[str, Any] = {}
+    if param_file:
+        try:
+            with open(param_file, 'r') as f:
+                params = json.load(f)
+        except Exception as e:
+            typer.echo(f"Error loading parameter file: {e}")
+            raise typer.Exit(1)
+    elif param_string:
+        params = parse_param_string(param_string)[0]
+    
+    backtester = PortfolioBacktester(
+        initial_capital=capital if capital is not None else opt.portfolio_capital,
+        fee_bps=config.strategy.fee_bps,
+        slippage_bps=config.strategy.slippage_bps,
+        max_positions=max_positions if max_positions is not None else opt.portfolio_max_positions,
+        max_correlated_positions=max_correlated if max_correlated is not None else opt.portfolio_max_correlated,
+        correlation_threshold=correlation_threshold if correlation_threshold is not None else opt.portfolio_correlation_threshold,
+    )
+    
+    typer.echo(f"Starting portfolio backtest...")
+    typer.echo(f"Strategy: {strategy}")
+    typer.echo(f"Coins: {coin_list}")
+    typer.echo(f"Timeframe: {timeframe}")
+    typer.echo(f"Capital: {backtester.initial_capital}")
+    
+    loader = create_data_loader(cache_dir)
+    if csv_dir:
+        loader.set_csv_fallback(csv_dir)
+    
+    try:
+        data = {symbol: loader.get_ohlcv(symbol, timeframe) for symbol in coin_list}
+        data = {symbol: frame for symbol, frame in data.items() if not frame.empty}
+        if not data:
+            typer.echo("Error: No data for any coin")
+            raise typer.Exit(1)
+        
+        signals = build_portfolio_signals(data, strategy_factory, params)
+        result = backtester.run_backtest(data, signals)
+        
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        result.trades.to_csv(output_path / "portfolio_trades.csv", index=False)
+        result.equity_curve.rename('equity').to_csv(output_path / "portfolio_equity.csv")
+        result.symbol_summary.to_csv(output_path / "portfolio_symbols.csv")
+        with open(output_path / "portfolio_summary.json", 'w') as f:
+            json.dump({'metrics': result.metrics, 'rejected': result.rejected, 'groups': result.groups,
+                       'params': params, 'timeframe': timeframe}, f, indent=2, default=str)
+        
+        metrics = result.metrics
+        typer.echo(f"\nPortfolio backtest completed!")
+        typer.echo(f"Trades: {len(result.trades)}, rejected entries: {result.rejected}")
+        typer.echo(f"Return: {metrics.get('total_return_pct', 0):.2f}%, "
+                  f"DD: {metrics.get('max_drawdown_pct', 0):.2f}%, "
+                  f"PF: {metrics.get('profit_factor', 0):.2f}, "
+                  f"Max open positions: {metrics.get('max_open_positions', 0)}")
+        typer.echo(f"Results saved to {output_dir}")
+        
+    except typer.Exit:
+        raise
+    except Exception as e:
+        typer.echo(f"Error during portfolio backtest: {e}")
+        raise typer.Exit(1)
+
+
 @app.command()
 def report(
     input_dir: str = typer.Option(None, "--in", "-i", help="Input directory with results"),
@@ -423,6 +627,10 @@ def report(
     """
     Generate reports and visualizations from optimization results.
     """
+    from .optimize.grid_search import RESULTS_STORE_FILE, open_results_store
+    from .optimize.robustness import ROBUSTNESS_FILE, load_robustness
+    from .reporting.reporter import create_reporter
+    
     if input_dir is None:
         input_dir = "./reports/grid"
     
@@ -441,8 +649,9 @@ def report(
     typer.echo(f"Top results: {top}")
     typer.echo(f"Generate plots: {plots}")
     
-    # Find results files
-    results_file = input_path / "grid_search_results.json"
+    # Find results files (a streamed results store takes precedence)
+    store_file = input_path / RESULTS_STORE_FILE
+    results_file = store_file if store_file.exists() else input_path / "grid_search_results.json"
     wf_results_file = input_path / "walk_forward_results.json"
     
     if not results_file.exists():
@@ -450,14 +659,29 @@ def report(
         raise typer.Exit(1)
     
     # Load results
+    store = None
     try:
-        with open(results_file, 'r') as f:
-            results = json.load(f)
-        typer.echo(f"Loaded {len(results)} grid search results")
+        if results_file == store_file:
+            store = open_results_store(input_path)
+            results = store
+            typer.echo(f"Opened results store with {store.count()} grid search results")
+        else:
+            with open(results_file, 'r') as f:
+                results = json.load(f)
+            typer.echo(f"Loaded {len(results)} grid search results")
     except Exception as e:
         typer.echo(f"Error loading results: {e}")
         raise typer.Exit(1)
     
+    search_stats = None
+    summary_file = input_path / "grid_search_summary.json"
+    if summary_file.exists():
+        try:
+            with open(summary_file, 'r') as f:
+                search_stats = json.load(f).get('search_space')
+        except Exception as e:
+            typer.echo(f"Warning: Could not load search space summary: {e}")
+    
     wf_results = None
     if wf_results_file.exists():
         try:
@@ -467,19 +691,43 @@ def report(
         except Exception as e:
             typer.echo(f"Warning: Could not load walk-forward results: {e}")
     
+    robustness = None
+    robustness_file = input_path / ROBUSTNESS_FILE
+    if robustness_file.exists():
+        try:
+            robustness = load_robustness(str(robustness_file))
+            typer.echo(f"Loaded robustness analysis for {len(robustness)} results")
+        except Exception as e:
+            typer.echo(f"Warning: Could not load robustness analysis: {e}")
+    
     # Generate reports
     try:
         reporter = create_reporter(str(output_path))
-        reporter.save_summary_tables(results, wf_results, "optimization_report")
+        reporter.save_summary_tables(results, wf_results, "optimization_report", search_stats, robustness)
         typer.echo("Summary tables generated")
         
+        if search_stats and search_stats.get('skipped_combinations'):
+            typer.echo(f"Redundant evaluations saved: {search_stats['skipped_combinations']}/"
+                      f"{search_stats['total_combinations']} ({search_stats['skipped_pct']:.1f}%)")
+        if search_stats and search_stats.get('startup'):
+            startup = search_stats['startup']
+            typer.echo(f"Worker startup: {startup['workers']} workers in {startup['pool_startup_seconds']:.2f}s "
+                      f"(kernel warm-up {startup['kernel_warmup_seconds']:.2f}s)")
+        
         if plots:
+            from .reporting.plots import create_visualizer
+            
+            # Plots take result dicts; from a store only the best ones are loaded
+            plot_results = store.get_top_results(PLOT_RESULTS_LIMIT) if store is not None else results
             visualizer = create_visualizer(str(output_path))
-            visualizer.save_all_plots(results, wf_results, "optimization_plots")
+            visualizer.save_all_plots(plot_results, wf_results, "optimization_plots")
             typer.echo("Plots generated")
         
         # Show top results
-        sorted_results = sorted(results, key=lambda x: x.get('metrics', {}).get('profit_factor', 0), reverse=True)
+        if store is not None:
+            sorted_results = store.get_top_results(top)
+        else:
+            sorted_results = sorted(results, key=lambda x: x.get('metrics', {}).get('profit_factor', 0), reverse=True)
         typer.echo(f"\nTop {top} results:")
         for i, result in enumerate(sorted_results[:top]):
             metrics = result.get('metrics', {})
@@ -538,6 +786,9 @@ def clear_cache(
     """
     Clear cached data.
     """
+    # The cache alone; a data loader would also import ccxt and connect to the exchange
+    from .data.cache import DataCache
+    
     config = get_config()
     
     if cache_dir is None:
@@ -546,8 +797,7 @@ def clear_cache(
     typer.echo(f"Clearing cache in {cache_dir}")
     
     try:
-        loader = create_data_loader(cache_dir)
-        loader.clear_cache(symbol, timeframe)
+        DataCache(cache_dir).clear_cache(symbol, timeframe)
         
         if symbol and timeframe:
             typer.echo(f"Cleared cache for {symbol} {timeframe}")
@@ -564,6 +814,8 @@ def nasdaq_symbols():
     """
     List available NASDAQ symbols.
     """
+    from .data.nasdaq_provider import get_nasdaq_symbols, get_high_volume_symbols
+    
     symbols = get_nasdaq_symbols()
     high_volume = get_high_volume_symbols()
     
@@ -586,12 +838,16 @@ def nasdaq_optimize(
     period: str = typer.Option("2y", "--period", "-p", help="Data period (1y, 2y, 5y)"),
     interval: str = typer.Option("1d", "--interval", "-i", help="Data interval (1d, 1h, 4h)"),
     max_workers: int = typer.Option(4, "--workers", "-w", help="Number of parallel workers"),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Worker processes for symbol/parameter chunks (1 = threads only)"),
     output_dir: str = typer.Option("./reports/nasdaq", "--out", "-o", help="Output directory"),
     compare: bool = typer.Option(False, "--compare", help="Compare with predefined parameters"),
 ):
     """
     Optimize ATR SuperTrend strategy for NASDAQ stocks.
     """
+    from .optimize.nasdaq_optimizer import NASDAQOptimizer
+    from .data.nasdaq_provider import get_high_volume_symbols
+    
     optimizer = NASDAQOptimizer()
     
     # Determine symbols to optimize
@@ -612,6 +868,7 @@ def nasdaq_optimize(
     typer.echo(f"Period: {period}")
     typer.echo(f"Interval: {interval}")
     typer.echo(f"Workers: {max_workers}")
+    typer.echo(f"Jobs: {jobs}")
     typer.echo(f"Output: {output_dir}")
     
     if compare:
@@ -630,18 +887,19 @@ def nasdaq_optimize(
         # Run optimization
         try:
             if len(symbol_list) == 1:
-                result = optimizer.optimize_single_symbol(symbol_list[0], period, interval, max_workers)
+                result = optimizer.optimize_single_symbol(symbol_list[0], period, interval, max_workers, jobs=jobs)
                 if result:
                     typer.echo(f"\nOptimization completed for {result.symbol}")
                     typer.echo(f"Best Sharpe Ratio: {result.best_score:.4f}")
                     typer.echo(f"Best Parameters: {result.best_params}")
                     typer.echo(f"Execution Time: {result.execution_time:.2f} seconds")
                     typer.echo(f"Total Tests: {result.total_tests}")
+                    typer.echo(f"Skipped Redundant Tests: {result.skipped_tests}")
                     
                     # Generate report
                     optimizer.generate_report({result.symbol: result}, output_dir)
             else:
-                results = optimizer.optimize_multiple_symbols(symbol_list, period, interval, max_workers)
+                results = optimizer.optimize_multiple_symbols(symbol_list, period, interval, max_workers, jobs=jobs)
                 if results:
                     typer.echo(f"\nOptimization completed for {len(results)} symbols")
                     
@@ -669,6 +927,8 @@ def nasdaq_data(
     """
     Fetch NASDAQ stock data.
     """
+    from .data.nasdaq_provider import NASDAQDataProvider
+    
     provider = NASDAQDataProvider()
     
     if info and symbol:
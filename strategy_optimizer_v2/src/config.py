@@ -22,6 +22,16 @@ class DataConfig(BaseSettings):
     
     cache_dir: str = Field(default="./cache", description="Cache directory")
     cache_ttl_hours: int = Field(default=24, description="Cache TTL in hours")
+    cache_partition_period: str = Field(default="M", description="Partition period of compacted cache files (M or Y)")
+    cache_max_partitions: int = Field(default=8, description="Appended partitions before a background compaction")
+    cache_format: str = Field(default="parquet", description="Cache file format: parquet or feather (memory-mapped Arrow IPC)")
+    ohlcv_dtype: str = Field(default="float64", description="OHLCV dtype returned by DataLoader: float64 or float32")
+    
+    # Concurrent fetching
+    fetch_workers: int = Field(default=8, description="Symbols fetched concurrently")
+    fetch_weight_per_minute: float = Field(default=2400, description="Exchange request weight budget per minute")
+    fetch_ohlcv_weight: float = Field(default=2, description="Request weight of one OHLCV page")
+    fetch_page_limit: int = Field(default=1000, description="Candles requested per OHLCV page")
     
     class Config:
         env_prefix = ""
@@ -59,6 +69,22 @@ class StrategyConfig(BaseSettings):
         description="Parameter space for optimization"
     )
     
+    # Parameter dependencies: a parameter only affects the strategy when the
+    # listed parameters have the given values. Combinations that differ only
+    # in inactive parameters are backtested once.
+    param_conditions: Dict[str, Dict[str, Any]] = Field(
+        default={
+            "trailing_stop_mult": {"use_trailing_stop": True},
+            "ema_fast_len": {"use_ema_confirmation": True},
+            "ema_slow_len": {"use_ema_confirmation": True},
+        },
+        description="Parameter dependencies for canonicalizing the search space"
+    )
+    param_constraints: List[str] = Field(
+        default=["ema_fast_len < ema_slow_len"],
+        description="Constraint expressions every evaluated combination must satisfy"
+    )
+    
     # Trailing stop parameters
     use_trailing_stop: bool = Field(default=True, description="Use trailing stop")
     trailing_stop_mult: float = Field(default=1.0, description="Trailing stop multiplier")
@@ -70,6 +96,10 @@ class StrategyConfig(BaseSettings):
     post_confirm_bars: int = Field(default=5, description="Post-confirm window bars")
     use_ema_confirmation: bool = Field(default=True, description="Use EMA confirmation")
     
+    # Trading costs
+    fee_bps: float = Field(default=10.0, description="Fee in basis points")
+    slippage_bps: float = Field(default=5.0, description="Slippage in basis points")
+    
     class Config:
         env_prefix = ""
 
@@ -86,6 +116,40 @@ class OptimizationConfig(BaseSettings):
     train_window_days: int = Field(default=90, description="Training window size in days")
     test_window_days: int = Field(default=30, description="Test window size in days")
     overlap_days: int = Field(default=0, description="Overlap between windows in days")
+    wf_warmup_bars: int = Field(default=100, description="Bars reserved for indicator warm-up before the first window")
+    
+    # Adaptive search configuration
+    search_mode: str = Field(default="grid", description="Search mode: grid or adaptive")
+    adaptive_candidates: int = Field(default=81, description="Candidates entering each successive halving bracket")
+    adaptive_eta: int = Field(default=3, description="Keep the top 1/eta candidates at each rung")
+    adaptive_min_fraction: float = Field(default=1 / 9, description="Data fraction of the first rung")
+    adaptive_brackets: int = Field(default=3, description="Brackets (first sampled, rest TPE-proposed)")
+    adaptive_min_bars: int = Field(default=200, description="Minimum bars in a partial-data rung")
+    adaptive_min_trades: int = Field(default=1, description="Minimum trades for a candidate to be promoted")
+    adaptive_seed: int = Field(default=42, description="Adaptive search random seed")
+    
+    # Early-abort rules for optimization backtests (disabled when None/0)
+    prune_max_drawdown_pct: Optional[float] = Field(default=None, description="Abort a backtest once drawdown exceeds this %")
+    prune_equity_floor_pct: Optional[float] = Field(default=None, description="Abort once equity falls below this % of initial capital")
+    prune_min_trades: int = Field(default=0, description="Abort unless at least this many entries per prune_trades_window_bars")
+    prune_trades_window_bars: int = Field(default=0, description="Bar window for the minimum trade-rate rule")
+    
+    # Optimization backtests keep metrics only; top results are re-run in full on demand
+    compact_backtests: bool = Field(default=True, description="Skip trade lists and equity curves in optimization backtests")
+    backtest_batch_size: int = Field(default=16, description="Combinations backtested together in one data pass (compact backtests; 1 = one at a time)")
+    
+    # Monte Carlo robustness analysis of top results
+    mc_paths: int = Field(default=10000, description="Simulated paths per robustness test")
+    mc_confidence: float = Field(default=0.9, description="Confidence interval coverage")
+    mc_block_days: int = Field(default=5, description="Days per block in the returns block bootstrap")
+    mc_slippage_bps: float = Field(default=5.0, description="Mean extra slippage per trade in slippage perturbations")
+    mc_seed: int = Field(default=42, description="Robustness analysis random seed")
+    
+    # Shared-capital portfolio backtests (0 = unlimited)
+    portfolio_capital: float = Field(default=10000.0, description="Shared account capital of portfolio backtests")
+    portfolio_max_positions: int = Field(default=0, description="Maximum concurrent positions across the portfolio")
+    portfolio_max_correlated: int = Field(default=0, description="Maximum same-direction positions per correlation group")
+    portfolio_correlation_threshold: float = Field(default=0.8, description="Return correlation that puts symbols in one group")
     
     class Config:
         env_prefix = ""
@@ -242,19 +306,30 @@ def validate_timeframes(timeframes: List[str]) -> List[str]:
     return valid_timeframes
 
 
-def get_param_combinations() -> List[Dict[str, Any]]:
-    """Generate all parameter combinations for grid search."""
-    import itertools
+def get_param_space():
+    """
+    Get the configured parameter space as a lazy, indexable enumerator.
     
-    param_space = config.strategy.param_space
-    param_names = list(param_space.keys())
-    param_values = list(param_space.values())
+    Returns:
+        ParamSpace over config.strategy.param_space
+    """
+    from .optimize.param_space import ParamSpace
     
-    combinations = []
-    for combo in itertools.product(*param_values):
-        combinations.append(dict(zip(param_names, combo)))
+    return ParamSpace(
+        config.strategy.param_space,
+        conditions=config.strategy.param_conditions,
+        constraints=config.strategy.param_constraints,
+    )
+
+
+def get_param_combinations() -> List[Dict[str, Any]]:
+    """
+    Generate all parameter combinations for grid search.
     
-    return combinations
+    This materializes the full Cartesian product; prefer get_param_space()
+    for large spaces.
+    """
+    return get_param_space().to_list()
 
 
 def get_wf_windows(total_days: int) -> List[Dict[str, Any]]:
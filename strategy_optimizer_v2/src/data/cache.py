@@ -6,10 +6,14 @@ import pandas as pd
 import numpy as np
 from typing import List, Optional, Dict, Any, Tuple
 import os
+import json
+import shutil
+import threading
 from pathlib import Path
 import logging
 from datetime import datetime, timedelta
 import pyarrow as pa
+import pyarrow.feather as feather
 import pyarrow.parquet as pq
 import hashlib
 
@@ -17,29 +21,97 @@ from ..config import get_config
 
 logger = logging.getLogger(__name__)
 
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def to_milliseconds(ts: Any) -> Optional[int]:
+    """
+    Convert a datetime-like value to epoch milliseconds.
+    
+    Naive values are taken as UTC, matching how cached timestamps are stored.
+    Values outside the pandas range (datetime.min/max) map to None (unbounded).
+    
+    Args:
+        ts: Datetime, Timestamp, or None
+        
+    Returns:
+        Milliseconds since epoch or None
+    """
+    if ts is None:
+        return None
+    try:
+        ts = pd.Timestamp(ts)
+    except (pd.errors.OutOfBoundsDatetime, OverflowError, ValueError):
+        return None
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return ts.value // 10**6
+
 
 class DataCache:
-    """Cache for OHLCV data using Parquet format."""
+    """
+    Cache for OHLCV data using partitioned Parquet or Arrow IPC storage.
+    
+    Each symbol/timeframe is a directory of partitions listed in the
+    metadata with the time range they cover. New candles are appended as a
+    small partition holding only the tail; once too many partitions pile up
+    they are compacted in a background thread into one file per calendar
+    period. Date-range reads open only the partitions overlapping the range.
+    
+    In 'feather' format partitions are uncompressed Arrow IPC files that are
+    memory-mapped on read, so worker processes loading the same series share
+    the OS page cache instead of each holding a decoded copy. A read served
+    by a single partition is zero-copy; use partition period 'all' to keep a
+    series in one file.
+    """
     
-    def __init__(self, cache_dir: str = "./cache"):
+    def __init__(self, cache_dir: str = "./cache", partition_period: Optional[str] = None,
+                 max_partitions: Optional[int] = None, storage_format: Optional[str] = None):
         """
         Initialize data cache.
         
         Args:
             cache_dir: Directory to store cache files
+            partition_period: Period of compacted partitions ('M', 'Y' or 'all', default from config)
+            max_partitions: Partitions per series before a background compaction (default from config)
+            storage_format: 'parquet' or 'feather' (memory-mapped Arrow IPC, default from config)
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        config = get_config().data
+        self.partition_period = partition_period or config.cache_partition_period
+        self.max_partitions = max_partitions if max_partitions is not None else config.cache_max_partitions
+        self.storage_format = storage_format or config.cache_format
+        if self.storage_format not in ('parquet', 'feather'):
+            raise ValueError(f"Unknown cache format: {self.storage_format}")
+        
+        # Guards metadata and partition files across compaction threads
+        self._lock = threading.RLock()
+        self._compactions: Dict[str, threading.Thread] = {}
+        
         # Cache metadata file
         self.metadata_file = self.cache_dir / "metadata.json"
         self.metadata = self._load_metadata()
     
+    def __getstate__(self) -> Dict[str, Any]:
+        # A cache held by an optimizer is pickled into its worker processes;
+        # the lock and compaction threads stay here and the metadata is read
+        # back from disk, where compactions publish their partitions
+        state = self.__dict__.copy()
+        del state['_lock'], state['_compactions'], state['metadata']
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self._compactions = {}
+        self.metadata = self._load_metadata()
+    
     def _load_metadata(self) -> Dict[str, Any]:
         """Load cache metadata."""
         if self.metadata_file.exists():
             try:
-                import json
                 with open(self.metadata_file, 'r') as f:
                     return json.load(f)
             except Exception as e:
@@ -50,9 +122,10 @@ class DataCache:
     def _save_metadata(self):
         """Save cache metadata."""
         try:
-            import json
-            with open(self.metadata_file, 'w') as f:
+            tmp_file = self.metadata_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
                 json.dump(self.metadata, f, indent=2)
+            os.replace(tmp_file, self.metadata_file)
         except Exception as e:
             logger.error(f"Failed to save cache metadata: {e}")
     
@@ -62,53 +135,241 @@ class DataCache:
         return hashlib.md5(key_string.encode()).hexdigest()
     
     def _get_cache_file(self, symbol: str, timeframe: str) -> Path:
-        """Get cache file path for symbol and timeframe."""
+        """Get legacy single-file cache path for symbol and timeframe."""
         cache_key = self._get_cache_key(symbol, timeframe)
         return self.cache_dir / f"{cache_key}.parquet"
     
-    def _is_cache_valid(self, symbol: str, timeframe: str, max_age_hours: int = 24) -> bool:
-        """Check if cache is valid."""
-        cache_file = self._get_cache_file(symbol, timeframe)
+    def _get_partition_dir(self, symbol: str, timeframe: str) -> Path:
+        """Get partition directory for symbol and timeframe."""
+        return self.cache_dir / self._get_cache_key(symbol, timeframe)
+    
+    def _get_entry(self, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
+        """Get the metadata entry of a series, migrating a legacy single file."""
+        cache_key = self._get_cache_key(symbol, timeframe)
+        entry = self.metadata.get(cache_key)
+        
+        if entry is not None and 'partitions' not in entry:
+            legacy_file = self._get_cache_file(symbol, timeframe)
+            if not legacy_file.exists():
+                return None
+            
+            df = pd.read_parquet(legacy_file)
+            df.columns = ['timestamp'] + OHLCV_COLUMNS
+            df = df.drop_duplicates('timestamp', keep='last').sort_values('timestamp', kind='stable')
+            entry.update({'tz': None, 'next_seq': 0, 'partitions': []})
+            self._add_partition(symbol, timeframe, entry, df)
+            self._update_summary(entry)
+            legacy_file.unlink()
+            self._save_metadata()
+            logger.info(f"Migrated cache for {symbol} {timeframe} to partitioned storage")
         
-        if not cache_file.exists():
-            return False
+        return entry
+    
+    def _to_records(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Convert an OHLCV DataFrame to stored form (millisecond timestamps)."""
+        df = data[OHLCV_COLUMNS].astype('float64')
+        index = data.index
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        df.insert(0, 'timestamp', index.values.astype('datetime64[ms]').astype('int64'))
+        return df.reset_index(drop=True)
+    
+    def _from_records(self, table: pa.Table, tz: Optional[str],
+                      dtype: Optional[str] = None) -> pd.DataFrame:
+        """
+        Convert stored records back to an OHLCV DataFrame.
         
-        # Check file age
-        file_age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
-        if file_age.total_seconds() > max_age_hours * 3600:
-            return False
+        Single-chunk columns of a memory-mapped table are wrapped without
+        copying (the resulting arrays are read-only views of the page cache).
+        Only the timestamp index and an explicit dtype cast allocate memory.
+        """
+        index = pd.to_datetime(table.column('timestamp').to_numpy(), unit='ms', utc=tz is not None)
+        if tz is not None and tz != 'UTC':
+            index = index.tz_convert(tz)
+        index = pd.DatetimeIndex(index, name='timestamp')
         
-        # Check metadata
-        cache_key = self._get_cache_key(symbol, timeframe)
-        if cache_key not in self.metadata:
-            return False
+        columns = {}
+        for col in OHLCV_COLUMNS:
+            values = table.column(col).to_numpy()
+            if dtype is not None and values.dtype != dtype:
+                values = values.astype(dtype)
+            columns[col] = values
+        return pd.DataFrame(columns, index=index, copy=False)
+    
+    def _add_partition(self, symbol: str, timeframe: str, entry: Dict[str, Any],
+                       records: pd.DataFrame) -> Dict[str, Any]:
+        """Write records as a new partition and append it to the entry."""
+        partition_dir = self._get_partition_dir(symbol, timeframe)
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        
+        suffix = 'arrow' if self.storage_format == 'feather' else 'parquet'
+        file_name = f"part-{entry['next_seq']:06d}.{suffix}"
+        entry['next_seq'] += 1
+        if self.storage_format == 'feather':
+            # Uncompressed, single record batch so reads map columns without copying
+            table = pa.Table.from_pandas(records, preserve_index=False)
+            feather.write_feather(table, partition_dir / file_name, compression='uncompressed',
+                                  chunksize=max(len(records), 1))
+        else:
+            records.to_parquet(partition_dir / file_name, index=False)
+        
+        partition = {
+            'file': file_name,
+            'start': int(records['timestamp'].iloc[0]),
+            'end': int(records['timestamp'].iloc[-1]),
+            'rows': len(records),
+        }
+        entry['partitions'].append(partition)
+        return partition
+    
+    def _periods(self, records: pd.DataFrame) -> pd.Series:
+        """Calendar period of each stored record."""
+        if self.partition_period == 'all':
+            return pd.Series(0, index=records.index)
+        return pd.to_datetime(records['timestamp'], unit='ms').dt.to_period(self.partition_period)
+    
+    def _write_periods(self, symbol: str, timeframe: str, entry: Dict[str, Any],
+                       records: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Write sorted, deduplicated records as one partition per calendar period."""
+        periods = self._periods(records)
+        return [self._add_partition(symbol, timeframe, entry, group)
+                for _, group in records.groupby(periods.values, sort=True)]
+    
+    def _update_summary(self, entry: Dict[str, Any]):
+        """Refresh the range and row summary of an entry."""
+        partitions = entry['partitions']
+        start = min(p['start'] for p in partitions)
+        end = max(p['end'] for p in partitions)
+        entry['last_timestamp'] = end
+        entry['start_date'] = pd.Timestamp(start, unit='ms').isoformat()
+        entry['end_date'] = pd.Timestamp(end, unit='ms').isoformat()
+    
+    def _read_table(self, path: Path, start_ms: Optional[int] = None,
+                    end_ms: Optional[int] = None) -> pa.Table:
+        """Read one partition, memory-mapping Arrow IPC files."""
+        if path.suffix == '.arrow':
+            table = pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+            if start_ms is None and end_ms is None:
+                return table
+            
+            # Partitions are sorted, so the range is a zero-copy slice
+            timestamps = table.column('timestamp').to_numpy()
+            lo = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms, side='left'))
+            hi = len(timestamps) if end_ms is None else int(np.searchsorted(timestamps, end_ms, side='right'))
+            return table.slice(lo, hi - lo)
+        
+        filters = []
+        if start_ms is not None:
+            filters.append(('timestamp', '>=', start_ms))
+        if end_ms is not None:
+            filters.append(('timestamp', '<=', end_ms))
+        return pq.read_table(path, filters=filters or None)
+    
+    def _read_partitions(self, symbol: str, timeframe: str, partitions: List[Dict[str, Any]],
+                         start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> pa.Table:
+        """Read partitions (oldest first) into a deduplicated, sorted table."""
+        partition_dir = self._get_partition_dir(symbol, timeframe)
+        tables = [self._read_table(partition_dir / p['file'], start_ms, end_ms) for p in partitions]
+        tables = [table.select(['timestamp'] + OHLCV_COLUMNS) for table in tables if table.num_rows > 0]
+        if not tables:
+            return pa.table({'timestamp': pa.array([], pa.int64()),
+                             **{col: pa.array([], pa.float64()) for col in OHLCV_COLUMNS}})
+        if len(tables) == 1:
+            return tables[0]
+        
+        table = pa.concat_tables(tables, promote_options='permissive').combine_chunks()
+        timestamps = table.column('timestamp').to_numpy()
+        if np.all(np.diff(timestamps) > 0):
+            return table
         
-        return True
+        # Later partitions win on duplicate timestamps (re-fetched last candle)
+        reversed_ts = timestamps[::-1]
+        _, first_in_reversed = np.unique(reversed_ts, return_index=True)
+        keep = len(timestamps) - 1 - first_in_reversed
+        return table.take(pa.array(keep))
     
-    def get_cached_data(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+    def _is_cache_valid(self, symbol: str, timeframe: str, max_age_hours: int = 24) -> bool:
+        """Check if cache is valid."""
+        return self.is_fresh(symbol, timeframe, max_age_hours)
+    
+    def is_fresh(self, symbol: str, timeframe: str, max_age_hours: int = 24) -> bool:
+        """
+        Check if cached data exists and was written within max_age_hours.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            max_age_hours: Maximum age of the last write
+            
+        Returns:
+            True if the cache is fresh
+        """
+        with self._lock:
+            entry = self._get_entry(symbol, timeframe)
+            if entry is None or not entry['partitions']:
+                return False
+            
+            cached_at = datetime.fromisoformat(entry['cached_at'])
+            return (datetime.now() - cached_at).total_seconds() <= max_age_hours * 3600
+    
+    def get_last_timestamp(self, symbol: str, timeframe: str) -> Optional[pd.Timestamp]:
+        """
+        Get the timestamp of the last cached candle.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            
+        Returns:
+            Timestamp of the last candle (in the cached timezone) or None
+        """
+        with self._lock:
+            entry = self._get_entry(symbol, timeframe)
+            if entry is None or not entry['partitions']:
+                return None
+            
+            last = pd.Timestamp(entry['last_timestamp'], unit='ms')
+            if entry.get('tz') is not None:
+                last = last.tz_localize('UTC').tz_convert(entry['tz'])
+            return last
+    
+    def get_cached_data(self, symbol: str, timeframe: str, start: Optional[datetime] = None,
+                        end: Optional[datetime] = None, max_age_hours: Optional[int] = None,
+                        dtype: Optional[str] = None) -> Optional[pd.DataFrame]:
         """
         Get cached data for symbol and timeframe.
         
         Args:
             symbol: Trading pair symbol
             timeframe: Timeframe
+            start: Only return candles at or after this time (optional)
+            end: Only return candles at or before this time (optional)
+            max_age_hours: Treat the cache as missing if written longer ago (optional)
+            dtype: OHLCV dtype, e.g. 'float32' (optional, stored dtype by default)
             
         Returns:
             Cached DataFrame or None if not available
         """
-        if not self._is_cache_valid(symbol, timeframe):
+        if max_age_hours is not None and not self._is_cache_valid(symbol, timeframe, max_age_hours):
             return None
         
         try:
-            cache_file = self._get_cache_file(symbol, timeframe)
-            df = pd.read_parquet(cache_file)
-            
-            # Ensure proper column names and types
-            df.columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            with self._lock:
+                entry = self._get_entry(symbol, timeframe)
+                if entry is None or not entry['partitions']:
+                    return None
+                
+                start_ms = to_milliseconds(start)
+                end_ms = to_milliseconds(end)
+                partitions = [
+                    p for p in entry['partitions']
+                    if (start_ms is None or p['end'] >= start_ms) and (end_ms is None or p['start'] <= end_ms)
+                ]
+                records = self._read_partitions(symbol, timeframe, partitions, start_ms, end_ms)
+                df = self._from_records(records, entry.get('tz'), dtype)
             
-            logger.info(f"Loaded cached data for {symbol} {timeframe}: {len(df)} candles")
+            logger.info(f"Loaded cached data for {symbol} {timeframe}: {len(df)} candles "
+                       f"from {len(partitions)}/{len(entry['partitions'])} partitions")
             return df
             
         except Exception as e:
@@ -117,7 +378,7 @@ class DataCache:
     
     def save_data(self, symbol: str, timeframe: str, data: pd.DataFrame):
         """
-        Save data to cache.
+        Save data to cache, replacing any cached candles.
         
         Args:
             symbol: Trading pair symbol
@@ -125,37 +386,176 @@ class DataCache:
             data: DataFrame with OHLCV data
         """
         try:
-            cache_file = self._get_cache_file(symbol, timeframe)
+            records = self._to_records(data)
+            records = records.drop_duplicates('timestamp', keep='last').sort_values('timestamp', kind='stable')
             
-            # Prepare data for saving
-            df_to_save = data.copy()
-            df_to_save.reset_index(inplace=True)
-            df_to_save['timestamp'] = df_to_save['timestamp'].astype('int64') // 10**6  # Convert to milliseconds
+            with self._lock:
+                cache_key = self._get_cache_key(symbol, timeframe)
+                old_entry = self._get_entry(symbol, timeframe)
+                
+                entry = {
+                    'symbol': symbol,
+                    'timeframe': timeframe,
+                    'cached_at': datetime.now().isoformat(),
+                    'rows': len(records),
+                    'tz': str(data.index.tz) if data.index.tz is not None else None,
+                    'next_seq': old_entry['next_seq'] if old_entry else 0,
+                    'partitions': [],
+                }
+                self._write_periods(symbol, timeframe, entry, records)
+                self._update_summary(entry)
+                
+                self.metadata[cache_key] = entry
+                self._save_metadata()
+                if old_entry:
+                    self._remove_partition_files(symbol, timeframe, old_entry['partitions'])
             
-            # Save to parquet
-            df_to_save.to_parquet(cache_file, index=False)
+            logger.info(f"Saved {len(records)} candles to cache for {symbol} {timeframe}")
             
-            # Update metadata
-            cache_key = self._get_cache_key(symbol, timeframe)
-            self.metadata[cache_key] = {
-                'symbol': symbol,
-                'timeframe': timeframe,
-                'cached_at': datetime.now().isoformat(),
-                'rows': len(data),
-                'start_date': data.index.min().isoformat(),
-                'end_date': data.index.max().isoformat(),
-            }
+        except Exception as e:
+            logger.error(f"Failed to save data to cache for {symbol} {timeframe}: {e}")
+    
+    def append_data(self, symbol: str, timeframe: str, data: pd.DataFrame) -> int:
+        """
+        Append fresh candles to the cache as a new partition.
+        
+        Candles older than the last cached one are ignored; a candle with the
+        same timestamp replaces it (the last candle may have been stored while
+        still forming). Starts a background compaction once the series has
+        more than ``max_partitions`` partitions.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            data: DataFrame with OHLCV data
             
+        Returns:
+            Number of new candles
+        """
+        if data.empty:
+            return 0
+        
+        with self._lock:
+            entry = self._get_entry(symbol, timeframe)
+            if entry is None or not entry['partitions']:
+                self.save_data(symbol, timeframe, data)
+                return len(data)
+            
+            records = self._to_records(data)
+            records = records.drop_duplicates('timestamp', keep='last').sort_values('timestamp', kind='stable')
+            last = entry['last_timestamp']
+            records = records[records['timestamp'] >= last]
+            if records.empty:
+                return 0
+            
+            new_rows = int((records['timestamp'] > last).sum())
+            self._add_partition(symbol, timeframe, entry, records)
+            entry['rows'] += new_rows
+            entry['cached_at'] = datetime.now().isoformat()
+            self._update_summary(entry)
             self._save_metadata()
             
-            logger.info(f"Saved {len(data)} candles to cache for {symbol} {timeframe}")
+            n_partitions = len(entry['partitions'])
+        
+        logger.info(f"Appended {new_rows} candles to cache for {symbol} {timeframe}")
+        
+        if n_partitions > self.max_partitions:
+            self.compact_async(symbol, timeframe)
+        
+        return new_rows
+    
+    def compact(self, symbol: str, timeframe: str) -> int:
+        """
+        Merge the partitions of a series into one partition per calendar period.
+        
+        Partitions appended while compaction runs are kept after the
+        compacted ones, so their candles still take precedence. If the series
+        is replaced or cleared meanwhile, the compacted files are discarded.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
             
-        except Exception as e:
-            logger.error(f"Failed to save data to cache for {symbol} {timeframe}: {e}")
+        Returns:
+            Number of partitions after compaction
+        """
+        cache_key = self._get_cache_key(symbol, timeframe)
+        with self._lock:
+            entry = self._get_entry(symbol, timeframe)
+            if entry is None or not entry['partitions']:
+                return 0
+            snapshot = list(entry['partitions'])
+            records = self._read_partitions(symbol, timeframe, snapshot).to_pandas()
+            
+            # Reserve file names so appends during compaction cannot collide
+            staging = {'next_seq': entry['next_seq'], 'partitions': []}
+            entry['next_seq'] += self._periods(records).nunique()
+        
+        # Write the compacted files without holding the lock, then swap them in
+        self._write_periods(symbol, timeframe, staging, records)
+        
+        with self._lock:
+            current = self.metadata.get(cache_key)
+            if current is not entry:
+                # save_data or clear_cache swapped the entry; its files are not ours
+                self._remove_partition_files(symbol, timeframe, staging['partitions'])
+                logger.info(f"Discarded compaction of {symbol} {timeframe}: the series was replaced")
+                return len(current['partitions']) if current else 0
+            compacted = {p['file'] for p in snapshot}
+            entry['partitions'] = staging['partitions'] + [
+                p for p in entry['partitions'] if p['file'] not in compacted
+            ]
+            self._save_metadata()
+            self._remove_partition_files(symbol, timeframe, snapshot)
+            n_partitions = len(entry['partitions'])
+        
+        logger.info(f"Compacted cache for {symbol} {timeframe}: {len(snapshot)} -> {n_partitions} partitions")
+        return n_partitions
+    
+    def compact_async(self, symbol: str, timeframe: str) -> threading.Thread:
+        """
+        Compact a series in a background thread (no-op if one is running).
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            
+        Returns:
+            Compaction thread
+        """
+        cache_key = self._get_cache_key(symbol, timeframe)
+        with self._lock:
+            thread = self._compactions.get(cache_key)
+            if thread is not None and thread.is_alive():
+                return thread
+            
+            def run():
+                try:
+                    self.compact(symbol, timeframe)
+                except Exception as e:
+                    logger.error(f"Failed to compact cache for {symbol} {timeframe}: {e}")
+            
+            thread = threading.Thread(target=run, name=f"cache-compact-{cache_key[:8]}", daemon=True)
+            self._compactions[cache_key] = thread
+            thread.start()
+            return thread
+    
+    def wait_for_compaction(self, timeout: Optional[float] = None):
+        """Wait for running background compactions to finish."""
+        for thread in list(self._compactions.values()):
+            thread.join(timeout)
+    
+    def _remove_partition_files(self, symbol: str, timeframe: str, partitions: List[Dict[str, Any]]):
+        """Delete partition files."""
+        partition_dir = self._get_partition_dir(symbol, timeframe)
+        for partition in partitions:
+            path = partition_dir / partition['file']
+            if path.exists():
+                path.unlink()
     
     def get_cache_info(self) -> Dict[str, Any]:
         """Get cache information."""
-        cache_files = list(self.cache_dir.glob("*.parquet"))
+        cache_files = list(self.cache_dir.glob("**/*.parquet")) + list(self.cache_dir.glob("**/*.arrow"))
         
         total_size = sum(f.stat().st_size for f in cache_files)
         
@@ -174,28 +574,38 @@ class DataCache:
             symbol: Specific symbol to clear (optional)
             timeframe: Specific timeframe to clear (optional)
         """
-        if symbol and timeframe:
-            # Clear specific symbol/timeframe
-            cache_file = self._get_cache_file(symbol, timeframe)
-            if cache_file.exists():
-                cache_file.unlink()
+        self.wait_for_compaction()
+        
+        with self._lock:
+            if symbol and timeframe:
+                # Clear specific symbol/timeframe
+                cache_file = self._get_cache_file(symbol, timeframe)
+                if cache_file.exists():
+                    cache_file.unlink()
                 
-            cache_key = self._get_cache_key(symbol, timeframe)
-            if cache_key in self.metadata:
-                del self.metadata[cache_key]
+                partition_dir = self._get_partition_dir(symbol, timeframe)
+                if partition_dir.exists():
+                    shutil.rmtree(partition_dir)
+                
+                cache_key = self._get_cache_key(symbol, timeframe)
+                if cache_key in self.metadata:
+                    del self.metadata[cache_key]
+                    self._save_metadata()
+                
+                logger.info(f"Cleared cache for {symbol} {timeframe}")
+            else:
+                # Clear all cache
+                cache_files = list(self.cache_dir.glob("**/*.parquet")) + list(self.cache_dir.glob("**/*.arrow"))
+                for cache_file in self.cache_dir.glob("*.parquet"):
+                    cache_file.unlink()
+                for partition_dir in self.cache_dir.iterdir():
+                    if partition_dir.is_dir():
+                        shutil.rmtree(partition_dir)
+                
+                self.metadata.clear()
                 self._save_metadata()
                 
-            logger.info(f"Cleared cache for {symbol} {timeframe}")
-        else:
-            # Clear all cache
-            cache_files = list(self.cache_dir.glob("*.parquet"))
-            for cache_file in cache_files:
-                cache_file.unlink()
-            
-            self.metadata.clear()
-            self._save_metadata()
-            
-            logger.info(f"Cleared all cache ({len(cache_files)} files)")
+                logger.info(f"Cleared all cache ({len(cache_files)} files)")
 
 
 def ohlcv_to_dataframe(ohlcv: List[List]) -> pd.DataFrame:
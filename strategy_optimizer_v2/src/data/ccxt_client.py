@@ -2,12 +2,13 @@
 CCXT client for fetching OHLCV data with retry logic and rate limiting.
 """
 
-import ccxt
 import pandas as pd
 import numpy as np
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Callable
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import os
 from pathlib import Path
@@ -17,12 +18,61 @@ from ..config import get_config
 logger = logging.getLogger(__name__)
 
 
+class WeightRateLimiter:
+    """
+    Thread-safe token bucket over exchange request weight.
+    
+    Exchanges such as Binance budget requests by weight per minute rather
+    than by spacing between calls, so concurrent requests are fine as long
+    as the total weight stays within the budget.
+    """
+    
+    def __init__(self, weight_per_minute: float, burst: Optional[float] = None):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            weight_per_minute: Sustained request weight allowed per minute
+            burst: Bucket capacity (defaults to one minute of weight)
+        """
+        self.rate = weight_per_minute / 60.0
+        self.capacity = burst if burst is not None else weight_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self._lock = threading.Lock()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def acquire(self, weight: float = 1.0):
+        """Block until ``weight`` can be spent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                sleep_time = (weight - self.tokens) / self.rate
+                self.waited += sleep_time
+            time.sleep(sleep_time)
+
+
 class CCXTClient:
     """CCXT client with retry logic and rate limiting."""
     
     def __init__(self, exchange_name: str = "binance", api_key: Optional[str] = None, 
                  secret: Optional[str] = None, proxy_url: Optional[str] = None,
-                 sandbox: bool = False):
+                 sandbox: bool = False, exchange: Optional[Any] = None,
+                 weight_per_minute: Optional[float] = None, ohlcv_weight: Optional[float] = None):
         """
         Initialize CCXT client.
         
@@ -32,6 +82,9 @@ class CCXTClient:
             secret: API secret (optional for public data)
             proxy_url: Proxy URL (optional)
             sandbox: Use sandbox mode
+            exchange: Ready exchange instance to use instead of creating one (optional)
+            weight_per_minute: Request weight budget per minute (default from config)
+            ohlcv_weight: Weight of one OHLCV request (default from config)
         """
         self.exchange_name = exchange_name
         self.api_key = api_key
@@ -40,21 +93,29 @@ class CCXTClient:
         self.sandbox = sandbox
         
         # Initialize exchange
-        self._init_exchange()
+        if exchange is not None:
+            self.exchange = exchange
+        else:
+            self._init_exchange()
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms between requests
+        # Rate limiting (shared by all fetch threads)
+        data_config = get_config().data
+        self.limiter = WeightRateLimiter(weight_per_minute or data_config.fetch_weight_per_minute)
+        self.ohlcv_weight = ohlcv_weight or data_config.fetch_ohlcv_weight
+        self.last_fetch_stats: Dict[str, Any] = {}
         
     def _init_exchange(self):
         """Initialize the exchange instance."""
+        import ccxt  # Deferred: importing ccxt takes about half a second
+        
         try:
             exchange_class = getattr(ccxt, self.exchange_name)
             
             config = {
                 'sandbox': self.sandbox,
-                'enableRateLimit': True,
-                'rateLimit': 1200,  # 1200ms between requests
+                # Requests are paced by the client's weight limiter; ccxt's own
+                # throttle would serialize concurrent fetches
+                'enableRateLimit': False,
             }
             
             if self.api_key and self.secret:
@@ -80,16 +141,9 @@ class CCXTClient:
             logger.error(f"Failed to initialize {self.exchange_name}: {e}")
             raise
     
-    def _rate_limit(self):
+    def _rate_limit(self, weight: Optional[float] = None):
         """Apply rate limiting."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        self.limiter.acquire(weight or self.ohlcv_weight)
     
     def fetch_ohlcv(self, symbol: str, timeframe: str, since: Optional[datetime] = None,
                    until: Optional[datetime] = None, limit: Optional[int] = None, retries: int = 3) -> List[List]:
@@ -107,16 +161,21 @@ class CCXTClient:
         Returns:
             List of OHLCV data
         """
+        # Convert datetime to milliseconds if provided
+        since_ms = None
+        if since is not None:
+            since_ms = int(since.timestamp() * 1000)
+        
+        return self._fetch_page(symbol, timeframe, since_ms, limit, retries)
+    
+    def _fetch_page(self, symbol: str, timeframe: str, since_ms: Optional[int],
+                    limit: Optional[int], retries: int = 3) -> List[List]:
+        """Fetch one page of OHLCV data with retry logic."""
         for attempt in range(retries + 1):
             try:
                 self._rate_limit()
                 
-                logger.info(f"Fetching {symbol} {timeframe} data (attempt {attempt + 1})")
-                
-                # Convert datetime to milliseconds if provided
-                since_ms = None
-                if since is not None:
-                    since_ms = int(since.timestamp() * 1000)
+                logger.debug(f"Fetching {symbol} {timeframe} data (attempt {attempt + 1})")
                 
                 ohlcv = self.exchange.fetch_ohlcv(
                     symbol=symbol,
@@ -125,7 +184,7 @@ class CCXTClient:
                     limit=limit
                 )
                 
-                logger.info(f"Fetched {len(ohlcv)} candles for {symbol} {timeframe}")
+                logger.debug(f"Fetched {len(ohlcv)} candles for {symbol} {timeframe}")
                 return ohlcv
                 
             except Exception as e:
@@ -142,6 +201,53 @@ class CCXTClient:
         
         return []
     
+    def fetch_ohlcv_history(self, symbol: str, timeframe: str, since: Optional[Any] = None,
+                            until: Optional[Any] = None, limit: Optional[int] = None,
+                            max_pages: int = 10000) -> Tuple[List[List], int]:
+        """
+        Fetch OHLCV history by paginating forward from ``since``.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            since: Start datetime or timestamp in milliseconds (single latest page if None)
+            until: End datetime or timestamp in milliseconds (defaults to now)
+            limit: Candles per request (default from config)
+            max_pages: Maximum number of requests
+            
+        Returns:
+            Tuple of (deduplicated OHLCV rows up to ``until``, number of requests)
+        """
+        limit = limit or get_config().data.fetch_page_limit
+        since_ms = _to_ms(since)
+        until_ms = _to_ms(until)
+        
+        if since_ms is None:
+            ohlcv = self._fetch_page(symbol, timeframe, None, limit)
+            return [row for row in ohlcv if until_ms is None or row[0] <= until_ms], 1
+        
+        if until_ms is None:
+            until_ms = int(time.time() * 1000)
+        
+        rows: List[List] = []
+        requests = 0
+        cursor = since_ms
+        while requests < max_pages and cursor <= until_ms:
+            page = self._fetch_page(symbol, timeframe, cursor, limit)
+            requests += 1
+            if not page:
+                break
+            
+            rows.extend(row for row in page if row[0] >= cursor and row[0] <= until_ms)
+            last = int(page[-1][0])
+            if last < cursor:
+                break
+            cursor = last + 1
+        
+        # Pages may overlap when an exchange ignores the exact start
+        deduped = {int(row[0]): row for row in rows}
+        return [deduped[ts] for ts in sorted(deduped)], requests
+    
     def ohlcv_to_dataframe(self, ohlcv: List[List]) -> pd.DataFrame:
         """
         Convert OHLCV data to DataFrame.
@@ -162,30 +268,72 @@ class CCXTClient:
         return df
     
     def fetch_multiple_symbols(self, symbols: List[str], timeframe: str,
-                             since: Optional[int] = None, limit: Optional[int] = None) -> Dict[str, List[List]]:
+                             since: Optional[Any] = None, limit: Optional[int] = None,
+                             until: Optional[Any] = None, max_workers: Optional[int] = None,
+                             on_symbol: Optional[Callable[[str, List[List]], None]] = None) -> Dict[str, List[List]]:
         """
-        Fetch OHLCV data for multiple symbols.
+        Fetch OHLCV data for multiple symbols concurrently.
+        
+        Each symbol's history is paginated in its own worker thread; all
+        requests share the client's weight limiter. Throughput statistics of
+        the call are stored in ``last_fetch_stats``.
         
         Args:
             symbols: List of trading pair symbols
             timeframe: Timeframe
-            since: Start timestamp in milliseconds
-            limit: Number of candles to fetch
+            since: Start datetime or timestamp in milliseconds
+            limit: Number of candles per request
+            until: End datetime or timestamp in milliseconds
+            max_workers: Concurrent symbols (default from config)
+            on_symbol: Called with (symbol, ohlcv) as soon as a symbol completes
             
         Returns:
             Dictionary mapping symbols to OHLCV data
         """
+        max_workers = max_workers or get_config().data.fetch_workers
         results = {}
+        requests = 0
+        failed = []
+        waited_before = self.limiter.waited
+        start = time.perf_counter()
         
-        for symbol in symbols:
-            try:
-                ohlcv = self.fetch_ohlcv(symbol, timeframe, since, limit)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols) or 1))) as executor:
+            futures = {
+                executor.submit(self.fetch_ohlcv_history, symbol, timeframe, since, until, limit): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    ohlcv, symbol_requests = future.result()
+                    requests += symbol_requests
+                except Exception as e:
+                    logger.error(f"Failed to fetch data for {symbol}: {e}")
+                    ohlcv = []
+                    failed.append(symbol)
+                
                 results[symbol] = ohlcv
-            except Exception as e:
-                logger.error(f"Failed to fetch data for {symbol}: {e}")
-                results[symbol] = []
+                if on_symbol is not None and ohlcv:
+                    try:
+                        on_symbol(symbol, ohlcv)
+                    except Exception as e:
+                        logger.error(f"Failed to handle fetched data for {symbol}: {e}")
+        
+        elapsed = time.perf_counter() - start
+        candles = sum(len(ohlcv) for ohlcv in results.values())
+        self.last_fetch_stats = {
+            'symbols': len(symbols),
+            'failed': failed,
+            'candles': candles,
+            'requests': requests,
+            'seconds': elapsed,
+            'candles_per_sec': candles / elapsed if elapsed > 0 else 0.0,
+            'rate_limit_wait_seconds': self.limiter.waited - waited_before,
+        }
+        logger.info(f"Fetched {candles} candles for {len(symbols)} symbols in {elapsed:.1f}s "
+                    f"({self.last_fetch_stats['candles_per_sec']:.0f} candles/sec, {requests} requests)")
         
-        return results
+        return {symbol: results[symbol] for symbol in symbols}
     
     def get_exchange_info(self) -> Dict[str, Any]:
         """Get exchange information."""
@@ -232,6 +380,15 @@ def create_client_from_config() -> CCXTClient:
     )
 
 
+def _to_ms(value: Optional[Any]) -> Optional[int]:
+    """Convert a datetime or millisecond timestamp to milliseconds."""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(pd.Timestamp(value).timestamp() * 1000)
+
+
 def timestamp_to_datetime(timestamp: int) -> datetime:
     """Convert timestamp to datetime."""
     return datetime.fromtimestamp(timestamp / 1000)
@@ -6,11 +6,11 @@ import pandas as pd
 import numpy as np
 from typing import List, Optional, Dict, Any, Tuple
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from .ccxt_client import CCXTClient, create_client_from_config, ohlcv_to_dataframe, merge_ohlcv_data
-from .cache import DataCache, filter_data_by_date_range, validate_ohlcv_data
+from .ccxt_client import CCXTClient, create_client_from_config, ohlcv_to_dataframe, get_timeframe_ms
+from .cache import DataCache, filter_data_by_date_range, validate_ohlcv_data, to_milliseconds
 from ..config import get_config
 
 logger = logging.getLogger(__name__)
@@ -19,16 +19,19 @@ logger = logging.getLogger(__name__)
 class DataLoader:
     """Unified data loader with caching and fallback support."""
     
-    def __init__(self, cache_dir: Optional[str] = None, use_cache: bool = True):
+    def __init__(self, cache_dir: Optional[str] = None, use_cache: bool = True,
+                 ohlcv_dtype: Optional[str] = None):
         """
         Initialize data loader.
         
         Args:
             cache_dir: Cache directory path
             use_cache: Whether to use caching
+            ohlcv_dtype: OHLCV dtype of returned data, 'float64' or 'float32' (default from config)
         """
         self.config = get_config()
         self.use_cache = use_cache
+        self.ohlcv_dtype = ohlcv_dtype or self.config.data.ohlcv_dtype
         
         # Initialize cache
         if use_cache:
@@ -72,34 +75,27 @@ class DataLoader:
         """
         logger.info(f"Loading data for {symbol} {timeframe}")
         
-        # Try cache first
+        # Try cache first, fetching only the missing tail when it is stale
         if use_cache and self.cache:
-            cached_data = self.cache.get_cached_data(symbol, timeframe)
-            if cached_data is not None:
-                # Filter by date range if specified
-                if since or until:
-                    cached_data = filter_data_by_date_range(cached_data, since or datetime.min, until or datetime.max)
-                
-                if not cached_data.empty:
-                    logger.info(f"Using cached data for {symbol} {timeframe}: {len(cached_data)} candles")
-                    return cached_data
+            if self._needs_refresh(symbol, timeframe, until):
+                self.refresh_tail(symbol, timeframe)
+            
+            cached_data = self.cache.get_cached_data(symbol, timeframe, since, until, dtype=self.ohlcv_dtype)
+            if cached_data is not None and not cached_data.empty:
+                logger.info(f"Using cached data for {symbol} {timeframe}: {len(cached_data)} candles")
+                return cached_data
         
         # Try CSV fallback
         if self.csv_fallback_dir:
             csv_data = self._load_from_csv(symbol, timeframe)
             if csv_data is not None:
                 logger.info(f"Using CSV data for {symbol} {timeframe}: {len(csv_data)} candles")
-                return csv_data
+                return self._cast(csv_data)
         
         # Fetch from exchange
         try:
-            # Convert datetime to timestamp
-            since_timestamp = None
-            if since:
-                since_timestamp = int(since.timestamp() * 1000)
-            
             # Fetch data
-            ohlcv = self.client.fetch_ohlcv(symbol, timeframe, since_timestamp, limit)
+            ohlcv = self.client.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
             
             if not ohlcv:
                 logger.warning(f"No data received for {symbol} {timeframe}")
@@ -122,39 +118,72 @@ class DataLoader:
                 self.cache.save_data(symbol, timeframe, df)
             
             logger.info(f"Fetched {len(df)} candles for {symbol} {timeframe}")
-            return df
+            return self._cast(df)
             
         except Exception as e:
             logger.error(f"Failed to fetch data for {symbol} {timeframe}: {e}")
             return pd.DataFrame()
     
+    def _cast(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Cast OHLCV columns to the configured dtype."""
+        columns = ['open', 'high', 'low', 'close', 'volume']
+        if all(data[col].dtype == self.ohlcv_dtype for col in columns):
+            return data
+        return data.astype({col: self.ohlcv_dtype for col in columns})
+    
     def get_multiple_symbols(self, symbols: List[str], timeframe: str,
                            since: Optional[datetime] = None, until: Optional[datetime] = None,
-                           limit: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+                           limit: Optional[int] = None, max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
         """
         Get OHLCV data for multiple symbols.
         
+        Cached symbols are served (and tail-refreshed) from the cache. The
+        remaining symbols are fetched concurrently with paginated history,
+        and each one is written to the cache as soon as it completes.
+        
         Args:
             symbols: List of trading pair symbols
             timeframe: Timeframe
             since: Start date
             until: End date
-            limit: Maximum number of candles per symbol
+            limit: Candles per request
+            max_workers: Concurrent fetches (default from config)
             
         Returns:
             Dictionary mapping symbols to DataFrames
         """
         results = {}
+        missing = []
         
         for symbol in symbols:
-            try:
-                df = self.get_ohlcv(symbol, timeframe, since, until, limit)
-                results[symbol] = df
-            except Exception as e:
-                logger.error(f"Failed to load data for {symbol}: {e}")
-                results[symbol] = pd.DataFrame()
-        
-        return results
+            if self.use_cache and self.cache and self.cache.get_last_timestamp(symbol, timeframe) is not None:
+                try:
+                    results[symbol] = self.get_ohlcv(symbol, timeframe, since, until, limit)
+                    continue
+                except Exception as e:
+                    logger.error(f"Failed to load cached data for {symbol}: {e}")
+            missing.append(symbol)
+        
+        if missing:
+            fetched = {}
+            
+            def store(symbol: str, ohlcv: List[List]):
+                df = ohlcv_to_dataframe(ohlcv)
+                if not validate_ohlcv_data(df):
+                    logger.error(f"Invalid data received for {symbol} {timeframe}")
+                    return
+                if self.use_cache and self.cache:
+                    self.cache.save_data(symbol, timeframe, df)
+                fetched[symbol] = df
+            
+            self.client.fetch_multiple_symbols(missing, timeframe, since=since, until=until, limit=limit,
+                                               max_workers=max_workers, on_symbol=store)
+            
+            for symbol in missing:
+                df = fetched.get(symbol, pd.DataFrame())
+                results[symbol] = self._cast(df) if not df.empty else df
+        
+        return {symbol: results[symbol] for symbol in symbols}
     
     def _load_from_csv(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
         """
@@ -215,6 +244,78 @@ class DataLoader:
         
         return None
     
+    def _needs_refresh(self, symbol: str, timeframe: str, until: Optional[datetime] = None) -> bool:
+        """
+        Check whether cached candles should be topped up from the exchange.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            until: End of the requested range (optional)
+            
+        Returns:
+            True if the cache exists and is older than the TTL or ends before ``until``
+        """
+        last = self.cache.get_last_timestamp(symbol, timeframe)
+        if last is None:
+            return False
+        
+        if not self.cache.is_fresh(symbol, timeframe, self.config.data.cache_ttl_hours):
+            return True
+        
+        until_ms = to_milliseconds(until)
+        if until_ms is None:
+            return False
+        
+        now_ms = to_milliseconds(datetime.now(timezone.utc))
+        return to_milliseconds(last) + get_timeframe_ms(timeframe) < min(until_ms, now_ms)
+    
+    def refresh_tail(self, symbol: str, timeframe: str, max_requests: int = 100) -> int:
+        """
+        Fetch the candles missing after the last cached one and append them.
+        
+        The last cached candle is re-fetched as well, since it may have been
+        stored while still forming. Fetching stops once the currently forming
+        candle has been received, so a recently refreshed cache costs a single
+        request.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            max_requests: Maximum number of exchange requests
+            
+        Returns:
+            Number of new candles appended
+        """
+        since = self.cache.get_last_timestamp(symbol, timeframe)
+        if since is None:
+            return 0
+        
+        timeframe_ms = get_timeframe_ms(timeframe)
+        appended = 0
+        requests = 0
+        
+        try:
+            while requests < max_requests:
+                ohlcv = self.client.fetch_ohlcv(symbol, timeframe, since=since.to_pydatetime())
+                requests += 1
+                if not ohlcv:
+                    break
+                
+                appended += self.cache.append_data(symbol, timeframe, ohlcv_to_dataframe(ohlcv))
+                
+                last_ms = int(ohlcv[-1][0])
+                now_ms = to_milliseconds(datetime.now(timezone.utc))
+                if last_ms <= to_milliseconds(since) or last_ms + timeframe_ms > now_ms:
+                    break
+                since = pd.Timestamp(last_ms, unit='ms', tz='UTC')
+                
+        except Exception as e:
+            logger.error(f"Failed to refresh {symbol} {timeframe}: {e}")
+        
+        logger.info(f"Refreshed {symbol} {timeframe}: {appended} new candles in {requests} requests")
+        return appended
+    
     def update_data(self, symbol: str, timeframe: str, days_back: int = 1) -> pd.DataFrame:
         """
         Update data by fetching recent candles.
@@ -222,44 +323,33 @@ class DataLoader:
         Args:
             symbol: Trading pair symbol
             timeframe: Timeframe
-            days_back: Number of days to look back for updates
+            days_back: Number of days to fetch when nothing is cached
             
         Returns:
             Updated DataFrame
         """
         logger.info(f"Updating data for {symbol} {timeframe}")
         
-        # Get existing cached data
-        existing_data = pd.DataFrame()
-        if self.cache:
-            existing_data = self.cache.get_cached_data(symbol, timeframe) or pd.DataFrame()
-        
-        # Calculate start date for update
-        if existing_data.empty:
-            start_date = datetime.now() - timedelta(days=days_back)
-        else:
-            # Start from last candle
-            start_date = existing_data.index[-1]
+        # Append only the missing tail to cached data
+        if self.cache and self.cache.get_last_timestamp(symbol, timeframe) is not None:
+            self.refresh_tail(symbol, timeframe)
+            updated_data = self.cache.get_cached_data(symbol, timeframe, dtype=self.ohlcv_dtype)
+            logger.info(f"Updated data for {symbol} {timeframe}: {len(updated_data)} total candles")
+            return updated_data
         
-        # Fetch new data
+        # Nothing cached yet: fetch recent history
+        start_date = datetime.now() - timedelta(days=days_back)
         new_data = self.get_ohlcv(symbol, timeframe, since=start_date, use_cache=False)
         
         if new_data.empty:
             logger.warning(f"No new data available for {symbol} {timeframe}")
-            return existing_data
-        
-        # Merge with existing data
-        if not existing_data.empty:
-            merged_data = merge_ohlcv_data(existing_data, new_data)
-        else:
-            merged_data = new_data
+            return new_data
         
-        # Save updated data to cache
         if self.cache:
-            self.cache.save_data(symbol, timeframe, merged_data)
+            self.cache.save_data(symbol, timeframe, new_data)
         
-        logger.info(f"Updated data for {symbol} {timeframe}: {len(merged_data)} total candles")
-        return merged_data
+        logger.info(f"Updated data for {symbol} {timeframe}: {len(new_data)} total candles")
+        return new_data
     
     def get_data_info(self) -> Dict[str, Any]:
         """Get information about available data."""
@@ -276,18 +366,20 @@ class DataLoader:
             self.cache.clear_cache(symbol, timeframe)
 
 
-def create_data_loader(cache_dir: Optional[str] = None, use_cache: bool = True) -> DataLoader:
+def create_data_loader(cache_dir: Optional[str] = None, use_cache: bool = True,
+                       ohlcv_dtype: Optional[str] = None) -> DataLoader:
     """
     Create a data loader instance.
     
     Args:
         cache_dir: Cache directory path
         use_cache: Whether to use caching
+        ohlcv_dtype: OHLCV dtype of returned data (default from config)
         
     Returns:
         DataLoader instance
     """
-    return DataLoader(cache_dir, use_cache)
+    return DataLoader(cache_dir, use_cache, ohlcv_dtype)
 
 
 def get_historical_data(symbol: str, timeframe: str, days: int = 365,
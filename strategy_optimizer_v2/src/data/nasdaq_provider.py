@@ -5,14 +5,36 @@ NASDAQ hisseleri için veri sağlayıcı modülü
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
-import yfinance as yf
+from typing import Dict, List, Optional, Tuple, Any
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import json
+import os
+import threading
 import logging
 from dataclasses import dataclass
 
+from ..config import get_config
+
 logger = logging.getLogger(__name__)
 
+# Yahoo periyotlarının başlangıç ofsetleri ('max' sınırsız, 'ytd' yıl başı)
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+# Hafta sonu/tatil nedeniyle periyot başında eksik kalabilecek gün sayısı
+PERIOD_START_TOLERANCE = pd.Timedelta(days=7)
+
 @dataclass
 class NASDAQSymbol:
     """NASDAQ sembol bilgileri"""
@@ -42,15 +64,88 @@ NASDAQ_SYMBOLS = {
     'ORCL': NASDAQSymbol('ORCL', 'Oracle Corporation', 'Technology', '300B', 10000000, (100, 130))
 }
 
+class YahooDataSource:
+    """
+    Yahoo Finance toplu veri kaynağı
+    Birden fazla sembolü tek bir yf.download çağrısıyla indirir
+    """
+    
+    def download(self,
+                 symbols: List[str],
+                 interval: str = "1d",
+                 period: Optional[str] = None,
+                 start: Optional[datetime] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Sembolleri toplu indir
+        
+        Args:
+            symbols: Hisse senedi sembolleri
+            interval: Veri aralığı
+            period: Veri periyodu (start verilmezse)
+            start: Başlangıç tarihi (artımlı güncelleme)
+            
+        Returns:
+            Sembol -> ham Yahoo DataFrame (Open, High, Low, Close, Volume)
+        """
+        if not symbols:
+            return {}
+        
+        import yfinance as yf  # Ertelenmiş içe aktarma: sembol listeleme yfinance yüklemez
+        
+        raw = yf.download(
+            symbols,
+            period=None if start is not None else period,
+            start=start,
+            interval=interval,
+            group_by='ticker',
+            auto_adjust=True,
+            threads=True,
+            progress=False,
+        )
+        
+        data = {}
+        for symbol in symbols:
+            if isinstance(raw.columns, pd.MultiIndex):
+                if symbol not in raw.columns.get_level_values(0):
+                    continue
+                df = raw[symbol]
+            else:
+                df = raw
+            df = df.dropna(how='all')
+            if not df.empty:
+                data[symbol] = df
+        
+        return data
+
+
 class NASDAQDataProvider:
     """
     NASDAQ hisseleri için veri sağlayıcı
     Yahoo Finance API kullanarak veri çekme
+    
+    Veriler sembol/aralık başına bir Parquet dosyasında diskte saklanır. Gün
+    içinde güncellenmemiş dosyalar için yalnızca son kayıttan sonraki veriler
+    indirilir; eksik semboller tek bir toplu istekle çekilir.
     """
     
-    def __init__(self):
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 source: Optional[Any] = None,
+                 max_workers: int = 4):
+        """
+        Args:
+            cache_dir: Disk cache dizini (varsayılan: <config cache_dir>/nasdaq)
+            source: Veri kaynağı (download(symbols, interval, period, start) metodu olan nesne)
+            max_workers: Diskten paralel okuma sayısı
+        """
         self.logger = logging.getLogger(__name__)
         self.cache = {}
+        self.cache_dir = Path(cache_dir or os.path.join(get_config().data.cache_dir, "nasdaq"))
+        self.source = source or YahooDataSource()
+        self.max_workers = max_workers
+        self.metadata_file = self.cache_dir / "metadata.json"
+        self.metadata = self._load_metadata()
+        self._lock = threading.Lock()
         
     def get_symbol_info(self, symbol: str) -> Optional[NASDAQSymbol]:
         """Sembol bilgilerini getir"""
@@ -85,37 +180,113 @@ class NASDAQDataProvider:
             use_cache: Cache kullan
         """
         symbol = symbol.upper()
-        
-        # Cache kontrolü
-        cache_key = f"{symbol}_{period}_{interval}"
-        if use_cache and cache_key in self.cache:
-            self.logger.info(f"Cache'den veri getiriliyor: {symbol}")
-            return self.cache[cache_key].copy()
-        
+        data = self.get_multiple_symbols_data([symbol], period, interval, use_cache=use_cache)
+        return data.get(symbol)
+    
+    def _load_metadata(self) -> Dict[str, Any]:
+        """Disk cache metadata'sını yükle"""
+        if self.metadata_file.exists():
+            try:
+                with open(self.metadata_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                self.logger.warning(f"Cache metadata okunamadı: {e}")
+        return {}
+    
+    def _save_metadata(self):
+        """Disk cache metadata'sını kaydet"""
         try:
-            self.logger.info(f"Veri çekiliyor: {symbol} ({period}, {interval})")
-            
-            # Yahoo Finance'den veri çek
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period=period, interval=interval)
-            
-            if df.empty:
-                self.logger.warning(f"Veri bulunamadı: {symbol}")
-                return None
-            
-            # Veri temizleme
-            df = self._clean_data(df)
-            
-            # Cache'e kaydet
-            if use_cache:
-                self.cache[cache_key] = df.copy()
-            
-            self.logger.info(f"Veri başarıyla çekildi: {symbol} ({len(df)} kayıt)")
-            return df
-            
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.metadata_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(self.metadata, f, indent=2)
+            os.replace(tmp_file, self.metadata_file)
         except Exception as e:
-            self.logger.error(f"Veri çekme hatası {symbol}: {e}")
+            self.logger.error(f"Cache metadata kaydedilemedi: {e}")
+    
+    def _cache_file(self, symbol: str, interval: str) -> Path:
+        """Sembol/aralık için Parquet dosya yolu"""
+        return self.cache_dir / f"{symbol}_{interval}.parquet"
+    
+    @staticmethod
+    def _time_column(df: pd.DataFrame) -> str:
+        """Zaman kolonunun adı (günlük: date, gün içi: datetime)"""
+        return 'date' if 'date' in df.columns else 'datetime'
+    
+    @staticmethod
+    def _period_start(period: str, now: Optional[pd.Timestamp] = None) -> Optional[pd.Timestamp]:
+        """Periyodun başlangıç tarihi (max için None)"""
+        now = now or pd.Timestamp.now(tz='UTC')
+        if period == 'max':
             return None
+        if period == 'ytd':
+            return pd.Timestamp(year=now.year, month=1, day=1, tz='UTC')
+        offset = PERIOD_OFFSETS.get(period)
+        if offset is None:
+            raise ValueError(f"Bilinmeyen periyot: {period}")
+        return now - offset
+    
+    def _covers(self, entry: Dict[str, Any], period: str) -> bool:
+        """Disk cache'i istenen periyodu kapsıyor mu"""
+        if entry.get('period') == 'max':
+            return True
+        start = self._period_start(period)
+        if start is None:
+            return False
+        first = pd.Timestamp(entry['first'])
+        first = first.tz_localize('UTC') if first.tzinfo is None else first.tz_convert('UTC')
+        return first <= start + PERIOD_START_TOLERANCE
+    
+    @staticmethod
+    def _is_stale(entry: Dict[str, Any]) -> bool:
+        """Dosya bugün (UTC) güncellenmedi mi"""
+        updated = datetime.fromisoformat(entry['updated_at']).date()
+        return updated < datetime.now(timezone.utc).date()
+    
+    def _read_disk(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        """Disk cache'den oku"""
+        try:
+            return pd.read_parquet(self._cache_file(symbol, interval))
+        except Exception as e:
+            self.logger.warning(f"Disk cache okunamadı {symbol}: {e}")
+            return None
+    
+    def _write_disk(self, symbol: str, interval: str, df: pd.DataFrame, period: str):
+        """Disk cache'e yaz ve metadata'yı güncelle"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(self._cache_file(symbol, interval), index=False)
+        
+        time_col = self._time_column(df)
+        key = f"{symbol}_{interval}"
+        previous = self.metadata.get(key, {})
+        # Daha uzun bir periyotla indirilmiş geçmiş korunur
+        stored_period = 'max' if 'max' in (period, previous.get('period')) else period
+        with self._lock:
+            self.metadata[key] = {
+                'symbol': symbol,
+                'interval': interval,
+                'period': stored_period,
+                'first': pd.Timestamp(df[time_col].iloc[0]).isoformat(),
+                'last': pd.Timestamp(df[time_col].iloc[-1]).isoformat(),
+                'rows': len(df),
+                'updated_at': datetime.now(timezone.utc).isoformat(),
+            }
+    
+    def _merge(self, cached: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+        """Cache'deki veriye yeni kayıtları ekle (aynı tarih yenisiyle değişir)"""
+        time_col = self._time_column(cached)
+        merged = pd.concat([cached, new[cached.columns.intersection(new.columns)]], ignore_index=True)
+        merged = merged.drop_duplicates(time_col, keep='last')
+        return merged.sort_values(time_col, kind='stable').reset_index(drop=True)
+    
+    def _slice_period(self, df: pd.DataFrame, period: str) -> pd.DataFrame:
+        """Veriyi istenen periyoda kırp"""
+        start = self._period_start(period)
+        if start is None:
+            return df
+        time_col = self._time_column(df)
+        times = pd.to_datetime(df[time_col], utc=True)
+        return df[times >= start].reset_index(drop=True)
     
     def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Veri temizleme"""
@@ -143,18 +314,95 @@ class NASDAQDataProvider:
     def get_multiple_symbols_data(self, 
                                  symbols: List[str],
                                  period: str = "2y",
-                                 interval: str = "1d") -> Dict[str, pd.DataFrame]:
-        """Birden fazla sembol için veri çek"""
+                                 interval: str = "1d",
+                                 use_cache: bool = True) -> Dict[str, pd.DataFrame]:
+        """
+        Birden fazla sembol için veri çek
+        
+        Disk cache'deki semboller paralel okunur; bugün güncellenmemiş olanlar
+        son kayıttan itibaren, cache'de olmayanlar ise tam periyotla tek bir
+        toplu istekle indirilir.
+        """
+        symbols = [symbol.upper() for symbol in symbols]
         data = {}
         
+        # Bellek cache'i
+        pending = []
         for symbol in symbols:
-            df = self.fetch_data(symbol, period, interval)
-            if df is not None:
-                data[symbol] = df
+            cache_key = f"{symbol}_{period}_{interval}"
+            if use_cache and cache_key in self.cache:
+                self.logger.info(f"Cache'den veri getiriliyor: {symbol}")
+                data[symbol] = self.cache[cache_key].copy()
             else:
+                pending.append(symbol)
+        
+        # Disk cache'i (paralel okuma)
+        on_disk = []
+        if use_cache:
+            on_disk = [symbol for symbol in pending
+                       if f"{symbol}_{interval}" in self.metadata
+                       and self._covers(self.metadata[f"{symbol}_{interval}"], period)
+                       and self._cache_file(symbol, interval).exists()]
+        
+        cached = {}
+        if on_disk:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                frames = executor.map(lambda symbol: self._read_disk(symbol, interval), on_disk)
+                cached = {symbol: df for symbol, df in zip(on_disk, frames) if df is not None and not df.empty}
+        
+        stale = [symbol for symbol in cached if self._is_stale(self.metadata[f"{symbol}_{interval}"])]
+        missing = [symbol for symbol in pending if symbol not in cached]
+        
+        # Artımlı güncelleme: son kayıttan itibaren toplu indir
+        if stale:
+            start = min(pd.Timestamp(self.metadata[f"{symbol}_{interval}"]['last']) for symbol in stale)
+            self.logger.info(f"Artımlı güncelleme: {stale} ({start.date()} itibarıyla)")
+            try:
+                updates = self.source.download(stale, interval=interval, start=start.to_pydatetime())
+            except Exception as e:
+                self.logger.error(f"Toplu güncelleme hatası: {e}")
+                updates = {}
+            
+            for symbol in stale:
+                update = updates.get(symbol)
+                if update is not None and not update.empty:
+                    cached[symbol] = self._merge(cached[symbol], self._clean_data(update))
+                entry = self.metadata[f"{symbol}_{interval}"]
+                self._write_disk(symbol, interval, cached[symbol], entry['period'])
+        
+        # Eksik semboller: tam periyot, tek toplu istek
+        if missing:
+            self.logger.info(f"Toplu veri çekiliyor: {missing} ({period}, {interval})")
+            try:
+                downloads = self.source.download(missing, interval=interval, period=period)
+            except Exception as e:
+                self.logger.error(f"Toplu veri çekme hatası: {e}")
+                downloads = {}
+            
+            for symbol in missing:
+                df = downloads.get(symbol)
+                if df is None or df.empty:
+                    self.logger.warning(f"Veri bulunamadı: {symbol}")
+                    continue
+                df = self._clean_data(df)
+                if use_cache:
+                    self._write_disk(symbol, interval, df, period)
+                cached[symbol] = df
+        
+        if stale or missing:
+            self._save_metadata()
+        
+        for symbol in pending:
+            if symbol not in cached:
                 self.logger.warning(f"Veri çekilemedi: {symbol}")
+                continue
+            df = self._slice_period(cached[symbol], period)
+            if use_cache:
+                self.cache[f"{symbol}_{period}_{interval}"] = df.copy()
+            data[symbol] = df
+            self.logger.info(f"Veri hazır: {symbol} ({len(df)} kayıt)")
         
-        return data
+        return {symbol: data[symbol] for symbol in symbols if symbol in data}
     
     def get_sector_data(self, 
                        sector: str,
@@ -172,17 +420,26 @@ class NASDAQDataProvider:
         symbols = self.get_high_volume_symbols(min_volume)
         return self.get_multiple_symbols_data(symbols, period, interval)
     
-    def clear_cache(self):
-        """Cache'i temizle"""
+    def clear_cache(self, disk: bool = False):
+        """Cache'i temizle (disk=True ise Parquet dosyaları da silinir)"""
         self.cache.clear()
+        if disk:
+            for cache_file in self.cache_dir.glob("*.parquet"):
+                cache_file.unlink()
+            self.metadata.clear()
+            self._save_metadata()
         self.logger.info("Cache temizlendi")
     
     def get_cache_info(self) -> Dict:
         """Cache bilgilerini getir"""
+        disk_files = list(self.cache_dir.glob("*.parquet")) if self.cache_dir.exists() else []
         return {
             'cache_size': len(self.cache),
             'cached_symbols': list(self.cache.keys()),
-            'memory_usage': sum(df.memory_usage(deep=True).sum() for df in self.cache.values())
+            'memory_usage': sum(df.memory_usage(deep=True).sum() for df in self.cache.values()),
+            'disk_dir': str(self.cache_dir),
+            'disk_files': len(disk_files),
+            'disk_size': sum(f.stat().st_size for f in disk_files),
         }
 
 # Global instance
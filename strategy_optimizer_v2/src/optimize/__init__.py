@@ -6,12 +6,22 @@ This module provides grid search and walk-forward optimization functionality.
 
 from .grid_search import GridSearchOptimizer, run_grid_search
 from .walk_forward import WalkForwardOptimizer, run_walk_forward
+from .param_space import ParamSpace, create_param_space
+from .adaptive_search import AdaptiveSearch, TPESampler, run_adaptive_search
+from .results_store import ResultsStore, params_hash, data_fingerprint
+from .robustness import run_robustness, analyze_backtest, robustness_key
+from .warmup import warm_up_kernels, init_worker, start_workers
+from .portfolio import PortfolioBacktester, PortfolioResult, run_portfolio_backtest, correlation_groups
 from .metrics import (
     calculate_basic_metrics,
     calculate_trade_metrics,
     calculate_risk_metrics,
     calculate_advanced_metrics,
     calculate_all_metrics,
+    calculate_all_metrics_batch,
+    calculate_metrics_batch,
+    pad_equity_curves,
+    TradeArrays,
     rank_results,
     calculate_portfolio_metrics,
     filter_results_by_metrics,
@@ -23,11 +33,33 @@ __all__ = [
     'run_grid_search',
     'WalkForwardOptimizer',
     'run_walk_forward',
+    'ParamSpace',
+    'create_param_space',
+    'AdaptiveSearch',
+    'TPESampler',
+    'run_adaptive_search',
+    'ResultsStore',
+    'params_hash',
+    'data_fingerprint',
+    'run_robustness',
+    'analyze_backtest',
+    'robustness_key',
+    'PortfolioBacktester',
+    'PortfolioResult',
+    'run_portfolio_backtest',
+    'correlation_groups',
+    'warm_up_kernels',
+    'init_worker',
+    'start_workers',
     'calculate_basic_metrics',
     'calculate_trade_metrics',
     'calculate_risk_metrics',
     'calculate_advanced_metrics',
     'calculate_all_metrics',
+    'calculate_all_metrics_batch',
+    'calculate_metrics_batch',
+    'pad_equity_curves',
+    'TradeArrays',
     'rank_results',
     'calculate_portfolio_metrics',
     'filter_results_by_metrics',
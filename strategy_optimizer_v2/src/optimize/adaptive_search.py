@@ -0,0 +1,334 @@
+"""
+Adaptive parameter search for strategy optimization.
+
+Successive halving evaluates many candidates on a short leading slice of the
+data and promotes only the best fraction of them to longer slices, so full
+length backtests are spent on promising regions only. After the first
+bracket, a Tree-structured Parzen Estimator (TPE) fitted on the scores
+observed so far proposes the candidates for the next bracket.
+
+The search is independent of the backtest engine: callers pass an
+``evaluate(params, fraction)`` callable that returns their usual result dict
+and a ``score(result)`` callable that turns it into a number to maximize.
+"""
+
+import math
+import logging
+from typing import Dict, Any, List, Optional, Callable
+
+import numpy as np
+import pandas as pd
+
+from .param_space import ParamSpace
+
+logger = logging.getLogger(__name__)
+
+
+def halving_fractions(min_fraction: float, eta: int) -> List[float]:
+    """
+    Get the data fractions of each successive halving rung.
+
+    Args:
+        min_fraction: Fraction of data used by the first rung
+        eta: Reduction factor between rungs
+
+    Returns:
+        Increasing list of fractions ending with 1.0
+    """
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    if not 0 < min_fraction <= 1:
+        raise ValueError("min_fraction must be in (0, 1]")
+
+    fractions = [1.0]
+    while fractions[0] / eta >= min_fraction * (1 - 1e-9):
+        fractions.insert(0, fractions[0] / eta)
+    return fractions
+
+
+def slice_data(data: pd.DataFrame, fraction: float, min_bars: int = 0) -> pd.DataFrame:
+    """
+    Get the leading slice of a dataset used by a rung.
+
+    Args:
+        data: OHLCV data
+        fraction: Fraction of bars to keep
+        min_bars: Minimum number of bars (indicator warm-up)
+
+    Returns:
+        Leading slice of the data (the data itself for fraction 1.0)
+    """
+    n = max(min_bars, int(math.ceil(len(data) * fraction)))
+    if n >= len(data):
+        return data
+    return data.iloc[:n]
+
+
+def metric_score(metric: str = 'profit_factor', min_trades: int = 0,
+                 cap: float = 100.0) -> Callable[[Dict[str, Any]], float]:
+    """
+    Build a score function for GridSearchOptimizer-style results.
+
+    Args:
+        metric: Metric name in ``result['metrics']``
+        min_trades: Results with fewer trades score -inf
+        cap: Upper bound for the metric (profit factor is inf without losses)
+
+    Returns:
+        Callable mapping a result dict to a score
+    """
+    def score(result: Dict[str, Any]) -> float:
+        if not result.get('success', False) or result.get('pruned', False):
+            return -np.inf
+        if result.get('num_trades', 0) < min_trades:
+            return -np.inf
+        value = result.get('metrics', {}).get(metric, 0)
+        if value is None or np.isnan(value):
+            return -np.inf
+        return float(min(value, cap))
+
+    return score
+
+
+class TPESampler:
+    """
+    Tree-structured Parzen Estimator over the discrete axes of a ParamSpace.
+
+    Observations are split at the ``gamma`` quantile of their scores into a
+    good and a bad group. For every axis a smoothed histogram of value
+    positions is fitted to each group, and candidates are ranked by the
+    density ratio l(x) / g(x), summed over axes in log space. Axis values are
+    treated as ordered, so each observation also lends weight to its
+    neighbouring values.
+    """
+
+    def __init__(self, radices: List[int], gamma: float = 0.25,
+                 prior_weight: float = 1.0, bandwidth: float = 0.5):
+        """
+        Initialize TPE sampler.
+
+        Args:
+            radices: Number of values on each axis
+            gamma: Fraction of observations treated as good
+            prior_weight: Weight of the uniform prior added to every histogram
+            bandwidth: Weight an observation lends to each neighbouring value
+        """
+        self.radices = list(radices)
+        self.gamma = gamma
+        self.prior_weight = prior_weight
+        self.bandwidth = bandwidth
+        self.good_log_density: List[np.ndarray] = []
+        self.bad_log_density: List[np.ndarray] = []
+
+    def _log_density(self, positions: np.ndarray, radix: int) -> np.ndarray:
+        """Smoothed log histogram of value positions on one axis."""
+        counts = np.bincount(positions, minlength=radix).astype(float)
+        smoothed = counts.copy()
+        if radix > 1:
+            smoothed[1:] += self.bandwidth * counts[:-1]
+            smoothed[:-1] += self.bandwidth * counts[1:]
+        smoothed += self.prior_weight / radix
+        return np.log(smoothed / smoothed.sum())
+
+    def fit(self, positions: np.ndarray, scores: np.ndarray) -> 'TPESampler':
+        """
+        Fit good and bad densities to observations.
+
+        Args:
+            positions: (n, axes) array of value positions
+            scores: Scores of the observations (higher is better)
+
+        Returns:
+            Self
+        """
+        order = np.argsort(-scores, kind='stable')
+        n_good = max(1, int(math.ceil(self.gamma * len(scores))))
+        good = positions[order[:n_good]]
+        bad = positions[order[n_good:]]
+
+        self.good_log_density = [self._log_density(good[:, k], radix) for k, radix in enumerate(self.radices)]
+        self.bad_log_density = [self._log_density(bad[:, k], radix) for k, radix in enumerate(self.radices)]
+        return self
+
+    def log_ratio(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Compute log l(x) - log g(x) for candidates.
+
+        Args:
+            positions: (n, axes) array of value positions
+
+        Returns:
+            Log density ratio per candidate (higher is more promising)
+        """
+        ratio = np.zeros(len(positions))
+        for k in range(len(self.radices)):
+            ratio += self.good_log_density[k][positions[:, k]] - self.bad_log_density[k][positions[:, k]]
+        return ratio
+
+
+class AdaptiveSearch:
+    """
+    Successive halving search with TPE proposals over a ParamSpace.
+    """
+
+    def __init__(self, space: ParamSpace,
+                 evaluate: Callable[[Dict[str, Any], float], Dict[str, Any]],
+                 score: Callable[[Dict[str, Any]], float],
+                 n_candidates: int = 81, eta: int = 3, min_fraction: float = 1 / 9,
+                 n_brackets: int = 3, gamma: float = 0.25,
+                 max_pool: int = 100_000, seed: Optional[int] = 42):
+        """
+        Initialize adaptive search.
+
+        Args:
+            space: Parameter space (or a view of it) to search
+            evaluate: Callable running one backtest on a data fraction
+            score: Callable mapping a result to a score to maximize
+            n_candidates: Candidates entering the first rung of each bracket
+            eta: Only the top 1/eta of a rung is promoted to the next one
+            min_fraction: Data fraction of the first rung
+            n_brackets: Number of brackets (the first is sampled, the rest TPE-proposed)
+            gamma: Fraction of observations TPE treats as good
+            max_pool: Maximum number of unevaluated candidates ranked by TPE per bracket
+            seed: Random seed
+        """
+        self.space = space
+        self.evaluate = evaluate
+        self.score = score
+        self.n_candidates = n_candidates
+        self.eta = eta
+        self.fractions = halving_fractions(min_fraction, eta)
+        self.n_brackets = n_brackets
+        self.max_pool = max_pool
+        self.rng = np.random.default_rng(seed)
+        self.seed = seed
+        self.sampler = TPESampler(space.radices, gamma=gamma)
+
+        # position -> {fraction: score}
+        self.observations: Dict[int, Dict[float, float]] = {}
+        self.evaluations: Dict[float, int] = {fraction: 0 for fraction in self.fractions}
+        self.results: List[Dict[str, Any]] = []
+
+    def _axis_positions(self, positions: np.ndarray) -> np.ndarray:
+        """Value position on every axis for positional indices of the space."""
+        digits = self.space._axis_digits(self.space._positions_to_base(positions))
+        return np.stack([digits[name] for name in self.space.names], axis=1)
+
+    def _initial_candidates(self) -> np.ndarray:
+        """Space-filling first bracket (Sobol on the full space, random on views)."""
+        if self.space.indices is None:
+            sample = self.space.sample_sobol(self.n_candidates, seed=self.seed)
+            return np.asarray(sample.indices, dtype=np.int64)
+        n = min(self.n_candidates, len(self.space))
+        return np.sort(self.rng.choice(len(self.space), size=n, replace=False))
+
+    def _propose_candidates(self) -> np.ndarray:
+        """Rank unevaluated candidates by the TPE density ratio."""
+        # Fit on the highest fidelity with enough observations to be informative
+        min_points = len(self.space.names) + 2
+        fidelity = self.fractions[0]
+        for fraction in self.fractions:
+            if sum(1 for obs in self.observations.values() if fraction in obs) >= min_points:
+                fidelity = fraction
+
+        observed = np.array([pos for pos, obs in self.observations.items() if fidelity in obs], dtype=np.int64)
+        scores = np.array([self.observations[pos][fidelity] for pos in observed])
+        # Failed runs rank below every finite score
+        finite = np.isfinite(scores)
+        floor = scores[finite].min() - 1 if finite.any() else 0.0
+        scores = np.where(finite, scores, floor)
+        self.sampler.fit(self._axis_positions(observed), scores)
+
+        size = len(self.space)
+        if size <= self.max_pool:
+            pool = np.arange(size, dtype=np.int64)
+        else:
+            pool = self.rng.choice(size, size=self.max_pool, replace=False)
+        pool = pool[~np.isin(pool, np.fromiter(self.observations.keys(), dtype=np.int64))]
+        if len(pool) == 0:
+            return pool
+
+        # Gumbel top-k: sample without replacement proportionally to l(x) / g(x)
+        keys = self.sampler.log_ratio(self._axis_positions(pool)) + self.rng.gumbel(size=len(pool))
+        n = min(self.n_candidates, len(pool))
+        return pool[np.argsort(-keys, kind='stable')[:n]]
+
+    def _run_bracket(self, candidates: np.ndarray) -> None:
+        """Run successive halving on one bracket of candidates."""
+        survivors = list(candidates)
+        for rung, fraction in enumerate(self.fractions):
+            scored = []
+            for position in survivors:
+                result = self.evaluate(self.space.decode(int(position)), fraction)
+                score = self.score(result)
+                self.observations.setdefault(int(position), {})[fraction] = score
+                self.evaluations[fraction] += 1
+                scored.append((score, int(position)))
+                if fraction == 1.0:
+                    self.results.append(result)
+
+            if fraction == 1.0:
+                break
+
+            n_promote = max(1, len(scored) // self.eta)
+            scored.sort(key=lambda item: item[0], reverse=True)
+            survivors = [position for score, position in scored[:n_promote] if np.isfinite(score)]
+            if not survivors:
+                break
+
+    def run(self) -> List[Dict[str, Any]]:
+        """
+        Run the search.
+
+        Returns:
+            Results of every full-data evaluation, in evaluation order
+        """
+        for bracket in range(self.n_brackets):
+            if bracket == 0:
+                candidates = self._initial_candidates()
+            else:
+                candidates = self._propose_candidates()
+            if len(candidates) == 0:
+                break
+
+            self._run_bracket(candidates)
+            logger.info(f"Adaptive search bracket {bracket + 1}/{self.n_brackets}: "
+                       f"{len(candidates)} candidates, {self.evaluations[1.0]} full backtests so far")
+
+        return self.results
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Evaluation budget statistics."""
+        bar_equivalent = sum(fraction * count for fraction, count in self.evaluations.items())
+        return {
+            'search_mode': 'adaptive',
+            'space_size': len(self.space),
+            'candidates_evaluated': len(self.observations),
+            'full_backtests': self.evaluations[1.0],
+            'partial_backtests': sum(count for fraction, count in self.evaluations.items() if fraction < 1.0),
+            'evaluations_by_fraction': {f"{fraction:.4f}": count for fraction, count in self.evaluations.items()},
+            'full_backtest_equivalents': bar_equivalent,
+            'reduction_vs_grid': len(self.space) / bar_equivalent if bar_equivalent > 0 else 0,
+        }
+
+
+def run_adaptive_search(space: ParamSpace,
+                        evaluate: Callable[[Dict[str, Any], float], Dict[str, Any]],
+                        score: Callable[[Dict[str, Any]], float],
+                        **kwargs) -> AdaptiveSearch:
+    """
+    Convenience function to run an adaptive search.
+
+    Args:
+        space: Parameter space to search
+        evaluate: Callable running one backtest on a data fraction
+        score: Callable mapping a result to a score to maximize
+        **kwargs: AdaptiveSearch options
+
+    Returns:
+        Finished AdaptiveSearch (results in ``.results``, budget in ``.stats``)
+    """
+    search = AdaptiveSearch(space, evaluate, score, **kwargs)
+    search.run()
+    return search
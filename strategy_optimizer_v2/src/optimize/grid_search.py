@@ -7,45 +7,86 @@ symbols, timeframes, and parameter combinations.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional, Tuple, Callable
+from typing import Dict, Any, List, Optional, Tuple, Callable, Union
 import logging
 from datetime import datetime, timedelta
+from dataclasses import asdict
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm
 import json
+import math
 import os
 from pathlib import Path
 
-from ..config import get_config, get_param_combinations
+from ..config import get_config, get_param_space
 from ..data.loader import create_data_loader
 from ..strategy.atr_st_core import create_strategy, validate_strategy_params
 from ..strategy.volensy_macd_trend import create_strategy as create_volensy_strategy, validate_strategy_params as validate_volensy_params
 from ..strategy.atr_supertrend import create_strategy as create_atr_supertrend_strategy, validate_strategy_params as validate_atr_supertrend_params
-from ..strategy.backtester import run_backtest
+from ..strategy.backtester import run_backtest, run_backtest_batch, BacktestResult, PruningRules
+from .param_space import ParamSpace, canonicalize_param_combinations
+from .adaptive_search import AdaptiveSearch, metric_score, slice_data
+from .metrics import filter_results_by_metrics
+from .results_store import ResultsStore, data_fingerprint, params_hash, strategy_name
+from .robustness import ROBUSTNESS_FILE, run_robustness, save_robustness
+from .warmup import init_worker, start_workers, sequential_startup
 
 logger = logging.getLogger(__name__)
 
+RESULTS_STORE_FILE = "grid_search_results.sqlite"
+
+# Fixed capital, fee (0.1%) and slippage (0.05%) of optimization backtests
+BACKTEST_SETTINGS = {'initial_capital': 10000, 'fee_bps': 10, 'slippage_bps': 5}
+
 
 class GridSearchOptimizer:
     """
     Grid search optimizer for ATR + SuperTrend strategy.
     """
     
-    def __init__(self, cache_dir: Optional[str] = None, use_cache: bool = True):
+    def __init__(self, cache_dir: Optional[str] = None, use_cache: bool = True,
+                 pruning: Optional[PruningRules] = None,
+                 results_store: Optional[Union[str, Path, ResultsStore]] = None,
+                 resume: bool = True):
         """
         Initialize grid search optimizer.
         
         Args:
             cache_dir: Cache directory path
             use_cache: Whether to use caching
+            pruning: Early-abort rules for backtests (uses config if None)
+            results_store: SQLite results store (or its path). Results are then
+                streamed to it as they complete instead of kept in memory.
+            resume: Skip combinations already in the store for the same data
         """
         self.config = get_config()
         self.data_loader = create_data_loader(cache_dir, use_cache)
         self.results = []
+        self.pruned_results = []
+        self.search_stats = {}
+        
+        if results_store is not None and not isinstance(results_store, ResultsStore):
+            results_store = ResultsStore(results_store)
+        self.store = results_store
+        self.resume = resume
+        self.store_batch_size = 500
+        self._fingerprints = {}
+        self._resumed = 0
+        
+        if pruning is None:
+            opt = self.config.optimization
+            pruning = PruningRules(
+                max_drawdown_pct=opt.prune_max_drawdown_pct,
+                equity_floor_pct=opt.prune_equity_floor_pct,
+                min_trades=opt.prune_min_trades,
+                trades_window_bars=opt.prune_trades_window_bars,
+            )
+        self.pruning = pruning
         
     def optimize_single_combination(self, symbol: str, timeframe: str, 
                                  params: Dict[str, Any], data: pd.DataFrame, 
-                                 strategy_factory: Callable = create_strategy) -> Dict[str, Any]:
+                                 strategy_factory: Callable = create_strategy,
+                                 use_pruning: bool = True) -> Dict[str, Any]:
         """
         Optimize a single parameter combination.
         
@@ -54,90 +95,209 @@ class GridSearchOptimizer:
             timeframe: Timeframe
             params: Parameter combination
             data: OHLCV data
+            use_pruning: Whether to apply the early-abort rules
             
         Returns:
-            Optimization result
+            Optimization result (flagged with 'pruned' if stopped early)
         """
         try:
-            # Select validation function based on strategy
-            if strategy_factory == create_volensy_strategy:
-                validate_func = validate_volensy_params
-            elif strategy_factory == create_atr_supertrend_strategy:
-                validate_func = validate_atr_supertrend_params
-            else:
-                validate_func = validate_strategy_params
+            signals = self._combination_signals(params, data, strategy_factory)
+            if isinstance(signals, str):
+                return self._failed_result(symbol, timeframe, params, signals)
             
-            # Validate parameters
-            if not validate_func(params):
-                return {
-                    'symbol': symbol,
-                    'timeframe': timeframe,
-                    'params': params,
-                    'error': 'Invalid parameters',
-                    'success': False
-                }
+            # Run backtest; sweeps keep metrics only unless configured otherwise
+            result = self._run_backtest(data, signals, use_pruning,
+                                        compact=self.config.optimization.compact_backtests)
+            return self._combination_result(symbol, timeframe, params, result)
             
-            # Create strategy
-            strategy = strategy_factory(params)
-            
-            # Run strategy
-            signals = strategy.run_strategy(data)
-            
-            if signals.empty:
-                return {
-                    'symbol': symbol,
-                    'timeframe': timeframe,
-                    'params': params,
-                    'error': 'No signals generated',
-                    'success': False
-                }
-            
-            # Run backtest
-            result = run_backtest(
-                data=data,
-                signals=signals,
-                initial_capital=10000,  # Fixed capital
-                fee_bps=10,  # 0.1% fee
-                slippage_bps=5  # 0.05% slippage
-            )
+        except Exception as e:
+            logger.error(f"Error optimizing {symbol} {timeframe} with params {params}: {e}")
+            return self._failed_result(symbol, timeframe, params, str(e))
+    
+    def optimize_batch(self, symbol: str, timeframe: str,
+                       param_batch: List[Dict[str, Any]], data: pd.DataFrame,
+                       strategy_factory: Callable = create_strategy,
+                       use_pruning: bool = True) -> List[Dict[str, Any]]:
+        """
+        Optimize several parameter combinations with one batched compact backtest.
+        
+        Signals are generated per combination, then all signal sets are
+        backtested together in a single pass over the data (see
+        ``Backtester.run_backtest_batch``). Results equal those of
+        ``optimize_single_combination`` with compact backtests.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            param_batch: Parameter combinations
+            data: OHLCV data
+            use_pruning: Whether to apply the early-abort rules
             
-            # Add metadata
-            result.symbol = symbol
-            result.timeframe = timeframe
-            result.parameters = params
+        Returns:
+            Optimization results, in the order of param_batch
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(param_batch)
+        positions, signals_batch = [], []
+        
+        for i, params in enumerate(param_batch):
+            try:
+                signals = self._combination_signals(params, data, strategy_factory)
+            except Exception as e:
+                logger.error(f"Error optimizing {symbol} {timeframe} with params {params}: {e}")
+                signals = str(e)
+            if isinstance(signals, str):
+                results[i] = self._failed_result(symbol, timeframe, params, signals)
+            else:
+                positions.append(i)
+                signals_batch.append(signals)
+        
+        if signals_batch:
+            try:
+                backtests = run_backtest_batch(
+                    data, signals_batch, **BACKTEST_SETTINGS,
+                    pruning=self.pruning if use_pruning else None
+                )
+                for i, backtest in zip(positions, backtests):
+                    results[i] = self._combination_result(symbol, timeframe, param_batch[i], backtest)
+            except Exception as e:
+                logger.error(f"Error in batched backtest of {symbol} {timeframe}: {e}")
+                for i in positions:
+                    results[i] = self._failed_result(symbol, timeframe, param_batch[i], str(e))
+        
+        return results
+    
+    def _combination_signals(self, params: Dict[str, Any], data: pd.DataFrame,
+                             strategy_factory: Callable) -> Union[pd.DataFrame, str]:
+        """Validated strategy signals for a combination, or the reason there are none."""
+        # Select validation function based on strategy
+        if strategy_factory == create_volensy_strategy:
+            validate_func = validate_volensy_params
+        elif strategy_factory == create_atr_supertrend_strategy:
+            validate_func = validate_atr_supertrend_params
+        else:
+            validate_func = validate_strategy_params
+        
+        # Validate parameters
+        if not validate_func(params):
+            return 'Invalid parameters'
+        
+        # Create and run strategy
+        signals = strategy_factory(params).run_strategy(data)
+        if signals.empty:
+            return 'No signals generated'
+        return signals
+    
+    @staticmethod
+    def _combination_result(symbol: str, timeframe: str, params: Dict[str, Any],
+                            result: BacktestResult) -> Dict[str, Any]:
+        """Optimization result of a combination's backtest."""
+        # Add metadata
+        result.symbol = symbol
+        result.timeframe = timeframe
+        result.parameters = params
+        
+        output = {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'params': params,
+            'metrics': result.metrics,
+            'num_trades': result.metrics.get('num_trades', len(result.trades)),
+            'success': True
+        }
+        
+        if result.pruned:
+            output.update({
+                'pruned': True,
+                'prune_reason': result.prune_reason,
+                'bars_processed': result.bars_processed,
+                'total_bars': result.total_bars,
+            })
+        
+        return output
+    
+    @staticmethod
+    def _failed_result(symbol: str, timeframe: str, params: Dict[str, Any],
+                       error: str) -> Dict[str, Any]:
+        """Optimization result of a combination that could not be evaluated."""
+        return {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'params': params,
+            'error': error,
+            'success': False
+        }
+    
+    def _run_backtest(self, data: pd.DataFrame, signals: pd.DataFrame,
+                      use_pruning: bool, compact: bool) -> BacktestResult:
+        """Backtest with the fixed optimization capital, fees and slippage."""
+        return run_backtest(
+            data=data,
+            signals=signals,
+            **BACKTEST_SETTINGS,
+            pruning=self.pruning if use_pruning else None,
+            compact=compact
+        )
+    
+    def materialize_result(self, result: Dict[str, Any],
+                           strategy_factory: Callable = create_strategy) -> BacktestResult:
+        """
+        Re-run a result's backtest in full to recover its trades and equity curve.
+        
+        Sweeps run compact backtests that keep only metrics; reports and plots
+        call this for the few results they show.
+        
+        Args:
+            result: Optimization result (symbol, timeframe, params)
+            strategy_factory: Strategy factory used by the optimization
             
-            return {
-                'symbol': symbol,
-                'timeframe': timeframe,
-                'params': params,
-                'metrics': result.metrics,
-                'num_trades': len(result.trades),
-                'success': True
-            }
+        Returns:
+            Full BacktestResult
+        """
+        symbol, timeframe, params = result['symbol'], result['timeframe'], result['params']
+        data = self.data_loader.get_ohlcv(symbol, timeframe)
+        signals = strategy_factory(params).run_strategy(data)
+        
+        backtest = self._run_backtest(data, signals, use_pruning=bool(result.get('pruned')), compact=False)
+        backtest.symbol = symbol
+        backtest.timeframe = timeframe
+        backtest.parameters = params
+        return backtest
+    
+    def materialize_top_results(self, n: Optional[int] = None, metric: str = 'profit_factor',
+                                strategy_factory: Callable = create_strategy) -> List[BacktestResult]:
+        """
+        Full backtests (trades and equity curves) for the top N results.
+        
+        Args:
+            n: Number of top results (uses config top_n_results if None)
+            metric: Metric to rank by
+            strategy_factory: Strategy factory used by the optimization
             
-        except Exception as e:
-            logger.error(f"Error optimizing {symbol} {timeframe} with params {params}: {e}")
-            return {
-                'symbol': symbol,
-                'timeframe': timeframe,
-                'params': params,
-                'error': str(e),
-                'success': False
-            }
+        Returns:
+            List of BacktestResult objects, best first
+        """
+        if n is None:
+            n = self.config.optimization.top_n_results
+        return [self.materialize_result(result, strategy_factory) for result in self.get_top_results(n, metric)]
     
     def optimize_symbol_timeframe(self, symbol: str, timeframe: str, 
-                                param_combinations: List[Dict[str, Any]], 
-                                strategy_factory: Callable = create_strategy) -> List[Dict[str, Any]]:
+                                param_combinations: Union[List[Dict[str, Any]], ParamSpace], 
+                                strategy_factory: Callable = create_strategy,
+                                sink: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                                sink_batch_size: int = 500) -> List[Dict[str, Any]]:
         """
         Optimize all parameter combinations for a single symbol/timeframe.
         
         Args:
             symbol: Trading pair symbol
             timeframe: Timeframe
-            param_combinations: List of parameter combinations
+            param_combinations: List of parameter combinations or a lazy ParamSpace
+            sink: Called with batches of results as they complete; the results
+                are then not returned
+            sink_batch_size: Results per sink call
             
         Returns:
-            List of optimization results
+            List of optimization results (empty when a sink is given)
         """
         logger.info(f"Optimizing {symbol} {timeframe} with {len(param_combinations)} combinations")
         
@@ -152,26 +312,225 @@ class GridSearchOptimizer:
             return []
         
         results = []
+        opt = self.config.optimization
+        batch_size = opt.backtest_batch_size if opt.compact_backtests else 1
+        pending = []
+        
+        def flush():
+            if batch_size > 1:
+                results.extend(self.optimize_batch(symbol, timeframe, pending, data, strategy_factory))
+            else:
+                results.extend(self.optimize_single_combination(symbol, timeframe, params, data, strategy_factory)
+                               for params in pending)
+            pending.clear()
         
-        # Optimize each parameter combination
+        # Optimize each parameter combination, batch_size backtests per data pass
         for params in tqdm(param_combinations, desc=f"{symbol} {timeframe}"):
-            result = self.optimize_single_combination(symbol, timeframe, params, data, strategy_factory)
-            results.append(result)
+            pending.append(params)
+            if len(pending) >= batch_size:
+                flush()
+            if sink is not None and len(results) >= sink_batch_size:
+                sink(results)
+                results = []
+        if pending:
+            flush()
+        
+        if sink is not None:
+            if results:
+                sink(results)
+            return []
         
         return results
     
+    def _data_fingerprint(self, symbol: str, timeframe: str) -> Optional[str]:
+        """Fingerprint of the data a symbol/timeframe is optimized on (cached per run)."""
+        key = (symbol, timeframe)
+        if key not in self._fingerprints:
+            try:
+                data = self.data_loader.get_ohlcv(symbol, timeframe)
+                self._fingerprints[key] = data_fingerprint(data) if not data.empty else None
+            except Exception as e:
+                logger.error(f"Failed to load data for {symbol} {timeframe}: {e}")
+                self._fingerprints[key] = None
+        return self._fingerprints[key]
+    
+    def _run_hash(self) -> str:
+        """Hash of the settings that change a result besides its data and parameters."""
+        return params_hash({
+            **BACKTEST_SETTINGS,
+            'pruning': asdict(self.pruning) if self.pruning is not None else None,
+            'compact_backtests': self.config.optimization.compact_backtests,
+        })
+    
+    def _pending_combinations(self, symbol: str, timeframe: str,
+                              param_combinations: Union[List[Dict[str, Any]], ParamSpace]
+                              ) -> Union[List[Dict[str, Any]], ParamSpace]:
+        """
+        Combinations of a symbol/timeframe that still need evaluating.
+        
+        With a results store and resume enabled, combinations whose parameter
+        hash is already stored for the same data fingerprint, strategy and
+        run settings (the store's scope) are dropped.
+        """
+        if self.store is None:
+            return param_combinations
+        
+        fingerprint = self._data_fingerprint(symbol, timeframe)
+        if fingerprint is None:
+            return param_combinations[:0]
+        if not self.resume:
+            return param_combinations
+        
+        done = self.store.evaluated(symbol, timeframe, fingerprint)
+        if not done:
+            return param_combinations
+        
+        keep = [params_hash(params) not in done for params in param_combinations]
+        skipped = len(keep) - sum(keep)
+        if skipped:
+            self._resumed += skipped
+            logger.info(f"Resuming {symbol} {timeframe}: {skipped} stored combinations skipped")
+        
+        if isinstance(param_combinations, ParamSpace):
+            return param_combinations.select(keep)
+        return [params for params, k in zip(param_combinations, keep) if k]
+    
+    def _collect(self, symbol: str, timeframe: str, results: List[Dict[str, Any]],
+                 all_results: List[Dict[str, Any]]):
+        """Stream results to the store, or keep them in memory without one."""
+        if self.store is not None:
+            self.store.add(results, self._data_fingerprint(symbol, timeframe) or '')
+        else:
+            all_results.extend(results)
+    
+    def optimize_adaptive(self, symbol: str, timeframe: str,
+                          param_combinations: Union[List[Dict[str, Any]], ParamSpace],
+                          strategy_factory: Callable = create_strategy,
+                          metric: str = 'profit_factor') -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Optimize a single symbol/timeframe with successive halving and TPE.
+        
+        Candidates are backtested on a leading slice of the data first and only
+        the best are promoted to longer slices, so far fewer full-length
+        backtests are needed than for an exhaustive grid.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            param_combinations: List of parameter combinations or a ParamSpace
+            metric: Metric to maximize
+            
+        Returns:
+            Tuple of (full-data results, search budget statistics)
+        """
+        opt = self.config.optimization
+        
+        if not isinstance(param_combinations, ParamSpace):
+            param_combinations = ParamSpace.from_combinations(param_combinations)
+        
+        logger.info(f"Adaptive search {symbol} {timeframe} over {len(param_combinations)} combinations")
+        
+        # Load data
+        try:
+            data = self.data_loader.get_ohlcv(symbol, timeframe)
+            if data.empty:
+                logger.error(f"No data available for {symbol} {timeframe}")
+                return [], {}
+        except Exception as e:
+            logger.error(f"Failed to load data for {symbol} {timeframe}: {e}")
+            return [], {}
+        
+        def evaluate(params: Dict[str, Any], fraction: float) -> Dict[str, Any]:
+            return self.optimize_single_combination(
+                symbol, timeframe, params, slice_data(data, fraction, opt.adaptive_min_bars), strategy_factory
+            )
+        
+        search = AdaptiveSearch(
+            param_combinations, evaluate, metric_score(metric, opt.adaptive_min_trades),
+            n_candidates=opt.adaptive_candidates,
+            eta=opt.adaptive_eta,
+            min_fraction=opt.adaptive_min_fraction,
+            n_brackets=opt.adaptive_brackets,
+            seed=opt.adaptive_seed,
+        )
+        results = search.run()
+        
+        stats = search.stats
+        logger.info(f"Adaptive search {symbol} {timeframe}: {stats['full_backtests']} full backtests, "
+                   f"{stats['full_backtest_equivalents']:.1f} full-backtest equivalents "
+                   f"({stats['reduction_vs_grid']:.1f}x fewer than grid)")
+        
+        return results, stats
+    
+    def optimize_adaptive_all(self, symbols: List[str], timeframes: List[str],
+                              param_combinations: Union[List[Dict[str, Any]], ParamSpace],
+                              strategy_factory: Callable = create_strategy,
+                              max_workers: int = 4) -> List[Dict[str, Any]]:
+        """
+        Run adaptive search for every symbol/timeframe.
+        
+        Each symbol/timeframe is an independent search; with more than one
+        worker they run in parallel processes.
+        
+        Args:
+            symbols: List of trading pair symbols
+            timeframes: List of timeframes
+            param_combinations: List of parameter combinations or a ParamSpace
+            max_workers: Maximum number of parallel workers
+            
+        Returns:
+            List of all full-data results
+        """
+        all_results = []
+        adaptive_stats = {}
+        tasks = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+        
+        if max_workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker) as executor:
+                self.search_stats['startup'] = start_workers(executor, max_workers)
+                future_to_task = {
+                    executor.submit(self.optimize_adaptive, symbol, timeframe, param_combinations, strategy_factory): (symbol, timeframe)
+                    for symbol, timeframe in tasks
+                }
+                
+                for future in tqdm(as_completed(future_to_task), total=len(tasks), desc="Adaptive Search Progress"):
+                    symbol, timeframe = future_to_task[future]
+                    try:
+                        results, stats = future.result()
+                        self._collect(symbol, timeframe, results, all_results)
+                        adaptive_stats[f"{symbol}_{timeframe}"] = stats
+                    except Exception as e:
+                        logger.error(f"Error processing {symbol} {timeframe}: {e}")
+        else:
+            self.search_stats['startup'] = sequential_startup()
+            for symbol, timeframe in tasks:
+                results, stats = self.optimize_adaptive(symbol, timeframe, param_combinations, strategy_factory)
+                self._collect(symbol, timeframe, results, all_results)
+                adaptive_stats[f"{symbol}_{timeframe}"] = stats
+        
+        self.search_stats['search_mode'] = 'adaptive'
+        self.search_stats['adaptive'] = adaptive_stats
+        return all_results
+    
     def optimize_parallel(self, symbols: List[str], timeframes: List[str], 
-                        param_combinations: List[Dict[str, Any]], 
+                        param_combinations: Union[List[Dict[str, Any]], ParamSpace], 
                         strategy_factory: Callable = create_strategy,
-                        max_workers: int = 4) -> List[Dict[str, Any]]:
+                        max_workers: int = 4,
+                        chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Run parallel optimization across symbols and timeframes.
         
+        When param_combinations is a ParamSpace, each symbol/timeframe is split
+        into index-range chunks so workers decode their own combinations
+        instead of receiving a copy of the full list.
+        
         Args:
             symbols: List of trading pair symbols
             timeframes: List of timeframes
-            param_combinations: List of parameter combinations
+            param_combinations: List of parameter combinations or a lazy ParamSpace
             max_workers: Maximum number of parallel workers
+            chunk_size: Combinations per task for ParamSpace input
+                (defaults to splitting each symbol/timeframe across all workers)
             
         Returns:
             List of all optimization results
@@ -182,12 +541,25 @@ class GridSearchOptimizer:
         
         # Create tasks
         tasks = []
-        for symbol in symbols:
-            for timeframe in timeframes:
-                tasks.append((symbol, timeframe, param_combinations))
+        if isinstance(param_combinations, ParamSpace):
+            if chunk_size is None:
+                chunk_size = max(1, math.ceil(len(param_combinations) / max_workers))
+            for symbol in symbols:
+                for timeframe in timeframes:
+                    pending = self._pending_combinations(symbol, timeframe, param_combinations)
+                    for start, stop in pending.index_ranges(chunk_size):
+                        tasks.append((symbol, timeframe, pending.take(start, stop)))
+        else:
+            for symbol in symbols:
+                for timeframe in timeframes:
+                    pending = self._pending_combinations(symbol, timeframe, param_combinations)
+                    if pending:
+                        tasks.append((symbol, timeframe, pending))
         
         # Run parallel optimization
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker) as executor:
+            self.search_stats['startup'] = start_workers(executor, max_workers)
+            
             # Submit all tasks
             future_to_task = {
                 executor.submit(self.optimize_symbol_timeframe, symbol, timeframe, param_combinations, strategy_factory): (symbol, timeframe)
@@ -199,7 +571,7 @@ class GridSearchOptimizer:
                 symbol, timeframe = future_to_task[future]
                 try:
                     results = future.result()
-                    all_results.extend(results)
+                    self._collect(symbol, timeframe, results, all_results)
                     logger.info(f"Completed {symbol} {timeframe}: {len(results)} results")
                 except Exception as e:
                     logger.error(f"Error processing {symbol} {timeframe}: {e}")
@@ -223,45 +595,95 @@ class GridSearchOptimizer:
         logger.info(f"Starting sequential optimization: {len(symbols)} symbols, {len(timeframes)} timeframes, {len(param_combinations)} combinations")
         
         all_results = []
+        self.search_stats['startup'] = sequential_startup()
         
         for symbol in symbols:
             for timeframe in timeframes:
-                results = self.optimize_symbol_timeframe(symbol, timeframe, param_combinations, strategy_factory)
+                pending = self._pending_combinations(symbol, timeframe, param_combinations)
+                if not len(pending):
+                    continue
+                
+                sink = None
+                if self.store is not None:
+                    sink = lambda batch, s=symbol, t=timeframe: self._collect(s, t, batch, all_results)
+                results = self.optimize_symbol_timeframe(symbol, timeframe, pending, strategy_factory,
+                                                         sink=sink, sink_batch_size=self.store_batch_size)
                 all_results.extend(results)
         
         return all_results
     
     def run_optimization(self, symbols: List[str], timeframes: List[str], 
-                         param_combinations: Optional[List[Dict[str, Any]]] = None,
+                         param_combinations: Optional[Union[List[Dict[str, Any]], ParamSpace]] = None,
                          strategy_factory: Callable = create_strategy,
-                         max_workers: int = 4, parallel: bool = True) -> List[Dict[str, Any]]:
+                         max_workers: int = 4, parallel: bool = True,
+                         chunk_size: Optional[int] = None,
+                         search_mode: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Run complete optimization.
         
         Args:
             symbols: List of trading pair symbols
             timeframes: List of timeframes
-            param_combinations: Parameter combinations (uses config if None)
+            param_combinations: Parameter combinations or ParamSpace (uses config space if None)
             max_workers: Maximum number of parallel workers
             parallel: Whether to use parallel processing
+            chunk_size: Combinations per parallel task for ParamSpace input
+            search_mode: 'grid' (exhaustive) or 'adaptive' (successive halving + TPE);
+                uses config if None
             
         Returns:
-            List of all optimization results
+            List of all optimization results (only the top results when
+            results are streamed to a store)
         """
+        if search_mode is None:
+            search_mode = self.config.optimization.search_mode
+        if search_mode not in ('grid', 'adaptive'):
+            raise ValueError(f"Unknown search mode '{search_mode}'. Available: grid, adaptive")
+        
         if param_combinations is None:
-            param_combinations = get_param_combinations()
+            param_combinations = get_param_space()
+        
+        self._fingerprints = {}
+        self._resumed = 0
+        if self.store is not None:
+            self.store.set_scope(strategy_name(strategy_factory), self._run_hash())
+        
+        # Collapse combinations that differ only in inactive parameters
+        param_combinations, self.search_stats = canonicalize_param_combinations(
+            param_combinations,
+            self.config.strategy.param_conditions,
+            self.config.strategy.param_constraints,
+        )
+        if self.search_stats['skipped_combinations']:
+            logger.info(f"Canonicalized parameter space: {self.search_stats['total_combinations']} -> "
+                       f"{self.search_stats['evaluated_combinations']} combinations "
+                       f"({self.search_stats['skipped_combinations']} redundant evaluations skipped per symbol/timeframe)")
         
-        logger.info(f"Starting optimization with {len(param_combinations)} parameter combinations")
+        logger.info(f"Starting {search_mode} optimization with {len(param_combinations)} parameter combinations")
         
-        if parallel and max_workers > 1:
-            results = self.optimize_parallel(symbols, timeframes, param_combinations, strategy_factory, max_workers)
+        if search_mode == 'adaptive':
+            results = self.optimize_adaptive_all(symbols, timeframes, param_combinations, strategy_factory,
+                                                 max_workers if parallel else 1)
+        elif parallel and max_workers > 1:
+            results = self.optimize_parallel(symbols, timeframes, param_combinations, strategy_factory, max_workers, chunk_size)
         else:
             results = self.optimize_sequential(symbols, timeframes, param_combinations, strategy_factory)
         
+        if self.store is not None:
+            return self._finish_stored_run()
+        
         # Filter successful results
         successful_results = [r for r in results if r.get('success', False)]
         failed_results = [r for r in results if not r.get('success', False)]
         
+        # Pruned runs are partial and would be rejected by the final filters
+        self.pruned_results = [r for r in successful_results if r.get('pruned', False)]
+        if self.pruned_results:
+            successful_results = [r for r in successful_results if not r.get('pruned', False)]
+            self.search_stats['pruning'] = self._pruning_stats(self.pruned_results)
+            logger.info(f"Pruned {len(self.pruned_results)} hopeless backtests early, "
+                       f"saving {self.search_stats['pruning']['bar_steps_saved']} bar steps")
+        
         logger.info(f"Optimization completed: {len(successful_results)} successful, {len(failed_results)} failed")
         
         if failed_results:
@@ -272,6 +694,108 @@ class GridSearchOptimizer:
         self.results = successful_results
         return successful_results
     
+    def _finish_stored_run(self) -> List[Dict[str, Any]]:
+        """
+        Summarize a run whose results were streamed to the store.
+        
+        Counts cover everything in the store for this strategy and these run
+        settings, including results resumed from earlier runs. Only pruned runs are loaded back; the full results stay
+        on disk and are queried through get_top_results.
+        
+        Returns:
+            Top results by profit factor (config top_n_results)
+        """
+        successful = self.store.count()
+        failed = self.store.count(success=False, pruned=None)
+        
+        self.pruned_results = list(self.store.iter_results(pruned=True))
+        if self.pruned_results:
+            self.search_stats['pruning'] = self._pruning_stats(self.pruned_results)
+            logger.info(f"Pruned {len(self.pruned_results)} hopeless backtests early, "
+                       f"saving {self.search_stats['pruning']['bar_steps_saved']} bar steps")
+        
+        self.search_stats['results_store'] = {
+            'path': str(self.store.path),
+            'strategy': self.store.strategy,
+            'run_hash': self.store.run_hash,
+            'stored_results': successful,
+            'resumed_combinations': self._resumed,
+        }
+        logger.info(f"Optimization completed: {successful} successful, {failed} failed "
+                   f"(stored in {self.store.path}, {self._resumed} combinations resumed)")
+        
+        if failed:
+            logger.warning(f"Failed optimizations: {failed}")
+            for result in self.store.iter_results(success=False, pruned=None, limit=5):  # Log first 5 failures
+                logger.warning(f"Failed: {result['symbol']} {result['timeframe']} - {result.get('error', 'Unknown error')}")
+        
+        self.results = []
+        return self.get_top_results(self.config.optimization.top_n_results)
+    
+    def _pruning_stats(self, pruned_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summarize pruned backtests."""
+        bars_processed = sum(r['bars_processed'] for r in pruned_results)
+        total_bars = sum(r['total_bars'] for r in pruned_results)
+        
+        reasons = {}
+        for r in pruned_results:
+            reasons[r['prune_reason']] = reasons.get(r['prune_reason'], 0) + 1
+        
+        return {
+            'pruned_runs': len(pruned_results),
+            'by_reason': reasons,
+            'bar_steps_saved': total_bars - bars_processed,
+            'bar_steps_saved_pct': (total_bars - bars_processed) / total_bars * 100 if total_bars > 0 else 0,
+        }
+    
+    def verify_pruning(self, sample_size: int = 20,
+                       strategy_factory: Callable = create_strategy) -> Dict[str, Any]:
+        """
+        Re-run a sample of pruned combinations to completion and check that
+        the final metric filters implied by the pruning rules reject them.
+        
+        Args:
+            sample_size: Maximum number of pruned runs to re-check
+            strategy_factory: Strategy factory used by the optimization
+            
+        Returns:
+            Verification summary with any combinations the filters would keep
+        """
+        sample = self.pruned_results[:sample_size]
+        confirmed = 0
+        violations = []
+        
+        for pruned in sample:
+            data = self.data_loader.get_ohlcv(pruned['symbol'], pruned['timeframe'])
+            full = self.optimize_single_combination(
+                pruned['symbol'], pruned['timeframe'], pruned['params'], data,
+                strategy_factory, use_pruning=False
+            )
+            filters = self.pruning.implied_filters(pruned['total_bars'])
+            
+            if not full.get('success', False) or not filter_results_by_metrics([full], filters):
+                confirmed += 1
+            else:
+                violations.append({
+                    'symbol': pruned['symbol'],
+                    'timeframe': pruned['timeframe'],
+                    'params': pruned['params'],
+                    'prune_reason': pruned['prune_reason'],
+                })
+        
+        summary = {
+            'checked': len(sample),
+            'confirmed': confirmed,
+            'violations': violations,
+        }
+        if violations:
+            logger.warning(f"Pruning verification: {len(violations)}/{len(sample)} pruned runs would have passed the final filters")
+        else:
+            logger.info(f"Pruning verification: all {len(sample)} checked runs would have been filtered")
+        
+        self.search_stats.setdefault('pruning', {})['verification'] = summary
+        return summary
+    
     def get_top_results(self, n: int = 10, metric: str = 'profit_factor') -> List[Dict[str, Any]]:
         """
         Get top N results sorted by metric.
@@ -283,6 +807,9 @@ class GridSearchOptimizer:
         Returns:
             List of top results
         """
+        if self.store is not None:
+            return self.store.get_top_results(n, metric)
+        
         if not self.results:
             return []
         
@@ -320,6 +847,36 @@ class GridSearchOptimizer:
         
         return grouped
     
+    def get_best_by_symbol_timeframe(self, metric: str = 'profit_factor') -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Best result per symbol and timeframe.
+        
+        With a results store this runs one top-1 query per group instead of
+        loading the results.
+        
+        Args:
+            metric: Metric to maximize
+            
+        Returns:
+            Nested dictionary: {symbol: {timeframe: best result}}
+        """
+        best = {}
+        
+        if self.store is not None:
+            for symbol, timeframe in self.store.groups():
+                top = self.store.get_top_results(1, metric, symbol, timeframe)
+                if top:
+                    best.setdefault(symbol, {})[timeframe] = top[0]
+            return best
+        
+        for symbol, timeframes in self.get_results_by_symbol_timeframe().items():
+            best[symbol] = {}
+            for timeframe, results in timeframes.items():
+                if results:
+                    best[symbol][timeframe] = max(results, key=lambda x: x['metrics'].get(metric, 0))
+        
+        return best
+    
     def save_results(self, output_dir: str, filename_prefix: str = "grid_search"):
         """
         Save optimization results to files.
@@ -331,14 +888,19 @@ class GridSearchOptimizer:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        # Save all results as JSON
-        json_file = output_path / f"{filename_prefix}_results.json"
-        with open(json_file, 'w') as f:
-            json.dump(self.results, f, indent=2, default=str)
-        
-        # Save as CSV
         csv_file = output_path / f"{filename_prefix}_results.csv"
-        self._save_results_csv(csv_file)
+        if self.store is not None:
+            # The store already holds every result; export the flat table in chunks
+            rows = self.store.export_csv(csv_file)
+            logger.info(f"Exported {rows} stored results to {csv_file}")
+        else:
+            # Save all results as JSON
+            json_file = output_path / f"{filename_prefix}_results.json"
+            with open(json_file, 'w') as f:
+                json.dump(self.results, f, indent=2, default=str)
+            
+            # Save as CSV
+            self._save_results_csv(csv_file)
         
         # Save top results
         top_results = self.get_top_results(n=100)
@@ -381,52 +943,114 @@ class GridSearchOptimizer:
     
     def _save_summary(self, summary_file: Path):
         """Save optimization summary."""
+        best_results = self.get_best_by_symbol_timeframe('profit_factor')
+        
         summary = {
-            'total_combinations': len(self.results),
-            'symbols': list(set(r['symbol'] for r in self.results)),
-            'timeframes': list(set(r['timeframe'] for r in self.results)),
+            'total_combinations': self.store.count() if self.store is not None else len(self.results),
+            'symbols': list(best_results),
+            'timeframes': list(set(timeframe for timeframes in best_results.values() for timeframe in timeframes)),
+            'search_space': self.search_stats,
             'best_results': {}
         }
         
-        # Get best result for each symbol/timeframe
-        grouped = self.get_results_by_symbol_timeframe()
-        for symbol, timeframes in grouped.items():
+        # Best result for each symbol/timeframe
+        for symbol, timeframes in best_results.items():
             summary['best_results'][symbol] = {}
-            for timeframe, results in timeframes.items():
-                if results:
-                    best = max(results, key=lambda x: x['metrics'].get('profit_factor', 0))
-                    summary['best_results'][symbol][timeframe] = {
-                        'params': best['params'],
-                        'profit_factor': best['metrics'].get('profit_factor', 0),
-                        'total_return': best['metrics'].get('total_return_pct', 0),
-                        'max_drawdown': best['metrics'].get('max_drawdown_pct', 0),
-                        'num_trades': best['num_trades'],
-                    }
+            for timeframe, best in timeframes.items():
+                summary['best_results'][symbol][timeframe] = {
+                    'params': best['params'],
+                    'profit_factor': best['metrics'].get('profit_factor', 0),
+                    'total_return': best['metrics'].get('total_return_pct', 0),
+                    'max_drawdown': best['metrics'].get('max_drawdown_pct', 0),
+                    'num_trades': best['num_trades'],
+                }
         
         with open(summary_file, 'w') as f:
             json.dump(summary, f, indent=2, default=str)
 
 
+def open_results_store(output_dir: Union[str, Path]) -> ResultsStore:
+    """
+    Open the results store of an output directory.
+    
+    The store is scoped to the strategy and run settings recorded in the
+    directory's grid_search_summary.json, so it reads only the last run's
+    results; without a summary it reads every stored result.
+    
+    Args:
+        output_dir: Directory a streamed run wrote to
+        
+    Returns:
+        ResultsStore
+    """
+    output_path = Path(output_dir)
+    store = ResultsStore(output_path / RESULTS_STORE_FILE)
+    try:
+        with open(output_path / "grid_search_summary.json", 'r') as f:
+            scope = json.load(f)['search_space']['results_store']
+        store.set_scope(scope.get('strategy'), scope.get('run_hash'))
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return store
+
+
 def run_grid_search(symbols: List[str], timeframes: List[str], 
-                   param_combinations: Optional[List[Dict[str, Any]]] = None,
+                   param_combinations: Optional[Union[List[Dict[str, Any]], ParamSpace]] = None,
                    strategy_factory: Callable = create_strategy,
                    max_workers: int = 4, parallel: bool = True,
-                   output_dir: str = "./reports/grid") -> List[Dict[str, Any]]:
+                   output_dir: str = "./reports/grid",
+                   chunk_size: Optional[int] = None,
+                   search_mode: Optional[str] = None,
+                   pruning: Optional[PruningRules] = None,
+                   verify_pruning: int = 0,
+                   stream_results: bool = False,
+                   resume: bool = True,
+                   plot_top: int = 0,
+                   robustness_top: int = 0) -> List[Dict[str, Any]]:
     """
     Convenience function to run grid search optimization.
     
     Args:
         symbols: List of trading pair symbols
         timeframes: List of timeframes
-        param_combinations: Parameter combinations
+        param_combinations: Parameter combinations or ParamSpace
         max_workers: Maximum number of parallel workers
         parallel: Whether to use parallel processing
         output_dir: Output directory
+        chunk_size: Combinations per parallel task for ParamSpace input
+        search_mode: 'grid' or 'adaptive' (uses config if None)
+        pruning: Early-abort rules (uses config if None)
+        verify_pruning: Number of pruned runs to re-check without pruning
+        stream_results: Stream results to <output_dir>/grid_search_results.sqlite
+            as they complete instead of keeping them in memory
+        resume: Skip combinations already in that store for the same data
+        plot_top: Re-run the top N results in full and save their equity and
+            drawdown plots
+        robustness_top: Monte Carlo robustness analysis of the top N results,
+            saved to <output_dir>/grid_search_robustness.json
         
     Returns:
-        List of optimization results
+        List of optimization results (top results when streaming)
     """
-    optimizer = GridSearchOptimizer()
-    results = optimizer.run_optimization(symbols, timeframes, param_combinations, strategy_factory, max_workers, parallel)
+    results_store = Path(output_dir) / RESULTS_STORE_FILE if stream_results else None
+    optimizer = GridSearchOptimizer(pruning=pruning, results_store=results_store, resume=resume)
+    results = optimizer.run_optimization(symbols, timeframes, param_combinations, strategy_factory, max_workers, parallel, chunk_size, search_mode)
+    if verify_pruning and optimizer.pruned_results:
+        optimizer.verify_pruning(verify_pruning, strategy_factory)
     optimizer.save_results(output_dir)
+    
+    # Full backtests are re-run once for whichever top results need them
+    backtests = []
+    if plot_top or robustness_top:
+        backtests = optimizer.materialize_top_results(max(plot_top, robustness_top),
+                                                      strategy_factory=strategy_factory)
+    if plot_top:
+        from ..reporting.plots import create_visualizer
+        create_visualizer(output_dir).save_backtest_plots(backtests[:plot_top], "grid_search_top")
+    if robustness_top:
+        opt = optimizer.config.optimization
+        summaries = run_robustness(backtests[:robustness_top], n_paths=opt.mc_paths,
+                                   confidence=opt.mc_confidence, block_size=opt.mc_block_days,
+                                   slippage_bps=opt.mc_slippage_bps, seed=opt.mc_seed)
+        save_robustness(summaries, str(Path(output_dir) / ROBUSTNESS_FILE))
     return results
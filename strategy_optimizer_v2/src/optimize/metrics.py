@@ -7,7 +7,8 @@ for strategy optimization results.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 import logging
 from scipy import stats
 
@@ -270,38 +271,370 @@ def calculate_advanced_metrics(equity_curve: pd.Series, trades: List[Any]) -> Di
     }
 
 
-def calculate_all_metrics(equity_curve: pd.Series, trades: List[Any]) -> Dict[str, float]:
+# Metric groups in the order calculate_all_metrics reports them
+BASIC_METRICS = ['total_return_pct', 'max_drawdown_pct', 'volatility_pct', 'sharpe_ratio',
+                 'sortino_ratio', 'calmar_ratio', 'mar_ratio']
+TRADE_METRICS = ['num_trades', 'win_rate_pct', 'profit_factor', 'expectancy', 'avg_win', 'avg_loss',
+                 'largest_win', 'largest_loss', 'avg_trade', 'avg_trade_duration']
+RISK_METRICS = ['var_95_pct', 'cvar_95_pct', 'max_consecutive_losses', 'avg_recovery_period', 'exposure_pct']
+ADVANCED_METRICS = ['skewness', 'kurtosis', 'information_ratio', 'omega_ratio', 'sterling_ratio',
+                    'burke_ratio', 'kappa_ratio']
+INTEGER_METRICS = {'num_trades', 'max_consecutive_losses'}
+
+
+@dataclass
+class TradeArrays:
     """
-    Calculate all available metrics.
+    Struct-of-arrays view of a trade list.
+    
+    Times are epoch seconds (NaN when unknown), bar indices are positions in
+    the equity curve (-1 when unknown) and side is +1 for long, -1 for short.
+    Fees are commission plus slippage.
+    """
+    entry_idx: np.ndarray
+    exit_idx: np.ndarray
+    entry_time: np.ndarray
+    exit_time: np.ndarray
+    pnl: np.ndarray
+    side: np.ndarray
+    fees: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.pnl)
+    
+    @classmethod
+    def from_trades(cls, trades: List[Any], index: Optional[pd.Index] = None) -> 'TradeArrays':
+        """
+        Convert trade objects to arrays.
+        
+        Args:
+            trades: List of trade objects
+            index: Equity curve index used to resolve bar positions
+            
+        Returns:
+            TradeArrays instance
+        """
+        entry_times = [t.entry_time for t in trades]
+        exit_times = [t.exit_time for t in trades]
+        
+        return cls(
+            entry_idx=_bar_positions(index, entry_times),
+            exit_idx=_bar_positions(index, exit_times),
+            entry_time=np.array([_epoch_seconds(t) for t in entry_times], dtype=np.float64),
+            exit_time=np.array([_epoch_seconds(t) for t in exit_times], dtype=np.float64),
+            pnl=np.array([np.nan if t.pnl is None else t.pnl for t in trades], dtype=np.float64),
+            side=np.array([1 if t.side == 'long' else -1 for t in trades], dtype=np.int8),
+            fees=np.array([(t.commission or 0.0) + (t.slippage or 0.0) for t in trades], dtype=np.float64),
+        )
+
+
+def _epoch_seconds(timestamp: Any) -> float:
+    """Epoch seconds of a timestamp, NaN when missing."""
+    if timestamp is None or timestamp is pd.NaT:
+        return np.nan
+    return pd.Timestamp(timestamp).timestamp()
+
+
+def _bar_positions(index: Optional[pd.Index], times: List[Any]) -> np.ndarray:
+    """Positions of timestamps in an index, -1 when absent or unresolvable."""
+    if not isinstance(index, pd.DatetimeIndex) or not times or not index.is_unique:
+        return np.full(len(times), -1, dtype=np.int64)
+    try:
+        return index.get_indexer(pd.DatetimeIndex(times)).astype(np.int64)
+    except (TypeError, ValueError):
+        return np.full(len(times), -1, dtype=np.int64)
+
+
+def pad_equity_curves(equity_curves: Sequence[pd.Series]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Stack equity curves of different lengths into NaN-padded matrices.
     
     Args:
-        equity_curve: Equity curve series
-        trades: List of trade objects
+        equity_curves: Equity curve series
         
     Returns:
-        Dictionary of all metrics
+        Tuple of (equity matrix, timestamp matrix in epoch seconds or None
+        when any curve lacks a DatetimeIndex)
     """
+    width = max((len(curve) for curve in equity_curves), default=0)
+    equity = np.full((len(equity_curves), width), np.nan)
+    has_times = all(isinstance(curve.index, pd.DatetimeIndex) for curve in equity_curves)
+    timestamps = np.full_like(equity, np.nan) if has_times else None
+    
+    for row, curve in enumerate(equity_curves):
+        equity[row, :len(curve)] = curve.to_numpy(dtype=np.float64)
+        if timestamps is not None and len(curve):
+            timestamps[row, :len(curve)] = curve.index.asi8 / 1e9
+    
+    return equity, timestamps
+
+
+def _row_moments(values: np.ndarray, mask: np.ndarray) -> Dict[str, np.ndarray]:
+    """Count, mean, sample std and central moments of the masked entries of each row."""
+    count = mask.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(mask, values, 0.0).sum(axis=1) / count
+        deviation = np.where(mask, values - mean[:, None], 0.0)
+        m2 = (deviation ** 2).sum(axis=1) / count
+        m3 = (deviation ** 3).sum(axis=1) / count
+        m4 = (deviation ** 4).sum(axis=1) / count
+        std = np.where(count > 1, np.sqrt(m2 * count / (count - 1)), np.nan)
+    return {'count': count, 'mean': mean, 'std': std, 'm2': m2, 'm3': m3, 'm4': m4}
+
+
+def _equity_metrics_batch(equity: np.ndarray, lengths: np.ndarray,
+                          trade_exposure: np.ndarray, timestamps: Optional[np.ndarray]) -> Dict[str, np.ndarray]:
+    """Basic, risk and advanced metrics for each row of a padded equity matrix."""
+    n_rows, width = equity.shape
+    rows = np.arange(n_rows)
+    positions = np.arange(width)
+    valid = positions[None, :] < lengths[:, None]
+    last = np.maximum(lengths - 1, 0)
     metrics = {}
     
-    # Basic metrics
-    basic_metrics = calculate_basic_metrics(equity_curve, trades)
-    metrics.update(basic_metrics)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Basic metrics
+        first = equity[:, 0] if width else np.full(n_rows, np.nan)
+        final = equity[rows, last] if width else np.full(n_rows, np.nan)
+        total_return = (final - first) / first * 100
+        
+        peak = np.fmax.accumulate(equity, axis=1)
+        drawdown = np.where(valid, (equity - peak) / peak * 100, np.nan)
+        max_drawdown = np.fmin.reduce(drawdown, axis=1) if width else np.full(n_rows, np.nan)
+        
+        returns = equity[:, 1:] / equity[:, :-1] - 1
+        returns_mask = valid[:, 1:] & ~np.isnan(returns)
+        moments = _row_moments(returns, returns_mask)
+        count, mean, std = moments['count'], moments['mean'], moments['std']
+        
+        downside_mask = returns_mask & (returns < 0)
+        downside_std = _row_moments(returns, downside_mask)['std']
+        
+        metrics['total_return_pct'] = total_return
+        metrics['max_drawdown_pct'] = max_drawdown
+        metrics['volatility_pct'] = np.where(count > 1, std * np.sqrt(252) * 100, 0.0)
+        metrics['sharpe_ratio'] = np.where(std > 0, mean / std * np.sqrt(252), 0.0)
+        metrics['sortino_ratio'] = np.where(downside_std > 0, mean / downside_std * np.sqrt(252), 0.0)
+        metrics['calmar_ratio'] = np.where(max_drawdown != 0, total_return / np.abs(max_drawdown), 0.0)
+        metrics['mar_ratio'] = metrics['calmar_ratio']
+        
+        # Risk metrics
+        var_95 = np.zeros(n_rows)
+        cvar_95 = np.zeros(n_rows)
+        has_returns = count > 0
+        if has_returns.any():
+            masked = np.where(returns_mask, returns, np.nan)[has_returns]
+            quantile = np.nanpercentile(masked, 5, axis=1)
+            tail = masked <= quantile[:, None]
+            var_95[has_returns] = quantile * 100
+            cvar_95[has_returns] = np.where(tail, masked, 0.0).sum(axis=1) / tail.sum(axis=1) * 100
+        metrics['var_95_pct'] = var_95
+        metrics['cvar_95_pct'] = cvar_95
+        
+        # Recovery periods: bars from crossing below -1% drawdown back to >= -1%
+        in_drawdown = valid & (drawdown < -1)
+        change = np.diff(in_drawdown.astype(np.int8), axis=1, prepend=0)
+        starts = change == 1
+        ends = (change == -1) & valid
+        unfinished = in_drawdown[rows, last] & (lengths > 0) if width else np.zeros(n_rows, dtype=bool)
+        last_start = np.where(starts, positions, -1).max(axis=1) if width else np.zeros(n_rows)
+        num_ends = ends.sum(axis=1)
+        start_sum = np.where(starts, positions, 0).sum(axis=1) - np.where(unfinished, last_start, 0)
+        period_sum = np.where(ends, positions, 0).sum(axis=1) - start_sum
+        metrics['avg_recovery_period'] = np.where(num_ends > 0, period_sum / num_ends, 0.0)
+        
+        if timestamps is not None:
+            total_time = (timestamps[rows, last] - timestamps[:, 0]) / 3600 if width else np.zeros(n_rows)
+        else:
+            total_time = (lengths - 1).astype(np.float64)
+        metrics['exposure_pct'] = np.where(total_time > 0, trade_exposure / total_time * 100, 0.0)
+        
+        # Advanced metrics
+        epsilon = np.finfo(np.float64).eps
+        degenerate = moments['m2'] <= (epsilon * mean) ** 2
+        skew = np.where(degenerate, np.nan, moments['m3'] / moments['m2'] ** 1.5)
+        kurtosis = np.where(degenerate, np.nan, moments['m4'] / moments['m2'] ** 2) - 3
+        metrics['skewness'] = np.where(count > 2, skew, 0.0)
+        metrics['kurtosis'] = np.where(count > 2, kurtosis, 0.0)
+        metrics['information_ratio'] = np.where(std > 0, mean / std, 0.0)
+        
+        gains = np.where(returns_mask & (returns > 0), returns, 0.0).sum(axis=1)
+        losing_mask = returns_mask & (returns <= 0)
+        losses = np.where(losing_mask, returns, 0.0).sum(axis=1)
+        metrics['omega_ratio'] = np.where(losing_mask.any(axis=1), gains / np.abs(losses), np.inf)
+        
+        underwater = drawdown < 0
+        num_underwater = underwater.sum(axis=1)
+        avg_drawdown = np.where(num_underwater > 0,
+                                np.where(underwater, drawdown, 0.0).sum(axis=1) / num_underwater, 0.0)
+        metrics['sterling_ratio'] = np.where(avg_drawdown != 0, mean / np.abs(avg_drawdown), 0.0)
+        drawdown_squared = np.where(underwater, drawdown ** 2, 0.0).sum(axis=1)
+        metrics['burke_ratio'] = np.where(drawdown_squared > 0, mean / np.sqrt(drawdown_squared), 0.0)
+        metrics['kappa_ratio'] = np.where(skew != 0, mean / np.power(skew, 1 / 3), 0.0)
+    
+    return metrics
+
+
+def _trade_metrics_batch(trades: Sequence[TradeArrays], n_rows: int,
+                         use_times: bool) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """Trade metrics for each row plus the time spent in trades (hours, or bars without times)."""
+    counts = np.array([len(t) for t in trades], dtype=np.int64)
+    row = np.repeat(np.arange(n_rows), counts)
+    
+    def concat(field: str) -> np.ndarray:
+        arrays = [getattr(t, field) for t in trades]
+        return np.concatenate(arrays) if arrays else np.empty(0)
+    
+    pnl = concat('pnl')
+    entry_time, exit_time = concat('entry_time'), concat('exit_time')
+    
+    def row_sum(weights: np.ndarray) -> np.ndarray:
+        return np.bincount(row, weights=weights, minlength=n_rows)
+    
+    wins = pnl > 0
+    losses = pnl < 0
+    num_trades = counts.astype(np.float64)
+    num_wins = row_sum(wins.astype(np.float64))
+    num_losses = row_sum(losses.astype(np.float64))
+    total_profit = row_sum(np.where(wins, pnl, 0.0))
+    total_loss = np.abs(row_sum(np.where(losses, pnl, 0.0)))
+    
+    largest_win = np.full(n_rows, -np.inf)
+    largest_loss = np.full(n_rows, np.inf)
+    np.maximum.at(largest_win, row, pnl)
+    np.minimum.at(largest_loss, row, pnl)
+    
+    # Longest run of losing trades; runs restart at every row boundary
+    position = np.arange(len(pnl))
+    row_start = np.diff(row, prepend=-1) != 0
+    reset = np.where(~losses, position, np.where(row_start, position - 1, -1))
+    streak = np.where(losses, position - np.maximum.accumulate(reset), 0)
+    max_consecutive_losses = np.zeros(n_rows, dtype=np.int64)
+    np.maximum.at(max_consecutive_losses, row, streak)
+    
+    durations = (exit_time - entry_time) / 3600
+    timed = ~np.isnan(durations)
+    num_timed = np.bincount(row[timed], minlength=n_rows)
+    duration_sum = np.bincount(row[timed], weights=durations[timed], minlength=n_rows)
+    
+    closed = ~np.isnan(exit_time)
+    if use_times:
+        exposure = np.bincount(row[closed], weights=durations[closed], minlength=n_rows)
+    else:
+        held = (concat('exit_idx') - concat('entry_idx')).astype(np.float64)
+        closed = concat('exit_idx') >= 0
+        exposure = np.bincount(row[closed], weights=held[closed], minlength=n_rows)
+    
+    traded = counts > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_win = np.where(num_wins > 0, total_profit / num_wins, 0.0)
+        avg_loss = np.where(num_losses > 0, total_loss / num_losses, 0.0)
+        metrics = {
+            'num_trades': counts,
+            'win_rate_pct': np.where(traded, num_wins / num_trades * 100, 0.0),
+            'profit_factor': np.where(total_loss > 0, total_profit / total_loss,
+                                      np.where(total_profit > 0, np.inf, 0.0)),
+            'expectancy': np.where(traded, (avg_win * num_wins - avg_loss * num_losses) / num_trades, 0.0),
+            'avg_win': avg_win,
+            'avg_loss': avg_loss,
+            'largest_win': np.where(traded, largest_win, 0.0),
+            'largest_loss': np.where(traded, largest_loss, 0.0),
+            'avg_trade': np.where(traded, row_sum(pnl) / num_trades, 0.0),
+            'avg_trade_duration': np.where(num_timed > 0, duration_sum / num_timed, 0.0),
+            'max_consecutive_losses': max_consecutive_losses,
+        }
     
-    # Trade metrics
-    trade_metrics = calculate_trade_metrics(trades)
-    metrics.update(trade_metrics)
+    return metrics, exposure
+
+
+def calculate_metrics_batch(equity: np.ndarray,
+                            trades: Optional[Sequence[TradeArrays]] = None,
+                            timestamps: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Score K results in one vectorized pass.
     
-    # Risk metrics
-    risk_metrics = calculate_risk_metrics(equity_curve, trades)
-    metrics.update(risk_metrics)
+    Each row of ``equity`` is one equity curve, padded at the end with NaN
+    (see ``pad_equity_curves``). Rows of length zero yield NaN for the
+    equity-based metrics.
     
-    # Advanced metrics
-    advanced_metrics = calculate_advanced_metrics(equity_curve, trades)
-    metrics.update(advanced_metrics)
+    Args:
+        equity: Equity matrix of shape (K, N)
+        trades: One TradeArrays per row (no trades when omitted)
+        timestamps: Bar timestamps in epoch seconds, shape (N,) or (K, N).
+            Without them exposure is measured in bars instead of hours.
+        
+    Returns:
+        Dictionary mapping metric names to arrays of length K
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=np.float64))
+    n_rows = equity.shape[0]
+    if trades is None:
+        trades = [TradeArrays.from_trades([]) for _ in range(n_rows)]
+    if len(trades) != n_rows:
+        raise ValueError(f"Expected {n_rows} trade arrays, got {len(trades)}")
+    if timestamps is not None:
+        timestamps = np.broadcast_to(np.asarray(timestamps, dtype=np.float64), equity.shape)
+    
+    lengths = np.count_nonzero(~np.isnan(equity), axis=1)
+    trade_metrics, exposure = _trade_metrics_batch(trades, n_rows, timestamps is not None)
+    equity_metrics = _equity_metrics_batch(equity, lengths, exposure, timestamps)
+    
+    empty = lengths == 0
+    for values in equity_metrics.values():
+        values[empty] = np.nan
     
+    metrics = {}
+    for name in BASIC_METRICS + TRADE_METRICS + RISK_METRICS + ADVANCED_METRICS:
+        metrics[name] = trade_metrics[name] if name in trade_metrics else equity_metrics[name]
     return metrics
 
 
+def calculate_all_metrics_batch(equity_curves: Sequence[pd.Series],
+                                trades: Sequence[List[Any]]) -> List[Dict[str, float]]:
+    """
+    Calculate all metrics for several results at once.
+    
+    Args:
+        equity_curves: Equity curve series, one per result
+        trades: Trade object lists, one per result
+        
+    Returns:
+        List of metric dictionaries matching ``calculate_all_metrics``
+    """
+    equity, timestamps = pad_equity_curves(equity_curves)
+    trade_arrays = [TradeArrays.from_trades(t, curve.index) for t, curve in zip(trades, equity_curves)]
+    batch = calculate_metrics_batch(equity, trade_arrays, timestamps)
+    
+    results = []
+    for row, curve in enumerate(equity_curves):
+        names = BASIC_METRICS + TRADE_METRICS + RISK_METRICS + ADVANCED_METRICS if len(curve) else TRADE_METRICS
+        results.append({
+            name: int(batch[name][row]) if name in INTEGER_METRICS else float(batch[name][row])
+            for name in names
+        })
+    return results
+
+
+def calculate_all_metrics(equity_curve: pd.Series, trades: List[Any]) -> Dict[str, float]:
+    """
+    Calculate all available metrics.
+    
+    Args:
+        equity_curve: Equity curve series
+        trades: List of trade objects
+        
+    Returns:
+        Dictionary of all metrics
+    """
+    return calculate_all_metrics_batch([equity_curve], [trades])[0]
+
+
+def _metric_values(results: List[Dict[str, Any]], metric: str, default: float = 0) -> np.ndarray:
+    """Array of one metric across results, with a default where it is missing."""
+    return np.fromiter((r['metrics'].get(metric, default) for r in results),
+                       dtype=np.float64, count=len(results))
+
+
 def rank_results(results: List[Dict[str, Any]], 
                 primary_metric: str = 'profit_factor',
                 secondary_metric: str = 'total_return_pct',
@@ -330,13 +663,13 @@ def rank_results(results: List[Dict[str, Any]],
     if not valid_results:
         return []
     
-    # Sort by primary metric, then secondary metric
-    def sort_key(result):
-        primary_value = result['metrics'].get(primary_metric, 0)
-        secondary_value = result['metrics'].get(secondary_metric, 0)
-        return (primary_value, secondary_value)
-    
-    sorted_results = sorted(valid_results, key=sort_key, reverse=not ascending)
+    # Sort by primary metric, then secondary metric; ties keep their input order
+    primary = _metric_values(valid_results, primary_metric)
+    secondary = _metric_values(valid_results, secondary_metric)
+    if not ascending:
+        primary, secondary = -primary, -secondary
+    order = np.lexsort((secondary, primary))
+    sorted_results = [valid_results[i] for i in order]
     
     # Add ranking
     for i, result in enumerate(sorted_results):
@@ -359,11 +692,12 @@ def calculate_portfolio_metrics(results: List[Dict[str, Any]]) -> Dict[str, Any]
         return {}
     
     # Extract metrics
-    total_returns = [r['metrics'].get('total_return_pct', 0) for r in results]
-    profit_factors = [r['metrics'].get('profit_factor', 0) for r in results]
-    max_drawdowns = [r['metrics'].get('max_drawdown_pct', 0) for r in results]
-    sharpe_ratios = [r['metrics'].get('sharpe_ratio', 0) for r in results]
-    num_trades = [r['metrics'].get('num_trades', 0) for r in results]
+    total_returns = _metric_values(results, 'total_return_pct')
+    profit_factors = _metric_values(results, 'profit_factor')
+    max_drawdowns = _metric_values(results, 'max_drawdown_pct')
+    sharpe_ratios = _metric_values(results, 'sharpe_ratio')
+    num_trades = _metric_values(results, 'num_trades')
+    positive_strategies = int(np.count_nonzero(total_returns > 0))
     
     # Calculate portfolio statistics
     portfolio_metrics = {
@@ -377,10 +711,10 @@ def calculate_portfolio_metrics(results: List[Dict[str, Any]]) -> Dict[str, Any]
         'median_max_drawdown_pct': np.median(max_drawdowns),
         'avg_sharpe_ratio': np.mean(sharpe_ratios),
         'median_sharpe_ratio': np.median(sharpe_ratios),
-        'total_trades': sum(num_trades),
+        'total_trades': num_trades.sum(),
         'avg_trades_per_strategy': np.mean(num_trades),
-        'positive_strategies': sum(1 for r in total_returns if r > 0),
-        'consistency_pct': sum(1 for r in total_returns if r > 0) / len(total_returns) * 100,
+        'positive_strategies': positive_strategies,
+        'consistency_pct': positive_strategies / len(total_returns) * 100,
     }
     
     return portfolio_metrics
@@ -440,12 +774,9 @@ def get_metric_summary(results: List[Dict[str, Any]], metric: str) -> Dict[str,
     if not results:
         return {}
     
-    values = []
-    for result in results:
-        if 'metrics' in result and metric in result['metrics']:
-            values.append(result['metrics'][metric])
+    values = _metric_values([r for r in results if 'metrics' in r and metric in r['metrics']], metric)
     
-    if not values:
+    if len(values) == 0:
         return {}
     
     return {
@@ -7,14 +7,16 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
+import heapq
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import itertools
+import math
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from datetime import datetime
 
 from ..strategy.atr_supertrend_nasdaq import ATRSuperTrendStrategy, ATRSuperTrendConfig, NASDAQ_OPTIMIZED_PARAMS
 from ..data.nasdaq_provider import NASDAQDataProvider, get_nasdaq_data, get_high_volume_symbols
 from ..optimize.metrics import calculate_all_metrics
+from ..optimize.param_space import ParamSpace, canonicalize_param_combinations
 from ..reporting.reporter import create_reporter
 
 logger = logging.getLogger(__name__)
@@ -28,6 +30,168 @@ class OptimizationResult:
     all_results: List[Dict]
     execution_time: float
     total_tests: int
+    skipped_tests: int = 0
+
+
+SIMPLE_METRIC_NAMES = ['sharpe_ratio', 'max_drawdown', 'total_return', 'win_rate', 'total_trades']
+
+
+def calculate_simple_metrics_batch(signal_frames: List[pd.DataFrame]) -> Dict[str, np.ndarray]:
+    """
+    Sinyal DataFrame'leri için basit metrikleri tek seferde hesapla
+    
+    Kapanış fiyatları ve sinyaller NaN ile doldurulmuş (K, N) matrislere
+    dizilir; tüm metrikler satır bazında vektörel hesaplanır.
+    
+    Args:
+        signal_frames: generate_signals çıktıları (close, buy_signal, sell_signal)
+        
+    Returns:
+        Metrik adı -> K uzunluğunda dizi
+    """
+    n_frames = len(signal_frames)
+    if n_frames == 0:
+        return {name: np.zeros(0) for name in SIMPLE_METRIC_NAMES}
+    
+    lengths = np.array([len(frame) for frame in signal_frames])
+    width = max(int(lengths.max()), 1)
+    close = np.full((n_frames, width), np.nan)
+    total_trades = np.zeros(n_frames)
+    for i, frame in enumerate(signal_frames):
+        close[i, :lengths[i]] = frame['close'].to_numpy(dtype=float)
+        total_trades[i] = (np.count_nonzero(frame['buy_signal'].to_numpy(dtype=bool))
+                           + np.count_nonzero(frame['sell_signal'].to_numpy(dtype=bool)))
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Fiyat değişimi
+        rows = np.arange(n_frames)
+        first = close[:, 0]
+        last = close[rows, np.maximum(lengths - 1, 0)]
+        total_return = (last - first) / first
+        
+        # Basit Sharpe ratio (getiri ortalaması / örneklem std)
+        returns = close[:, 1:] / close[:, :-1] - 1
+        valid = ~np.isnan(returns)
+        n_returns = valid.sum(axis=1)
+        mean = np.where(valid, returns, 0.0).sum(axis=1) / n_returns
+        sq_dev = np.where(valid, (returns - mean[:, None]) ** 2, 0.0).sum(axis=1)
+        volatility = np.where(n_returns > 1, np.sqrt(sq_dev / (n_returns - 1)), 0.0)
+        sharpe_ratio = np.where(volatility > 0, mean / volatility, 0.0)
+        
+        # Drawdown (NaN dolgusu tepe değerini bozmaz)
+        peak = np.fmax.accumulate(close, axis=1)
+        drawdown = np.where(np.isnan(close), np.inf, (close - peak) / peak)
+        max_drawdown = np.abs(drawdown.min(axis=1))
+    
+    # Sinyal olmayan satırlar sıfır
+    traded = total_trades > 0
+    return {
+        'sharpe_ratio': np.where(traded, sharpe_ratio, 0.0),
+        'max_drawdown': np.where(traded, max_drawdown, 0.0),
+        'total_return': np.where(traded, total_return, 0.0),
+        'win_rate': np.where(traded, 0.5, 0.0),  # Basit hesaplama (varsayılan)
+        'total_trades': total_trades,
+    }
+
+
+def _signals_for_params(symbol: str, df: pd.DataFrame, params: Tuple) -> pd.DataFrame:
+    """Parametre kombinasyonu için sinyal üret"""
+    key_value, atr_period, multiplier, use_heikin_ashi = params
+    config = ATRSuperTrendConfig(
+        symbol=symbol,
+        key_value=key_value,
+        atr_period=atr_period,
+        multiplier=multiplier,
+        use_heikin_ashi=use_heikin_ashi
+    )
+    return ATRSuperTrendStrategy(config).generate_signals(df)
+
+
+def _result_row(params: Tuple, metrics: Dict[str, float]) -> Dict:
+    """Test sonucu satırı"""
+    key_value, atr_period, multiplier, use_heikin_ashi = params
+    return {
+        'params': {
+            'key_value': key_value,
+            'atr_period': atr_period,
+            'multiplier': multiplier,
+            'use_heikin_ashi': use_heikin_ashi
+        },
+        'sharpe_ratio': metrics.get('sharpe_ratio', 0),
+        'max_drawdown': metrics.get('max_drawdown', 0),
+        'total_return': metrics.get('total_return', 0),
+        'win_rate': metrics.get('win_rate', 0),
+        'total_trades': metrics.get('total_trades', 0)
+    }
+
+
+def evaluate_param_chunk(symbol: str, df: pd.DataFrame, param_chunk: List[Tuple]) -> List[Dict]:
+    """
+    Parametre grubunu test et (process pool görevi)
+    
+    Sinyaller kombinasyon başına üretilir, metrikler grup için tek seferde
+    hesaplanır. Hatalı kombinasyonlar atlanır.
+    """
+    frames = []
+    evaluated = []
+    for params in param_chunk:
+        try:
+            frames.append(_signals_for_params(symbol, df, params))
+            evaluated.append(params)
+        except Exception as e:
+            logger.error(f"Test hatası {symbol} {params}: {e}")
+    
+    metrics = calculate_simple_metrics_batch(frames)
+    return [
+        _result_row(params, {
+            name: int(values[i]) if name == 'total_trades' else float(values[i])
+            for name, values in metrics.items()
+        })
+        for i, params in enumerate(evaluated)
+    ]
+
+
+class StreamingRanking:
+    """
+    Sonuçları geldikçe sıralayan yapı
+    
+    top_k verilirse yalnızca en iyi k sonuç bir min-heap'te tutulur. Eşit
+    skorlarda önce gönderilen kombinasyon öne geçer.
+    """
+    
+    def __init__(self, top_k: Optional[int] = None, key: str = 'sharpe_ratio'):
+        self.top_k = top_k
+        self.key = key
+        self.count = 0
+        self._items = []
+    
+    def _score(self, result: Dict) -> float:
+        score = result.get(self.key, 0)
+        return -math.inf if score is None or np.isnan(score) else float(score)
+    
+    def add(self, results: List[Dict], offset: int = 0):
+        """Sonuçları ekle (offset: gruptaki ilk kombinasyonun sırası)"""
+        for i, result in enumerate(results):
+            item = (self._score(result), -(offset + i), result)
+            self.count += 1
+            if self.top_k is None:
+                self._items.append(item)
+            elif len(self._items) < self.top_k:
+                heapq.heappush(self._items, item)
+            elif item[:2] > self._items[0][:2]:
+                heapq.heapreplace(self._items, item)
+    
+    @property
+    def best(self) -> Optional[Dict]:
+        """Şu ana kadarki en iyi sonuç"""
+        if not self._items:
+            return None
+        return max(self._items, key=lambda item: item[:2])[2]
+    
+    def results(self) -> List[Dict]:
+        """Skora göre azalan sıralı sonuçlar"""
+        return [item[2] for item in sorted(self._items, key=lambda item: item[:2], reverse=True)]
+
 
 class NASDAQOptimizer:
     """
@@ -42,10 +206,16 @@ class NASDAQOptimizer:
         self.param_ranges = {
             'key_value': np.arange(1.5, 4.5, 0.5),      # 1.5, 2.0, 2.5, 3.0, 3.5, 4.0
             'atr_period': range(5, 21, 2),               # 5, 7, 9, 11, 13, 15, 17, 19
-            'multiplier': np.arange(1.0, 2.5, 0.2),     # 1.0, 1.2, 1.4, 1.6, 1.8, 2.0, 2.2, 2.4
+            # multiplier yalnızca SuperTrend çizgisini etkiler; skorlanan sütunlar
+            # (close, buy_signal, sell_signal) ona bağlı değildir, bu yüzden taranmaz
+            'multiplier': [1.5],
             'use_heikin_ashi': [False, True]             # Normal ve Heikin Ashi
         }
         
+        # Parametre bağımlılıkları ve kısıtları (ParamSpace formatında)
+        self.param_conditions = {}
+        self.param_constraints = []
+        
         # Optimizasyon metrikleri
         self.metrics = ['sharpe_ratio', 'max_drawdown', 'total_return', 'win_rate']
         
@@ -53,7 +223,10 @@ class NASDAQOptimizer:
                               symbol: str,
                               period: str = "2y",
                               interval: str = "1d",
-                              max_workers: int = 4) -> OptimizationResult:
+                              max_workers: int = 4,
+                              df: Optional[pd.DataFrame] = None,
+                              jobs: int = 1,
+                              top_k: Optional[int] = None) -> OptimizationResult:
         """
         Tek sembol için optimizasyon
         
@@ -61,64 +234,84 @@ class NASDAQOptimizer:
             symbol: Hisse senedi sembolü
             period: Veri periyodu
             interval: Veri aralığı
-            max_workers: Paralel işlem sayısı
+            max_workers: Paralel işlem sayısı (thread)
+            df: Önceden yüklenmiş veri (verilmezse sağlayıcıdan çekilir)
+            jobs: Process sayısı (1'den büyükse kombinasyonlar process pool'da test edilir)
+            top_k: Saklanacak en iyi sonuç sayısı (None: tümü)
         """
         self.logger.info(f"Optimizasyon başlatılıyor: {symbol}")
         start_time = datetime.now()
         
         # Veri çek
-        df = self.data_provider.fetch_data(symbol, period, interval)
+        if df is None:
+            df = self.data_provider.fetch_data(symbol, period, interval)
         if df is None:
             self.logger.error(f"Veri çekilemedi: {symbol}")
             return None
         
         self.logger.info(f"Veri yüklendi: {symbol} ({len(df)} kayıt)")
         
-        # Parametre kombinasyonları oluştur
-        param_combinations = list(itertools.product(
-            self.param_ranges['key_value'],
-            self.param_ranges['atr_period'],
-            self.param_ranges['multiplier'],
-            self.param_ranges['use_heikin_ashi']
-        ))
+        if jobs > 1:
+            return self._optimize_in_processes({symbol: df}, jobs, top_k).get(symbol)
         
+        param_combinations, search_stats = self._param_combinations()
         total_tests = len(param_combinations)
-        self.logger.info(f"Toplam test sayısı: {total_tests}")
         
         # Paralel optimizasyon
-        results = []
+        ranking = StreamingRanking(top_k)
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Görevleri gönder
-            future_to_params = {
-                executor.submit(self._test_parameters, symbol, df, params): params
-                for params in param_combinations
+            future_to_index = {
+                executor.submit(self._test_parameters, symbol, df, params): index
+                for index, params in enumerate(param_combinations)
             }
             
             # Sonuçları topla
-            for i, future in enumerate(as_completed(future_to_params)):
+            for i, future in enumerate(as_completed(future_to_index)):
+                index = future_to_index[future]
                 try:
                     result = future.result()
                     if result:
-                        results.append(result)
+                        ranking.add([result], index)
                     
                     if (i + 1) % 50 == 0:
                         self.logger.info(f"İlerleme: {i + 1}/{total_tests}")
                         
                 except Exception as e:
-                    params = future_to_params[future]
-                    self.logger.error(f"Test hatası {params}: {e}")
+                    self.logger.error(f"Test hatası {param_combinations[index]}: {e}")
         
+        execution_time = (datetime.now() - start_time).total_seconds()
+        return self._build_result(symbol, ranking, execution_time, total_tests, search_stats)
+    
+    def _param_combinations(self) -> Tuple[List[Tuple], Dict]:
+        """Parametre kombinasyonları oluştur (gereksiz kombinasyonlar elenir)"""
+        param_space = ParamSpace(
+            {name: self.param_ranges[name] for name in ['key_value', 'atr_period', 'multiplier', 'use_heikin_ashi']},
+            conditions=self.param_conditions,
+            constraints=self.param_constraints,
+        )
+        param_space, search_stats = canonicalize_param_combinations(param_space)
+        param_combinations = [tuple(params.values()) for params in param_space]
+        
+        self.logger.info(f"Toplam test sayısı: {len(param_combinations)} "
+                         f"(atlanan gereksiz test: {search_stats['skipped_combinations']})")
+        return param_combinations, search_stats
+    
+    def _build_result(self,
+                      symbol: str,
+                      ranking: StreamingRanking,
+                      execution_time: float,
+                      total_tests: int,
+                      search_stats: Dict) -> Optional[OptimizationResult]:
+        """Sıralanmış sonuçlardan OptimizationResult oluştur"""
         # En iyi sonucu bul
+        results = ranking.results()
         if not results:
             self.logger.error(f"Hiç sonuç bulunamadı: {symbol}")
             return None
         
-        # Sharpe ratio'ya göre sırala
-        results.sort(key=lambda x: x['sharpe_ratio'], reverse=True)
         best_result = results[0]
         
-        execution_time = (datetime.now() - start_time).total_seconds()
-        
         self.logger.info(f"Optimizasyon tamamlandı: {symbol}")
         self.logger.info(f"En iyi Sharpe Ratio: {best_result['sharpe_ratio']:.4f}")
         self.logger.info(f"En iyi parametreler: {best_result['params']}")
@@ -130,48 +323,67 @@ class NASDAQOptimizer:
             best_score=best_result['sharpe_ratio'],
             all_results=results,
             execution_time=execution_time,
-            total_tests=total_tests
+            total_tests=total_tests,
+            skipped_tests=search_stats['skipped_combinations']
         )
     
+    def _optimize_in_processes(self,
+                               data: Dict[str, pd.DataFrame],
+                               jobs: int,
+                               top_k: Optional[int] = None) -> Dict[str, OptimizationResult]:
+        """
+        Sembol x parametre gruplarını process pool'da test et
+        
+        Her sembolün kombinasyonları jobs sayısı kadar gruba bölünür; tüm
+        gruplar tek bir havuza gönderilir. Sonuçlar geldikçe sembol bazında
+        sıralanır ve son grubu biten sembol hemen raporlanır.
+        """
+        param_combinations, search_stats = self._param_combinations()
+        total_tests = len(param_combinations)
+        chunk_size = max(1, math.ceil(total_tests / jobs))
+        offsets = range(0, total_tests, chunk_size)
+        
+        rankings = {symbol: StreamingRanking(top_k) for symbol in data}
+        pending = {symbol: len(offsets) for symbol in data}
+        results = {}
+        start_time = datetime.now()
+        
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            future_to_task = {
+                executor.submit(evaluate_param_chunk, symbol, df,
+                                param_combinations[offset:offset + chunk_size]): (symbol, offset)
+                for symbol, df in data.items()
+                for offset in offsets
+            }
+            
+            for future in as_completed(future_to_task):
+                symbol, offset = future_to_task[future]
+                try:
+                    rankings[symbol].add(future.result(), offset)
+                except Exception as e:
+                    self.logger.error(f"Optimizasyon hatası {symbol} (grup {offset}): {e}")
+                
+                pending[symbol] -= 1
+                if pending[symbol] == 0:
+                    execution_time = (datetime.now() - start_time).total_seconds()
+                    result = self._build_result(symbol, rankings.pop(symbol), execution_time,
+                                                total_tests, search_stats)
+                    if result:
+                        results[symbol] = result
+        
+        # Giriş sırasını koru
+        return {symbol: results[symbol] for symbol in data if symbol in results}
+    
     def _test_parameters(self, symbol: str, df: pd.DataFrame, params: Tuple) -> Optional[Dict]:
         """Parametre kombinasyonunu test et"""
         try:
-            key_value, atr_period, multiplier, use_heikin_ashi = params
-            
-            # Strateji konfigürasyonu
-            config = ATRSuperTrendConfig(
-                symbol=symbol,
-                key_value=key_value,
-                atr_period=atr_period,
-                multiplier=multiplier,
-                use_heikin_ashi=use_heikin_ashi
-            )
-            
-            # Strateji oluştur
-            strategy = ATRSuperTrendStrategy(config)
-            
             # Sinyalleri üret
-            signals_df = strategy.generate_signals(df)
+            signals_df = _signals_for_params(symbol, df, params)
             
             # Metrikleri hesapla
             metrics = self._calculate_simple_metrics(signals_df)
             
-            # Sonuç
-            result = {
-                'params': {
-                    'key_value': key_value,
-                    'atr_period': atr_period,
-                    'multiplier': multiplier,
-                    'use_heikin_ashi': use_heikin_ashi
-                },
-                'sharpe_ratio': metrics.get('sharpe_ratio', 0),
-                'max_drawdown': metrics.get('max_drawdown', 0),
-                'total_return': metrics.get('total_return', 0),
-                'win_rate': metrics.get('win_rate', 0),
-                'total_trades': metrics.get('total_trades', 0)
-            }
-            
-            return result
+            return _result_row(params, metrics)
             
         except Exception as e:
             self.logger.error(f"Test hatası {params}: {e}")
@@ -181,13 +393,31 @@ class NASDAQOptimizer:
                                  symbols: List[str],
                                  period: str = "2y",
                                  interval: str = "1d",
-                                 max_workers: int = 4) -> Dict[str, OptimizationResult]:
-        """Birden fazla sembol için optimizasyon"""
+                                 max_workers: int = 4,
+                                 jobs: int = 1,
+                                 top_k: Optional[int] = None) -> Dict[str, OptimizationResult]:
+        """
+        Birden fazla sembol için optimizasyon
+        
+        jobs > 1 ise tüm semboller ve parametre grupları ortak bir process
+        pool'da eş zamanlı test edilir.
+        """
         results = {}
         
+        # Tüm semboller tek seferde yüklenir (disk cache + toplu indirme)
+        data = self.data_provider.get_multiple_symbols_data(symbols, period, interval)
+        self.logger.info(f"Veri yüklendi: {len(data)}/{len(symbols)} sembol")
+        
         for symbol in symbols:
+            if symbol.upper() not in data:
+                self.logger.error(f"Veri çekilemedi: {symbol.upper()}")
+        
+        if jobs > 1:
+            return self._optimize_in_processes(data, jobs, top_k)
+        
+        for symbol, df in data.items():
             try:
-                result = self.optimize_single_symbol(symbol, period, interval, max_workers)
+                result = self.optimize_single_symbol(symbol, period, interval, max_workers, df=df, top_k=top_k)
                 if result:
                     results[symbol] = result
             except Exception as e:
@@ -199,23 +429,25 @@ class NASDAQOptimizer:
                                     min_volume: int = 10000000,
                                     period: str = "2y",
                                     interval: str = "1d",
-                                    max_workers: int = 4) -> Dict[str, OptimizationResult]:
+                                    max_workers: int = 4,
+                                    jobs: int = 1) -> Dict[str, OptimizationResult]:
         """Yüksek hacimli hisseler için optimizasyon"""
         symbols = get_high_volume_symbols(min_volume)
         self.logger.info(f"Yüksek hacimli semboller: {symbols}")
         
-        return self.optimize_multiple_symbols(symbols, period, interval, max_workers)
+        return self.optimize_multiple_symbols(symbols, period, interval, max_workers, jobs=jobs)
     
     def optimize_sector(self, 
                        sector: str,
                        period: str = "2y",
                        interval: str = "1d",
-                       max_workers: int = 4) -> Dict[str, OptimizationResult]:
+                       max_workers: int = 4,
+                       jobs: int = 1) -> Dict[str, OptimizationResult]:
         """Sektör için optimizasyon"""
         symbols = self.data_provider.get_symbols_by_sector(sector)
         self.logger.info(f"{sector} sektörü sembolleri: {symbols}")
         
-        return self.optimize_multiple_symbols(symbols, period, interval, max_workers)
+        return self.optimize_multiple_symbols(symbols, period, interval, max_workers, jobs=jobs)
     
     def compare_with_predefined(self, symbol: str, period: str = "2y") -> Dict:
         """Önceden tanımlı parametrelerle karşılaştır"""
@@ -266,53 +498,15 @@ class NASDAQOptimizer:
     def _calculate_simple_metrics(self, signals_df: pd.DataFrame) -> Dict[str, float]:
         """Basit metrikler hesapla"""
         try:
-            # Buy/Sell sinyallerini say
-            buy_signals = signals_df['buy_signal'].sum()
-            sell_signals = signals_df['sell_signal'].sum()
-            total_trades = buy_signals + sell_signals
-            
-            if total_trades == 0:
-                return {
-                    'sharpe_ratio': 0,
-                    'max_drawdown': 0,
-                    'total_return': 0,
-                    'win_rate': 0,
-                    'total_trades': 0
-                }
-            
-            # Fiyat değişimi
-            price_change = (signals_df['close'].iloc[-1] - signals_df['close'].iloc[0]) / signals_df['close'].iloc[0]
-            
-            # Basit Sharpe ratio (fiyat değişimi / volatilite)
-            returns = signals_df['close'].pct_change().dropna()
-            volatility = returns.std() if len(returns) > 1 else 0
-            sharpe_ratio = returns.mean() / volatility if volatility > 0 else 0
-            
-            # Drawdown hesaplama
-            peak = signals_df['close'].expanding().max()
-            drawdown = (signals_df['close'] - peak) / peak
-            max_drawdown = abs(drawdown.min()) if len(drawdown) > 0 else 0
-            
-            # Win rate (basit hesaplama)
-            win_rate = 0.5  # Varsayılan
-            
+            metrics = calculate_simple_metrics_batch([signals_df])
             return {
-                'sharpe_ratio': sharpe_ratio,
-                'max_drawdown': max_drawdown,
-                'total_return': price_change,
-                'win_rate': win_rate,
-                'total_trades': total_trades
+                name: int(values[0]) if name == 'total_trades' else float(values[0])
+                for name, values in metrics.items()
             }
             
         except Exception as e:
             self.logger.error(f"Metrics hesaplama hatası: {e}")
-            return {
-                'sharpe_ratio': 0,
-                'max_drawdown': 0,
-                'total_return': 0,
-                'win_rate': 0,
-                'total_trades': 0
-            }
+            return {name: 0 for name in SIMPLE_METRIC_NAMES}
     
     def generate_report(self, results: Dict[str, OptimizationResult], output_dir: str = "reports/nasdaq"):
         """Optimizasyon raporu oluştur"""
@@ -326,7 +520,8 @@ class NASDAQOptimizer:
                 'Best_Sharpe_Ratio': result.best_score,
                 'Best_Params': str(result.best_params),
                 'Execution_Time': result.execution_time,
-                'Total_Tests': result.total_tests
+                'Total_Tests': result.total_tests,
+                'Skipped_Tests': result.skipped_tests
             })
         
         summary_df = pd.DataFrame(summary_data)
@@ -352,7 +547,7 @@ class NASDAQOptimizer:
             
             # Parametre etkisi analizi
             param_analysis = {}
-            for param_name in ['key_value', 'atr_period', 'multiplier']:
+            for param_name in ['key_value', 'atr_period']:
                 param_values = []
                 param_sharpe = []
                 
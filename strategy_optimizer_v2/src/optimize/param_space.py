@@ -0,0 +1,559 @@
+"""
+Lazy parameter space enumeration for grid search optimization.
+
+This module provides an indexable view over the Cartesian product of a
+parameter space. Combinations are decoded from an integer index on demand,
+so workers can be handed index ranges instead of materialized dict lists.
+
+Parameter dependencies ("only matters if a flag is set") and constraints
+("fast < slow") can be declared so behaviorally identical combinations are
+collapsed to one canonical combination before any backtest is dispatched.
+"""
+
+import numpy as np
+import operator
+import re
+from typing import Dict, Any, List, Optional, Tuple, Iterator, Sequence, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Comparison operators allowed in constraint expressions
+CONSTRAINT_OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+_CONSTRAINT_PATTERN = re.compile(r'^\s*(\w+)\s*(<=|>=|==|!=|<|>)\s*(\S+)\s*$')
+
+
+def parse_constraint(constraint: str) -> Tuple[str, str, Any]:
+    """
+    Parse a constraint expression like 'ema_fast_len < ema_slow_len'.
+    
+    The right-hand side may be another parameter name or a literal
+    (int, float, True/False).
+    
+    Args:
+        constraint: Constraint expression
+        
+    Returns:
+        Tuple of (left parameter, operator, right parameter name or literal)
+    """
+    match = _CONSTRAINT_PATTERN.match(constraint)
+    if not match:
+        raise ValueError(f"Invalid constraint expression: '{constraint}'")
+    
+    left, op, right = match.groups()
+    if right in ('True', 'False'):
+        return left, op, right == 'True'
+    try:
+        return left, op, int(right)
+    except ValueError:
+        pass
+    try:
+        return left, op, float(right)
+    except ValueError:
+        return left, op, right
+
+
+class ParamSpace:
+    """
+    Indexable, lazily decoded Cartesian product of parameter values.
+
+    Index ``i`` maps to the same combination ``itertools.product`` yields at
+    position ``i`` (last axis varies fastest). A space can also be a view over
+    a subset of the full product (a sample or a shard), in which case
+    positional index ``i`` refers to the ``i``-th selected combination.
+    """
+
+    def __init__(self, param_space: Dict[str, Sequence[Any]],
+                 indices: Optional[Union[range, np.ndarray]] = None,
+                 conditions: Optional[Dict[str, Dict[str, Any]]] = None,
+                 constraints: Optional[List[str]] = None):
+        """
+        Initialize parameter space.
+
+        Args:
+            param_space: Mapping of parameter name to candidate values
+            indices: Optional subset of full-product indices this view covers
+            conditions: Mapping of parameter name to the {other_param: value}
+                settings it requires to have any effect, e.g.
+                {'trailing_stop_mult': {'use_trailing_stop': True}}. A list
+                value means "any of these values".
+            constraints: Expressions every evaluated combination must satisfy,
+                e.g. ['ema_fast_len < ema_slow_len']
+        """
+        self.names: List[str] = list(param_space.keys())
+        self.values: List[List[Any]] = [list(v) for v in param_space.values()]
+        self.radices: List[int] = [len(v) for v in self.values]
+
+        # Stride of each axis in the flat index (last axis fastest)
+        self.strides: List[int] = []
+        stride = 1
+        for radix in reversed(self.radices):
+            self.strides.append(stride)
+            stride *= radix
+        self.strides.reverse()
+        self.full_size: int = stride if self.radices else 0
+
+        self.indices = indices
+
+        # Ignore conditions/constraints on parameters that are not swept
+        self.conditions: Dict[str, Dict[str, Any]] = {
+            name: {dep: value for dep, value in requires.items() if dep in self.names}
+            for name, requires in (conditions or {}).items()
+            if name in self.names
+        }
+        self.constraints: List[Tuple[str, str, Any]] = []
+        for expression in constraints or []:
+            left, op, right = parse_constraint(expression)
+            if left in self.names and (not isinstance(right, str) or right in self.names):
+                self.constraints.append((left, op, right))
+
+    @classmethod
+    def from_combinations(cls, param_combinations: List[Dict[str, Any]],
+                          conditions: Optional[Dict[str, Dict[str, Any]]] = None,
+                          constraints: Optional[List[str]] = None) -> 'ParamSpace':
+        """
+        Build a view over an explicit list of combinations.
+
+        Axis values are collected in first-seen order, so the first value of
+        each axis comes from the list itself.
+
+        Args:
+            param_combinations: Parameter combinations (all with the same keys)
+            conditions: Parameter dependencies
+            constraints: Constraint expressions
+
+        Returns:
+            ParamSpace view covering exactly the listed combinations
+        """
+        axes: Dict[str, List[Any]] = {}
+        for params in param_combinations:
+            for name, value in params.items():
+                values = axes.setdefault(name, [])
+                if value not in values:
+                    values.append(value)
+        space = cls(axes, conditions=conditions, constraints=constraints)
+        indices = np.array([space.encode(params) for params in param_combinations], dtype=np.int64)
+        return space._view(indices)
+
+    @property
+    def param_space(self) -> Dict[str, List[Any]]:
+        """Parameter space as a name -> values mapping."""
+        return dict(zip(self.names, self.values))
+
+    def __len__(self) -> int:
+        if self.indices is not None:
+            return len(self.indices)
+        return self.full_size
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.decode(i)
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[Dict[str, Any], 'ParamSpace']:
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            return self._view(self.base_indices()[start:stop:step])
+        return self.decode(item)
+
+    def __repr__(self) -> str:
+        return f"ParamSpace(axes={len(self.names)}, size={len(self)}, full_size={self.full_size})"
+
+    def base_indices(self) -> Union[range, np.ndarray]:
+        """Full-product indices covered by this view."""
+        if self.indices is not None:
+            return self.indices
+        return range(self.full_size)
+
+    def base_index(self, i: int) -> int:
+        """
+        Map a positional index of this view to a full-product index.
+
+        Args:
+            i: Positional index (negative values count from the end)
+
+        Returns:
+            Index into the full Cartesian product
+        """
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(f"Parameter index {i} out of range for space of size {n}")
+        if self.indices is not None:
+            return int(self.indices[i])
+        return i
+
+    def decode(self, i: int) -> Dict[str, Any]:
+        """
+        Decode a positional index into a parameter combination in O(axes).
+
+        Args:
+            i: Positional index within this view
+
+        Returns:
+            Parameter combination dict
+        """
+        index = self.base_index(i)
+        params = {}
+        for name, values, stride, radix in zip(self.names, self.values, self.strides, self.radices):
+            params[name] = values[(index // stride) % radix]
+        return params
+
+    def encode(self, params: Dict[str, Any]) -> int:
+        """
+        Encode a parameter combination into its full-product index.
+
+        Args:
+            params: Parameter combination (must contain every axis)
+
+        Returns:
+            Index into the full Cartesian product
+        """
+        index = 0
+        for name, values, stride in zip(self.names, self.values, self.strides):
+            try:
+                index += values.index(params[name]) * stride
+            except (KeyError, ValueError):
+                raise ValueError(f"Value {params.get(name)!r} for '{name}' is not in the parameter space")
+        return index
+
+    def _view(self, indices: Union[range, np.ndarray]) -> 'ParamSpace':
+        """Create a view over a subset of full-product indices."""
+        view = ParamSpace.__new__(ParamSpace)
+        view.__dict__.update(self.__dict__)
+        view.indices = indices
+        return view
+
+    def take(self, start: int, stop: int) -> 'ParamSpace':
+        """
+        Get a contiguous positional slice of this view.
+
+        Args:
+            start: First positional index (inclusive)
+            stop: Last positional index (exclusive)
+
+        Returns:
+            ParamSpace view over the slice
+        """
+        return self[start:stop]
+
+    def select(self, mask: Sequence[bool]) -> 'ParamSpace':
+        """
+        Get the combinations of this view where ``mask`` is True.
+
+        Args:
+            mask: One boolean per positional index
+
+        Returns:
+            ParamSpace view over the selected combinations
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if len(mask) != len(self):
+            raise ValueError(f"Mask length {len(mask)} does not match space size {len(self)}")
+        return self._view(np.asarray(self.base_indices(), dtype=np.int64)[mask])
+
+    def index_ranges(self, chunk_size: int) -> List[Tuple[int, int]]:
+        """
+        Split this view into contiguous positional index ranges.
+
+        Args:
+            chunk_size: Maximum number of combinations per range
+
+        Returns:
+            List of (start, stop) tuples
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        n = len(self)
+        return [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+
+    def shard(self, shard_id: int, num_shards: int) -> 'ParamSpace':
+        """
+        Get a deterministic contiguous shard of this view.
+
+        Every machine that builds the same space and calls ``shard`` with the
+        same ``num_shards`` gets disjoint shards that together cover the view.
+
+        Args:
+            shard_id: Zero-based shard id
+            num_shards: Total number of shards
+
+        Returns:
+            ParamSpace view over the shard
+        """
+        if num_shards <= 0:
+            raise ValueError("num_shards must be positive")
+        if not 0 <= shard_id < num_shards:
+            raise ValueError(f"shard_id must be in [0, {num_shards}), got {shard_id}")
+        n = len(self)
+        start = shard_id * n // num_shards
+        stop = (shard_id + 1) * n // num_shards
+        return self.take(start, stop)
+
+    def sample_random(self, n: int, seed: Optional[int] = None) -> 'ParamSpace':
+        """
+        Uniformly sample combinations without replacement.
+
+        Args:
+            n: Number of combinations to sample (capped at the view size)
+            seed: Random seed for reproducibility
+
+        Returns:
+            ParamSpace view over the sampled combinations, in index order
+        """
+        size = len(self)
+        n = min(n, size)
+        rng = np.random.default_rng(seed)
+        positions = np.sort(rng.choice(size, size=n, replace=False))
+        return self._view(self._positions_to_base(positions))
+
+    def sample_sobol(self, n: int, seed: Optional[int] = None) -> 'ParamSpace':
+        """
+        Sample combinations with a scrambled Sobol sequence.
+
+        Sobol points cover every axis more evenly than uniform random samples.
+        Points that map to the same grid cell are deduplicated, so the result
+        can hold slightly fewer than ``n`` combinations. Only defined on the
+        full product.
+
+        Args:
+            n: Number of Sobol points to draw
+            seed: Scrambling seed for reproducibility
+
+        Returns:
+            ParamSpace view over the sampled combinations, in index order
+        """
+        if self.indices is not None:
+            raise ValueError("Sobol sampling is only supported on the full parameter space")
+        from scipy.stats import qmc
+
+        n = min(n, self.full_size)
+        sampler = qmc.Sobol(d=len(self.names), scramble=True, seed=seed)
+        points = sampler.random(n)
+
+        radices = np.asarray(self.radices, dtype=np.int64)
+        strides = np.asarray(self.strides, dtype=np.int64)
+        cells = np.minimum((points * radices).astype(np.int64), radices - 1)
+        indices = np.unique(cells @ strides)
+        return self._view(indices)
+
+    def _positions_to_base(self, positions: np.ndarray) -> np.ndarray:
+        """Map positional indices of this view to full-product indices."""
+        if self.indices is None:
+            return positions.astype(np.int64)
+        if isinstance(self.indices, range):
+            return self.indices.start + positions.astype(np.int64) * self.indices.step
+        return np.asarray(self.indices)[positions]
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Materialize every combination in this view."""
+        return list(self)
+
+    @property
+    def has_rules(self) -> bool:
+        """Whether any conditions or constraints are declared."""
+        return bool(self.conditions or self.constraints)
+
+    def is_active(self, name: str, params: Dict[str, Any]) -> bool:
+        """
+        Check whether a parameter has any effect for a combination.
+
+        Args:
+            name: Parameter name
+            params: Parameter combination
+
+        Returns:
+            True if every condition on the parameter is met
+        """
+        for dep, required in self.conditions.get(name, {}).items():
+            allowed = required if isinstance(required, (list, tuple, set)) else [required]
+            if params.get(dep) not in allowed:
+                return False
+        return True
+
+    def canonicalize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reset inactive parameters to the first value of their axis.
+
+        Combinations that differ only in inactive parameters share one
+        canonical form, so only that form needs a backtest.
+
+        Args:
+            params: Parameter combination
+
+        Returns:
+            Canonical parameter combination
+        """
+        canonical = dict(params)
+        for name in self.conditions:
+            if name in canonical and not self.is_active(name, params):
+                canonical[name] = self.values[self.names.index(name)][0]
+        return canonical
+
+    def satisfies_constraints(self, params: Dict[str, Any]) -> bool:
+        """
+        Check a combination against the declared constraints.
+
+        Constraints that involve an inactive parameter are not enforced.
+
+        Args:
+            params: Parameter combination
+
+        Returns:
+            True if every applicable constraint holds
+        """
+        for left, op, right in self.constraints:
+            if left not in params or not self.is_active(left, params):
+                continue
+            if isinstance(right, str):
+                if right not in params or not self.is_active(right, params):
+                    continue
+                right_value = params[right]
+            else:
+                right_value = right
+            if not CONSTRAINT_OPERATORS[op](params[left], right_value):
+                return False
+        return True
+
+    def _axis_digits(self, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        """Decode a vector of full-product indices into per-axis value positions."""
+        return {
+            name: (indices // stride) % radix
+            for name, stride, radix in zip(self.names, self.strides, self.radices)
+        }
+
+    def _canonical_mask(self, indices: np.ndarray) -> np.ndarray:
+        """Vectorized check of which full-product indices are canonical and valid."""
+        digits = self._axis_digits(indices)
+        mask = np.ones(len(indices), dtype=bool)
+
+        active = {}
+        for name, requires in self.conditions.items():
+            is_active = np.ones(len(indices), dtype=bool)
+            for dep, required in requires.items():
+                allowed = required if isinstance(required, (list, tuple, set)) else [required]
+                dep_values = self.values[self.names.index(dep)]
+                positions = [k for k, value in enumerate(dep_values) if value in allowed]
+                is_active &= np.isin(digits[dep], positions)
+            active[name] = is_active
+            # Inactive parameters must sit at their canonical (first) value
+            mask &= is_active | (digits[name] == 0)
+
+        for left, op, right in self.constraints:
+            left_values = np.asarray(self.values[self.names.index(left)], dtype=object)[digits[left]]
+            applies = active.get(left, np.ones(len(indices), dtype=bool))
+            if isinstance(right, str):
+                right_values = np.asarray(self.values[self.names.index(right)], dtype=object)[digits[right]]
+                applies = applies & active.get(right, np.ones(len(indices), dtype=bool))
+            else:
+                right_values = right
+            holds = CONSTRAINT_OPERATORS[op](left_values, right_values).astype(bool)
+            mask &= holds | ~applies
+
+        return mask
+
+    def canonical(self, block_size: int = 1_000_000) -> 'ParamSpace':
+        """
+        Get a view holding only canonical combinations that satisfy constraints.
+
+        Args:
+            block_size: Number of indices checked per vectorized block
+
+        Returns:
+            ParamSpace view without redundant or invalid combinations
+        """
+        if not self.has_rules:
+            return self
+
+        base = self.base_indices()
+        kept = []
+        for start in range(0, len(base), block_size):
+            block = np.asarray(base[start:start + block_size], dtype=np.int64)
+            kept.append(block[self._canonical_mask(block)])
+
+        indices = np.concatenate(kept) if kept else np.empty(0, dtype=np.int64)
+        return self._view(indices)
+
+    def dedupe_combinations(self, param_combinations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Canonicalize an explicit list of combinations and drop duplicates.
+
+        Args:
+            param_combinations: Parameter combinations (order is preserved)
+
+        Returns:
+            Unique canonical combinations that satisfy constraints
+        """
+        seen = set()
+        unique = []
+        for params in param_combinations:
+            canonical = self.canonicalize(params)
+            if not self.satisfies_constraints(canonical):
+                continue
+            key = tuple(sorted(canonical.items(), key=lambda item: item[0]))
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(canonical)
+        return unique
+
+
+def canonicalize_param_combinations(
+        param_combinations: Union[List[Dict[str, Any]], ParamSpace],
+        conditions: Optional[Dict[str, Dict[str, Any]]] = None,
+        constraints: Optional[List[str]] = None
+) -> Tuple[Union[List[Dict[str, Any]], ParamSpace], Dict[str, Any]]:
+    """
+    Drop redundant and invalid combinations before dispatch.
+    
+    A ParamSpace uses its own declared rules; an explicit list uses the
+    conditions and constraints passed in.
+    
+    Args:
+        param_combinations: Parameter combinations or ParamSpace
+        conditions: Parameter dependencies for list input
+        constraints: Constraint expressions for list input
+        
+    Returns:
+        Tuple of (deduplicated combinations, search space statistics)
+    """
+    total = len(param_combinations)
+    
+    if isinstance(param_combinations, ParamSpace):
+        deduped = param_combinations.canonical()
+    elif param_combinations:
+        rules = ParamSpace.from_combinations(param_combinations, conditions, constraints)
+        deduped = rules.dedupe_combinations(param_combinations) if rules.has_rules else param_combinations
+    else:
+        deduped = param_combinations
+    
+    evaluated = len(deduped)
+    stats = {
+        'total_combinations': total,
+        'evaluated_combinations': evaluated,
+        'skipped_combinations': total - evaluated,
+        'skipped_pct': (total - evaluated) / total * 100 if total > 0 else 0,
+    }
+    return deduped, stats
+
+
+def create_param_space(param_space: Dict[str, Sequence[Any]]) -> ParamSpace:
+    """
+    Create a parameter space from a name -> values mapping.
+
+    Args:
+        param_space: Mapping of parameter name to candidate values
+
+    Returns:
+        ParamSpace instance
+    """
+    return ParamSpace(param_space)
@@ -0,0 +1,466 @@
+"""
+Portfolio-level backtesting of many symbols on one shared account.
+
+``calculate_portfolio_metrics`` aggregates independent per-symbol results
+after the fact, as if every symbol had its own account. The portfolio
+backtester instead steps all symbols on a common timeline in one compiled
+loop, so positions compete for the same capital:
+
+- shared capital: each entry locks its symbol's margin from one cash balance
+- max concurrent positions across the account
+- correlated exposure: symbols are grouped by return correlation and only
+  a limited number of same-direction positions may be open per group
+
+Per symbol the trade rules are those of ``Backtester``: SL/TP are checked
+first on each bar, then entry signals, then trailing TP updates. Signals
+are the strategies' own signal frames, aligned once into (bars, symbols)
+arrays.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Optional, Callable, Union
+import logging
+from dataclasses import dataclass
+from numba import jit
+
+from .metrics import TradeArrays, calculate_metrics_batch
+
+logger = logging.getLogger(__name__)
+
+EXIT_REASONS = ('sl', 'tp', 'end')
+REJECT_REASONS = ('capital', 'max_positions', 'correlation')
+
+
+@dataclass
+class PortfolioResult:
+    """Portfolio backtest result container."""
+    trades: pd.DataFrame
+    equity_curve: pd.Series
+    open_positions: pd.Series
+    metrics: Dict[str, float]
+    symbol_summary: pd.DataFrame
+    rejected: Dict[str, int]
+    groups: Dict[str, int]
+
+
+def correlation_groups(closes: pd.DataFrame, threshold: float = 0.8) -> Dict[str, int]:
+    """
+    Group symbols whose bar returns are strongly correlated.
+    
+    Symbols are assigned greedily in column order: a symbol joins the
+    first group whose first member it correlates with at ``threshold`` or
+    more, otherwise it starts a new group.
+    
+    Args:
+        closes: Close prices, one column per symbol
+        threshold: Minimum return correlation within a group
+    
+    Returns:
+        Dictionary mapping symbol to group id
+    """
+    corr = closes.pct_change(fill_method=None).corr().to_numpy()
+    leaders: List[int] = []
+    groups = {}
+    
+    for i, symbol in enumerate(closes.columns):
+        for group, leader in enumerate(leaders):
+            if corr[i, leader] >= threshold:
+                groups[symbol] = group
+                break
+        else:
+            groups[symbol] = len(leaders)
+            leaders.append(i)
+    
+    return groups
+
+
+@jit(nopython=True)
+def _portfolio_kernel(high, low, close, buy, sell, sl_mult, rr, atr, trailing,
+                      margin, group, n_groups, initial_capital, leverage,
+                      fee, slippage, max_positions, max_correlated, max_trades):
+    """
+    Step all symbols bar by bar on one account.
+    
+    Bars where a symbol has no data (NaN close) are skipped for that
+    symbol; its open position is valued at the last known close.
+    
+    Returns:
+        Tuple of (equity, open position counts, trade matrix, number of
+        trades, rejection counts). Trade matrix columns: symbol, side,
+        entry bar, exit bar, entry price, exit price, quantity, pnl,
+        commission, slippage, exit reason.
+    """
+    n_bars, n_symbols = close.shape
+    
+    side = np.zeros(n_symbols, dtype=np.int64)
+    entry_price = np.zeros(n_symbols)
+    quantity = np.zeros(n_symbols)
+    stop = np.zeros(n_symbols)
+    target = np.zeros(n_symbols)
+    entry_bar = np.zeros(n_symbols, dtype=np.int64)
+    entry_comm = np.zeros(n_symbols)
+    entry_slip = np.zeros(n_symbols)
+    last_close = np.full(n_symbols, np.nan)
+    group_open = np.zeros((n_groups, 2), dtype=np.int64)
+    
+    equity = np.empty(n_bars)
+    positions = np.zeros(n_bars, dtype=np.int64)
+    trades = np.empty((max_trades, 11))
+    rejected = np.zeros(3, dtype=np.int64)
+    n_trades = 0
+    n_open = 0
+    cash = initial_capital
+    
+    for t in range(n_bars):
+        for s in range(n_symbols):
+            c = close[t, s]
+            if np.isnan(c):
+                continue
+            last_close[s] = c
+            
+            # Check SL/TP first
+            exit_price = np.nan
+            reason = -1
+            if side[s] == 1:
+                if high[t, s] >= target[s]:
+                    exit_price, reason = target[s], 1
+                elif low[t, s] <= stop[s]:
+                    exit_price, reason = stop[s], 0
+            elif side[s] == -1:
+                if low[t, s] <= target[s]:
+                    exit_price, reason = target[s], 1
+                elif high[t, s] >= stop[s]:
+                    exit_price, reason = stop[s], 0
+            
+            if reason >= 0:
+                fill = exit_price * (1 - side[s] * slippage)
+                pnl = side[s] * (fill - entry_price[s]) * quantity[s]
+                exit_comm = fill * quantity[s] * fee
+                cash += margin[s] + pnl - exit_comm
+                
+                row = trades[n_trades]
+                row[0] = s
+                row[1] = side[s]
+                row[2] = entry_bar[s]
+                row[3] = t
+                row[4] = entry_price[s]
+                row[5] = fill
+                row[6] = quantity[s]
+                row[7] = pnl
+                row[8] = entry_comm[s] + exit_comm
+                row[9] = entry_slip[s]
+                row[10] = reason
+                n_trades += 1
+                
+                group_open[group[s], (1 - side[s]) // 2] -= 1
+                side[s] = 0
+                n_open -= 1
+                continue
+            
+            # Process signals if no SL/TP triggered
+            direction = 0
+            if side[s] == 0:
+                if buy[t, s]:
+                    direction = 1
+                elif sell[t, s]:
+                    direction = -1
+            elif not np.isnan(trailing[t, s]):
+                target[s] = trailing[t, s]
+            
+            if direction == 0:
+                continue
+            if max_positions > 0 and n_open >= max_positions:
+                rejected[1] += 1
+                continue
+            if max_correlated > 0 and group_open[group[s], (1 - direction) // 2] >= max_correlated:
+                rejected[2] += 1
+                continue
+            if margin[s] > cash:
+                rejected[0] += 1
+                continue
+            
+            # Calculate SL/TP from entry price (TradingView style)
+            if sl_mult[t, s] < 1.0:
+                stop[s] = c * (1 - direction * sl_mult[t, s])
+                target[s] = c * (1 + direction * rr[t, s])
+            else:
+                stop[s] = c - direction * atr[t, s] * sl_mult[t, s]
+                target[s] = c + direction * atr[t, s] * rr[t, s]
+            if not np.isnan(trailing[t, s]):
+                target[s] = trailing[t, s]
+            
+            fill = c * (1 + direction * slippage)
+            side[s] = direction
+            entry_price[s] = fill
+            quantity[s] = margin[s] * leverage / fill
+            entry_comm[s] = fill * quantity[s] * fee
+            entry_slip[s] = abs(fill - c)
+            entry_bar[s] = t
+            cash -= margin[s]
+            group_open[group[s], (1 - direction) // 2] += 1
+            n_open += 1
+        
+        # Equity: free cash + locked margin + unrealized PnL
+        value = cash
+        for s in range(n_symbols):
+            if side[s] != 0:
+                value += margin[s] + side[s] * (last_close[s] - entry_price[s]) * quantity[s]
+        equity[t] = value
+        positions[t] = n_open
+    
+    # Close any remaining position at the last bar
+    for s in range(n_symbols):
+        if side[s] != 0:
+            fill = last_close[s] * (1 - side[s] * slippage)
+            pnl = side[s] * (fill - entry_price[s]) * quantity[s]
+            exit_comm = fill * quantity[s] * fee
+            cash += margin[s] + pnl - exit_comm
+            
+            row = trades[n_trades]
+            row[0] = s
+            row[1] = side[s]
+            row[2] = entry_bar[s]
+            row[3] = n_bars - 1
+            row[4] = entry_price[s]
+            row[5] = fill
+            row[6] = quantity[s]
+            row[7] = pnl
+            row[8] = entry_comm[s] + exit_comm
+            row[9] = entry_slip[s]
+            row[10] = 2
+            n_trades += 1
+    
+    # The curve ends at the realized final capital, after closing costs
+    if n_bars > 0:
+        equity[n_bars - 1] = cash
+    
+    return equity, positions, trades, n_trades, rejected
+
+
+class PortfolioBacktester:
+    """
+    Backtest many symbols on one account with shared capital and exposure limits.
+    """
+    
+    def __init__(self, initial_capital: float = 10000.0, fee_bps: float = 5.0,
+                 slippage_bps: float = 5.0, position_size: Union[float, Dict[str, float]] = 200.0,
+                 leverage: float = 10.0, max_positions: int = 0,
+                 max_correlated_positions: int = 0, correlation_threshold: float = 0.8,
+                 groups: Optional[Dict[str, int]] = None):
+        """
+        Initialize portfolio backtester.
+        
+        Args:
+            initial_capital: Shared account capital
+            fee_bps: Fee in basis points
+            slippage_bps: Slippage in basis points
+            position_size: Margin per position in USD, or a per-symbol mapping
+            leverage: Leverage multiplier
+            max_positions: Maximum concurrent positions (0 = unlimited)
+            max_correlated_positions: Maximum same-direction positions per
+                correlation group (0 = unlimited)
+            correlation_threshold: Return correlation that puts symbols in one group
+            groups: Explicit symbol to group mapping (computed from returns if omitted)
+        """
+        self.initial_capital = initial_capital
+        self.fee_bps = fee_bps / 10000.0
+        self.slippage_bps = slippage_bps / 10000.0
+        self.position_size = position_size
+        self.leverage = leverage
+        self.max_positions = max_positions
+        self.max_correlated_positions = max_correlated_positions
+        self.correlation_threshold = correlation_threshold
+        self.groups = groups
+    
+    def _margins(self, symbols: List[str]) -> np.ndarray:
+        if isinstance(self.position_size, dict):
+            return np.array([self.position_size[s] for s in symbols], dtype=np.float64)
+        return np.full(len(symbols), float(self.position_size))
+    
+    def run_backtest(self, data: Dict[str, pd.DataFrame],
+                     signals: Dict[str, pd.DataFrame]) -> PortfolioResult:
+        """
+        Run the portfolio backtest.
+        
+        Symbols are processed in the order of ``data`` within each bar, so
+        earlier symbols get capital first when entries compete. A NaN
+        ``trailing_tp`` leaves the take profit unchanged.
+        
+        Args:
+            data: OHLCV data per symbol
+            signals: Signal frames per symbol (``buy_final``, ``sell_final``,
+                ``atr_sl_mult``, ``atr_rr`` and optionally ``atr`` and ``trailing_tp``)
+        
+        Returns:
+            PortfolioResult object
+        """
+        symbols = list(data)
+        index = data[symbols[0]].index
+        for symbol in symbols[1:]:
+            index = index.union(data[symbol].index)
+        logger.info(f"Starting portfolio backtest: {len(symbols)} symbols, {len(index)} bars")
+        
+        # Timeline positions of each frame, shared by all its columns
+        positions = {}
+        
+        def matrix(frames: Dict[str, pd.DataFrame], column: str, default: float,
+                   dtype: type = np.float64) -> np.ndarray:
+            out = np.full((len(index), len(symbols)), default, dtype=dtype)
+            for j, symbol in enumerate(symbols):
+                frame = frames[symbol]
+                if column not in frame:
+                    continue
+                if id(frame) not in positions:
+                    positions[id(frame)] = index.get_indexer(frame.index)
+                out[positions[id(frame)], j] = frame[column].to_numpy(dtype=dtype, na_value=default)
+            return out
+        
+        close = matrix(data, 'close', np.nan)
+        if self.groups is not None:
+            groups = {symbol: self.groups[symbol] for symbol in symbols}
+        else:
+            groups = correlation_groups(pd.DataFrame(close, index=index, columns=symbols),
+                                        self.correlation_threshold)
+        group_ids = np.array([groups[s] for s in symbols], dtype=np.int64)
+        buy = matrix(signals, 'buy_final', False, np.bool_)
+        sell = matrix(signals, 'sell_final', False, np.bool_)
+        max_trades = int(np.count_nonzero(buy | sell)) + 1
+        
+        equity, positions, trades, n_trades, rejected = _portfolio_kernel(
+            matrix(data, 'high', np.nan), matrix(data, 'low', np.nan), close, buy, sell,
+            matrix(signals, 'atr_sl_mult', 0.02), matrix(signals, 'atr_rr', 0.01),
+            matrix(signals, 'atr', 0.01), matrix(signals, 'trailing_tp', np.nan),
+            self._margins(symbols), group_ids, int(group_ids.max()) + 1,
+            float(self.initial_capital), float(self.leverage), float(self.fee_bps),
+            float(self.slippage_bps), int(self.max_positions),
+            int(self.max_correlated_positions), max_trades)
+        
+        trades = trades[:n_trades]
+        order = np.lexsort((trades[:, 0], trades[:, 3]))
+        trades = trades[order]
+        equity_series = pd.Series(equity, index=index)
+        trade_frame = self._trade_frame(trades, symbols, index)
+        
+        metrics = self.calculate_metrics(equity_series, trades, index)
+        metrics['max_open_positions'] = int(positions.max()) if len(positions) else 0
+        metrics['avg_open_positions'] = float(positions.mean()) if len(positions) else 0.0
+        
+        logger.info(f"Portfolio backtest completed. {n_trades} trades executed, "
+                   f"{int(rejected.sum())} entries rejected.")
+        
+        return PortfolioResult(
+            trades=trade_frame,
+            equity_curve=equity_series,
+            open_positions=pd.Series(positions, index=index),
+            metrics=metrics,
+            symbol_summary=self._symbol_summary(trade_frame, symbols, groups),
+            rejected=dict(zip(REJECT_REASONS, rejected.tolist())),
+            groups=groups,
+        )
+    
+    @staticmethod
+    def _trade_frame(trades: np.ndarray, symbols: List[str], index: pd.Index) -> pd.DataFrame:
+        entry = trades[:, 2].astype(np.int64)
+        exit_ = trades[:, 3].astype(np.int64)
+        return pd.DataFrame({
+            'symbol': np.array(symbols, dtype=object)[trades[:, 0].astype(np.int64)],
+            'side': np.where(trades[:, 1] > 0, 'long', 'short'),
+            'entry_time': index[entry],
+            'exit_time': index[exit_],
+            'entry_price': trades[:, 4],
+            'exit_price': trades[:, 5],
+            'quantity': trades[:, 6],
+            'pnl': trades[:, 7],
+            'commission': trades[:, 8],
+            'slippage': trades[:, 9],
+            'exit_reason': np.array(EXIT_REASONS, dtype=object)[trades[:, 10].astype(np.int64)],
+        })
+    
+    @staticmethod
+    def _symbol_summary(trades: pd.DataFrame, symbols: List[str],
+                        groups: Dict[str, int]) -> pd.DataFrame:
+        grouped = trades.groupby('symbol')['pnl']
+        summary = pd.DataFrame({
+            'group': pd.Series(groups),
+            'num_trades': grouped.size(),
+            'total_pnl': grouped.sum(),
+            'win_rate_pct': grouped.apply(lambda pnl: (pnl > 0).mean() * 100),
+        }).reindex(symbols)
+        summary['num_trades'] = summary['num_trades'].fillna(0).astype(int)
+        summary['total_pnl'] = summary['total_pnl'].fillna(0.0)
+        return summary
+    
+    def calculate_metrics(self, equity_curve: pd.Series, trades: np.ndarray,
+                          index: pd.Index) -> Dict[str, float]:
+        """
+        Calculate portfolio metrics with the vectorized metrics engine.
+        
+        Args:
+            equity_curve: Portfolio equity curve
+            trades: Trade matrix returned by the kernel
+            index: Common timeline
+        
+        Returns:
+            Dictionary of metrics
+        """
+        timestamps = None
+        if isinstance(index, pd.DatetimeIndex):
+            timestamps = index.asi8 / 1e9 if index.tz is None else index.tz_convert('UTC').asi8 / 1e9
+        
+        def times(positions: np.ndarray) -> np.ndarray:
+            if timestamps is None:
+                return np.full(len(positions), np.nan)
+            return timestamps[positions]
+        
+        entry = trades[:, 2].astype(np.int64)
+        exit_ = trades[:, 3].astype(np.int64)
+        trade_arrays = TradeArrays(
+            entry_idx=entry,
+            exit_idx=exit_,
+            entry_time=times(entry),
+            exit_time=times(exit_),
+            pnl=trades[:, 7].copy(),
+            side=trades[:, 1].astype(np.int8),
+            fees=trades[:, 8] + trades[:, 9],
+        )
+        
+        batch = calculate_metrics_batch(equity_curve.to_numpy()[None, :], [trade_arrays], timestamps)
+        metrics = {name: values[0].item() for name, values in batch.items()}
+        metrics['final_capital'] = float(equity_curve.iloc[-1]) if len(equity_curve) else self.initial_capital
+        return metrics
+
+
+def build_portfolio_signals(data: Dict[str, pd.DataFrame],
+                            strategy_factory: Callable[[Dict[str, Any]], Any],
+                            params: Union[Dict[str, Any], Dict[str, Dict[str, Any]]]) -> Dict[str, pd.DataFrame]:
+    """
+    Run a strategy on every symbol to get its signal frame.
+    
+    Args:
+        data: OHLCV data per symbol
+        strategy_factory: Function creating a strategy from parameters
+        params: One parameter set for all symbols, or a parameter set per symbol
+    
+    Returns:
+        Dictionary mapping symbol to signal frame
+    """
+    per_symbol = all(symbol in params for symbol in data)
+    return {symbol: strategy_factory(params[symbol] if per_symbol else params).run_strategy(frame)
+            for symbol, frame in data.items()}
+
+
+def run_portfolio_backtest(data: Dict[str, pd.DataFrame], signals: Dict[str, pd.DataFrame],
+                           **kwargs) -> PortfolioResult:
+    """
+    Run a portfolio backtest with the given settings.
+    
+    Args:
+        data: OHLCV data per symbol
+        signals: Signal frames per symbol
+        **kwargs: PortfolioBacktester arguments
+    
+    Returns:
+        PortfolioResult object
+    """
+    return PortfolioBacktester(**kwargs).run_backtest(data, signals)
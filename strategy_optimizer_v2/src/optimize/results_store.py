@@ -0,0 +1,470 @@
+"""
+Streaming results store for large optimization runs.
+
+Results are appended to a SQLite table as they complete, with parameters and
+metrics flattened into ``param_*`` and ``metric_*`` columns. Every row is keyed
+by symbol, timeframe, strategy, a hash of the run's backtest settings, a
+content hash of its parameters and a fingerprint of the data it was computed
+on, so an interrupted run can resume by skipping stored keys, and top-k
+queries run in SQL without loading every result.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, Callable, List, Optional, Iterator, Iterable, Set, Union
+import logging
+import sqlite3
+import functools
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PARAM_PREFIX = "param_"
+METRIC_PREFIX = "metric_"
+
+BASE_COLUMNS = [
+    ('id', 'INTEGER PRIMARY KEY AUTOINCREMENT'),
+    ('symbol', 'TEXT NOT NULL'),
+    ('timeframe', 'TEXT NOT NULL'),
+    ('strategy', "TEXT NOT NULL DEFAULT ''"),
+    ('run_hash', "TEXT NOT NULL DEFAULT ''"),
+    ('params_hash', 'TEXT NOT NULL'),
+    ('data_fingerprint', 'TEXT NOT NULL'),
+    ('params_json', 'TEXT NOT NULL'),
+    ('success', 'INTEGER NOT NULL'),
+    ('pruned', 'INTEGER NOT NULL DEFAULT 0'),
+    ('prune_reason', 'TEXT'),
+    ('error', 'TEXT'),
+    ('num_trades', 'INTEGER'),
+    ('bars_processed', 'INTEGER'),
+    ('total_bars', 'INTEGER'),
+    ('created_at', 'TEXT'),
+]
+KEY_COLUMNS = ['symbol', 'timeframe', 'strategy', 'run_hash', 'params_hash', 'data_fingerprint']
+
+
+def params_hash(params: Dict[str, Any]) -> str:
+    """
+    Content hash of a parameter combination.
+
+    Args:
+        params: Parameter combination
+
+    Returns:
+        Hex digest independent of key order
+    """
+    payload = json.dumps(_plain(params), sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def strategy_name(strategy_factory: Callable) -> str:
+    """
+    Stable name of a strategy factory.
+
+    Uses the last module component, so the same factory imported as
+    ``src.strategy...`` or ``strategy_optimizer_v2.src.strategy...`` gets the
+    same name. Partials include their bound arguments.
+
+    Args:
+        strategy_factory: Strategy factory function
+
+    Returns:
+        Name such as ``atr_st_core.create_strategy``
+    """
+    if isinstance(strategy_factory, functools.partial):
+        bound = json.dumps([strategy_factory.args, strategy_factory.keywords], sort_keys=True, default=str)
+        return f"{strategy_name(strategy_factory.func)}{bound}"
+    module = getattr(strategy_factory, '__module__', None) or ''
+    name = getattr(strategy_factory, '__qualname__', None) or type(strategy_factory).__qualname__
+    return f"{module.rsplit('.', 1)[-1]}.{name}"
+
+
+def data_fingerprint(data: pd.DataFrame) -> str:
+    """
+    Fingerprint of an OHLCV frame.
+
+    Covers the timestamps and every value, so any refreshed or corrected
+    candle produces a different fingerprint.
+
+    Args:
+        data: OHLCV data
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha1()
+    digest.update(json.dumps([list(map(str, data.columns)), len(data)]).encode())
+    if isinstance(data.index, pd.DatetimeIndex):
+        digest.update(data.index.asi8.tobytes())
+    else:
+        digest.update(pd.util.hash_pandas_object(data.index, index=False).values.tobytes())
+    numeric = data.select_dtypes(include=[np.number])
+    digest.update(np.ascontiguousarray(numeric.to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def _plain(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Parameters with numpy scalars converted to Python values."""
+    return {key: value.item() if isinstance(value, np.generic) else value for key, value in params.items()}
+
+
+def _quote(name: str) -> str:
+    """Quote a column name for SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _to_sql_value(value: Any) -> Any:
+    """Convert a param/metric value to a type SQLite can bind."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return json.dumps(value, default=str)
+
+
+class ResultsStore:
+    """
+    Append-only SQLite store of optimization results.
+
+    Only the process that owns the store writes to it; workers return results
+    and the parent appends them as they complete. The connection is not
+    pickled, so an optimizer holding a store can still be sent to workers.
+
+    A store scoped to a strategy and run hash (see ``set_scope``) writes rows
+    under that scope and only reads rows from it; an unscoped store reads
+    every row.
+    """
+
+    TABLE = "results"
+
+    def __init__(self, path: Union[str, Path], strategy: Optional[str] = None,
+                 run_hash: Optional[str] = None):
+        """
+        Open (or create) a results store.
+
+        Args:
+            path: SQLite database file
+            strategy: Strategy name to scope the store to (optional)
+            run_hash: Backtest settings hash to scope the store to (optional)
+        """
+        self.path = Path(path)
+        self.strategy = strategy
+        self.run_hash = run_hash
+        self._conn = None
+        self._columns = None
+        self._indexed = set()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'path': self.path, 'strategy': self.strategy, 'run_hash': self.run_hash}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__init__(**state)
+
+    def __enter__(self) -> 'ResultsStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def set_scope(self, strategy: Optional[str], run_hash: Optional[str]):
+        """
+        Scope writes and reads to a strategy and run hash (None reads all rows).
+
+        Args:
+            strategy: Strategy name (see ``strategy_name``)
+            run_hash: Hash of the run's backtest settings
+        """
+        self.strategy = strategy
+        self.run_hash = run_hash
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Lazily opened connection."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+
+            existing = [row[1] for row in self._conn.execute(f"PRAGMA table_info({self.TABLE})")]
+            if existing and 'run_hash' not in existing:
+                # Rows keyed without strategy and run settings cannot be resumed
+                # safely; keep them aside and start a new table
+                logger.warning(f"Results store {self.path} predates strategy/run keys; "
+                               f"moving its rows to {self.TABLE}_unscoped")
+                self._conn.execute(f"ALTER TABLE {self.TABLE} RENAME TO {self.TABLE}_unscoped")
+
+            columns = ", ".join(f"{name} {decl}" for name, decl in BASE_COLUMNS)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.TABLE} ({columns}, "
+                f"UNIQUE ({', '.join(KEY_COLUMNS)}))"
+            )
+            self._conn.commit()
+            self._columns = [row[1] for row in self._conn.execute(f"PRAGMA table_info({self.TABLE})")]
+        return self._conn
+
+    def close(self):
+        """Close the connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @property
+    def param_columns(self) -> List[str]:
+        """Flattened parameter column names."""
+        self.conn
+        return [c for c in self._columns if c.startswith(PARAM_PREFIX)]
+
+    @property
+    def metric_columns(self) -> List[str]:
+        """Flattened metric column names."""
+        self.conn
+        return [c for c in self._columns if c.startswith(METRIC_PREFIX)]
+
+    def _ensure_columns(self, names: Iterable[str]):
+        """Add flattened columns that do not exist yet."""
+        conn = self.conn
+        for name in names:
+            if name not in self._columns:
+                # No declared type: values keep their own storage class
+                conn.execute(f"ALTER TABLE {self.TABLE} ADD COLUMN {_quote(name)}")
+                self._columns.append(name)
+
+    def add(self, results: List[Dict[str, Any]], fingerprint: str) -> int:
+        """
+        Append a batch of results in one transaction.
+
+        A result with the same key as a stored one replaces it.
+
+        Args:
+            results: Optimization result dicts
+            fingerprint: Fingerprint of the data the results were computed on
+
+        Returns:
+            Number of rows written
+        """
+        if not results:
+            return 0
+
+        created_at = datetime.now().isoformat()
+        rows = []
+        for result in results:
+            params = result.get('params', {})
+            row = {
+                'symbol': result['symbol'],
+                'timeframe': result['timeframe'],
+                'strategy': self.strategy or '',
+                'run_hash': self.run_hash or '',
+                'params_hash': params_hash(params),
+                'data_fingerprint': fingerprint,
+                'params_json': json.dumps(_plain(params), default=str),
+                'success': int(bool(result.get('success', False))),
+                'pruned': int(bool(result.get('pruned', False))),
+                'prune_reason': result.get('prune_reason'),
+                'error': result.get('error'),
+                'num_trades': _to_sql_value(result.get('num_trades')),
+                'bars_processed': _to_sql_value(result.get('bars_processed')),
+                'total_bars': _to_sql_value(result.get('total_bars')),
+                'created_at': created_at,
+            }
+            for key, value in params.items():
+                row[PARAM_PREFIX + key] = _to_sql_value(value)
+            for key, value in result.get('metrics', {}).items():
+                row[METRIC_PREFIX + key] = _to_sql_value(value)
+            rows.append(row)
+
+        columns = list(dict.fromkeys(name for row in rows for name in row))
+        self._ensure_columns(columns)
+
+        sql = (f"INSERT OR REPLACE INTO {self.TABLE} ({', '.join(map(_quote, columns))}) "
+               f"VALUES ({', '.join('?' * len(columns))})")
+        with self.conn:
+            self.conn.executemany(sql, [tuple(row.get(name) for name in columns) for row in rows])
+        return len(rows)
+
+    def evaluated(self, symbol: str, timeframe: str, fingerprint: str) -> Set[str]:
+        """
+        Parameter hashes already evaluated successfully for a symbol/timeframe
+        and data (within the store's scope). Failed rows are left out so a
+        resumed run retries them.
+
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            fingerprint: Data fingerprint
+
+        Returns:
+            Set of parameter hashes
+        """
+        where, args = self._where(True, None, symbol, timeframe)
+        cursor = self.conn.execute(
+            f"SELECT params_hash FROM {self.TABLE}{where} AND data_fingerprint = ?",
+            args + [fingerprint],
+        )
+        return {row[0] for row in cursor}
+
+    def _where(self, success: Optional[bool] = True, pruned: Optional[bool] = False,
+               symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        """Build a WHERE clause and its arguments (None filters match both), within the scope."""
+        clauses, args = [], []
+        for column, value in (('strategy', self.strategy), ('run_hash', self.run_hash)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        if success is not None:
+            clauses.append("success = ?")
+            args.append(int(success))
+        if pruned is not None:
+            clauses.append("pruned = ?")
+            args.append(int(pruned))
+        if symbol is not None:
+            clauses.append("symbol = ?")
+            args.append(symbol)
+        if timeframe is not None:
+            clauses.append("timeframe = ?")
+            args.append(timeframe)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def count(self, success: Optional[bool] = True, pruned: Optional[bool] = False,
+              symbol: Optional[str] = None, timeframe: Optional[str] = None) -> int:
+        """Number of stored results matching the filters (complete, successful by default)."""
+        where, args = self._where(success, pruned, symbol, timeframe)
+        return self.conn.execute(f"SELECT COUNT(*) FROM {self.TABLE}{where}", args).fetchone()[0]
+
+    def groups(self) -> List[tuple]:
+        """Stored (symbol, timeframe) pairs in first-stored order."""
+        where, args = self._where(None, None)
+        cursor = self.conn.execute(
+            f"SELECT symbol, timeframe FROM {self.TABLE}{where} GROUP BY symbol, timeframe ORDER BY MIN(id)", args
+        )
+        return [tuple(row) for row in cursor]
+
+    def _row_to_result(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Rebuild a result dict from a stored row."""
+        result = {
+            'symbol': row['symbol'],
+            'timeframe': row['timeframe'],
+            'params': json.loads(row['params_json']),
+            'metrics': {
+                name[len(METRIC_PREFIX):]: row[name]
+                for name in row.keys()
+                if name.startswith(METRIC_PREFIX) and row[name] is not None
+            },
+            'num_trades': row['num_trades'],
+            'success': bool(row['success']),
+        }
+        if row['pruned']:
+            result.update({
+                'pruned': True,
+                'prune_reason': row['prune_reason'],
+                'bars_processed': row['bars_processed'],
+                'total_bars': row['total_bars'],
+            })
+        if row['error'] is not None:
+            result['error'] = row['error']
+        return result
+
+    def _query(self, sql: str, args: List[Any]) -> Iterator[Dict[str, Any]]:
+        """Run a query and yield rebuilt result dicts."""
+        cursor = self.conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        for row in cursor.execute(sql, args):
+            yield self._row_to_result(row)
+
+    def get_top_results(self, n: int = 10, metric: str = 'profit_factor',
+                        symbol: Optional[str] = None, timeframe: Optional[str] = None,
+                        include_pruned: bool = False) -> List[Dict[str, Any]]:
+        """
+        Top N successful results by a metric, computed in SQL.
+
+        Args:
+            n: Number of results
+            metric: Metric to sort by (descending)
+            symbol: Restrict to a symbol
+            timeframe: Restrict to a timeframe
+            include_pruned: Include partial (pruned) backtests
+
+        Returns:
+            List of result dicts (results without the metric are skipped)
+        """
+        column = METRIC_PREFIX + metric
+        self.conn
+        if column not in self._columns:
+            return []
+
+        if column not in self._indexed:
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote('idx_' + column)} "
+                              f"ON {self.TABLE} ({_quote(column)})")
+            self._indexed.add(column)
+
+        where, args = self._where(True, None if include_pruned else False, symbol, timeframe)
+        where += (" AND " if where else " WHERE ") + f"{_quote(column)} IS NOT NULL"
+        sql = f"SELECT * FROM {self.TABLE}{where} ORDER BY {_quote(column)} DESC, id ASC LIMIT ?"
+        return list(self._query(sql, args + [n]))
+
+    def iter_results(self, success: Optional[bool] = True, pruned: Optional[bool] = False,
+                     symbol: Optional[str] = None, timeframe: Optional[str] = None,
+                     limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream stored results in insertion order.
+
+        Args:
+            success: Only successful (True), only failed (False) or both (None)
+            pruned: Only pruned (True), only complete (False) or both (None)
+            symbol: Restrict to a symbol
+            timeframe: Restrict to a timeframe
+            limit: Maximum number of results
+
+        Yields:
+            Result dicts
+        """
+        where, args = self._where(success, pruned, symbol, timeframe)
+        sql = f"SELECT * FROM {self.TABLE}{where} ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        yield from self._query(sql, args)
+
+    def read_frame(self, columns: Optional[List[str]] = None, success: Optional[bool] = True,
+                   pruned: Optional[bool] = False, chunksize: Optional[int] = None):
+        """
+        Read flattened columns into a DataFrame.
+
+        Args:
+            columns: Columns to read (default: symbol, timeframe, num_trades and
+                all param_*/metric_* columns); missing ones are skipped
+            success: Only successful (True), only failed (False) or both (None)
+            pruned: Only pruned (True), only complete (False) or both (None)
+            chunksize: Yield DataFrames of this many rows instead
+
+        Returns:
+            DataFrame, or an iterator of DataFrames when chunksize is given
+        """
+        self.conn
+        if columns is None:
+            columns = ['symbol', 'timeframe', 'num_trades'] + self.param_columns + self.metric_columns
+        columns = [c for c in columns if c in self._columns]
+
+        where, args = self._where(success, pruned)
+        sql = f"SELECT {', '.join(map(_quote, columns))} FROM {self.TABLE}{where} ORDER BY id"
+        return pd.read_sql_query(sql, self.conn, params=args, chunksize=chunksize)
+
+    def export_csv(self, csv_file: Union[str, Path], chunksize: int = 50_000) -> int:
+        """
+        Write flattened successful, complete results to CSV in chunks.
+
+        Args:
+            csv_file: Output file
+            chunksize: Rows per chunk
+
+        Returns:
+            Number of rows written
+        """
+        rows = 0
+        for i, chunk in enumerate(self.read_frame(chunksize=chunksize)):
+            chunk.to_csv(csv_file, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+            rows += len(chunk)
+        return rows
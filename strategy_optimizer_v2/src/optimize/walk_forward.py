@@ -7,23 +7,85 @@ to test strategy robustness across different time periods.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 import logging
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
+import hashlib
 import json
+import math
 import os
 from pathlib import Path
 
-from ..config import get_config, get_wf_windows
+from ..config import get_config, get_wf_windows, get_param_space
 from ..data.loader import create_data_loader
 from ..strategy.atr_st_core import create_strategy, validate_strategy_params
 from ..strategy.backtester import run_backtest
-from .grid_search import GridSearchOptimizer
+from .grid_search import BACKTEST_SETTINGS, GridSearchOptimizer
+from .param_space import ParamSpace, canonicalize_param_combinations
+from .results_store import data_fingerprint
+from .adaptive_search import AdaptiveSearch, metric_score, slice_data
+from .warmup import init_worker
 
 logger = logging.getLogger(__name__)
 
 
+def sweep_train_windows(data: pd.DataFrame, param_combinations: Union[List[Dict[str, Any]], ParamSpace],
+                        windows: List[Dict[str, Any]], fee_bps: float,
+                        slippage_bps: float) -> List[Tuple[Dict[str, Any], Dict[int, float]]]:
+    """
+    Evaluate parameter combinations on the training slice of every window.
+    
+    The strategy runs once per combination on the full series; each window
+    then backtests its slice of those signals, so indicators are not
+    recomputed for overlapping windows.
+    
+    Args:
+        data: Complete dataset
+        param_combinations: Parameter combinations to test
+        windows: Resolved windows (with train_start/train_end timestamps)
+        fee_bps: Fee in basis points
+        slippage_bps: Slippage in basis points
+        
+    Returns:
+        List of (params, {window_id: training profit factor})
+    """
+    evaluated = []
+    
+    for params in param_combinations:
+        try:
+            if not validate_strategy_params(params):
+                continue
+            
+            signals = create_strategy(params).run_strategy(data)
+            if signals.empty:
+                continue
+            
+            train_metrics = {}
+            for window in windows:
+                mask = (data.index >= window['train_start']) & (data.index <= window['train_end'])
+                if not mask.any():
+                    continue
+                train_result = run_backtest(
+                    data=data[mask],
+                    signals=signals[mask],
+                    initial_capital=10000.0,
+                    fee_bps=fee_bps,
+                    slippage_bps=slippage_bps,
+                    compact=True
+                )
+                train_metrics[window['window_id']] = train_result.metrics.get('profit_factor', 0)
+            
+            evaluated.append((params, train_metrics))
+            
+        except Exception as e:
+            logger.warning(f"Error optimizing params {params} on training data: {e}")
+            continue
+    
+    return evaluated
+
+
 class WalkForwardOptimizer:
     """
     Walk-forward optimizer for ATR + SuperTrend strategy.
@@ -40,6 +102,61 @@ class WalkForwardOptimizer:
         self.config = get_config()
         self.data_loader = create_data_loader(cache_dir, use_cache)
         self.results = []
+        self.search_stats = {}
+        self.search_mode = self.config.optimization.search_mode
+        self.max_workers = self.config.optimization.default_jobs
+        self.resume_dir: Optional[Path] = None
+        self.resumed_windows = 0
+        self._grid_optimizer = None
+    
+    def _adaptive_best_params(self, symbol: str, timeframe: str, train_data: pd.DataFrame,
+                              param_combinations: Any, window_id: int) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Find the best training parameters with successive halving and TPE.
+        
+        Backtests go through GridSearchOptimizer.optimize_single_combination on
+        leading slices of the training data.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe
+            train_data: Training data
+            param_combinations: Parameter combinations or ParamSpace
+            window_id: Window identifier
+            
+        Returns:
+            Tuple of (best parameters or None, best profit factor)
+        """
+        opt = self.config.optimization
+        
+        if self._grid_optimizer is None:
+            self._grid_optimizer = GridSearchOptimizer(use_cache=False)
+        if not isinstance(param_combinations, ParamSpace):
+            param_combinations = ParamSpace.from_combinations(param_combinations)
+        
+        def evaluate(params: Dict[str, Any], fraction: float) -> Dict[str, Any]:
+            return self._grid_optimizer.optimize_single_combination(
+                symbol, timeframe, params, slice_data(train_data, fraction, opt.adaptive_min_bars)
+            )
+        
+        score = metric_score('profit_factor', opt.adaptive_min_trades)
+        search = AdaptiveSearch(
+            param_combinations, evaluate, score,
+            n_candidates=opt.adaptive_candidates,
+            eta=opt.adaptive_eta,
+            min_fraction=opt.adaptive_min_fraction,
+            n_brackets=opt.adaptive_brackets,
+            seed=opt.adaptive_seed,
+        )
+        results = search.run()
+        self.search_stats.setdefault('adaptive', {})[f"{symbol}_{timeframe}_w{window_id}"] = search.stats
+        
+        successful = [r for r in results if r.get('success', False)]
+        if not successful:
+            return None, -float('inf')
+        
+        best = max(successful, key=score)
+        return best['params'], best['metrics'].get('profit_factor', 0)
         
     def optimize_window(self, symbol: str, timeframe: str, 
                        train_data: pd.DataFrame, test_data: pd.DataFrame,
@@ -65,40 +182,46 @@ class WalkForwardOptimizer:
         best_params = None
         best_metric = -float('inf')
         
-        for params in param_combinations:
-            try:
-                # Validate parameters
-                if not validate_strategy_params(params):
-                    continue
-                
-                # Create strategy
-                strategy = create_strategy(params)
-                
-                # Run strategy on training data
-                train_signals = strategy.run_strategy(train_data)
-                
-                if train_signals.empty:
-                    continue
-                
-                # Run backtest on training data
-                train_result = run_backtest(
-                    data=train_data,
-                    signals=train_signals,
-                    initial_capital=10000.0,
-                    fee_bps=self.config.strategy.fee_bps,
-                    slippage_bps=self.config.strategy.slippage_bps
-                )
-                
-                # Use profit factor as optimization metric
-                metric_value = train_result.metrics.get('profit_factor', 0)
-                
-                if metric_value > best_metric:
-                    best_metric = metric_value
-                    best_params = params
+        if self.search_mode == 'adaptive':
+            best_params, best_metric = self._adaptive_best_params(
+                symbol, timeframe, train_data, param_combinations, window_id
+            )
+        else:
+            for params in param_combinations:
+                try:
+                    # Validate parameters
+                    if not validate_strategy_params(params):
+                        continue
                     
-            except Exception as e:
-                logger.warning(f"Error optimizing params {params} on training data: {e}")
-                continue
+                    # Create strategy
+                    strategy = create_strategy(params)
+                    
+                    # Run strategy on training data
+                    train_signals = strategy.run_strategy(train_data)
+                    
+                    if train_signals.empty:
+                        continue
+                    
+                    # Run backtest on training data
+                    train_result = run_backtest(
+                        data=train_data,
+                        signals=train_signals,
+                        initial_capital=10000.0,
+                        fee_bps=self.config.strategy.fee_bps,
+                        slippage_bps=self.config.strategy.slippage_bps,
+                        compact=True
+                    )
+                    
+                    # Use profit factor as optimization metric
+                    metric_value = train_result.metrics.get('profit_factor', 0)
+                    
+                    if metric_value > best_metric:
+                        best_metric = metric_value
+                        best_params = params
+                        
+                except Exception as e:
+                    logger.warning(f"Error optimizing params {params} on training data: {e}")
+                    continue
         
         if best_params is None:
             logger.warning(f"No valid parameters found for window {window_id}")
@@ -169,11 +292,248 @@ class WalkForwardOptimizer:
                 'error': str(e)
             }
     
+    def resolve_windows(self, data: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Resolve walk-forward windows to timestamps.
+        
+        Windows start after ``wf_warmup_bars`` bars so every window sees fully
+        warmed-up indicators when signals are computed on the full series.
+        
+        Args:
+            data: Complete dataset
+            
+        Returns:
+            List of windows with train/test start and end timestamps
+        """
+        warmup = min(self.config.optimization.wf_warmup_bars, len(data) - 1)
+        origin = data.index[warmup]
+        total_days = (data.index[-1] - origin).days
+        
+        resolved = []
+        for window in get_wf_windows(total_days):
+            resolved.append({
+                'window_id': window['window_id'],
+                'train_start': origin + timedelta(days=window['train_start']),
+                'train_end': origin + timedelta(days=window['train_end']),
+                'test_start': origin + timedelta(days=window['test_start']),
+                'test_end': origin + timedelta(days=window['test_end']),
+            })
+        return resolved
+    
+    def _window_signature(self, symbol: str, timeframe: str, data: pd.DataFrame,
+                          window: Dict[str, Any], param_combinations: Any) -> str:
+        """
+        Hash identifying a window's inputs, used to skip finished windows.
+        
+        Covers the bars up to the window's test end (indicators see every
+        earlier bar), so refreshed or corrected candles invalidate it, and the
+        backtest costs of both the training sweep and the test run.
+        """
+        if isinstance(param_combinations, ParamSpace):
+            indices = param_combinations.indices
+            space_key = {
+                'param_space': param_combinations.param_space,
+                'size': len(param_combinations),
+                'indices': hashlib.sha1(np.asarray(indices, dtype=np.int64).tobytes()).hexdigest() if indices is not None else None,
+            }
+        else:
+            space_key = param_combinations
+        
+        payload = json.dumps({
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'window': window,
+            'data': data_fingerprint(data[data.index <= window['test_end']]),
+            'costs': {
+                'fee_bps': self.config.strategy.fee_bps,
+                'slippage_bps': self.config.strategy.slippage_bps,
+                'adaptive_train': BACKTEST_SETTINGS,
+            },
+            'search_mode': self.search_mode,
+            'warmup_bars': self.config.optimization.wf_warmup_bars,
+            'params': space_key,
+        }, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+    
+    def _window_file(self, symbol: str, timeframe: str, window_id: int) -> Path:
+        """Path of a stored window result."""
+        return self.resume_dir / "windows" / f"{symbol.replace('/', '_')}_{timeframe}_w{window_id}.json"
+    
+    def _load_window(self, symbol: str, timeframe: str, window: Dict[str, Any],
+                     signature: str) -> Optional[Dict[str, Any]]:
+        """Load a window result from an earlier run if its inputs are unchanged."""
+        if self.resume_dir is None:
+            return None
+        
+        window_file = self._window_file(symbol, timeframe, window['window_id'])
+        if not window_file.exists():
+            return None
+        
+        try:
+            with open(window_file, 'r') as f:
+                stored = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read stored window {window_file}: {e}")
+            return None
+        
+        if stored.get('signature') != signature:
+            return None
+        return stored.get('result')
+    
+    def _save_window(self, symbol: str, timeframe: str, result: Dict[str, Any], signature: str):
+        """Store a finished window result so later runs can skip it."""
+        if self.resume_dir is None or not result.get('success', False):
+            return
+        
+        window_file = self._window_file(symbol, timeframe, result['window_id'])
+        window_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(window_file, 'w') as f:
+            json.dump({'signature': signature, 'result': result}, f, indent=2, default=str)
+    
+    def _test_params(self, symbol: str, timeframe: str, data: pd.DataFrame, window: Dict[str, Any],
+                     best_params: Optional[Dict[str, Any]], best_metric: float,
+                     signals_cache: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+        """Backtest a window's best training parameters on its test slice."""
+        window_id = window['window_id']
+        
+        if best_params is None:
+            logger.warning(f"No valid parameters found for window {window_id}")
+            return {
+                'window_id': window_id,
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'best_params': None,
+                'train_metrics': {},
+                'test_metrics': {},
+                'success': False,
+                'error': 'No valid parameters found'
+            }
+        
+        try:
+            # Windows that pick the same parameters share one strategy run
+            key = json.dumps(best_params, sort_keys=True, default=str)
+            if key not in signals_cache:
+                signals_cache[key] = create_strategy(best_params).run_strategy(data)
+            signals = signals_cache[key]
+            
+            mask = (data.index >= window['test_start']) & (data.index <= window['test_end'])
+            test_data = data[mask]
+            test_signals = signals[mask]
+            
+            if test_signals.empty:
+                return {
+                    'window_id': window_id,
+                    'symbol': symbol,
+                    'timeframe': timeframe,
+                    'best_params': best_params,
+                    'train_metrics': {},
+                    'test_metrics': {},
+                    'success': False,
+                    'error': 'No signals generated on test data'
+                }
+            
+            test_result = run_backtest(
+                data=test_data,
+                signals=test_signals,
+                initial_capital=10000.0,
+                fee_bps=self.config.strategy.fee_bps,
+                slippage_bps=self.config.strategy.slippage_bps
+            )
+            
+            return {
+                'window_id': window_id,
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'best_params': best_params,
+                'train_metrics': {'profit_factor': best_metric},
+                'test_metrics': test_result.metrics,
+                'train_start': window['train_start'],
+                'train_end': window['train_end'],
+                'test_start': test_data.index[0],
+                'test_end': test_data.index[-1],
+                'success': True
+            }
+            
+        except Exception as e:
+            logger.error(f"Error testing best parameters on test data: {e}")
+            return {
+                'window_id': window_id,
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'best_params': best_params,
+                'train_metrics': {'profit_factor': best_metric},
+                'test_metrics': {},
+                'success': False,
+                'error': str(e)
+            }
+    
+    def _run_grid_windows(self, symbol: str, timeframe: str, data: pd.DataFrame,
+                          windows: List[Dict[str, Any]], param_combinations: Any) -> List[Dict[str, Any]]:
+        """Grid-search all pending windows in one parallel parameter sweep."""
+        fee_bps = self.config.strategy.fee_bps
+        slippage_bps = self.config.strategy.slippage_bps
+        
+        if self.max_workers > 1 and len(param_combinations) > 1:
+            if not isinstance(param_combinations, ParamSpace):
+                param_combinations = ParamSpace.from_combinations(param_combinations)
+            chunk_size = max(1, math.ceil(len(param_combinations) / self.max_workers))
+            
+            evaluated = []
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_worker) as executor:
+                futures = [
+                    executor.submit(sweep_train_windows, data, param_combinations.take(start, stop),
+                                    windows, fee_bps, slippage_bps)
+                    for start, stop in param_combinations.index_ranges(chunk_size)
+                ]
+                # Collect in submission order so ties resolve as in a serial sweep
+                for future in tqdm(futures, desc=f"WF {symbol} {timeframe}"):
+                    try:
+                        evaluated.extend(future.result())
+                    except Exception as e:
+                        logger.error(f"Error in walk-forward sweep for {symbol} {timeframe}: {e}")
+        else:
+            evaluated = sweep_train_windows(data, param_combinations, windows, fee_bps, slippage_bps)
+        
+        # Best training parameters per window
+        best = {window['window_id']: (None, -float('inf')) for window in windows}
+        for params, train_metrics in evaluated:
+            for window_id, metric_value in train_metrics.items():
+                if metric_value > best[window_id][1]:
+                    best[window_id] = (params, metric_value)
+        
+        signals_cache = {}
+        return [
+            self._test_params(symbol, timeframe, data, window, *best[window['window_id']], signals_cache)
+            for window in windows
+        ]
+    
+    def _run_adaptive_windows(self, symbol: str, timeframe: str, data: pd.DataFrame,
+                              windows: List[Dict[str, Any]], param_combinations: Any) -> List[Dict[str, Any]]:
+        """Run an adaptive training search per pending window."""
+        results = []
+        for window in tqdm(windows, desc=f"WF {symbol} {timeframe}"):
+            train_mask = (data.index >= window['train_start']) & (data.index <= window['train_end'])
+            test_mask = (data.index >= window['test_start']) & (data.index <= window['test_end'])
+            if not train_mask.any() or not test_mask.any():
+                logger.warning(f"Empty data for window {window['window_id']}")
+                continue
+            
+            results.append(self.optimize_window(
+                symbol, timeframe, data[train_mask], data[test_mask],
+                param_combinations, window['window_id']
+            ))
+        return results
+    
     def run_walk_forward(self, symbol: str, timeframe: str, 
                         data: pd.DataFrame, param_combinations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Run walk-forward analysis for a single symbol/timeframe.
         
+        In grid mode the strategy runs once per parameter combination on the
+        full series and every window backtests its own slice, with the sweep
+        split across worker processes. Windows stored by an earlier run with
+        the same inputs are loaded instead of recomputed.
+        
         Args:
             symbol: Trading pair symbol
             timeframe: Timeframe
@@ -186,48 +546,48 @@ class WalkForwardOptimizer:
         logger.info(f"Running walk-forward analysis for {symbol} {timeframe}")
         
         # Generate walk-forward windows
-        total_days = (data.index[-1] - data.index[0]).days
-        windows = get_wf_windows(total_days)
+        windows = self.resolve_windows(data)
         
         if not windows:
             logger.error(f"No walk-forward windows generated for {symbol} {timeframe}")
             return []
         
         results = []
+        pending = []
+        signatures = {}
         
-        # Process each window
-        for window in tqdm(windows, desc=f"WF {symbol} {timeframe}"):
-            try:
-                # Extract training data
-                train_start = data.index[0] + timedelta(days=window['train_start'])
-                train_end = data.index[0] + timedelta(days=window['train_end'])
-                train_data = data[(data.index >= train_start) & (data.index <= train_end)]
-                
-                # Extract test data
-                test_start = data.index[0] + timedelta(days=window['test_start'])
-                test_end = data.index[0] + timedelta(days=window['test_end'])
-                test_data = data[(data.index >= test_start) & (data.index <= test_end)]
-                
-                if train_data.empty or test_data.empty:
-                    logger.warning(f"Empty data for window {window['window_id']}")
-                    continue
-                
-                # Optimize and test window
-                result = self.optimize_window(
-                    symbol, timeframe, train_data, test_data, 
-                    param_combinations, window['window_id']
-                )
-                
-                results.append(result)
-                
-            except Exception as e:
-                logger.error(f"Error processing window {window['window_id']}: {e}")
-                continue
+        for window in windows:
+            signature = self._window_signature(symbol, timeframe, data, window, param_combinations)
+            signatures[window['window_id']] = signature
+            
+            stored = self._load_window(symbol, timeframe, window, signature)
+            if stored is not None:
+                results.append(stored)
+            else:
+                pending.append(window)
+        
+        if len(pending) < len(windows):
+            self.resumed_windows += len(windows) - len(pending)
+            logger.info(f"Skipping {len(windows) - len(pending)}/{len(windows)} windows already on disk for {symbol} {timeframe}")
+        
+        if pending:
+            if self.search_mode == 'adaptive':
+                new_results = self._run_adaptive_windows(symbol, timeframe, data, pending, param_combinations)
+            else:
+                new_results = self._run_grid_windows(symbol, timeframe, data, pending, param_combinations)
+            
+            for result in new_results:
+                self._save_window(symbol, timeframe, result, signatures[result['window_id']])
+            results.extend(new_results)
         
+        results.sort(key=lambda r: r['window_id'])
         return results
     
     def run_multi_symbol_walk_forward(self, symbols: List[str], timeframes: List[str],
-                                    param_combinations: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+                                    param_combinations: Optional[List[Dict[str, Any]]] = None,
+                                    search_mode: Optional[str] = None,
+                                    max_workers: Optional[int] = None,
+                                    resume_dir: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Run walk-forward analysis across multiple symbols and timeframes.
         
@@ -235,14 +595,39 @@ class WalkForwardOptimizer:
             symbols: List of trading pair symbols
             timeframes: List of timeframes
             param_combinations: Parameter combinations (uses config if None)
+            search_mode: 'grid' or 'adaptive' training search (uses config if None)
+            max_workers: Parallel workers for the parameter sweep (uses config if None)
+            resume_dir: Directory storing per-window results; windows already
+                stored there with the same inputs are skipped
             
         Returns:
             List of all walk-forward results
         """
+        if search_mode is not None:
+            self.search_mode = search_mode
+        if max_workers is not None:
+            self.max_workers = max_workers
+        if resume_dir is not None:
+            self.resume_dir = Path(resume_dir)
+        self.resumed_windows = 0
+        
         if param_combinations is None:
-            param_combinations = get_param_combinations()
+            param_combinations = get_param_space()
+        
+        # Collapse combinations that differ only in inactive parameters
+        param_combinations, self.search_stats = canonicalize_param_combinations(
+            param_combinations,
+            self.config.strategy.param_conditions,
+            self.config.strategy.param_constraints,
+        )
+        if self.search_stats['skipped_combinations']:
+            logger.info(f"Canonicalized parameter space: {self.search_stats['total_combinations']} -> "
+                       f"{self.search_stats['evaluated_combinations']} combinations "
+                       f"({self.search_stats['skipped_combinations']} redundant evaluations skipped per window)")
+        
+        self.search_stats['search_mode'] = self.search_mode
         
-        logger.info(f"Starting walk-forward analysis: {len(symbols)} symbols, {len(timeframes)} timeframes")
+        logger.info(f"Starting walk-forward analysis: {len(symbols)} symbols, {len(timeframes)} timeframes ({self.search_mode} search)")
         
         all_results = []
         
@@ -422,6 +807,8 @@ class WalkForwardOptimizer:
             'timeframes': list(set(r['timeframe'] for r in self.results)),
             'wf_metrics': wf_metrics,
             'best_parameters': best_params,
+            'search_space': self.search_stats,
+            'resumed_windows': self.resumed_windows,
             'overall_stats': self._calculate_overall_stats()
         }
         
@@ -449,7 +836,10 @@ class WalkForwardOptimizer:
 
 def run_walk_forward(symbols: List[str], timeframes: List[str], 
                     param_combinations: Optional[List[Dict[str, Any]]] = None,
-                    output_dir: str = "./reports/wf") -> List[Dict[str, Any]]:
+                    output_dir: str = "./reports/wf",
+                    search_mode: Optional[str] = None,
+                    max_workers: Optional[int] = None,
+                    resume: bool = True) -> List[Dict[str, Any]]:
     """
     Convenience function to run walk-forward analysis.
     
@@ -458,11 +848,17 @@ def run_walk_forward(symbols: List[str], timeframes: List[str],
         timeframes: List of timeframes
         param_combinations: Parameter combinations
         output_dir: Output directory
+        search_mode: 'grid' or 'adaptive' (uses config if None)
+        max_workers: Parallel workers (uses config if None)
+        resume: Skip windows already stored in output_dir by an earlier run
         
     Returns:
         List of walk-forward results
     """
     optimizer = WalkForwardOptimizer()
-    results = optimizer.run_multi_symbol_walk_forward(symbols, timeframes, param_combinations)
+    results = optimizer.run_multi_symbol_walk_forward(
+        symbols, timeframes, param_combinations, search_mode, max_workers,
+        resume_dir=output_dir if resume else None
+    )
     optimizer.save_results(output_dir)
     return results
@@ -0,0 +1,135 @@
+"""
+Numba kernel warm-up for optimizer worker processes.
+
+The strategy indicator kernels are compiled eagerly for their declared
+signatures and, like the batched backtest kernel, cached on disk, so a fresh
+process only has to load machine code. ``init_worker`` does that loading as a
+ProcessPoolExecutor initializer, before a worker takes its first task, and
+``start_workers`` measures what pool startup cost so the optimizer summary
+can report it.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import Executor, wait
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+WARMUP_BARS = 64
+
+# Process id and duration of the warm-up done in this process (or, after a
+# fork, in the parent whose loaded kernels it inherited)
+_warmup: Optional[Tuple[int, float]] = None
+
+
+def _warmup_data(dtype: str) -> pd.DataFrame:
+    """Small random-walk 15m OHLCV history."""
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2024-01-01', periods=WARMUP_BARS, freq='15min', tz='UTC', name='timestamp')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, WARMUP_BARS)))
+    return pd.DataFrame({
+        'open': close,
+        'high': close * 1.005,
+        'low': close * 0.995,
+        'close': close,
+        'volume': rng.uniform(100, 1000, WARMUP_BARS),
+    }, index=index).astype(dtype)
+
+
+def warm_up_kernels() -> float:
+    """
+    Load (or compile) the optimizer's numba kernels in this process.
+    
+    Runs both numba-backed strategies on a small synthetic history in float64
+    and float32 and backtests their signals through the batched kernel. The
+    strategy modules are imported here so that, in a spawned worker, loading
+    their cached kernels counts as warm-up. Only the first call does any work.
+    
+    Returns:
+        Seconds the warm-up took in this process (0.0 in a forked worker
+        that inherited warm kernels)
+    """
+    global _warmup
+    if _warmup is not None:
+        pid, seconds = _warmup
+        return seconds if pid == os.getpid() else 0.0
+    
+    start = time.perf_counter()
+    from ..strategy.atr_st_core import create_strategy
+    from ..strategy.volensy_macd_trend import create_strategy as create_volensy_strategy
+    from ..strategy.backtester import run_backtest_batch
+    
+    # Strategy runs log every call; keep the warm-up quiet
+    strategy_logger = logging.getLogger(create_strategy.__module__)
+    level = strategy_logger.level
+    strategy_logger.setLevel(logging.WARNING)
+    try:
+        for dtype in ('float64', 'float32'):
+            data = _warmup_data(dtype)
+            signals = create_strategy({'c': 5}).run_strategy(data)
+            create_volensy_strategy({'ema_len': 10, 'rsi_len': 5}).calculate_indicators(data)
+            run_backtest_batch(data, [signals, signals])
+    finally:
+        strategy_logger.setLevel(level)
+    
+    _warmup = (os.getpid(), time.perf_counter() - start)
+    return _warmup[1]
+
+
+def init_worker():
+    """ProcessPoolExecutor initializer that warms the kernels before any task."""
+    warm_up_kernels()
+
+
+def _worker_warmup() -> Tuple[int, float]:
+    """Report this worker's process id and warm-up time."""
+    return os.getpid(), warm_up_kernels()
+
+
+def start_workers(executor: Executor, max_workers: int) -> Dict[str, Any]:
+    """
+    Start an executor's workers and wait until their kernels are warm.
+    
+    The kernels are warmed in this process first, so forked workers inherit
+    them. One probe per worker is then submitted and awaited; pools created
+    with ``initializer=init_worker`` warm up before running the probes.
+    
+    Args:
+        executor: Freshly created process pool
+        max_workers: Number of workers in the pool
+    
+    Returns:
+        Dict with the workers that answered, the wall time until all of them
+        were ready and the slowest worker's kernel warm-up time
+    """
+    start = time.perf_counter()
+    parent_seconds = warm_up_kernels()
+    
+    done, _ = wait([executor.submit(_worker_warmup) for _ in range(max_workers)])
+    warmups = dict(future.result() for future in done)
+    
+    stats = {
+        'workers': len(warmups),
+        'parent_warmup_seconds': parent_seconds,
+        'pool_startup_seconds': time.perf_counter() - start,
+        'kernel_warmup_seconds': max(warmups.values()),
+    }
+    logger.info(f"Started {stats['workers']} workers in {stats['pool_startup_seconds']:.2f}s "
+               f"(slowest kernel warm-up {stats['kernel_warmup_seconds']:.2f}s)")
+    return stats
+
+
+def sequential_startup() -> Dict[str, Any]:
+    """Warm the kernels for an in-process run and report it like ``start_workers``."""
+    seconds = warm_up_kernels()
+    return {
+        'workers': 0,
+        'parent_warmup_seconds': seconds,
+        'pool_startup_seconds': 0.0,
+        'kernel_warmup_seconds': seconds,
+    }
@@ -598,6 +598,27 @@ class ResultsVisualizer:
                     logger.error(f"Failed to create walk-forward plot for {key}: {e}")
         
         logger.info(f"All plots saved to {self.output_dir}")
+    
+    def save_backtest_plots(self, backtests: List[Any], filename_prefix: str = "backtest"):
+        """
+        Save equity and drawdown plots for full backtest results.
+        
+        Args:
+            backtests: BacktestResult objects (e.g. re-materialized top results)
+            filename_prefix: Filename prefix
+        """
+        for rank, backtest in enumerate(backtests, 1):
+            if backtest.equity_curve.empty:
+                logger.warning(f"Skipping rank {rank} plot: backtest has no equity curve")
+                continue
+            try:
+                symbol = backtest.symbol.replace('/', '')
+                save_path = self.output_dir / f"{filename_prefix}_{rank}_{symbol}_{backtest.timeframe}.png"
+                title = (f"#{rank} {backtest.symbol} {backtest.timeframe} - "
+                         f"{len(backtest.trades)} trades, PF {backtest.metrics.get('profit_factor', 0):.2f}")
+                self.plot_equity_and_drawdown(backtest.equity_curve, title=title, save_path=str(save_path))
+            except Exception as e:
+                logger.error(f"Failed to create backtest plot for rank {rank}: {e}")
 
 
 def create_visualizer(output_dir: str = "./reports", dpi: int = 300) -> ResultsVisualizer:
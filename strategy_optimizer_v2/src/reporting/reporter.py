@@ -7,15 +7,33 @@ and walk-forward optimization results.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 import logging
 import json
 import os
 from pathlib import Path
 from datetime import datetime
 
+from ..optimize.results_store import ResultsStore, PARAM_PREFIX, METRIC_PREFIX
+from ..optimize.robustness import robustness_key
+
 logger = logging.getLogger(__name__)
 
+# Grid search results: a list of result dicts or a streaming results store
+Results = Union[List[Dict[str, Any]], ResultsStore]
+
+# Summary table columns filled from robustness summaries: (simulation, metric, bound)
+ROBUSTNESS_COLUMNS = {
+    'PF_CI_Low': ('bootstrap', 'profit_factor', 0),
+    'PF_CI_High': ('bootstrap', 'profit_factor', 1),
+    'DD_CI_Low_%': ('bootstrap', 'max_drawdown_pct', 0),
+    'DD_CI_High_%': ('bootstrap', 'max_drawdown_pct', 1),
+    'Block_DD_CI_Low_%': ('block_bootstrap', 'max_drawdown_pct', 0),
+    'Block_DD_CI_High_%': ('block_bootstrap', 'max_drawdown_pct', 1),
+    'Slippage_PF_CI_Low': ('slippage', 'profit_factor', 0),
+    'Slippage_PF_CI_High': ('slippage', 'profit_factor', 1),
+}
+
 
 class ResultsReporter:
     """
@@ -32,16 +50,24 @@ class ResultsReporter:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
-    def load_results(self, results_file: str) -> List[Dict[str, Any]]:
+    def load_results(self, results_file: str) -> Results:
         """
         Load results from JSON file.
         
+        A SQLite results store (.sqlite/.db) is opened instead of loaded, so
+        later tables query it rather than holding every result in memory.
+        
         Args:
-            results_file: Path to results JSON file
+            results_file: Path to results JSON file or results store
             
         Returns:
-            List of results
+            List of results or ResultsStore
         """
+        if Path(results_file).suffix in ('.sqlite', '.db'):
+            store = ResultsStore(results_file)
+            logger.info(f"Opened results store {results_file} ({store.count()} results)")
+            return store
+        
         try:
             with open(results_file, 'r') as f:
                 results = json.load(f)
@@ -51,24 +77,59 @@ class ResultsReporter:
             logger.error(f"Failed to load results from {results_file}: {e}")
             return []
     
-    def create_summary_table(self, results: List[Dict[str, Any]], 
-                           top_n: int = 10) -> pd.DataFrame:
+    def _count(self, results: Results) -> int:
+        """Number of results in a list or store."""
+        if isinstance(results, ResultsStore):
+            return results.count()
+        return len(results) if results else 0
+    
+    def _top_results(self, results: Results, n: int, metric: str = 'profit_factor') -> List[Dict[str, Any]]:
+        """Top N results by a metric (a SQL query for a store)."""
+        if isinstance(results, ResultsStore):
+            return results.get_top_results(n, metric)
+        return sorted(results, key=lambda x: x.get('metrics', {}).get(metric, 0), reverse=True)[:n]
+    
+    def _results_frame(self, results: Results, params: List[str], metrics: List[str]) -> pd.DataFrame:
+        """
+        Flat frame of symbol, timeframe and the given params/metrics.
+        
+        Missing values are NaN. For a store only these columns are read.
+        """
+        if isinstance(results, ResultsStore):
+            columns = ['symbol', 'timeframe'] + [PARAM_PREFIX + p for p in params] + [METRIC_PREFIX + m for m in metrics]
+            df = results.read_frame(columns)
+            df = df.rename(columns=lambda c: c[len(PARAM_PREFIX):] if c.startswith(PARAM_PREFIX)
+                           else c[len(METRIC_PREFIX):] if c.startswith(METRIC_PREFIX) else c)
+            return df.reindex(columns=['symbol', 'timeframe'] + params + metrics)
+        
+        rows = []
+        for result in results:
+            row = {'symbol': result.get('symbol', ''), 'timeframe': result.get('timeframe', '')}
+            row.update({p: result.get('params', {}).get(p, np.nan) for p in params})
+            row.update({m: result.get('metrics', {}).get(m, np.nan) for m in metrics})
+            rows.append(row)
+        return pd.DataFrame(rows, columns=['symbol', 'timeframe'] + params + metrics)
+    
+    def create_summary_table(self, results: Results, 
+                           top_n: int = 10,
+                           robustness: Optional[Dict[str, Dict[str, Any]]] = None) -> pd.DataFrame:
         """
         Create summary table of top results.
         
         Args:
-            results: List of optimization results
+            results: List of optimization results or a results store
             top_n: Number of top results to include
+            robustness: Monte Carlo summaries keyed by robustness_key; adds
+                confidence interval columns (NaN for results not analyzed)
             
         Returns:
             Summary DataFrame
         """
-        if not results:
+        if not self._count(results):
             return pd.DataFrame()
         
         # Sort by profit factor
-        sorted_results = sorted(results, key=lambda x: x.get('metrics', {}).get('profit_factor', 0), reverse=True)
-        top_results = sorted_results[:top_n]
+        top_results = self._top_results(results, top_n)
         
         # Create summary data
         summary_data = []
@@ -94,65 +155,62 @@ class ResultsReporter:
                 'SL_Multiplier': params.get('atr_sl_mult', 0),
                 'RR_Ratio': params.get('atr_rr', 0),
             })
+            
+            if robustness is not None:
+                summary_data[-1].update(self._robustness_columns(
+                    robustness.get(robustness_key(result.get('symbol', ''), result.get('timeframe', ''), params))))
         
         return pd.DataFrame(summary_data)
     
-    def create_symbol_timeframe_summary(self, results: List[Dict[str, Any]]) -> pd.DataFrame:
+    def _robustness_columns(self, summary: Optional[Dict[str, Any]]) -> Dict[str, float]:
+        """Confidence interval columns of one robustness summary."""
+        columns = {}
+        for column, (simulation, metric, bound) in ROBUSTNESS_COLUMNS.items():
+            interval = (summary or {}).get(simulation, {}).get(metric)
+            columns[column] = round(interval[bound], 2) if interval else np.nan
+        prob_loss = (summary or {}).get('bootstrap', {}).get('prob_loss_pct')
+        columns['Prob_Loss_%'] = round(prob_loss, 2) if prob_loss is not None else np.nan
+        return columns
+    
+    def create_symbol_timeframe_summary(self, results: Results) -> pd.DataFrame:
         """
         Create summary table grouped by symbol and timeframe.
         
         Args:
-            results: List of optimization results
+            results: List of optimization results or a results store
             
         Returns:
             Summary DataFrame grouped by symbol/timeframe
         """
-        if not results:
+        if not self._count(results):
             return pd.DataFrame()
         
-        # Group results by symbol/timeframe
-        grouped = {}
-        for result in results:
-            symbol = result.get('symbol', '')
-            timeframe = result.get('timeframe', '')
-            key = f"{symbol}_{timeframe}"
-            
-            if key not in grouped:
-                grouped[key] = []
-            grouped[key].append(result)
+        metric_names = ['total_return_pct', 'profit_factor', 'max_drawdown_pct', 'sharpe_ratio', 'num_trades']
+        df = self._results_frame(results, [], metric_names).fillna({m: 0 for m in metric_names})
         
-        # Create summary for each group
+        # Create summary for each symbol/timeframe
         summary_data = []
-        for key, group_results in grouped.items():
-            if not group_results:
-                continue
-            
-            symbol, timeframe = key.split('_', 1)
-            
-            # Calculate statistics
-            total_returns = [r.get('metrics', {}).get('total_return_pct', 0) for r in group_results]
-            profit_factors = [r.get('metrics', {}).get('profit_factor', 0) for r in group_results]
-            max_drawdowns = [r.get('metrics', {}).get('max_drawdown_pct', 0) for r in group_results]
-            sharpe_ratios = [r.get('metrics', {}).get('sharpe_ratio', 0) for r in group_results]
-            num_trades = [r.get('metrics', {}).get('num_trades', 0) for r in group_results]
-            
+        for (symbol, timeframe), group in df.groupby(['symbol', 'timeframe'], sort=False):
             # Find best result
-            best_result = max(group_results, key=lambda x: x.get('metrics', {}).get('profit_factor', 0))
-            best_params = best_result.get('params', {})
+            if isinstance(results, ResultsStore):
+                best = results.get_top_results(1, 'profit_factor', symbol, timeframe)
+                best_params = best[0].get('params', {}) if best else {}
+            else:
+                best_params = results[group['profit_factor'].idxmax()].get('params', {})
             
             summary_data.append({
                 'Symbol': symbol,
                 'Timeframe': timeframe,
-                'Num_Combinations': len(group_results),
-                'Best_Return_%': round(max(total_returns), 2),
-                'Avg_Return_%': round(np.mean(total_returns), 2),
-                'Best_PF': round(max(profit_factors), 2),
-                'Avg_PF': round(np.mean(profit_factors), 2),
-                'Best_Sharpe': round(max(sharpe_ratios), 2),
-                'Avg_Sharpe': round(np.mean(sharpe_ratios), 2),
-                'Best_MaxDD_%': round(min(max_drawdowns), 2),
-                'Avg_MaxDD_%': round(np.mean(max_drawdowns), 2),
-                'Total_Trades': sum(num_trades),
+                'Num_Combinations': len(group),
+                'Best_Return_%': round(group['total_return_pct'].max(), 2),
+                'Avg_Return_%': round(group['total_return_pct'].mean(), 2),
+                'Best_PF': round(group['profit_factor'].max(), 2),
+                'Avg_PF': round(group['profit_factor'].mean(), 2),
+                'Best_Sharpe': round(group['sharpe_ratio'].max(), 2),
+                'Avg_Sharpe': round(group['sharpe_ratio'].mean(), 2),
+                'Best_MaxDD_%': round(group['max_drawdown_pct'].min(), 2),
+                'Avg_MaxDD_%': round(group['max_drawdown_pct'].mean(), 2),
+                'Total_Trades': group['num_trades'].sum(),
                 'Best_ATR_Sensitivity': best_params.get('a', 0),
                 'Best_ATR_Period': best_params.get('c', 0),
                 'Best_ST_Factor': best_params.get('st_factor', 0),
@@ -160,42 +218,25 @@ class ResultsReporter:
         
         return pd.DataFrame(summary_data)
     
-    def create_parameter_analysis(self, results: List[Dict[str, Any]]) -> Dict[str, pd.DataFrame]:
+    def create_parameter_analysis(self, results: Results) -> Dict[str, pd.DataFrame]:
         """
         Create parameter analysis tables.
         
         Args:
-            results: List of optimization results
+            results: List of optimization results or a results store
             
         Returns:
             Dictionary of parameter analysis DataFrames
         """
-        if not results:
+        if not self._count(results):
             return {}
         
         # Extract parameter data
-        param_data = []
-        for result in results:
-            params = result.get('params', {})
-            metrics = result.get('metrics', {})
-            
-            param_data.append({
-                'symbol': result.get('symbol', ''),
-                'timeframe': result.get('timeframe', ''),
-                'a': params.get('a', 0),
-                'c': params.get('c', 0),
-                'st_factor': params.get('st_factor', 0),
-                'min_delay_m': params.get('min_delay_m', 0),
-                'atr_sl_mult': params.get('atr_sl_mult', 0),
-                'atr_rr': params.get('atr_rr', 0),
-                'total_return_pct': metrics.get('total_return_pct', 0),
-                'profit_factor': metrics.get('profit_factor', 0),
-                'max_drawdown_pct': metrics.get('max_drawdown_pct', 0),
-                'sharpe_ratio': metrics.get('sharpe_ratio', 0),
-                'num_trades': metrics.get('num_trades', 0),
-            })
-        
-        df = pd.DataFrame(param_data)
+        df = self._results_frame(
+            results,
+            ['a', 'c', 'st_factor', 'min_delay_m', 'atr_sl_mult', 'atr_rr'],
+            ['total_return_pct', 'profit_factor', 'max_drawdown_pct', 'sharpe_ratio', 'num_trades'],
+        ).fillna(0)
         
         # Create parameter analysis tables
         analysis = {}
@@ -300,19 +341,43 @@ class ResultsReporter:
         
         return pd.DataFrame(summary_data)
     
-    def save_summary_tables(self, results: List[Dict[str, Any]], 
+    def create_search_space_summary(self, search_stats: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Create summary table of parameter space canonicalization.
+        
+        Args:
+            search_stats: Search space statistics from the optimizer
+            
+        Returns:
+            Summary DataFrame
+        """
+        if not search_stats:
+            return pd.DataFrame()
+        
+        return pd.DataFrame([{
+            'Total_Combinations': search_stats.get('total_combinations', 0),
+            'Evaluated_Combinations': search_stats.get('evaluated_combinations', 0),
+            'Skipped_Combinations': search_stats.get('skipped_combinations', 0),
+            'Skipped_%': round(search_stats.get('skipped_pct', 0), 2),
+        }])
+    
+    def save_summary_tables(self, results: Results, 
                           wf_results: Optional[List[Dict[str, Any]]] = None,
-                          filename_prefix: str = "summary"):
+                          filename_prefix: str = "summary",
+                          search_stats: Optional[Dict[str, Any]] = None,
+                          robustness: Optional[Dict[str, Dict[str, Any]]] = None):
         """
         Save all summary tables to files.
         
         Args:
-            results: Grid search results
+            results: Grid search results (list or results store)
             wf_results: Walk-forward results (optional)
             filename_prefix: Filename prefix
+            search_stats: Search space statistics (optional)
+            robustness: Monte Carlo summaries keyed by robustness_key (optional)
         """
         # Create summary tables
-        top_results = self.create_summary_table(results, top_n=50)
+        top_results = self.create_summary_table(results, top_n=50, robustness=robustness)
         symbol_tf_summary = self.create_symbol_timeframe_summary(results)
         param_analysis = self.create_parameter_analysis(results)
         
@@ -335,9 +400,15 @@ class ResultsReporter:
             wf_file = self.output_dir / f"{filename_prefix}_walk_forward.csv"
             wf_summary.to_csv(wf_file, index=False)
         
+        # Save search space summary if provided
+        if search_stats:
+            search_summary = self.create_search_space_summary(search_stats)
+            search_file = self.output_dir / f"{filename_prefix}_search_space.csv"
+            search_summary.to_csv(search_file, index=False)
+        
         logger.info(f"Summary tables saved to {self.output_dir}")
     
-    def create_parameter_heatmap_data(self, results: List[Dict[str, Any]], 
+    def create_parameter_heatmap_data(self, results: Results, 
                                     param1: str, param2: str, 
                                     metric: str = 'profit_factor') -> pd.DataFrame:
         """
@@ -352,26 +423,14 @@ class ResultsReporter:
         Returns:
             DataFrame suitable for heatmap
         """
-        if not results:
+        if not self._count(results):
             return pd.DataFrame()
         
         # Extract data
-        heatmap_data = []
-        for result in results:
-            params = result.get('params', {})
-            metrics = result.get('metrics', {})
-            
-            if param1 in params and param2 in params and metric in metrics:
-                heatmap_data.append({
-                    param1: params[param1],
-                    param2: params[param2],
-                    metric: metrics[metric]
-                })
-        
-        if not heatmap_data:
-            return pd.DataFrame()
+        df = self._results_frame(results, [param1, param2], [metric]).dropna(subset=[param1, param2, metric])
         
-        df = pd.DataFrame(heatmap_data)
+        if df.empty:
+            return pd.DataFrame()
         
         # Create pivot table
         pivot = df.pivot_table(
@@ -384,14 +443,16 @@ class ResultsReporter:
         return pivot
     
     def generate_report(self, results_file: str, wf_results_file: Optional[str] = None,
-                       output_prefix: str = "optimization_report"):
+                       output_prefix: str = "optimization_report",
+                       search_stats: Optional[Dict[str, Any]] = None):
         """
         Generate comprehensive optimization report.
         
         Args:
-            results_file: Path to grid search results JSON file
+            results_file: Path to grid search results JSON file or results store
             wf_results_file: Path to walk-forward results JSON file (optional)
             output_prefix: Output file prefix
+            search_stats: Search space statistics (optional)
         """
         logger.info(f"Generating optimization report from {results_file}")
         
@@ -401,12 +462,12 @@ class ResultsReporter:
         if wf_results_file and os.path.exists(wf_results_file):
             wf_results = self.load_results(wf_results_file)
         
-        if not results:
+        if not self._count(results):
             logger.error("No results to generate report")
             return
         
         # Save summary tables
-        self.save_summary_tables(results, wf_results, output_prefix)
+        self.save_summary_tables(results, wf_results, output_prefix, search_stats)
         
         # Create parameter heatmap data
         heatmap_data = {}
@@ -428,13 +489,14 @@ class ResultsReporter:
             heatmap_df.to_csv(heatmap_file)
         
         # Generate text report
-        self._generate_text_report(results, wf_results, output_prefix)
+        self._generate_text_report(results, wf_results, output_prefix, search_stats)
         
         logger.info(f"Optimization report generated in {self.output_dir}")
     
-    def _generate_text_report(self, results: List[Dict[str, Any]], 
+    def _generate_text_report(self, results: Results, 
                             wf_results: Optional[List[Dict[str, Any]]],
-                            output_prefix: str):
+                            output_prefix: str,
+                            search_stats: Optional[Dict[str, Any]] = None):
         """Generate text summary report."""
         report_file = self.output_dir / f"{output_prefix}_summary.txt"
         
@@ -446,11 +508,21 @@ class ResultsReporter:
             # Grid search summary
             f.write("GRID SEARCH RESULTS\n")
             f.write("-" * 20 + "\n")
-            f.write(f"Total combinations tested: {len(results)}\n")
+            f.write(f"Total combinations tested: {self._count(results)}\n")
+            
+            if search_stats:
+                f.write(f"Parameter space: {search_stats.get('total_combinations', 0)} combinations, "
+                       f"{search_stats.get('evaluated_combinations', 0)} after canonicalization\n")
+                f.write(f"Redundant evaluations saved: {search_stats.get('skipped_combinations', 0)} "
+                       f"({search_stats.get('skipped_pct', 0):.1f}%)\n")
+                startup = search_stats.get('startup')
+                if startup:
+                    f.write(f"Worker startup: {startup['workers']} workers in {startup['pool_startup_seconds']:.2f}s "
+                           f"(kernel warm-up {startup['kernel_warmup_seconds']:.2f}s)\n")
             
-            if results:
+            if self._count(results):
                 # Best result
-                best_result = max(results, key=lambda x: x.get('metrics', {}).get('profit_factor', 0))
+                best_result = self._top_results(results, 1)[0]
                 best_metrics = best_result.get('metrics', {})
                 best_params = best_result.get('params', {})
                 
@@ -464,8 +536,9 @@ class ResultsReporter:
                 f.write(f"  Parameters: {best_params}\n\n")
                 
                 # Statistics
-                total_returns = [r.get('metrics', {}).get('total_return_pct', 0) for r in results]
-                profit_factors = [r.get('metrics', {}).get('profit_factor', 0) for r in results]
+                stats_df = self._results_frame(results, [], ['total_return_pct', 'profit_factor']).fillna(0)
+                total_returns = stats_df['total_return_pct'].tolist()
+                profit_factors = stats_df['profit_factor'].tolist()
                 
                 f.write(f"Statistics:\n")
                 f.write(f"  Average Return: {np.mean(total_returns):.2f}%\n")
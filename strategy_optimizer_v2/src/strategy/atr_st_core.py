@@ -8,13 +8,24 @@ with SuperTrend filter and cooldown functionality.
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, Tuple, Optional, List
-from numba import jit
+from numba import types, float32, float64, int64
 import logging
 
+from .numba_cache import cached_jit
+
 logger = logging.getLogger(__name__)
 
+# Kernels are compiled eagerly at import for these price arrays and cached on
+# disk (see numba_cache), so optimizer worker processes load the machine code instead of
+# compiling it again on their first task. Contiguous float64/float32 columns
+# match the first signature of their dtype; strided or read-only arrays (as
+# pandas copy-on-write hands them out) are accepted by the second.
+PRICE_ARRAYS = [types.Array(dtype, 1, layout, readonly=readonly)
+                for dtype in (float64, float32)
+                for layout, readonly in (('C', False), ('A', True))]
+
 
-@jit(nopython=True)
+@cached_jit([(t, t, t, int64) for t in PRICE_ARRAYS], nopython=True)
 def calculate_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
     """
     Calculate ATR (Average True Range) using Numba for performance.
@@ -29,13 +40,13 @@ def calculate_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period:
         ATR values
     """
     n = len(close)
-    atr = np.zeros(n)
+    atr = np.zeros(n, dtype=close.dtype)
     
     if n < period:
         return atr
     
     # Calculate True Range
-    tr = np.zeros(n)
+    tr = np.zeros(n, dtype=close.dtype)
     tr[0] = high[0] - low[0]
     
     for i in range(1, n):
@@ -54,7 +65,7 @@ def calculate_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period:
     return atr
 
 
-@jit(nopython=True)
+@cached_jit([(t, int64) for t in PRICE_ARRAYS], nopython=True)
 def calculate_ema(values: np.ndarray, period: int) -> np.ndarray:
     """
     Calculate EMA (Exponential Moving Average) using Numba.
@@ -67,7 +78,7 @@ def calculate_ema(values: np.ndarray, period: int) -> np.ndarray:
         EMA values
     """
     n = len(values)
-    ema = np.zeros(n)
+    ema = np.zeros(n, dtype=values.dtype)
     
     if n == 0:
         return ema
@@ -85,7 +96,7 @@ def calculate_ema(values: np.ndarray, period: int) -> np.ndarray:
     return ema
 
 
-@jit(nopython=True)
+@cached_jit([(t, t, float64) for t in PRICE_ARRAYS], nopython=True)
 def calculate_atr_trailing_stop(close: np.ndarray, atr: np.ndarray, a: float) -> np.ndarray:
     """
     Calculate ATR trailing stop following Pine Script v6 logic.
@@ -99,7 +110,7 @@ def calculate_atr_trailing_stop(close: np.ndarray, atr: np.ndarray, a: float) ->
         ATR trailing stop values
     """
     n = len(close)
-    trailing_stop = np.zeros(n)
+    trailing_stop = np.zeros(n, dtype=close.dtype)
     nloss = atr * a
     
     # Initialize first value
@@ -128,7 +139,7 @@ def calculate_atr_trailing_stop(close: np.ndarray, atr: np.ndarray, a: float) ->
     return trailing_stop
 
 
-@jit(nopython=True)
+@cached_jit([(t, t, t, t, float64) for t in PRICE_ARRAYS], nopython=True)
 def calculate_supertrend(high: np.ndarray, low: np.ndarray, close: np.ndarray, 
                          atr: np.ndarray, factor: float) -> np.ndarray:
     """
@@ -145,7 +156,7 @@ def calculate_supertrend(high: np.ndarray, low: np.ndarray, close: np.ndarray,
         SuperTrend line values
     """
     n = len(close)
-    supertrend = np.zeros(n)
+    supertrend = np.zeros(n, dtype=close.dtype)
     
     if n == 0:
         return supertrend
@@ -173,7 +184,7 @@ def calculate_supertrend(high: np.ndarray, low: np.ndarray, close: np.ndarray,
     return supertrend
 
 
-@jit(nopython=True)
+@cached_jit([(t, t) for t in PRICE_ARRAYS], nopython=True)
 def detect_crossovers(series1: np.ndarray, series2: np.ndarray) -> np.ndarray:
     """
     Detect crossovers between two series.
@@ -247,7 +258,8 @@ class ATRSuperTrendStrategy:
         
         df = data.copy()
         
-        # Convert to numpy arrays for Numba functions
+        # Convert to numpy arrays for Numba functions (indicators keep the
+        # input dtype, so float32 OHLCV data stays float32)
         high = df['high'].values
         low = df['low'].values
         close = df['close'].values
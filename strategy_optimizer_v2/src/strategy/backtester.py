@@ -7,11 +7,13 @@ stop loss/take profit execution, commission handling, and slippage simulation.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 import logging
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
+from .numba_cache import cached_jit
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,6 +45,328 @@ class BacktestResult:
     timeframe: str
     start_date: datetime
     end_date: datetime
+    pruned: bool = False  # True if stopped early by a pruning rule
+    prune_reason: Optional[str] = None
+    bars_processed: int = 0
+    total_bars: int = 0
+    compact: bool = False  # True if trades and equity curve were not kept
+
+
+@dataclass
+class PruningRules:
+    """
+    Early-abort rules checked on every bar of a backtest.
+    
+    A run that breaks a rule is stopped and returned as a flagged partial
+    result. Each rule anticipates a final metrics filter (see
+    ``implied_filters``), so pruned runs are ones that filter would reject.
+    """
+    max_drawdown_pct: Optional[float] = None  # Abort once drawdown exceeds this (e.g. 50.0)
+    equity_floor_pct: Optional[float] = None  # Abort once equity falls below this % of initial capital
+    min_trades: int = 0  # Require at least min_trades entries per trades_window_bars bars
+    trades_window_bars: int = 0
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether any rule is active."""
+        return (self.max_drawdown_pct is not None or self.equity_floor_pct is not None
+                or (self.min_trades > 0 and self.trades_window_bars > 0))
+    
+    def check(self, bars: int, equity: float, peak: float, entries: int,
+              initial_capital: float) -> Optional[str]:
+        """
+        Check the rules after a bar.
+        
+        Args:
+            bars: Bars processed so far
+            equity: Current equity
+            peak: Highest equity so far
+            entries: Positions opened so far
+            initial_capital: Initial capital
+            
+        Returns:
+            Name of the broken rule, or None
+        """
+        if self.max_drawdown_pct is not None and peak > 0:
+            if (equity - peak) / peak * 100 < -self.max_drawdown_pct:
+                return 'max_drawdown'
+        
+        if self.equity_floor_pct is not None:
+            if equity < initial_capital * self.equity_floor_pct / 100:
+                return 'equity_floor'
+        
+        if self.min_trades > 0 and self.trades_window_bars > 0 and bars >= self.trades_window_bars:
+            if entries < self.min_trades * (bars // self.trades_window_bars):
+                return 'min_trades'
+        
+        return None
+    
+    def implied_filters(self, total_bars: int) -> Dict[str, Tuple[float, float]]:
+        """
+        Metric filters (for filter_results_by_metrics) the rules anticipate.
+        
+        The drawdown rule is exact: drawdown only deepens, so a run pruned by
+        it always fails the drawdown filter. The equity floor (mapped to the
+        same drawdown filter) and the trade-rate rule (mapped to a minimum
+        trade count over the full run) are heuristics.
+        
+        Args:
+            total_bars: Number of bars in the full backtest
+            
+        Returns:
+            Dictionary mapping metric names to (min, max) tuples
+        """
+        filters = {}
+        
+        min_drawdown = -float('inf')
+        if self.max_drawdown_pct is not None:
+            min_drawdown = max(min_drawdown, -self.max_drawdown_pct)
+        if self.equity_floor_pct is not None:
+            min_drawdown = max(min_drawdown, self.equity_floor_pct - 100)
+        if min_drawdown > -float('inf'):
+            filters['max_drawdown_pct'] = (min_drawdown, float('inf'))
+        
+        if self.min_trades > 0 and self.trades_window_bars > 0:
+            filters['num_trades'] = (self.min_trades * (total_bars // self.trades_window_bars), float('inf'))
+        
+        return filters
+
+
+PRUNE_REASONS = (None, 'max_drawdown', 'equity_floor', 'min_trades')
+
+_NS_PER_DAY = 86_400_000_000_000
+
+
+def _compact_metrics(num_trades: int, num_wins: int, num_losses: int, total_profit: float,
+                     total_loss: float, exposure_days: int, first_equity: float,
+                     last_equity: float, max_drawdown: float, returns_count: int,
+                     returns_mean: float, returns_m2: float, total_days: int) -> Dict[str, float]:
+    """
+    Build the ``calculate_metrics`` dictionary from running totals.
+    
+    Args:
+        num_trades: Closed trades
+        num_wins: Trades with positive PnL
+        num_losses: Trades with negative PnL
+        total_profit: Sum of winning PnL
+        total_loss: Sum of losing PnL (negative)
+        exposure_days: Whole days spent in positions
+        first_equity: Equity after the first bar
+        last_equity: Equity after the last processed bar
+        max_drawdown: Deepest drawdown in percent (negative)
+        returns_count: Number of bar returns
+        returns_mean: Running mean of bar returns
+        returns_m2: Running sum of squared deviations of bar returns
+        total_days: Whole days between the first and last processed bar
+    
+    Returns:
+        Dictionary of metrics
+    """
+    total_return = (last_equity - first_equity) / first_equity * 100
+    total_loss = abs(total_loss)
+    if num_trades:
+        returns_std = np.sqrt(returns_m2 / (returns_count - 1)) if returns_count > 1 else np.nan
+        avg_win = total_profit / num_wins if num_wins else 0
+        avg_loss = total_loss / num_losses if num_losses else 0
+        metrics_values = {
+            'profit_factor': total_profit / total_loss if total_loss > 0 else float('inf'),
+            'win_rate_pct': num_wins / num_trades * 100,
+            'expectancy': (avg_win * num_wins - avg_loss * num_losses) / num_trades,
+            'sharpe_ratio': returns_mean / returns_std * np.sqrt(252) if returns_std > 0 else 0,
+            'mar_ratio': total_return / abs(max_drawdown) if max_drawdown != 0 else 0,
+            'exposure_pct': exposure_days / total_days * 100 if total_days > 0 else 0,
+        }
+    else:
+        metrics_values = dict.fromkeys(
+            ['profit_factor', 'win_rate_pct', 'expectancy', 'sharpe_ratio', 'mar_ratio', 'exposure_pct'], 0)
+    
+    return {
+        'total_return_pct': total_return,
+        'max_drawdown_pct': max_drawdown,
+        'profit_factor': metrics_values['profit_factor'],
+        'win_rate_pct': metrics_values['win_rate_pct'],
+        'num_trades': num_trades,
+        'expectancy': metrics_values['expectancy'],
+        'sharpe_ratio': metrics_values['sharpe_ratio'],
+        'mar_ratio': metrics_values['mar_ratio'],
+        'exposure_pct': metrics_values['exposure_pct'],
+        'final_capital': last_equity,
+    }
+
+
+@cached_jit(nopython=True)
+def _batch_kernel(high, low, close, timestamps, buy, sell, sl_mult, rr, atr, trailing,
+                  trailing_set, initial_capital, margin, position_value, fee, slippage,
+                  prune_drawdown, prune_floor, prune_min_trades, prune_window):
+    """
+    Step K compact backtests of the same bars together.
+    
+    Signal inputs are (bars, K) arrays, so the inner loop over the K runs
+    reads one contiguous row per bar. Each run follows ``_run_compact``
+    operation for operation. A disabled pruning rule is passed as NaN
+    (drawdown, floor) or 0 (trade rate).
+    
+    Returns:
+        Tuple of per-run arrays: trades, wins, losses, total profit, total
+        loss, exposure days, first equity, last equity, max drawdown,
+        returns count, returns mean, returns M2, bars processed and prune
+        reason code (index into ``PRUNE_REASONS``).
+    """
+    n_bars, n_runs = buy.shape
+    
+    capital = np.full(n_runs, initial_capital)
+    side = np.zeros(n_runs, dtype=np.int64)
+    entry_price = np.zeros(n_runs)
+    quantity = np.zeros(n_runs)
+    stop_loss = np.zeros(n_runs)
+    take_profit = np.zeros(n_runs)
+    entry_bar = np.zeros(n_runs, dtype=np.int64)
+    entries = np.zeros(n_runs, dtype=np.int64)
+    
+    num_trades = np.zeros(n_runs, dtype=np.int64)
+    num_wins = np.zeros(n_runs, dtype=np.int64)
+    num_losses = np.zeros(n_runs, dtype=np.int64)
+    total_profit = np.zeros(n_runs)
+    total_loss = np.zeros(n_runs)
+    exposure_days = np.zeros(n_runs, dtype=np.int64)
+    first_equity = np.zeros(n_runs)
+    last_equity = np.zeros(n_runs)
+    peak = np.full(n_runs, -np.inf)
+    max_drawdown = np.full(n_runs, np.inf)
+    returns_count = np.zeros(n_runs, dtype=np.int64)
+    returns_mean = np.zeros(n_runs)
+    returns_m2 = np.zeros(n_runs)
+    bars_processed = np.zeros(n_runs, dtype=np.int64)
+    prune_code = np.zeros(n_runs, dtype=np.int64)
+    
+    active = n_runs
+    for i in range(n_bars):
+        for k in range(n_runs):
+            if prune_code[k] != 0:
+                continue
+            
+            # Check SL/TP first
+            exit_price = np.nan
+            if side[k] == 1:
+                if high[i] >= take_profit[k]:
+                    exit_price = take_profit[k]
+                elif low[i] <= stop_loss[k]:
+                    exit_price = stop_loss[k]
+            elif side[k] == -1:
+                if low[i] <= take_profit[k]:
+                    exit_price = take_profit[k]
+                elif high[i] >= stop_loss[k]:
+                    exit_price = stop_loss[k]
+            
+            if not np.isnan(exit_price):
+                pnl = _close_trade(k, i, exit_price, timestamps, capital, side, entry_price,
+                                   quantity, entry_bar, exposure_days, margin, fee, slippage)
+                num_trades[k] += 1
+                if pnl > 0:
+                    num_wins[k] += 1
+                    total_profit[k] += pnl
+                elif pnl < 0:
+                    num_losses[k] += 1
+                    total_loss[k] += pnl
+            else:
+                new_side = 0
+                if buy[i, k] and side[k] == 0:
+                    new_side = 1
+                elif sell[i, k] and side[k] == 0:
+                    new_side = -1
+                elif side[k] != 0 and trailing_set[i, k]:
+                    take_profit[k] = trailing[i, k]
+                
+                if new_side != 0:
+                    price = close[i]
+                    if sl_mult[i, k] < 1.0:
+                        sl = price * (1 - new_side * sl_mult[i, k])
+                        tp = price * (1 + new_side * rr[i, k])
+                    else:
+                        sl = price - new_side * (atr[i, k] * sl_mult[i, k])
+                        tp = price + new_side * (atr[i, k] * rr[i, k])
+                    
+                    fill = price + price * slippage if new_side == 1 else price - price * slippage
+                    size = position_value / fill
+                    if size > 0 and margin <= capital[k]:
+                        side[k] = new_side
+                        entry_price[k] = fill
+                        quantity[k] = size
+                        stop_loss[k] = sl
+                        take_profit[k] = trailing[i, k] if trailing_set[i, k] else tp
+                        entry_bar[k] = i
+                        capital[k] -= margin
+                        entries[k] += 1
+            
+            # Current equity with unrealized PnL
+            equity = capital[k]
+            if side[k] == 1:
+                equity += (close[i] - entry_price[k]) * quantity[k]
+            elif side[k] == -1:
+                equity += (entry_price[k] - close[i]) * quantity[k]
+            
+            if bars_processed[k] == 0:
+                first_equity[k] = equity
+            else:
+                ret = equity / last_equity[k] - 1
+                returns_count[k] += 1
+                delta = ret - returns_mean[k]
+                returns_mean[k] += delta / returns_count[k]
+                returns_m2[k] += delta * (ret - returns_mean[k])
+            peak[k] = max(peak[k], equity)
+            max_drawdown[k] = min(max_drawdown[k], (equity - peak[k]) / peak[k] * 100)
+            last_equity[k] = equity
+            bars_processed[k] += 1
+            
+            # Early abort for hopeless runs (PruningRules.check)
+            bars = i + 1
+            if not np.isnan(prune_drawdown) and peak[k] > 0 \
+                    and (equity - peak[k]) / peak[k] * 100 < -prune_drawdown:
+                prune_code[k] = 1
+            elif not np.isnan(prune_floor) and equity < initial_capital * prune_floor / 100:
+                prune_code[k] = 2
+            elif prune_min_trades > 0 and prune_window > 0 and bars >= prune_window \
+                    and entries[k] < prune_min_trades * (bars // prune_window):
+                prune_code[k] = 3
+            if prune_code[k] != 0:
+                active -= 1
+        
+        if active == 0:
+            break
+    
+    # Close any remaining position at each run's last processed bar
+    for k in range(n_runs):
+        if side[k] != 0:
+            last = bars_processed[k] - 1
+            pnl = _close_trade(k, last, close[last], timestamps, capital, side, entry_price,
+                               quantity, entry_bar, exposure_days, margin, fee, slippage)
+            num_trades[k] += 1
+            if pnl > 0:
+                num_wins[k] += 1
+                total_profit[k] += pnl
+            elif pnl < 0:
+                num_losses[k] += 1
+                total_loss[k] += pnl
+    
+    return (num_trades, num_wins, num_losses, total_profit, total_loss, exposure_days,
+            first_equity, last_equity, max_drawdown, returns_count, returns_mean, returns_m2,
+            bars_processed, prune_code)
+
+
+@cached_jit(nopython=True)
+def _close_trade(k, bar, price, timestamps, capital, side, entry_price, quantity, entry_bar,
+                 exposure_days, margin, fee, slippage):
+    """Close run k's position at price and return the trade PnL."""
+    if side[k] == 1:
+        exit_price = price - price * slippage
+        pnl = (exit_price - entry_price[k]) * quantity[k]
+    else:
+        exit_price = price + price * slippage
+        pnl = (entry_price[k] - exit_price) * quantity[k]
+    capital[k] += margin + pnl - exit_price * quantity[k] * fee
+    exposure_days[k] += (timestamps[bar] - timestamps[entry_bar[k]]) // _NS_PER_DAY
+    side[k] = 0
+    return pnl
 
 
 class Backtester:
@@ -52,7 +376,8 @@ class Backtester:
     
     def __init__(self, initial_capital: float = 10000.0, fee_bps: float = 5.0, 
                  slippage_bps: float = 5.0, position_size: float = 200.0, 
-                 leverage: float = 10.0):
+                 leverage: float = 10.0, pruning: Optional[PruningRules] = None,
+                 compact: bool = False):
         """
         Initialize backtester with risk management.
         
@@ -62,8 +387,13 @@ class Backtester:
             slippage_bps: Slippage in basis points
             position_size: Fixed position size in USD ($200)
             leverage: Leverage multiplier (10x)
+            pruning: Early-abort rules (optional)
+            compact: Compute metrics inline without keeping trades or the
+                equity curve (for optimization sweeps)
         """
         self.initial_capital = initial_capital
+        self.pruning = pruning if pruning is not None and pruning.enabled else None
+        self.compact = compact
         self.fee_bps = fee_bps / 10000.0  # Convert to decimal
         self.slippage_bps = slippage_bps / 10000.0  # Convert to decimal
         
@@ -297,12 +627,19 @@ class Backtester:
         """
         logger.info(f"Starting backtest with {len(data)} candles")
         
+        if self.compact:
+            return self._run_compact(data, signals)
+        
         # Reset state
         self.current_capital = self.initial_capital
         self.current_position = None
         self.trades = []
         self.equity_curve = []
         
+        pruned_reason = None
+        peak_equity = -float('inf')
+        entries = 0
+        
         # Process each candle
         for i, (timestamp, row) in enumerate(data.iterrows()):
             # Check SL/TP first
@@ -332,14 +669,15 @@ class Backtester:
                     # Get trailing TP if available
                     trailing_tp = signals.iloc[i].get('trailing_tp')
                     
-                    self.open_position(
+                    if self.open_position(
                         timestamp=timestamp,
                         price=entry_price,
                         side='long',
                         stop_loss=sl,
                         take_profit=tp,
                         trailing_tp=trailing_tp
-                    )
+                    ) is not None:
+                        entries += 1
                 
                 # Check for sell signal
                 elif signals.iloc[i]['sell_final'] and self.current_position is None:
@@ -361,14 +699,15 @@ class Backtester:
                     # Get trailing TP if available
                     trailing_tp = signals.iloc[i].get('trailing_tp')
                     
-                    self.open_position(
+                    if self.open_position(
                         timestamp=timestamp,
                         price=entry_price,
                         side='short',
                         stop_loss=sl,
                         take_profit=tp,
                         trailing_tp=trailing_tp
-                    )
+                    ) is not None:
+                        entries += 1
                 
                 # Update TP for existing position (trailing TP only, SL stays fixed)
                 elif self.current_position is not None:
@@ -392,20 +731,33 @@ class Backtester:
                 current_equity += unrealized_pnl
             
             self.equity_curve.append(current_equity)
+            
+            # Early abort for hopeless runs
+            if self.pruning is not None:
+                peak_equity = max(peak_equity, current_equity)
+                pruned_reason = self.pruning.check(i + 1, current_equity, peak_equity, entries, self.initial_capital)
+                if pruned_reason is not None:
+                    break
+        
+        bars_processed = len(self.equity_curve)
         
-        # Close any remaining position at the end
+        # Close any remaining position at the last processed bar
         if self.current_position is not None:
-            last_timestamp = data.index[-1]
-            last_close = data.iloc[-1]['close']
-            self.close_position(last_timestamp, last_close, 'end')
+            last_timestamp = data.index[bars_processed - 1]
+            last_close = data.iloc[bars_processed - 1]['close']
+            self.close_position(last_timestamp, last_close, 'pruned' if pruned_reason else 'end')
         
         # Create equity curve series
-        equity_series = pd.Series(self.equity_curve, index=data.index)
+        equity_series = pd.Series(self.equity_curve, index=data.index[:bars_processed])
         
         # Calculate metrics
         metrics = self.calculate_metrics(equity_series)
         
-        logger.info(f"Backtest completed. {len(self.trades)} trades executed.")
+        if pruned_reason is not None:
+            logger.info(f"Backtest pruned ({pruned_reason}) after {bars_processed}/{len(data)} candles. "
+                       f"{len(self.trades)} trades executed.")
+        else:
+            logger.info(f"Backtest completed. {len(self.trades)} trades executed.")
         
         return BacktestResult(
             trades=self.trades,
@@ -415,9 +767,298 @@ class Backtester:
             symbol="",  # Will be filled by caller
             timeframe="",  # Will be filled by caller
             start_date=data.index[0],
-            end_date=data.index[-1]
+            end_date=data.index[bars_processed - 1],
+            pruned=pruned_reason is not None,
+            prune_reason=pruned_reason,
+            bars_processed=bars_processed,
+            total_bars=len(data)
         )
     
+    def _run_compact(self, data: pd.DataFrame, signals: pd.DataFrame) -> BacktestResult:
+        """
+        Run the backtest keeping only running totals.
+        
+        Follows the same fills, capital updates and pruning checks as
+        ``run_backtest`` but reads bars from arrays, tracks the open position
+        as scalars and accumulates the ``calculate_metrics`` inputs on the fly.
+        The result has no trades and an empty equity curve.
+        
+        Args:
+            data: OHLCV data
+            signals: DataFrame with trading signals
+            
+        Returns:
+            BacktestResult object with ``compact`` set
+        """
+        n = len(data)
+        timestamps = data.index
+        
+        # Memoryviews index to Python scalars without copying the columns
+        def bars(values: np.ndarray, dtype: type) -> memoryview:
+            return memoryview(np.ascontiguousarray(values[:n], dtype=dtype))
+        
+        def column(name: str, default: Any) -> np.ndarray:
+            if name in signals.columns:
+                return signals[name].to_numpy()[:n]
+            return np.full(n, default, dtype=object)
+        
+        high = bars(data['high'].to_numpy(), np.float64)
+        low = bars(data['low'].to_numpy(), np.float64)
+        close = bars(data['close'].to_numpy(), np.float64)
+        buy_final = bars(column('buy_final', False).astype(bool), bool)
+        sell_final = bars(column('sell_final', False).astype(bool), bool)
+        
+        # Read on entries and trailing updates only
+        sl_mults = column('atr_sl_mult', 0.02)
+        rrs = column('atr_rr', 0.01)
+        atrs = column('atr', 0.01)
+        trailing = column('trailing_tp', None)
+        
+        slippage = self.slippage_bps
+        fee = self.fee_bps
+        margin = self.position_size
+        position_value = self.position_size * self.leverage
+        
+        capital = self.initial_capital
+        side = 0  # +1 long, -1 short, 0 flat
+        entry_price = quantity = stop_loss = take_profit = 0.0
+        entry_bar = 0
+        
+        # Running trade and equity statistics
+        num_trades = num_wins = num_losses = 0
+        total_profit = total_loss = 0.0
+        exposure_days = 0
+        first_equity = last_equity = 0.0
+        peak = -float('inf')
+        max_drawdown = float('inf')
+        returns_count = 0
+        returns_mean = returns_m2 = 0.0
+        
+        pruned_reason = None
+        peak_equity = -float('inf')
+        entries = 0
+        bars_processed = 0
+        
+        def close_trade(bar: int, price: float) -> None:
+            nonlocal capital, side, num_trades, num_wins, num_losses, total_profit, total_loss, exposure_days
+            if side == 1:
+                exit_price = price - price * slippage
+                pnl = (exit_price - entry_price) * quantity
+            else:
+                exit_price = price + price * slippage
+                pnl = (entry_price - exit_price) * quantity
+            capital += margin + pnl - exit_price * quantity * fee
+            num_trades += 1
+            if pnl > 0:
+                num_wins += 1
+                total_profit += pnl
+            elif pnl < 0:
+                num_losses += 1
+                total_loss += pnl
+            exposure_days += (timestamps[bar] - timestamps[entry_bar]).days
+            side = 0
+        
+        for i in range(n):
+            # Check SL/TP first
+            triggered = False
+            if side == 1:
+                if high[i] >= take_profit:
+                    close_trade(i, take_profit)
+                    triggered = True
+                elif low[i] <= stop_loss:
+                    close_trade(i, stop_loss)
+                    triggered = True
+            elif side == -1:
+                if low[i] <= take_profit:
+                    close_trade(i, take_profit)
+                    triggered = True
+                elif high[i] >= stop_loss:
+                    close_trade(i, stop_loss)
+                    triggered = True
+            
+            if not triggered:
+                new_side = 0
+                if buy_final[i] and side == 0:
+                    new_side = 1
+                elif sell_final[i] and side == 0:
+                    new_side = -1
+                elif side != 0 and trailing[i] is not None:
+                    take_profit = trailing[i]
+                
+                if new_side != 0:
+                    price = close[i]
+                    atr_sl_mult = sl_mults[i]
+                    atr_rr = rrs[i]
+                    if atr_sl_mult < 1.0:
+                        sl = price * (1 - new_side * atr_sl_mult)
+                        tp = price * (1 + new_side * atr_rr)
+                    else:
+                        sl = price - new_side * (atrs[i] * atr_sl_mult)
+                        tp = price + new_side * (atrs[i] * atr_rr)
+                    
+                    fill = price + price * slippage if new_side == 1 else price - price * slippage
+                    size = position_value / fill
+                    if size > 0 and margin <= capital:
+                        side = new_side
+                        entry_price = fill
+                        quantity = size
+                        stop_loss = sl
+                        take_profit = trailing[i] if trailing[i] is not None else tp
+                        entry_bar = i
+                        capital -= margin
+                        entries += 1
+            
+            # Current equity with unrealized PnL
+            equity = capital
+            if side == 1:
+                equity += (close[i] - entry_price) * quantity
+            elif side == -1:
+                equity += (entry_price - close[i]) * quantity
+            
+            if bars_processed == 0:
+                first_equity = equity
+            else:
+                ret = equity / last_equity - 1
+                returns_count += 1
+                delta = ret - returns_mean
+                returns_mean += delta / returns_count
+                returns_m2 += delta * (ret - returns_mean)
+            peak = max(peak, equity)
+            max_drawdown = min(max_drawdown, (equity - peak) / peak * 100)
+            last_equity = equity
+            bars_processed += 1
+            
+            # Early abort for hopeless runs
+            if self.pruning is not None:
+                peak_equity = max(peak_equity, equity)
+                pruned_reason = self.pruning.check(i + 1, equity, peak_equity, entries, self.initial_capital)
+                if pruned_reason is not None:
+                    break
+        
+        # Close any remaining position at the last processed bar
+        if side != 0:
+            close_trade(bars_processed - 1, close[bars_processed - 1])
+        
+        metrics = {}
+        if bars_processed > 0:
+            metrics = _compact_metrics(
+                num_trades, num_wins, num_losses, total_profit, total_loss, exposure_days,
+                first_equity, last_equity, max_drawdown, returns_count, returns_mean, returns_m2,
+                (timestamps[bars_processed - 1] - timestamps[0]).days
+            )
+        
+        self.current_capital = capital
+        self.current_position = None
+        self.trades = []
+        self.equity_curve = []
+        
+        return BacktestResult(
+            trades=[],
+            equity_curve=pd.Series(dtype=np.float64),
+            metrics=metrics,
+            parameters={},  # Will be filled by caller
+            symbol="",  # Will be filled by caller
+            timeframe="",  # Will be filled by caller
+            start_date=data.index[0],
+            end_date=data.index[bars_processed - 1],
+            pruned=pruned_reason is not None,
+            prune_reason=pruned_reason,
+            bars_processed=bars_processed,
+            total_bars=n,
+            compact=True
+        )
+    
+    def run_backtest_batch(self, data: pd.DataFrame,
+                           signals_batch: Sequence[pd.DataFrame]) -> List[BacktestResult]:
+        """
+        Run compact backtests of many signal sets on the same data in one pass.
+        
+        Each signal frame is one parameter setting (its entries, SL/TP and
+        trailing TP columns). They are stacked into (bars, K) arrays and all
+        K simulations advance together bar by bar in one compiled loop, so
+        the price bars are read once for the whole batch. Results match K
+        separate compact ``run_backtest`` calls, including pruning.
+        
+        Args:
+            data: OHLCV data with a DatetimeIndex
+            signals_batch: Signal frames, one per parameter setting
+        
+        Returns:
+            List of compact BacktestResult objects, in batch order
+        """
+        n = len(data)
+        k = len(signals_batch)
+        if k == 0:
+            return []
+        logger.info(f"Starting batched backtest: {k} signal sets x {n} candles")
+        
+        def stack(name: str, default: float) -> np.ndarray:
+            out = np.full((n, k), default, dtype=np.float64)
+            for j, signals in enumerate(signals_batch):
+                if name in signals.columns:
+                    out[:, j] = signals[name].to_numpy(dtype=np.float64)[:n]
+            return out
+        
+        def flags(name: str) -> np.ndarray:
+            out = np.zeros((n, k), dtype=np.bool_)
+            for j, signals in enumerate(signals_batch):
+                if name in signals.columns:
+                    out[:, j] = signals[name].to_numpy()[:n].astype(bool)
+            return out
+        
+        # A trailing TP replaces the target whenever it is not None (NaN included)
+        trailing_set = np.zeros((n, k), dtype=np.bool_)
+        for j, signals in enumerate(signals_batch):
+            if 'trailing_tp' in signals.columns:
+                values = signals['trailing_tp'].to_numpy()[:n]
+                trailing_set[:, j] = [v is not None for v in values] if values.dtype == object else True
+        
+        pruning = self.pruning
+        (num_trades, num_wins, num_losses, total_profit, total_loss, exposure_days,
+         first_equity, last_equity, max_drawdown, returns_count, returns_mean, returns_m2,
+         bars_processed, prune_code) = _batch_kernel(
+            data['high'].to_numpy(dtype=np.float64), data['low'].to_numpy(dtype=np.float64),
+            data['close'].to_numpy(dtype=np.float64), np.asarray(data.index.asi8, dtype=np.int64),
+            flags('buy_final'), flags('sell_final'), stack('atr_sl_mult', 0.02), stack('atr_rr', 0.01),
+            stack('atr', 0.01), stack('trailing_tp', np.nan), trailing_set,
+            float(self.initial_capital), float(self.position_size),
+            float(self.position_size * self.leverage), float(self.fee_bps), float(self.slippage_bps),
+            np.nan if pruning is None or pruning.max_drawdown_pct is None else float(pruning.max_drawdown_pct),
+            np.nan if pruning is None or pruning.equity_floor_pct is None else float(pruning.equity_floor_pct),
+            0 if pruning is None else int(pruning.min_trades),
+            0 if pruning is None else int(pruning.trades_window_bars))
+        
+        results = []
+        for j in range(k):
+            bars = int(bars_processed[j])
+            metrics = {}
+            if bars > 0:
+                metrics = _compact_metrics(
+                    int(num_trades[j]), int(num_wins[j]), int(num_losses[j]), float(total_profit[j]),
+                    float(total_loss[j]), int(exposure_days[j]), float(first_equity[j]),
+                    float(last_equity[j]), float(max_drawdown[j]), int(returns_count[j]),
+                    float(returns_mean[j]), float(returns_m2[j]),
+                    (data.index[bars - 1] - data.index[0]).days
+                )
+            reason = PRUNE_REASONS[prune_code[j]]
+            results.append(BacktestResult(
+                trades=[],
+                equity_curve=pd.Series(dtype=np.float64),
+                metrics=metrics,
+                parameters={},  # Will be filled by caller
+                symbol="",  # Will be filled by caller
+                timeframe="",  # Will be filled by caller
+                start_date=data.index[0],
+                end_date=data.index[bars - 1],
+                pruned=reason is not None,
+                prune_reason=reason,
+                bars_processed=bars,
+                total_bars=n,
+                compact=True
+            ))
+        
+        return results
+    
     def calculate_metrics(self, equity_curve: pd.Series) -> Dict[str, float]:
         """
         Calculate backtest metrics.
@@ -492,7 +1133,8 @@ class Backtester:
 
 def run_backtest(data: pd.DataFrame, signals: pd.DataFrame, 
                 initial_capital: float = 10000.0, fee_bps: float = 5.0,
-                slippage_bps: float = 5.0) -> BacktestResult:
+                slippage_bps: float = 5.0, pruning: Optional[PruningRules] = None,
+                compact: bool = False) -> BacktestResult:
     """
     Convenience function to run backtest.
     
@@ -502,9 +1144,33 @@ def run_backtest(data: pd.DataFrame, signals: pd.DataFrame,
         initial_capital: Initial capital
         fee_bps: Fee in basis points
         slippage_bps: Slippage in basis points
+        pruning: Early-abort rules (optional)
+        compact: Return metrics only, without trades or equity curve
         
     Returns:
         BacktestResult object
     """
-    backtester = Backtester(initial_capital, fee_bps, slippage_bps)
+    backtester = Backtester(initial_capital, fee_bps, slippage_bps, pruning=pruning, compact=compact)
     return backtester.run_backtest(data, signals)
+
+
+def run_backtest_batch(data: pd.DataFrame, signals_batch: Sequence[pd.DataFrame],
+                       initial_capital: float = 10000.0, fee_bps: float = 5.0,
+                       slippage_bps: float = 5.0,
+                       pruning: Optional[PruningRules] = None) -> List[BacktestResult]:
+    """
+    Convenience function to run compact backtests of many signal sets in one pass.
+    
+    Args:
+        data: OHLCV data
+        signals_batch: Signal frames, one per parameter setting
+        initial_capital: Initial capital
+        fee_bps: Fee in basis points
+        slippage_bps: Slippage in basis points
+        pruning: Early-abort rules (optional)
+        
+    Returns:
+        List of compact BacktestResult objects, in batch order
+    """
+    backtester = Backtester(initial_capital, fee_bps, slippage_bps, pruning=pruning, compact=True)
+    return backtester.run_backtest_batch(data, signals_batch)
@@ -0,0 +1,60 @@
+"""
+Disk-cached numba kernels keyed by their full module name.
+
+numba's ``cache=True`` names cache files after the source file only, so a
+module imported under two names (``src.strategy.backtester`` from the CLI,
+``strategy_optimizer_v2.src.strategy.backtester`` from the package) shares
+one set of entries. Loading an entry written under the other name imports
+that name again, which fails when its root is not on sys.path. ``cached_jit``
+gives each import name its own cache files.
+"""
+
+import sys
+from typing import Callable, Optional, Sequence
+
+from numba import jit
+from numba.core.caching import CompileResultCacheImpl, FunctionCache
+from numba.core.dispatcher import Dispatcher
+
+
+class _ModuleCacheImpl(CompileResultCacheImpl):
+    """Cache implementation whose file names start with ``func.__module__``."""
+    
+    def __init__(self, py_func):
+        super().__init__(py_func)
+        fullname = f"{py_func.__module__}.{py_func.__qualname__}"
+        self._filename_base = self.get_filename_base(fullname, getattr(sys, 'abiflags', ''))
+
+
+class _ModuleFunctionCache(FunctionCache):
+    _impl_class = _ModuleCacheImpl
+
+
+def cached_jit(signatures: Optional[Sequence] = None, **options) -> Callable:
+    """
+    ``numba.jit(signatures, cache=True, **options)`` with per-module cache files.
+    
+    With signatures the kernel is compiled (or loaded from the cache) at
+    decoration time and further compilation is disabled, as with ``jit``;
+    without them it compiles lazily on first call.
+    
+    Args:
+        signatures: Explicit signatures to compile eagerly (optional)
+        **options: Options passed on to ``numba.jit``
+    
+    Returns:
+        Decorator
+    """
+    def decorate(func):
+        dispatcher = jit(**options)(func)
+        if not isinstance(dispatcher, Dispatcher):  # NUMBA_DISABLE_JIT
+            return dispatcher
+        
+        dispatcher._cache = _ModuleFunctionCache(func)
+        if signatures is not None:
+            for signature in signatures:
+                dispatcher.compile(signature)
+            dispatcher.disable_compile()
+        return dispatcher
+    
+    return decorate
@@ -8,13 +8,21 @@ with EMA trend filter, MACD momentum, and RSI confirmation.
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, Tuple, Optional, List
-from numba import jit
+from numba import types, float32, float64, int64
 import logging
 
+from .numba_cache import cached_jit
+from .signal_filters import filter_alternating_signals
+
 logger = logging.getLogger(__name__)
 
+# Eagerly compiled, disk-cached kernel signatures (see atr_st_core)
+PRICE_ARRAYS = [types.Array(dtype, 1, layout, readonly=readonly)
+                for dtype in (float64, float32)
+                for layout, readonly in (('C', False), ('A', True))]
+
 
-@jit(nopython=True)
+@cached_jit([(t, int64) for t in PRICE_ARRAYS], nopython=True)
 def calculate_ema(prices: np.ndarray, period: int) -> np.ndarray:
     """Calculate EMA using Numba for performance."""
     n = len(prices)
@@ -35,7 +43,7 @@ def calculate_ema(prices: np.ndarray, period: int) -> np.ndarray:
     return ema
 
 
-@jit(nopython=True)
+@cached_jit([(t, int64) for t in PRICE_ARRAYS], nopython=True)
 def calculate_rsi(prices: np.ndarray, period: int) -> np.ndarray:
     """Calculate RSI using Numba for performance."""
     n = len(prices)
@@ -229,20 +237,10 @@ class VolensyMacdTrendStrategy:
         else:
             df['can_signal'] = True
         
-        # Prevent duplicate signals
-        df['buy_signal'] = False
-        df['sell_signal'] = False
-        
-        # Track last direction to prevent duplicates
-        last_dir = 0
-        
-        for i in range(len(df)):
-            if df.iloc[i]['can_signal'] and df.iloc[i]['raw_buy'] and last_dir != 1:
-                df.iloc[i, df.columns.get_loc('buy_signal')] = True
-                last_dir = 1
-            elif df.iloc[i]['can_signal'] and df.iloc[i]['raw_sell'] and last_dir != -1:
-                df.iloc[i, df.columns.get_loc('sell_signal')] = True
-                last_dir = -1
+        # Prevent duplicate signals (alternate BUY/SELL direction)
+        df['buy_signal'], df['sell_signal'] = filter_alternating_signals(
+            df['can_signal'] & df['raw_buy'], df['can_signal'] & df['raw_sell']
+        )
         
         # Convert signals to backtester format
         df['buy_final'] = df['buy_signal']
@@ -0,0 +1,103 @@
+"""
+Tests for adaptive (successive halving + TPE) parameter search.
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.optimize.param_space import ParamSpace
+from strategy_optimizer_v2.src.optimize.adaptive_search import (
+    AdaptiveSearch,
+    TPESampler,
+    halving_fractions,
+    metric_score,
+)
+
+
+@pytest.fixture
+def space():
+    """Parameter space with 4096 combinations."""
+    return ParamSpace({f'p{i}': list(range(8)) for i in range(4)})
+
+
+def objective(params):
+    """Smooth objective peaking at p0=p1=p2=p3=5."""
+    return -sum((value - 5) ** 2 for value in params.values())
+
+
+def make_evaluate(calls):
+    """Evaluate callable whose noise shrinks as more data is used."""
+    rng = np.random.default_rng(0)
+
+    def evaluate(params, fraction):
+        calls.append(fraction)
+        noise = rng.normal(0, 4 * (1 - fraction))
+        return {'params': params, 'score': objective(params) + noise, 'fraction': fraction}
+
+    return evaluate
+
+
+def test_halving_fractions():
+    assert halving_fractions(1 / 9, 3) == pytest.approx([1 / 9, 1 / 3, 1.0])
+    assert halving_fractions(1.0, 3) == [1.0]
+    with pytest.raises(ValueError):
+        halving_fractions(0.5, 1)
+
+
+def test_tpe_prefers_good_region():
+    positions = np.array([[0], [1], [2], [6], [7]])
+    scores = np.array([-10.0, -8.0, -6.0, 5.0, 4.0])
+    sampler = TPESampler([8], gamma=0.4).fit(positions, scores)
+
+    ratio = sampler.log_ratio(np.arange(8).reshape(-1, 1))
+    assert ratio[6] > ratio[1]
+    assert np.argmax(ratio) in (6, 7)
+
+
+def test_adaptive_search_finds_optimum_with_few_full_backtests(space):
+    calls = []
+    search = AdaptiveSearch(space, make_evaluate(calls), lambda r: r['score'],
+                            n_candidates=81, eta=3, min_fraction=1 / 9, n_brackets=4, seed=1)
+    results = search.run()
+
+    best = max(results, key=lambda r: r['score'])
+    assert objective(best['params']) >= -2
+
+    stats = search.stats
+    assert stats['full_backtests'] == len(results) == calls.count(1.0)
+    assert stats['full_backtests'] * 10 <= len(space)
+    assert stats['reduction_vs_grid'] >= 10
+    assert all(r['fraction'] == 1.0 for r in results)
+
+
+def test_adaptive_search_is_deterministic(space):
+    run1 = AdaptiveSearch(space, make_evaluate([]), lambda r: r['score'], n_candidates=27, n_brackets=2, seed=3).run()
+    run2 = AdaptiveSearch(space, make_evaluate([]), lambda r: r['score'], n_candidates=27, n_brackets=2, seed=3).run()
+
+    assert [r['params'] for r in run1] == [r['params'] for r in run2]
+
+
+def test_adaptive_search_on_view_stays_in_view(space):
+    view = space.sample_random(200, seed=0)
+    allowed = {space.encode(p) for p in view}
+
+    search = AdaptiveSearch(view, make_evaluate([]), lambda r: r['score'], n_candidates=27, n_brackets=3, seed=0)
+    results = search.run()
+
+    assert results
+    assert all(space.encode(r['params']) in allowed for r in results)
+    assert len(search.observations) <= len(view)
+
+
+def test_metric_score_handles_failures_and_inf():
+    score = metric_score('profit_factor', min_trades=2, cap=50)
+
+    assert score({'success': False}) == -np.inf
+    assert score({'success': True, 'num_trades': 1, 'metrics': {'profit_factor': 3.0}}) == -np.inf
+    assert score({'success': True, 'num_trades': 5, 'metrics': {'profit_factor': float('inf')}}) == 50
+    assert score({'success': True, 'num_trades': 5, 'metrics': {'profit_factor': 1.7}}) == 1.7
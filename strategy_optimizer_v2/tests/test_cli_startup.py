@@ -0,0 +1,38 @@
+"""
+Tests that light CLI commands do not import the heavy libraries.
+"""
+
+from pathlib import Path
+import subprocess
+import sys
+import os
+
+import pytest
+
+PROJECT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = {"ccxt", "yfinance", "numba", "scipy", "matplotlib", "plotly", "tqdm"}
+
+
+def imported_modules(*args):
+    """Run the CLI with -X importtime and return the modules it imported."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-m", "src.cli", *args],
+                         cwd=PROJECT, capture_output=True, text=True, env={**os.environ, "PYTHONPATH": ""})
+    assert out.returncode == 0, out.stderr[-2000:]
+    return {line.split("|")[-1].strip() for line in out.stderr.splitlines() if line.startswith("import time:")}
+
+
+@pytest.mark.parametrize("args", [
+    ["--help"],
+    ["optimize", "--help"],
+    ["config-info"],
+    ["nasdaq-symbols"],
+])
+def test_light_commands_skip_heavy_imports(args):
+    assert not imported_modules(*args) & HEAVY_MODULES
+
+
+def test_clear_cache_skips_exchange_client(tmp_path):
+    modules = imported_modules("clear-cache", "--cache-dir", str(tmp_path))
+
+    assert not modules & HEAVY_MODULES
+    assert "src.data.cache" in modules
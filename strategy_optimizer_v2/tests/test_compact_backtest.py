@@ -0,0 +1,152 @@
+"""
+Tests for compact (metrics-only) backtests and re-materializing top results.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.config import get_config
+from strategy_optimizer_v2.src.strategy.backtester import PruningRules, run_backtest, run_backtest_batch
+from strategy_optimizer_v2.src.optimize.grid_search import GridSearchOptimizer
+
+
+def make_data(n=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    return pd.DataFrame({"open": close, "high": close * 1.003, "low": close * 0.997, "close": close,
+                         "volume": np.full(n, 10.0)}, index=ts)
+
+
+def make_signals(data, seed, atr_based=False, trailing=False):
+    """Random long/short entries with percentage or ATR-based SL/TP."""
+    rng = np.random.default_rng(seed)
+    n = len(data)
+    signals = pd.DataFrame({
+        "buy_final": rng.random(n) < 0.03,
+        "sell_final": rng.random(n) < 0.03,
+        "atr_sl_mult": 2.0 if atr_based else 0.006,
+        "atr_rr": 3.0 if atr_based else 0.004,
+    }, index=data.index)
+    if atr_based:
+        signals["atr"] = data["close"] * 0.002
+    if trailing:
+        signals["trailing_tp"] = data["close"] * np.where(rng.random(n) < 0.5, 1.004, 0.996)
+    return signals
+
+
+@pytest.mark.parametrize("atr_based,trailing,pruning", [
+    (False, False, None),
+    (True, False, None),
+    (False, True, None),
+    (False, False, PruningRules(max_drawdown_pct=0.5)),
+])
+def test_compact_metrics_match_full_run(atr_based, trailing, pruning):
+    data = make_data()
+    for seed in range(3):
+        signals = make_signals(data, seed, atr_based, trailing)
+        full = run_backtest(data, signals, fee_bps=10, slippage_bps=5, pruning=pruning)
+        compact = run_backtest(data, signals, fee_bps=10, slippage_bps=5, pruning=pruning, compact=True)
+
+        assert full.metrics['num_trades'] > 0
+        assert compact.compact and compact.trades == [] and compact.equity_curve.empty
+        assert (compact.pruned, compact.prune_reason, compact.bars_processed) == \
+            (full.pruned, full.prune_reason, full.bars_processed)
+        assert set(compact.metrics) == set(full.metrics)
+        for name, value in full.metrics.items():
+            np.testing.assert_allclose(compact.metrics[name], value, rtol=1e-9, err_msg=name)
+
+
+@pytest.mark.parametrize("pruning", [
+    None,
+    PruningRules(max_drawdown_pct=0.5),
+    PruningRules(equity_floor_pct=99.5),
+    PruningRules(min_trades=20, trades_window_bars=300),
+])
+def test_batched_backtests_match_separate_runs(pruning):
+    data = make_data()
+    signal_sets = [make_signals(data, seed, atr_based=seed % 2 == 1, trailing=seed % 3 == 2)
+                   for seed in range(6)]
+    signal_sets[2].loc[signal_sets[2].index[::5], 'trailing_tp'] = np.nan
+
+    batch = run_backtest_batch(data, signal_sets, fee_bps=10, slippage_bps=5, pruning=pruning)
+
+    assert len(batch) == len(signal_sets)
+    for signals, batched in zip(signal_sets, batch):
+        single = run_backtest(data, signals, fee_bps=10, slippage_bps=5, pruning=pruning, compact=True)
+        assert batched.compact and batched.trades == []
+        assert (batched.pruned, batched.prune_reason, batched.bars_processed, batched.end_date) == \
+            (single.pruned, single.prune_reason, single.bars_processed, single.end_date)
+        assert batched.metrics == single.metrics
+    if pruning is not None:
+        assert any(b.pruned for b in batch)
+
+
+class FakeLoader:
+    def __init__(self, data):
+        self.data = data
+
+    def get_ohlcv(self, symbol, timeframe):
+        return self.data
+
+
+BASE_PARAMS = {'a': 1.0, 'c': 10, 'st_factor': 1.5, 'min_delay_m': 0, 'atr_sl_mult': 2.0, 'atr_rr': 2.0}
+
+
+class FakeStrategy:
+    """Random signals keyed by an extra 'seed' parameter."""
+
+    def __init__(self, params):
+        self.seed = params['seed']
+
+    def run_strategy(self, data):
+        return make_signals(data, self.seed)
+
+
+def test_top_results_are_rematerialized_in_full():
+    data = make_data()
+    optimizer = GridSearchOptimizer.__new__(GridSearchOptimizer)
+    optimizer.config = get_config()
+    optimizer.data_loader = FakeLoader(data)
+    optimizer.pruning = None
+    optimizer.store = None
+    optimizer.results = [
+        optimizer.optimize_single_combination("BTC/USDT", "1h", {**BASE_PARAMS, 'seed': seed}, data,
+                                               FakeStrategy)
+        for seed in range(4)
+    ]
+    assert all(r['success'] for r in optimizer.results)
+
+    backtests = optimizer.materialize_top_results(2, 'total_return_pct', strategy_factory=FakeStrategy)
+    top = optimizer.get_top_results(2, 'total_return_pct')
+
+    assert [b.parameters for b in backtests] == [r['params'] for r in top]
+    for backtest, result in zip(backtests, top):
+        assert not backtest.compact and backtest.symbol == "BTC/USDT"
+        assert len(backtest.trades) == result['num_trades']
+        assert len(backtest.equity_curve) == len(data)
+        np.testing.assert_allclose(backtest.metrics['total_return_pct'], result['metrics']['total_return_pct'])
+
+
+def test_optimizer_batches_match_single_combinations():
+    data = make_data()
+    optimizer = GridSearchOptimizer.__new__(GridSearchOptimizer)
+    optimizer.config = get_config()
+    optimizer.data_loader = FakeLoader(data)
+    optimizer.pruning = PruningRules(max_drawdown_pct=1.0)
+    optimizer.store = None
+    param_batch = [{**BASE_PARAMS, 'seed': seed} for seed in range(5)]
+    param_batch.insert(2, {**BASE_PARAMS, 'seed': 9, 'a': -1.0})  # fails validation
+
+    batched = optimizer.optimize_batch("BTC/USDT", "1h", param_batch, data, FakeStrategy)
+    single = [optimizer.optimize_single_combination("BTC/USDT", "1h", params, data, FakeStrategy)
+              for params in param_batch]
+
+    assert batched == single
+    assert [r['success'] for r in batched] == [True, True, False, True, True, True]
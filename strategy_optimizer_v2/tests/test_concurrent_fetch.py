@@ -0,0 +1,136 @@
+"""
+Tests for concurrent multi-symbol OHLCV fetching against a fake exchange.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.config import get_config
+from strategy_optimizer_v2.src.data import ccxt_client
+from strategy_optimizer_v2.src.data.cache import DataCache
+from strategy_optimizer_v2.src.data.ccxt_client import CCXTClient, WeightRateLimiter
+from strategy_optimizer_v2.src.data.loader import DataLoader
+
+HOUR_MS = 3600 * 1000
+START_MS = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+
+
+class FakeExchange:
+    """Serves hourly candles per symbol and records request concurrency."""
+
+    def __init__(self, bars=2500, delay=0.01, page_cap=1000):
+        self.bars = bars
+        self.delay = delay
+        self.page_cap = page_cap
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        threading.Event().wait(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+
+        if symbol == 'BAD/USDT':
+            raise RuntimeError("unknown symbol")
+
+        limit = min(limit or self.page_cap, self.page_cap)
+        first = 0 if since is None else max(0, -(-(since - START_MS) // HOUR_MS))
+        if since is None:
+            first = max(0, self.bars - limit)
+        price = float(sum(map(ord, symbol)))
+        return [[START_MS + i * HOUR_MS, price, price + 1, price - 1, price, 1.0]
+                for i in range(first, min(first + limit, self.bars))]
+
+
+def make_client(exchange, **kwargs):
+    return CCXTClient(exchange=exchange, weight_per_minute=60_000, ohlcv_weight=1, **kwargs)
+
+
+def test_history_is_paginated_without_gaps():
+    client = make_client(FakeExchange(bars=2500))
+    until = START_MS + 2499 * HOUR_MS
+
+    ohlcv, requests = client.fetch_ohlcv_history('BTC/USDT', '1h', since=START_MS, until=until, limit=1000)
+
+    assert requests == 3
+    assert [row[0] for row in ohlcv] == [START_MS + i * HOUR_MS for i in range(2500)]
+
+
+def test_symbols_are_fetched_concurrently_and_streamed(monkeypatch):
+    # Skip retry backoff for the failing symbol
+    monkeypatch.setattr(ccxt_client.time, 'sleep', lambda seconds: None)
+    exchange = FakeExchange(bars=2500)
+    client = make_client(exchange)
+    symbols = [f'C{i}/USDT' for i in range(12)] + ['BAD/USDT']
+    completed = []
+
+    results = client.fetch_multiple_symbols(
+        symbols, '1h', since=START_MS, until=START_MS + 2499 * HOUR_MS, limit=1000,
+        max_workers=6, on_symbol=lambda symbol, ohlcv: completed.append(symbol),
+    )
+
+    assert list(results) == symbols
+    assert all(len(results[s]) == 2500 for s in symbols[:-1])
+    assert results['BAD/USDT'] == []
+    assert sorted(completed) == sorted(symbols[:-1])
+    assert exchange.max_in_flight > 1
+
+    stats = client.last_fetch_stats
+    assert stats['candles'] == 12 * 2500
+    assert stats['failed'] == ['BAD/USDT']
+    assert stats['candles_per_sec'] > 0
+
+
+def test_rate_limiter_enforces_weight_budget():
+    limiter = WeightRateLimiter(weight_per_minute=600, burst=2)  # 10 weight/sec
+
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire(1)
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 0.35
+    assert limiter.waited > 0
+
+
+def test_rate_limiter_pickles_with_a_fresh_lock():
+    import pickle
+
+    limiter = WeightRateLimiter(weight_per_minute=600, burst=2)
+    limiter.acquire(2)
+    copy = pickle.loads(pickle.dumps(limiter))
+
+    assert copy.tokens == limiter.tokens and copy._lock is not limiter._lock
+    copy.acquire(1)
+    assert copy.waited > 0
+
+
+def test_loader_streams_fetched_symbols_into_cache(tmp_path):
+    exchange = FakeExchange(bars=1500)
+    loader = DataLoader.__new__(DataLoader)
+    loader.config = get_config()
+    loader.use_cache = True
+    loader.ohlcv_dtype = "float64"
+    loader.cache = DataCache(str(tmp_path))
+    loader.client = make_client(exchange)
+    loader.csv_fallback_dir = None
+
+    since = datetime.fromtimestamp(START_MS / 1000, tz=timezone.utc)
+    until = since + timedelta(hours=1499)
+    symbols = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT']
+    data = loader.get_multiple_symbols(symbols, '1h', since=since, until=until, limit=1000)
+
+    assert all(len(data[s]) == 1500 for s in symbols)
+    assert all(loader.cache.get_last_timestamp(s, '1h') is not None for s in symbols)
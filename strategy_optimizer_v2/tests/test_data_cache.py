@@ -0,0 +1,228 @@
+"""
+Tests for partitioned OHLCV caching and incremental tail refresh.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.config import get_config
+from strategy_optimizer_v2.src.data import cache as cache_module
+from strategy_optimizer_v2.src.data.cache import DataCache
+from strategy_optimizer_v2.src.data.loader import DataLoader
+
+
+def make_ohlcv(start, periods, freq="15min"):
+    """OHLCV frame with a UTC index."""
+    ts = pd.date_range(start, periods=periods, freq=freq, tz="UTC", name="timestamp")
+    close = 100 + np.arange(periods, dtype=float)
+    return pd.DataFrame({
+        "open": close,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": np.full(periods, 10.0),
+    }, index=ts)
+
+
+def to_ccxt(df):
+    """DataFrame back to ccxt OHLCV rows."""
+    ms = df.index.tz_convert("UTC").tz_localize(None).values.astype("datetime64[ms]").astype("int64")
+    return [[int(t), *row] for t, row in zip(ms, df[["open", "high", "low", "close", "volume"]].values.tolist())]
+
+
+class FakeClient:
+    """Exchange client serving candles from a frame."""
+
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, until=None, limit=None):
+        self.calls.append(since)
+        rows = self.data[self.data.index >= pd.Timestamp(since)] if since is not None else self.data
+        return to_ccxt(rows.iloc[:1000])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DataCache(str(tmp_path), partition_period="M", max_partitions=4)
+
+
+def test_save_roundtrip_and_monthly_partitions(cache):
+    data = make_ohlcv("2024-01-01", 96 * 90)
+    cache.save_data("BTC/USDT", "15m", data)
+
+    entry = cache.metadata[cache._get_cache_key("BTC/USDT", "15m")]
+    assert len(entry["partitions"]) == 3
+
+    loaded = cache.get_cached_data("BTC/USDT", "15m")
+    pd.testing.assert_frame_equal(loaded, data, check_freq=False)
+
+
+def test_range_read_touches_only_overlapping_partitions(cache, monkeypatch):
+    data = make_ohlcv("2024-01-01", 96 * 90)
+    cache.save_data("BTC/USDT", "15m", data)
+
+    opened = []
+    read_table = cache_module.pq.read_table
+
+    def spy(path, *args, **kwargs):
+        opened.append(path)
+        return read_table(path, *args, **kwargs)
+
+    monkeypatch.setattr(cache_module.pq, "read_table", spy)
+
+    start = datetime(2024, 2, 10, tzinfo=timezone.utc)
+    end = datetime(2024, 2, 20, tzinfo=timezone.utc)
+    loaded = cache.get_cached_data("BTC/USDT", "15m", start, end)
+
+    assert len(opened) == 1
+    assert loaded.index[0] == pd.Timestamp(start) and loaded.index[-1] == pd.Timestamp(end)
+
+
+def test_append_replaces_last_candle_and_compacts(cache):
+    data = make_ohlcv("2024-01-01", 96 * 10)
+    cache.save_data("BTC/USDT", "15m", data.iloc[:500])
+
+    # The stored last candle was still forming
+    partial = data.iloc[:500].copy()
+    partial.iloc[-1, partial.columns.get_loc("close")] = -1.0
+    cache.save_data("BTC/USDT", "15m", partial)
+
+    for start in range(499, 960, 60):
+        cache.append_data("BTC/USDT", "15m", data.iloc[start:start + 61])
+    cache.wait_for_compaction()
+
+    entry = cache.metadata[cache._get_cache_key("BTC/USDT", "15m")]
+    assert len(entry["partitions"]) <= cache.max_partitions
+    assert entry["rows"] == len(data)
+
+    loaded = cache.get_cached_data("BTC/USDT", "15m")
+    pd.testing.assert_frame_equal(loaded, data, check_freq=False)
+
+    # Stale candles are ignored
+    assert cache.append_data("BTC/USDT", "15m", data.iloc[:100]) == 0
+
+
+def test_save_during_compaction_discards_compacted_files(cache, monkeypatch):
+    data = make_ohlcv("2024-01-01", 96 * 60)
+    cache.save_data("BTC/USDT", "15m", data.iloc[:96 * 30])
+    for start in range(96 * 30, 96 * 60, 96 * 10):
+        cache.append_data("BTC/USDT", "15m", data.iloc[start:start + 96 * 10])
+    cache.wait_for_compaction()
+
+    write_periods = cache._write_periods
+
+    def save_while_writing(symbol, timeframe, entry, records):
+        # Compaction writes into a staging entry without the lock held
+        if 'symbol' not in entry:
+            cache.save_data(symbol, timeframe, data)
+        return write_periods(symbol, timeframe, entry, records)
+
+    monkeypatch.setattr(cache, "_write_periods", save_while_writing)
+    n_partitions = cache.compact("BTC/USDT", "15m")
+
+    entry = cache.metadata[cache._get_cache_key("BTC/USDT", "15m")]
+    assert n_partitions == len(entry["partitions"])
+    stored = {p.name for p in cache._get_partition_dir("BTC/USDT", "15m").iterdir()}
+    assert stored == {p["file"] for p in entry["partitions"]}
+    pd.testing.assert_frame_equal(cache.get_cached_data("BTC/USDT", "15m"), data, check_freq=False)
+
+
+def test_legacy_single_file_is_migrated(cache):
+    data = make_ohlcv("2024-01-01", 200, freq="1h").tz_localize(None)
+    legacy = data.reset_index()
+    legacy["timestamp"] = legacy["timestamp"].astype("int64") // 10**6
+    legacy.to_parquet(cache._get_cache_file("ETH/USDT", "1h"), index=False)
+    cache.metadata[cache._get_cache_key("ETH/USDT", "1h")] = {
+        "symbol": "ETH/USDT", "timeframe": "1h", "cached_at": datetime.now().isoformat(), "rows": 200,
+    }
+
+    loaded = cache.get_cached_data("ETH/USDT", "1h")
+
+    pd.testing.assert_frame_equal(loaded, data, check_freq=False)
+    assert not cache._get_cache_file("ETH/USDT", "1h").exists()
+
+
+def test_stale_cache_fetches_only_the_tail(cache, monkeypatch):
+    monkeypatch.setattr(get_config().data, "cache_ttl_hours", 0)
+
+    now = pd.Timestamp.now(tz="UTC").floor("15min")
+    history = make_ohlcv(now - pd.Timedelta(days=730), 96 * 730 + 1)
+    cache.save_data("BTC/USDT", "15m", history.iloc[:-50])
+
+    loader = DataLoader.__new__(DataLoader)
+    loader.config = get_config()
+    loader.use_cache = True
+    loader.ohlcv_dtype = "float64"
+    loader.cache = cache
+    loader.client = FakeClient(history)
+    loader.csv_fallback_dir = None
+
+    loaded = loader.get_ohlcv("BTC/USDT", "15m")
+
+    assert loader.client.calls == [history.index[-51].to_pydatetime()]
+    assert len(loaded) == len(history)
+    assert loaded.index[-1] == history.index[-1]
+
+
+def test_feather_reads_are_memory_mapped(tmp_path):
+    cache = DataCache(str(tmp_path), partition_period="all", storage_format="feather")
+    data = make_ohlcv("2024-01-01", 96 * 40)
+    cache.save_data("BTC/USDT", "15m", data)
+
+    loaded = cache.get_cached_data("BTC/USDT", "15m")
+    pd.testing.assert_frame_equal(loaded, data, check_freq=False)
+    # Columns are read-only views of the mapped file, not private copies
+    assert not loaded["close"].values.flags.writeable
+
+    start = datetime(2024, 1, 10, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 12, tzinfo=timezone.utc)
+    ranged = cache.get_cached_data("BTC/USDT", "15m", start, end)
+    pd.testing.assert_frame_equal(ranged, data.loc[start:end], check_freq=False)
+
+
+def test_float32_mode(cache):
+    from strategy_optimizer_v2.src.strategy.atr_st_core import calculate_atr, calculate_supertrend
+
+    data = make_ohlcv("2024-01-01", 500)
+    cache.save_data("BTC/USDT", "15m", data)
+
+    loaded = cache.get_cached_data("BTC/USDT", "15m", dtype="float32")
+    assert (loaded.dtypes == np.float32).all()
+    np.testing.assert_allclose(loaded["close"].values, data["close"].values, rtol=1e-6)
+
+    high, low, close = (loaded[col].values for col in ("high", "low", "close"))
+    atr = calculate_atr(high, low, close, 14)
+    assert atr.dtype == np.float32
+    assert calculate_supertrend(high, low, close, atr, 2.0).dtype == np.float32
+
+
+def test_optimizer_with_cache_pickles_into_workers(tmp_path, monkeypatch):
+    # Process pools pickle bound methods of the optimizer, and with it the
+    # loader's cache and exchange client
+    import pickle
+    import ccxt
+    from strategy_optimizer_v2.src.optimize.grid_search import GridSearchOptimizer
+
+    exchange_class = getattr(ccxt, get_config().data.exchange)
+    monkeypatch.setattr(exchange_class, "fetch_status", lambda self, params={}: {"status": "ok"})
+    optimizer = GridSearchOptimizer(cache_dir=str(tmp_path), use_cache=True)
+    cache = optimizer.data_loader.cache
+    cache.save_data("BTC/USDT", "15m", make_ohlcv("2024-01-01", 500))
+    cache.compact_async("BTC/USDT", "15m")
+    cache.wait_for_compaction()
+
+    method = pickle.loads(pickle.dumps(optimizer.optimize_symbol_timeframe))
+    copy = method.__self__.data_loader.cache
+
+    pd.testing.assert_frame_equal(copy.get_cached_data("BTC/USDT", "15m"), cache.get_cached_data("BTC/USDT", "15m"))
+    assert copy._compactions == {}
+    copy.save_data("ETH/USDT", "15m", make_ohlcv("2024-01-01", 10))
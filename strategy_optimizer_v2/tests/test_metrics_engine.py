@@ -0,0 +1,129 @@
+"""
+Tests for the array-based metrics engine against the per-trade reference functions.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.strategy.backtester import Trade
+from strategy_optimizer_v2.src.optimize.metrics import (
+    TradeArrays,
+    calculate_advanced_metrics,
+    calculate_all_metrics,
+    calculate_all_metrics_batch,
+    calculate_basic_metrics,
+    calculate_metrics_batch,
+    calculate_portfolio_metrics,
+    calculate_risk_metrics,
+    calculate_trade_metrics,
+    get_metric_summary,
+    pad_equity_curves,
+    rank_results,
+)
+
+
+def make_result(n, seed, num_trades=12, open_last=False):
+    """Random-walk equity curve with trades placed on its bars."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC")
+    equity = pd.Series(10000 * np.exp(np.cumsum(rng.normal(0, 0.01, n))), index=index)
+    trades = []
+    if n > 1:
+        for entry in np.sort(rng.choice(n - 1, size=min(num_trades, n - 1), replace=False)):
+            exit_ = min(entry + int(rng.integers(1, 10)), n - 1)
+            trades.append(Trade(
+                entry_time=index[entry], exit_time=index[exit_], entry_price=100.0, exit_price=101.0,
+                side='long' if rng.random() < 0.5 else 'short', quantity=1.0, stop_loss=99.0,
+                take_profit=102.0, pnl=float(rng.choice([-1, 1]) * rng.integers(1, 50)),
+                commission=0.1, slippage=0.05, exit_reason='signal',
+            ))
+    if open_last and trades:
+        trades[-1].exit_time = None
+    return equity, trades
+
+
+def reference_metrics(equity, trades):
+    metrics = {}
+    for func in (calculate_basic_metrics, calculate_risk_metrics, calculate_advanced_metrics):
+        metrics.update(func(equity, trades))
+    metrics.update(calculate_trade_metrics(trades))
+    return metrics
+
+
+def assert_metrics_close(actual, expected):
+    assert set(actual) == set(expected)
+    for name, value in expected.items():
+        np.testing.assert_allclose(actual[name], value, rtol=1e-9, atol=1e-12, err_msg=name)
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_all_metrics_match_reference():
+    cases = [make_result(400, 1), make_result(150, 2, num_trades=30), make_result(60, 3, open_last=True),
+             make_result(80, 4, num_trades=0), make_result(3, 5, num_trades=1), make_result(1, 6)]
+
+    for equity, trades in cases:
+        assert_metrics_close(calculate_all_metrics(equity, trades), reference_metrics(equity, trades))
+
+    batch = calculate_all_metrics_batch([equity for equity, _ in cases], [trades for _, trades in cases])
+    for (equity, trades), metrics in zip(cases, batch):
+        assert_metrics_close(metrics, reference_metrics(equity, trades))
+
+    # An empty curve only reports trade metrics, as before
+    empty = pd.Series([], dtype=float, index=pd.DatetimeIndex([], tz="UTC"))
+    assert calculate_all_metrics(empty, []) == calculate_trade_metrics([])
+
+
+def test_batch_from_padded_matrix():
+    curves = [make_result(n, seed) for seed, n in enumerate((50, 200, 120))]
+    equity, timestamps = pad_equity_curves([c for c, _ in curves])
+    assert equity.shape == (3, 200) and np.isnan(equity[0, 50:]).all()
+
+    trades = [TradeArrays.from_trades(t, c.index) for c, t in curves]
+    assert trades[0].entry_idx.min() >= 0 and (trades[0].side != 0).all()
+    np.testing.assert_allclose(trades[0].fees, 0.15)
+
+    batch = calculate_metrics_batch(equity, trades, timestamps)
+    for row, (curve, trade_list) in enumerate(curves):
+        expected = calculate_all_metrics(curve, trade_list)
+        for name, value in expected.items():
+            np.testing.assert_allclose(batch[name][row], value, rtol=1e-9, err_msg=name)
+
+    # Without timestamps, exposure is measured in bars held
+    by_bars = calculate_metrics_batch(equity, trades)
+    held = (trades[1].exit_idx - trades[1].entry_idx).sum()
+    np.testing.assert_allclose(by_bars['exposure_pct'][1], held / 199 * 100)
+
+
+def test_result_aggregates_match_loops():
+    rng = np.random.default_rng(0)
+    results = [{'id': i, 'metrics': {'profit_factor': float(rng.integers(0, 4)),
+                                     'total_return_pct': float(rng.integers(-5, 5)),
+                                     'num_trades': int(rng.integers(0, 20))}} for i in range(50)]
+    results.append({'id': 50})
+
+    ranked = rank_results([dict(r) for r in results])
+    expected = sorted(results[:50], key=lambda r: (r['metrics']['profit_factor'],
+                                                   r['metrics']['total_return_pct']), reverse=True)
+    assert [r['id'] for r in ranked] == [r['id'] for r in expected]
+    assert [r['rank'] for r in ranked] == list(range(1, 51))
+
+    ascending = rank_results([dict(r) for r in results], ascending=True)
+    assert [r['id'] for r in ascending] == [r['id'] for r in sorted(
+        results[:50], key=lambda r: (r['metrics']['profit_factor'], r['metrics']['total_return_pct']))]
+
+    returns = [r['metrics']['total_return_pct'] for r in results[:50]]
+    portfolio = calculate_portfolio_metrics(results[:50])
+    assert portfolio['positive_strategies'] == sum(1 for r in returns if r > 0)
+    assert portfolio['total_trades'] == sum(r['metrics']['num_trades'] for r in results[:50])
+    assert portfolio['median_return_pct'] == np.median(returns)
+
+    summary = get_metric_summary(results, 'num_trades')
+    assert summary['count'] == 50
+    assert summary['q75'] == np.percentile([r['metrics']['num_trades'] for r in results[:50]], 75)
+    assert get_metric_summary(results, 'missing') == {}
@@ -0,0 +1,123 @@
+"""
+Tests for batched metrics, streaming ranking and process-pool NASDAQ optimization.
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.data.nasdaq_provider import NASDAQDataProvider
+from strategy_optimizer_v2.src.optimize.nasdaq_optimizer import (
+    NASDAQOptimizer, StreamingRanking, calculate_simple_metrics_batch
+)
+
+
+def make_frame(n, seed, trades=True):
+    """Signal frame with random-walk closes."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    buy = rng.random(n) < 0.05 if trades else np.zeros(n, dtype=bool)
+    sell = rng.random(n) < 0.05 if trades else np.zeros(n, dtype=bool)
+    return pd.DataFrame({"close": close, "buy_signal": buy, "sell_signal": sell})
+
+
+def reference_metrics(signals_df):
+    """Row-at-a-time pandas implementation the batch version replaces."""
+    total_trades = signals_df['buy_signal'].sum() + signals_df['sell_signal'].sum()
+    if total_trades == 0:
+        return {'sharpe_ratio': 0, 'max_drawdown': 0, 'total_return': 0, 'win_rate': 0, 'total_trades': 0}
+    close = signals_df['close']
+    returns = close.pct_change().dropna()
+    volatility = returns.std() if len(returns) > 1 else 0
+    peak = close.expanding().max()
+    return {
+        'sharpe_ratio': returns.mean() / volatility if volatility > 0 else 0,
+        'max_drawdown': abs(((close - peak) / peak).min()),
+        'total_return': (close.iloc[-1] - close.iloc[0]) / close.iloc[0],
+        'win_rate': 0.5,
+        'total_trades': total_trades,
+    }
+
+
+class StubProvider(NASDAQDataProvider):
+    """Serves synthetic daily bars without touching disk or network."""
+
+    def __init__(self):
+        self.cache = {}
+
+    def get_multiple_symbols_data(self, symbols, period="2y", interval="1d", use_cache=True):
+        data = {}
+        for i, symbol in enumerate(symbols):
+            rng = np.random.default_rng(i)
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 400)))
+            data[symbol.upper()] = pd.DataFrame({
+                "date": pd.date_range("2023-01-01", periods=400, freq="D"),
+                "open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+                "volume": np.full(400, 1e6),
+            })
+        return data
+
+
+def test_batch_metrics_match_reference():
+    frames = [make_frame(300, 1), make_frame(120, 2), make_frame(50, 3, trades=False), make_frame(2, 4)]
+
+    batch = calculate_simple_metrics_batch(frames)
+
+    for i, frame in enumerate(frames):
+        expected = reference_metrics(frame)
+        for name, value in expected.items():
+            np.testing.assert_allclose(batch[name][i], value, rtol=1e-10, atol=1e-12, err_msg=name)
+
+
+def test_streaming_ranking_keeps_top_k_in_order():
+    rng = np.random.default_rng(0)
+    rows = [{'sharpe_ratio': float(score), 'id': i} for i, score in enumerate(rng.integers(0, 5, 40))]
+
+    full = StreamingRanking()
+    top = StreamingRanking(top_k=5)
+    for offset in range(0, 40, 8):
+        full.add(rows[offset:offset + 8], offset)
+        top.add(rows[offset:offset + 8], offset)
+
+    expected = sorted(rows, key=lambda r: (-r['sharpe_ratio'], r['id']))
+    assert [r['id'] for r in full.results()] == [r['id'] for r in expected]
+    assert [r['id'] for r in top.results()] == [r['id'] for r in expected[:5]]
+    assert top.best == expected[0] and top.count == 40
+
+
+def test_process_pool_matches_threaded_run():
+    optimizer = NASDAQOptimizer(data_provider=StubProvider())
+    optimizer.param_ranges = {
+        'key_value': [1.5, 3.0],
+        'atr_period': [7, 14],
+        'multiplier': [1.5],
+        'use_heikin_ashi': [False, True],
+    }
+
+    threaded = optimizer.optimize_multiple_symbols(["AAPL", "MSFT"], max_workers=2)
+    parallel = optimizer.optimize_multiple_symbols(["AAPL", "MSFT"], jobs=2)
+
+    assert list(parallel) == ["AAPL", "MSFT"]
+    for symbol in parallel:
+        assert parallel[symbol].total_tests == 8
+        assert [r['params'] for r in parallel[symbol].all_results] == \
+            [r['params'] for r in threaded[symbol].all_results]
+        assert parallel[symbol].best_score == threaded[symbol].best_score
+
+    top = optimizer.optimize_multiple_symbols(["AAPL"], jobs=2, top_k=3)
+    assert top["AAPL"].all_results == parallel["AAPL"].all_results[:3]
+
+
+def test_multiplier_is_not_swept():
+    optimizer = NASDAQOptimizer(data_provider=StubProvider())
+    assert len(optimizer.param_ranges['multiplier']) == 1
+    assert len(optimizer._param_combinations()[0]) == 96
+
+    # The multiplier does not change the scored signals
+    df = StubProvider().get_multiple_symbols_data(["AAPL"])["AAPL"]
+    scores = [optimizer._test_parameters("AAPL", df, (3.0, 7, multiplier, False)) for multiplier in (1.0, 2.0)]
+    assert {k: v for k, v in scores[0].items() if k != 'params'} == {k: v for k, v in scores[1].items() if k != 'params'}
@@ -0,0 +1,125 @@
+"""
+Tests for the persistent, batched NASDAQ data provider using a stubbed source.
+"""
+
+import json
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta, timezone
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.data.nasdaq_provider import NASDAQDataProvider
+from strategy_optimizer_v2.src.optimize.nasdaq_optimizer import NASDAQOptimizer
+
+
+def make_history(symbol, end, days=800):
+    """Daily Yahoo-style frame (capitalized columns, 'Date' index)."""
+    dates = pd.date_range(end=end, periods=days, freq="D", name="Date")
+    base = 50.0 + sum(map(ord, symbol)) % 50
+    close = base + np.sin(np.arange(days) / 10.0) * 5 + np.arange(days) * 0.05
+    return pd.DataFrame({
+        "Open": close,
+        "High": close + 1,
+        "Low": close - 1,
+        "Close": close,
+        "Volume": np.full(days, 1_000_000.0),
+    }, index=dates)
+
+
+class StubSource:
+    """Serves prepared histories and records every batched request."""
+
+    def __init__(self, end):
+        self.end = pd.Timestamp(end)
+        self.calls = []
+
+    def download(self, symbols, interval="1d", period=None, start=None):
+        self.calls.append({"symbols": list(symbols), "period": period, "start": start})
+        data = {}
+        for symbol in symbols:
+            df = make_history(symbol, self.end)
+            if start is not None:
+                df = df[df.index >= pd.Timestamp(start)]
+            data[symbol] = df
+        return data
+
+
+def today():
+    return pd.Timestamp.now().normalize()
+
+
+def test_missing_symbols_are_downloaded_in_one_batch(tmp_path):
+    source = StubSource(today())
+    provider = NASDAQDataProvider(cache_dir=str(tmp_path), source=source)
+
+    data = provider.get_multiple_symbols_data(["aapl", "MSFT", "NVDA"], period="2y")
+
+    assert list(data) == ["AAPL", "MSFT", "NVDA"]
+    assert len(source.calls) == 1
+    assert source.calls[0]["symbols"] == ["AAPL", "MSFT", "NVDA"]
+    assert list(data["AAPL"].columns[:6]) == ["date", "open", "high", "low", "close", "volume"]
+    # Sliced to the requested period
+    assert data["AAPL"]["date"].iloc[0] >= today() - pd.DateOffset(years=2)
+    assert (tmp_path / "AAPL_1d.parquet").exists()
+
+
+def test_fresh_cache_is_served_from_disk(tmp_path):
+    source = StubSource(today())
+    NASDAQDataProvider(cache_dir=str(tmp_path), source=source).get_multiple_symbols_data(["AAPL", "MSFT"], period="2y")
+
+    provider = NASDAQDataProvider(cache_dir=str(tmp_path), source=source)
+    data = provider.get_multiple_symbols_data(["AAPL", "MSFT"], period="1y")
+    assert len(source.calls) == 1
+    assert len(data["MSFT"]) > 300
+
+    # A longer period than the cached one is downloaded again
+    provider.fetch_data("AAPL", period="5y")
+    assert source.calls[-1] == {"symbols": ["AAPL"], "period": "5y", "start": None}
+
+
+def test_stale_cache_is_updated_incrementally(tmp_path):
+    yesterday = today() - timedelta(days=1)
+    NASDAQDataProvider(cache_dir=str(tmp_path), source=StubSource(yesterday)).get_multiple_symbols_data(
+        ["AAPL", "MSFT"], period="2y")
+
+    # Pretend the files were written yesterday
+    metadata_file = tmp_path / "metadata.json"
+    metadata = json.loads(metadata_file.read_text())
+    for entry in metadata.values():
+        entry["updated_at"] = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+    metadata_file.write_text(json.dumps(metadata))
+
+    source = StubSource(today())
+    provider = NASDAQDataProvider(cache_dir=str(tmp_path), source=source)
+    data = provider.get_multiple_symbols_data(["AAPL", "MSFT"], period="2y")
+
+    assert len(source.calls) == 1
+    assert source.calls[0]["period"] is None
+    assert pd.Timestamp(source.calls[0]["start"]) == yesterday
+    assert data["AAPL"]["date"].iloc[-1] == today()
+    assert data["AAPL"]["date"].is_unique
+
+    # Updated today: no further requests
+    NASDAQDataProvider(cache_dir=str(tmp_path), source=source).get_multiple_symbols_data(["AAPL", "MSFT"], period="2y")
+    assert len(source.calls) == 1
+
+
+def test_optimizer_prefetches_all_symbols(tmp_path):
+    source = StubSource(today())
+    provider = NASDAQDataProvider(cache_dir=str(tmp_path), source=source)
+    optimizer = NASDAQOptimizer(data_provider=provider)
+    optimizer.param_ranges = {
+        'key_value': [2.0],
+        'atr_period': [10],
+        'multiplier': [1.5],
+        'use_heikin_ashi': [False],
+    }
+
+    results = optimizer.optimize_multiple_symbols(["AAPL", "MSFT"], period="1y", max_workers=1)
+
+    assert len(source.calls) == 1
+    assert set(results) == {"AAPL", "MSFT"}
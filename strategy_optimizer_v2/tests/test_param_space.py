@@ -0,0 +1,219 @@
+"""
+Tests for lazy parameter space enumeration.
+"""
+
+import itertools
+import pickle
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.optimize.param_space import ParamSpace, canonicalize_param_combinations
+
+
+@pytest.fixture
+def param_space_dict():
+    """Small mixed-type parameter space."""
+    return {
+        'a': [1.5, 2.0, 2.5],
+        'c': [7, 10],
+        'use_trailing_stop': [True, False],
+        'ema_fast_len': [9, 12, 15, 20],
+    }
+
+
+def expected_combinations(param_space_dict):
+    names = list(param_space_dict.keys())
+    return [dict(zip(names, combo)) for combo in itertools.product(*param_space_dict.values())]
+
+
+class TestParamSpace:
+    """Test cases for ParamSpace."""
+
+    def test_matches_itertools_product_order(self, param_space_dict):
+        space = ParamSpace(param_space_dict)
+
+        assert len(space) == 3 * 2 * 2 * 4
+        assert list(space) == expected_combinations(param_space_dict)
+
+    def test_decode_encode_roundtrip(self, param_space_dict):
+        space = ParamSpace(param_space_dict)
+
+        for i in range(len(space)):
+            assert space.encode(space.decode(i)) == i
+
+        assert space[-1] == expected_combinations(param_space_dict)[-1]
+        with pytest.raises(IndexError):
+            space.decode(len(space))
+
+    def test_index_ranges_cover_space(self, param_space_dict):
+        space = ParamSpace(param_space_dict)
+        ranges = space.index_ranges(10)
+
+        assert ranges[0] == (0, 10)
+        assert ranges[-1][1] == len(space)
+
+        combos = []
+        for start, stop in ranges:
+            combos.extend(space.take(start, stop))
+        assert combos == list(space)
+
+    def test_shards_are_disjoint_and_complete(self, param_space_dict):
+        space = ParamSpace(param_space_dict)
+        num_shards = 5
+
+        seen = []
+        for shard_id in range(num_shards):
+            shard = space.shard(shard_id, num_shards)
+            seen.extend(space.encode(p) for p in shard)
+
+        assert sorted(seen) == list(range(len(space)))
+        assert len(set(seen)) == len(space)
+
+        with pytest.raises(ValueError):
+            space.shard(5, 5)
+
+    def test_random_sample_is_deterministic_and_unique(self, param_space_dict):
+        space = ParamSpace(param_space_dict)
+
+        sample1 = space.sample_random(20, seed=7)
+        sample2 = space.sample_random(20, seed=7)
+
+        assert len(sample1) == 20
+        assert list(sample1) == list(sample2)
+        indices = [space.encode(p) for p in sample1]
+        assert len(set(indices)) == 20
+
+        # Sampling more than available returns the full space
+        assert len(space.sample_random(1000, seed=1)) == len(space)
+
+    def test_sobol_sample_covers_every_axis(self, param_space_dict):
+        space = ParamSpace(param_space_dict)
+        sample = space.sample_sobol(32, seed=3)
+
+        assert 0 < len(sample) <= 32
+        for name, values in param_space_dict.items():
+            assert {p[name] for p in sample} == set(values)
+
+        assert list(sample) == list(space.sample_sobol(32, seed=3))
+
+    def test_sharded_sample_and_pickle(self, param_space_dict):
+        space = ParamSpace(param_space_dict).sample_random(30, seed=0)
+        shard = space.shard(1, 3)
+
+        restored = pickle.loads(pickle.dumps(shard))
+        assert list(restored) == list(shard)
+        assert len(shard) == 10
+
+    def test_large_space_is_lazy(self):
+        # 10 axes with 10 values each: 1e10 combinations
+        space = ParamSpace({f'p{i}': list(range(10)) for i in range(10)})
+
+        assert len(space) == 10 ** 10
+        assert space.decode(1234567890) == {f'p{i}': int(d) for i, d in enumerate('1234567890')}
+
+        sample = space.sample_random(100, seed=0)
+        assert len(sample) == 100
+        assert isinstance(sample.indices, np.ndarray)
+
+
+@pytest.fixture
+def conditional_space_dict():
+    """Parameter space with a toggle and an ordered pair."""
+    return {
+        'use_trailing_stop': [False, True],
+        'trailing_stop_mult': [1.0, 1.5, 2.0],
+        'ema_fast_len': [9, 12, 20],
+        'ema_slow_len': [12, 21],
+    }
+
+
+class TestCanonicalParamSpace:
+    """Test cases for conditional and constrained parameter spaces."""
+
+    def brute_force(self, space):
+        """Reference canonical set via per-combination canonicalize."""
+        expected = []
+        for params in ParamSpace(space.param_space):
+            canonical = space.canonicalize(params)
+            if space.satisfies_constraints(canonical) and canonical not in expected:
+                expected.append(canonical)
+        return expected
+
+    def test_canonical_removes_inactive_duplicates(self, conditional_space_dict):
+        space = ParamSpace(
+            conditional_space_dict,
+            conditions={'trailing_stop_mult': {'use_trailing_stop': True}},
+        )
+        canonical = space.canonical()
+
+        # 3 fast * 2 slow * (1 disabled + 3 enabled trailing settings)
+        assert len(canonical) == 3 * 2 * 4
+        assert [p for p in canonical] == self.brute_force(space)
+        for params in canonical:
+            if not params['use_trailing_stop']:
+                assert params['trailing_stop_mult'] == 1.0
+
+    def test_constraints_filter_invalid_pairs(self, conditional_space_dict):
+        space = ParamSpace(conditional_space_dict, constraints=['ema_fast_len < ema_slow_len'])
+        canonical = space.canonical()
+
+        assert all(p['ema_fast_len'] < p['ema_slow_len'] for p in canonical)
+        # Valid (fast, slow) pairs: (9,12), (9,21), (12,21), (20,21)
+        assert len(canonical) == 4 * 2 * 3
+
+    def test_constraint_skipped_when_inactive(self, conditional_space_dict):
+        space = ParamSpace(
+            dict(conditional_space_dict, use_ema_confirmation=[False, True]),
+            conditions={
+                'ema_fast_len': {'use_ema_confirmation': True},
+                'ema_slow_len': {'use_ema_confirmation': True},
+            },
+            constraints=['ema_fast_len < ema_slow_len'],
+        )
+
+        assert list(space.canonical()) == self.brute_force(space)
+        assert space.satisfies_constraints({'use_ema_confirmation': False,
+                                            'ema_fast_len': 20, 'ema_slow_len': 12})
+
+    def test_canonical_of_sample_stays_in_sample(self, conditional_space_dict):
+        space = ParamSpace(conditional_space_dict, constraints=['ema_fast_len < ema_slow_len'])
+        sample = space.sample_random(10, seed=0)
+        canonical = sample.canonical()
+
+        sample_indices = set(space.encode(p) for p in sample)
+        assert all(space.encode(p) in sample_indices for p in canonical)
+
+    def test_invalid_constraint_raises(self):
+        with pytest.raises(ValueError):
+            ParamSpace({'a': [1, 2]}, constraints=['a <> 1'])
+
+    def test_canonicalize_list_input(self):
+        combos = [
+            {'use_trailing_stop': False, 'trailing_stop_mult': 1.0},
+            {'use_trailing_stop': False, 'trailing_stop_mult': 2.0},
+            {'use_trailing_stop': True, 'trailing_stop_mult': 2.0},
+        ]
+        deduped, stats = canonicalize_param_combinations(
+            combos, conditions={'trailing_stop_mult': {'use_trailing_stop': True}}
+        )
+
+        assert deduped == [combos[0], combos[2]]
+        assert stats['total_combinations'] == 3
+        assert stats['skipped_combinations'] == 1
+
+    def test_default_config_space_is_reduced(self):
+        from strategy_optimizer_v2.src.config import get_param_space
+
+        space = get_param_space()
+        deduped, stats = canonicalize_param_combinations(space)
+
+        assert stats['total_combinations'] == len(space)
+        assert 0 < stats['evaluated_combinations'] < stats['total_combinations']
+        for params in deduped.take(0, 2000):
+            if params['use_ema_confirmation']:
+                assert params['ema_fast_len'] < params['ema_slow_len']
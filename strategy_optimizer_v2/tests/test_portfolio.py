@@ -0,0 +1,131 @@
+"""
+Tests for the shared-capital portfolio backtester.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.strategy.backtester import run_backtest
+from strategy_optimizer_v2.src.optimize.portfolio import (
+    PortfolioBacktester, build_portfolio_signals, correlation_groups, run_portfolio_backtest,
+)
+
+
+def make_data(n=1500, seed=0, start="2024-01-01"):
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range(start, periods=n, freq="h", tz="UTC")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    return pd.DataFrame({"open": close, "high": close * 1.003, "low": close * 0.997, "close": close,
+                         "volume": np.full(n, 10.0)}, index=ts)
+
+
+def make_signals(data, seed, atr_based=False, trailing=False):
+    """Random long/short entries with percentage or ATR-based SL/TP."""
+    rng = np.random.default_rng(seed)
+    n = len(data)
+    signals = pd.DataFrame({
+        "buy_final": rng.random(n) < 0.03,
+        "sell_final": rng.random(n) < 0.03,
+        "atr_sl_mult": 2.0 if atr_based else 0.006,
+        "atr_rr": 3.0 if atr_based else 0.004,
+    }, index=data.index)
+    if atr_based:
+        signals["atr"] = data["close"] * 0.002
+    if trailing:
+        signals["trailing_tp"] = data["close"] * np.where(rng.random(n) < 0.5, 1.004, 0.996)
+    return signals
+
+
+@pytest.mark.parametrize("atr_based,trailing", [(False, False), (True, False), (False, True)])
+def test_single_symbol_matches_backtester(atr_based, trailing):
+    data = make_data()
+    signals = make_signals(data, 1, atr_based, trailing)
+    full = run_backtest(data, signals, fee_bps=10, slippage_bps=5)
+    portfolio = run_portfolio_backtest({"BTC": data}, {"BTC": signals}, fee_bps=10, slippage_bps=5)
+
+    trades = portfolio.trades
+    assert len(trades) == len(full.trades) > 0
+    np.testing.assert_allclose(trades['pnl'], [t.pnl for t in full.trades], rtol=1e-12)
+    np.testing.assert_allclose(trades['commission'], [t.commission for t in full.trades], rtol=1e-12)
+    assert list(trades['exit_reason']) == [t.exit_reason for t in full.trades]
+    assert list(trades['entry_time']) == [t.entry_time for t in full.trades]
+    # Same cash once every position is closed; open margin is counted in portfolio equity
+    assert portfolio.metrics['final_capital'] == pytest.approx(
+        10000 + sum(t.pnl - t.quantity * t.exit_price * 0.001 for t in full.trades))
+    assert portfolio.metrics['num_trades'] == len(full.trades)
+
+
+def test_shared_capital_and_limits():
+    symbols = [f"S{i}" for i in range(6)]
+    data = {s: make_data(seed=i) for i, s in enumerate(symbols)}
+    # Everyone wants to be long on the same bars
+    signals = {}
+    for s in symbols:
+        frame = make_signals(data[s], 7)
+        frame["sell_final"] = False
+        signals[s] = frame
+
+    unlimited = run_portfolio_backtest(data, signals, groups={s: 0 for s in symbols})
+    assert unlimited.rejected == {'capital': 0, 'max_positions': 0, 'correlation': 0}
+    assert unlimited.metrics['max_open_positions'] == 6
+
+    capped = run_portfolio_backtest(data, signals, max_positions=2, groups={s: 0 for s in symbols})
+    assert capped.open_positions.max() == 2
+    assert capped.rejected['max_positions'] > 0
+
+    # Three longs per group of three symbols
+    groups = {s: i // 3 for i, s in enumerate(symbols)}
+    grouped = run_portfolio_backtest(data, signals, max_correlated_positions=1, groups=groups)
+    assert grouped.rejected['correlation'] > 0
+    assert grouped.open_positions.max() <= 2
+    assert set(grouped.symbol_summary['group']) == {0, 1}
+
+    # Capital for two margins only
+    poor = run_portfolio_backtest(data, signals, initial_capital=450, groups={s: 0 for s in symbols})
+    assert poor.open_positions.max() == 2
+    assert poor.rejected['capital'] > 0
+    assert poor.symbol_summary['num_trades'].sum() == len(poor.trades)
+
+
+def test_unaligned_timelines_and_correlation_groups():
+    base = make_data(n=800, seed=3)
+    twin = base * 1.5
+    other = make_data(n=600, seed=4, start="2024-01-10")
+    data = {"A": base, "B": twin, "C": other}
+    assert correlation_groups(pd.DataFrame({s: d['close'] for s, d in data.items()})) == {"A": 0, "B": 0, "C": 1}
+
+    signals = {s: make_signals(d, i) for i, (s, d) in enumerate(data.items())}
+    result = PortfolioBacktester(max_correlated_positions=1).run_backtest(data, signals)
+    assert result.groups == {"A": 0, "B": 0, "C": 1}
+    assert result.equity_curve.index.equals(base.index.union(other.index))
+    assert not result.equity_curve.isna().any()
+
+    late = result.trades[result.trades['symbol'] == "C"]
+    assert (late['entry_time'] >= other.index[0]).all()
+    assert (late['exit_time'] <= other.index[-1]).all()
+    # Equity at the end is the realized cash balance (exit commissions are charged to cash)
+    trades = result.trades
+    exit_commission = trades['quantity'] * trades['exit_price'] * 0.0005
+    assert result.equity_curve.iloc[-1] == pytest.approx(10000 + (trades['pnl'] - exit_commission).sum())
+
+
+class FakeStrategy:
+    def __init__(self, params):
+        self.params = params
+
+    def run_strategy(self, data):
+        return make_signals(data, self.params['seed'])
+
+
+def test_build_portfolio_signals():
+    data = {"A": make_data(n=100, seed=1), "B": make_data(n=100, seed=2)}
+    shared = build_portfolio_signals(data, FakeStrategy, {'seed': 5})
+    per_symbol = build_portfolio_signals(data, FakeStrategy, {"A": {'seed': 5}, "B": {'seed': 6}})
+    pd.testing.assert_frame_equal(shared["B"], make_signals(data["B"], 5))
+    pd.testing.assert_frame_equal(per_symbol["B"], make_signals(data["B"], 6))
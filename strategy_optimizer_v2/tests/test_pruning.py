@@ -0,0 +1,99 @@
+"""
+Tests for early-abort (pruning) rules in the backtester.
+"""
+
+import pandas as pd
+import numpy as np
+from datetime import datetime
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.strategy.backtester import Backtester, PruningRules, run_backtest
+from strategy_optimizer_v2.src.optimize.metrics import filter_results_by_metrics
+
+
+def make_falling_df(n=300):
+    """Steadily falling prices."""
+    ts = pd.date_range(datetime(2024, 1, 1), periods=n, freq="h", tz="UTC")
+    close = np.linspace(100, 50, n)
+    return pd.DataFrame({
+        "open": close,
+        "high": close * 1.001,
+        "low": close * 0.999,
+        "close": close,
+        "volume": np.full(n, 1000.0),
+    }, index=ts)
+
+
+def make_signals(df, buy_every=None):
+    """Long entries every `buy_every` bars with wide percentage SL/TP."""
+    buy = np.zeros(len(df), dtype=bool)
+    if buy_every:
+        buy[::buy_every] = True
+    return pd.DataFrame({
+        "buy_final": buy,
+        "sell_final": np.zeros(len(df), dtype=bool),
+        "atr_sl_mult": 0.9,
+        "atr_rr": 0.9,
+    }, index=df.index)
+
+
+def test_no_rules_runs_to_the_end():
+    df = make_falling_df()
+    signals = make_signals(df, buy_every=10)
+
+    result = run_backtest(df, signals, pruning=PruningRules())
+
+    assert not result.pruned
+    assert result.bars_processed == result.total_bars == len(df)
+    assert len(result.equity_curve) == len(df)
+
+
+def test_max_drawdown_prunes_and_matches_full_run_prefix():
+    df = make_falling_df()
+    signals = make_signals(df, buy_every=10)
+    rules = PruningRules(max_drawdown_pct=5.0)
+
+    full = run_backtest(df, signals)
+    pruned = run_backtest(df, signals, pruning=rules)
+
+    assert pruned.pruned
+    assert pruned.prune_reason == 'max_drawdown'
+    assert pruned.bars_processed < len(df)
+    assert pruned.trades[-1].exit_reason == 'pruned'
+
+    # The partial equity curve is the prefix of the full run
+    k = pruned.bars_processed
+    np.testing.assert_allclose(pruned.equity_curve.values, full.equity_curve.values[:k])
+
+    # The full run would have been rejected by the implied final filter
+    filters = rules.implied_filters(len(df))
+    assert filter_results_by_metrics([{'metrics': full.metrics}], filters) == []
+
+
+def test_min_trades_rule():
+    df = make_falling_df()
+    rules = PruningRules(min_trades=1, trades_window_bars=50)
+
+    idle = run_backtest(df, make_signals(df), pruning=rules)
+    assert idle.pruned
+    assert idle.prune_reason == 'min_trades'
+    assert idle.bars_processed == 50
+
+    # A single long-held position satisfies one entry per 200 bars
+    rules = PruningRules(min_trades=1, trades_window_bars=200)
+    active = Backtester(pruning=rules).run_backtest(df, make_signals(df, buy_every=20))
+    assert not active.pruned
+
+
+def test_implied_filters():
+    rules = PruningRules(max_drawdown_pct=30.0, equity_floor_pct=60.0, min_trades=2, trades_window_bars=100)
+    filters = rules.implied_filters(total_bars=1000)
+
+    assert filters['max_drawdown_pct'][0] == -30.0
+    assert filters['num_trades'][0] == 20
+    assert PruningRules().implied_filters(1000) == {}
+    assert not PruningRules().enabled
@@ -0,0 +1,231 @@
+"""
+Tests for the streaming results store, resume-on-restart and store-backed reporting.
+"""
+
+import pickle
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.config import get_config
+from strategy_optimizer_v2.src.optimize.grid_search import GridSearchOptimizer
+from strategy_optimizer_v2.src.optimize.param_space import ParamSpace
+from strategy_optimizer_v2.src.optimize.results_store import ResultsStore, data_fingerprint, params_hash
+from strategy_optimizer_v2.src.reporting.reporter import ResultsReporter
+
+
+def make_ohlcv(n=200, offset=0.0):
+    ts = pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC", name="timestamp")
+    close = 100 + np.arange(n, dtype=float) + offset
+    return pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close,
+                         "volume": np.full(n, 10.0)}, index=ts)
+
+
+def fake_result(symbol, timeframe, params):
+    """Deterministic result whose metrics depend on the parameters."""
+    score = params['a'] * 10 + params['c'] / 10 + params['st_factor']
+    return {
+        'symbol': symbol,
+        'timeframe': timeframe,
+        'params': params,
+        'metrics': {
+            'profit_factor': np.float64(score / 10),
+            'total_return_pct': score - 20,
+            'max_drawdown_pct': -params['c'] / 2,
+            'sharpe_ratio': params['st_factor'],
+            'num_trades': np.int64(params['c']),
+        },
+        'num_trades': int(params['c']),
+        'success': True,
+    }
+
+
+class FakeLoader:
+    def __init__(self, data):
+        self.data = data
+
+    def get_ohlcv(self, symbol, timeframe):
+        return self.data
+
+
+def make_optimizer(store, data, crash_after=None, fail_params=None):
+    """Optimizer wired to a fake loader and a cheap evaluation function."""
+    optimizer = GridSearchOptimizer.__new__(GridSearchOptimizer)
+    optimizer.config = get_config().model_copy(deep=True)
+    # Evaluate combination by combination through the fake evaluation function
+    optimizer.config.optimization.backtest_batch_size = 1
+    optimizer.data_loader = FakeLoader(data)
+    optimizer.results = []
+    optimizer.pruned_results = []
+    optimizer.search_stats = {}
+    optimizer.pruning = None
+    optimizer.store = store
+    optimizer.resume = True
+    optimizer.store_batch_size = 3
+    optimizer._fingerprints = {}
+    optimizer._resumed = 0
+    optimizer.evaluated = []
+
+    def evaluate(symbol, timeframe, params, data, strategy_factory=None, use_pruning=True):
+        if crash_after is not None and len(optimizer.evaluated) == crash_after:
+            raise RuntimeError("worker crashed")
+        optimizer.evaluated.append(params)
+        if params == fail_params:
+            return {'symbol': symbol, 'timeframe': timeframe, 'params': params,
+                    'error': "backtest failed", 'success': False}
+        return fake_result(symbol, timeframe, params)
+
+    optimizer.optimize_single_combination = evaluate
+    return optimizer
+
+
+SPACE = {'a': [1.0, 2.0, 3.0], 'c': [10, 14], 'st_factor': [1.0, 1.5]}
+
+
+def test_store_roundtrip_and_top_k(tmp_path):
+    store = ResultsStore(tmp_path / "results.sqlite")
+    results = [fake_result("BTC/USDT", "1h", p) for p in ParamSpace(SPACE)]
+    store.add(results, "fp")
+
+    assert store.count() == 12
+    assert "param_a" in store.param_columns and "metric_profit_factor" in store.metric_columns
+
+    top = store.get_top_results(3, 'profit_factor')
+    expected = sorted(results, key=lambda r: r['metrics']['profit_factor'], reverse=True)[:3]
+    assert [r['params'] for r in top] == [r['params'] for r in expected]
+    assert top[0]['metrics']['num_trades'] == expected[0]['metrics']['num_trades']
+
+    assert store.evaluated("BTC/USDT", "1h", "fp") == {params_hash(r['params']) for r in results}
+    assert store.evaluated("BTC/USDT", "1h", "other") == set()
+
+    # Same key replaces; the connection is not pickled
+    store.add(results[:1], "fp")
+    assert store.count() == 12
+    clone = pickle.loads(pickle.dumps(store))
+    assert clone.count() == 12
+
+    csv_file = tmp_path / "results.csv"
+    assert store.export_csv(csv_file, chunksize=5) == 12
+    assert len(pd.read_csv(csv_file)) == 12
+
+
+def test_interrupted_run_resumes_where_it_stopped(tmp_path):
+    data = make_ohlcv()
+    store_file = tmp_path / "results.sqlite"
+
+    crashed = make_optimizer(ResultsStore(store_file), data, crash_after=7)
+    with pytest.raises(RuntimeError):
+        crashed.run_optimization(["BTC/USDT"], ["1h"], ParamSpace(SPACE), parallel=False)
+    # Two full batches of three were flushed before the crash
+    assert ResultsStore(store_file).count() == 6
+
+    resumed = make_optimizer(ResultsStore(store_file), data)
+    top = resumed.run_optimization(["BTC/USDT"], ["1h"], ParamSpace(SPACE), parallel=False)
+
+    assert len(resumed.evaluated) == 6
+    assert resumed.search_stats['results_store']['resumed_combinations'] == 6
+    assert resumed.store.count() == 12
+    assert resumed.results == []
+    assert top[0]['params'] == {'a': 3.0, 'c': 14, 'st_factor': 1.5}
+
+    # Changed data invalidates the stored results
+    refreshed = make_optimizer(ResultsStore(store_file), make_ohlcv(offset=1.0))
+    refreshed.run_optimization(["BTC/USDT"], ["1h"], ParamSpace(SPACE), parallel=False)
+    assert len(refreshed.evaluated) == 12
+    assert data_fingerprint(data) != data_fingerprint(make_ohlcv(offset=1.0))
+
+
+def test_failed_combinations_are_retried_on_resume(tmp_path):
+    data = make_ohlcv()
+    store_file = tmp_path / "results.sqlite"
+    failing = {'a': 2.0, 'c': 14, 'st_factor': 1.0}
+
+    first = make_optimizer(ResultsStore(store_file), data, fail_params=failing)
+    first.run_optimization(["BTC/USDT"], ["1h"], ParamSpace(SPACE), parallel=False)
+    assert first.store.count() == 11 and first.store.count(success=False) == 1
+
+    resumed = make_optimizer(ResultsStore(store_file), data)
+    resumed.run_optimization(["BTC/USDT"], ["1h"], ParamSpace(SPACE), parallel=False)
+
+    assert resumed.evaluated == [failing]
+    assert resumed.store.count() == 12 and resumed.store.count(success=False) == 0
+
+
+def test_resume_is_scoped_to_strategy_and_run_settings(tmp_path):
+    from strategy_optimizer_v2.src.strategy.backtester import PruningRules
+    from strategy_optimizer_v2.src.strategy.volensy_macd_trend import create_strategy as create_volensy_strategy
+
+    data = make_ohlcv()
+    store_file = tmp_path / "results.sqlite"
+    first = make_optimizer(ResultsStore(store_file), data)
+    first.run_optimization(["BTC/USDT"], ["1h"], ParamSpace(SPACE), parallel=False)
+
+    # Another strategy on the same store evaluates everything and only sees its own rows
+    other = make_optimizer(ResultsStore(store_file), data)
+    top = other.run_optimization(["BTC/USDT"], ["1h"], ParamSpace(SPACE), create_volensy_strategy, parallel=False)
+    assert len(other.evaluated) == 12 and other._resumed == 0
+    assert other.store.count() == 12 and top[0]['params'] == {'a': 3.0, 'c': 14, 'st_factor': 1.5}
+    assert ResultsStore(store_file).count() == 24
+
+    # Changed pruning rules (part of the run settings) invalidate the stored rows
+    pruned = make_optimizer(ResultsStore(store_file), data)
+    pruned.pruning = PruningRules(max_drawdown_pct=50.0)
+    pruned.run_optimization(["BTC/USDT"], ["1h"], ParamSpace(SPACE), parallel=False)
+    assert len(pruned.evaluated) == 12
+
+    same = make_optimizer(ResultsStore(store_file), data)
+    same.run_optimization(["BTC/USDT"], ["1h"], ParamSpace(SPACE), parallel=False)
+    assert same.evaluated == []
+
+
+def test_legacy_store_rows_are_moved_aside(tmp_path):
+    import sqlite3
+
+    store_file = tmp_path / "results.sqlite"
+    with sqlite3.connect(store_file) as conn:
+        conn.execute("CREATE TABLE results (id INTEGER PRIMARY KEY, symbol TEXT, timeframe TEXT, params_hash TEXT, "
+                     "data_fingerprint TEXT, UNIQUE (symbol, timeframe, params_hash, data_fingerprint))")
+        conn.execute("INSERT INTO results (symbol, timeframe, params_hash, data_fingerprint) VALUES ('BTC/USDT', '1h', 'h', 'fp')")
+
+    store = ResultsStore(store_file, strategy="atr_st_core.create_strategy", run_hash="r")
+    assert store.count(success=None, pruned=None) == 0
+    assert store.evaluated("BTC/USDT", "1h", "fp") == set()
+    assert store.conn.execute("SELECT COUNT(*) FROM results_unscoped").fetchone()[0] == 1
+
+
+def test_symbol_without_data_has_no_pending_combinations(tmp_path):
+    class MissingLoader:
+        def get_ohlcv(self, symbol, timeframe):
+            raise FileNotFoundError(symbol)
+
+    optimizer = make_optimizer(ResultsStore(tmp_path / "results.sqlite"), make_ohlcv())
+    optimizer.data_loader = MissingLoader()
+
+    pending = optimizer._pending_combinations("BTC/USDT", "1h", ParamSpace(SPACE))
+    assert isinstance(pending, ParamSpace) and pending.index_ranges(4) == []
+    assert optimizer._pending_combinations("BTC/USDT", "1h", list(ParamSpace(SPACE))) == []
+
+
+def test_reporter_tables_match_in_memory_results(tmp_path):
+    results = [fake_result(symbol, tf, p) for symbol in ("BTC/USDT", "ETH/USDT")
+               for tf in ("1h", "4h") for p in ParamSpace(SPACE)]
+    store = ResultsStore(tmp_path / "results.sqlite")
+    store.add(results, "fp")
+    reporter = ResultsReporter(str(tmp_path / "reports"))
+
+    pd.testing.assert_frame_equal(reporter.create_summary_table(store, 5),
+                                  reporter.create_summary_table(results, 5))
+    pd.testing.assert_frame_equal(reporter.create_symbol_timeframe_summary(store),
+                                  reporter.create_symbol_timeframe_summary(results), check_dtype=False)
+
+    stored_analysis = reporter.create_parameter_analysis(store)
+    for name, table in reporter.create_parameter_analysis(results).items():
+        pd.testing.assert_frame_equal(stored_analysis[name], table, check_dtype=False)
+
+    pd.testing.assert_frame_equal(reporter.create_parameter_heatmap_data(store, 'a', 'c'),
+                                  reporter.create_parameter_heatmap_data(results, 'a', 'c'))
@@ -0,0 +1,115 @@
+"""
+Tests for Monte Carlo robustness analysis and its summary table columns.
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.strategy.backtester import BacktestResult, Trade
+from strategy_optimizer_v2.src.optimize.robustness import (
+    analyze_backtest, block_bootstrap_returns, bootstrap_trades, confidence_interval,
+    load_robustness, perturb_slippage, run_robustness, save_robustness
+)
+from strategy_optimizer_v2.src.reporting.reporter import ResultsReporter
+
+PARAMS = {'a': 1.0, 'c': 10, 'st_factor': 1.5, 'min_delay_m': 0, 'atr_sl_mult': 2.0, 'atr_rr': 2.0}
+
+
+def closed_trade_path(pnl, capital):
+    """Reference profit factor, max drawdown % and return % of one trade sequence."""
+    equity = capital + np.cumsum(pnl)
+    peak = np.maximum(np.maximum.accumulate(equity), capital)
+    loss = -pnl[pnl < 0].sum()
+    return (pnl[pnl > 0].sum() / loss, min(((equity - peak) / peak).min(), 0) * 100,
+            (equity[-1] - capital) / capital * 100)
+
+
+def make_backtest(n_trades=60, seed=0, params=PARAMS):
+    """Full backtest result with random trades over an hourly equity curve."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=24 * 90, freq="h", tz="UTC")
+    pnl = rng.normal(5, 40, n_trades)
+    exits = np.sort(rng.choice(np.arange(1, len(index)), n_trades, replace=False))
+    trades = [Trade(entry_time=index[i - 1], exit_time=index[i], entry_price=100.0, exit_price=101.0,
+                    side='long', quantity=20.0, stop_loss=98.0, take_profit=103.0, pnl=float(p))
+              for i, p in zip(exits, pnl)]
+    realized = np.zeros(len(index))
+    realized[exits] = pnl
+    equity = pd.Series(10000 + np.cumsum(realized), index=index)
+    return BacktestResult(trades=trades, equity_curve=equity, metrics={}, parameters=params,
+                          symbol="BTC/USDT", timeframe="1h", start_date=index[0], end_date=index[-1])
+
+
+def test_unresampled_paths_reproduce_the_original_sequence():
+    pnl = np.random.default_rng(1).normal(2, 30, 80)
+    expected = closed_trade_path(pnl, 10000.0)
+
+    paths = perturb_slippage(pnl, np.full(80, 4000.0), 0.0, 50, 10000.0)
+    for name, value in zip(('profit_factor', 'max_drawdown_pct', 'total_return_pct'), expected):
+        np.testing.assert_allclose(paths[name], value, rtol=1e-12, err_msg=name)
+
+    # Extra slippage only ever costs; its mean is slippage_bps on the turnover
+    slipped = perturb_slippage(pnl, np.full(80, 4000.0), 5.0, 20000, 10000.0, seed=3)
+    assert (slipped['profit_factor'] < expected[0]).all()
+    expected_cost = 80 * 4000.0 * 5.0 / 10000 / 10000.0 * 100
+    np.testing.assert_allclose(expected[2] - slipped['total_return_pct'].mean(), expected_cost, rtol=0.01)
+
+
+def test_bootstrap_is_seeded_and_brackets_the_original():
+    pnl = np.random.default_rng(2).normal(2, 30, 120)
+    first = bootstrap_trades(pnl, 5000, 10000.0, seed=7)
+    again = bootstrap_trades(pnl, 5000, 10000.0, seed=7)
+    other = bootstrap_trades(pnl, 5000, 10000.0, seed=8)
+
+    np.testing.assert_array_equal(first['profit_factor'], again['profit_factor'])
+    assert not np.array_equal(first['profit_factor'], other['profit_factor'])
+
+    profit_factor, _, total_return = closed_trade_path(pnl, 10000.0)
+    low, high = confidence_interval(first['profit_factor'], 0.9)
+    assert low < profit_factor < high
+    np.testing.assert_allclose(first['total_return_pct'].mean(), total_return, atol=0.5)
+
+    # A single winning trade has no losses: infinite profit factor without NaN
+    single = bootstrap_trades(np.array([10.0]), 100, 10000.0)
+    assert confidence_interval(single['profit_factor']) == (np.inf, np.inf)
+
+
+def test_block_bootstrap_of_whole_series_is_a_rotation():
+    returns = np.random.default_rng(3).normal(0.001, 0.02, 50)
+    paths = block_bootstrap_returns(returns, 200, block_size=50)
+
+    np.testing.assert_allclose(paths['total_return_pct'], (np.prod(1 + returns) - 1) * 100, rtol=1e-9)
+    assert (paths['max_drawdown_pct'] <= 0).all()
+
+    short_blocks = block_bootstrap_returns(returns, 200, block_size=3)
+    assert short_blocks['total_return_pct'].std() > 0
+
+
+def test_summary_table_gets_confidence_intervals(tmp_path):
+    analyzed = make_backtest(seed=0)
+    other_params = {**PARAMS, 'c': 14}
+    summaries = run_robustness([analyzed], n_paths=2000)
+    save_robustness(summaries, str(tmp_path / "robustness.json"))
+    robustness = load_robustness(str(tmp_path / "robustness.json"))
+
+    summary = summaries[0]
+    assert set(summary) >= {'bootstrap', 'block_bootstrap', 'slippage'}
+    assert summary == analyze_backtest(analyzed, n_paths=2000)
+    low, high = summary['bootstrap']['max_drawdown_pct']
+    assert low <= high <= 0
+
+    results = [
+        {'symbol': 'BTC/USDT', 'timeframe': '1h', 'params': PARAMS, 'metrics': {'profit_factor': 2.0}},
+        {'symbol': 'BTC/USDT', 'timeframe': '1h', 'params': other_params, 'metrics': {'profit_factor': 1.0}},
+    ]
+    table = ResultsReporter(str(tmp_path / "reports")).create_summary_table(results, 5, robustness=robustness)
+
+    assert table.loc[0, 'PF_CI_Low'] == round(summary['bootstrap']['profit_factor'][0], 2)
+    assert table.loc[0, 'Block_DD_CI_Low_%'] == round(summary['block_bootstrap']['max_drawdown_pct'][0], 2)
+    assert table.loc[0, 'Slippage_PF_CI_High'] == round(summary['slippage']['profit_factor'][1], 2)
+    assert table.loc[1, ['PF_CI_Low', 'DD_CI_High_%', 'Prob_Loss_%']].isna().all()
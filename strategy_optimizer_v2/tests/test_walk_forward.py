@@ -0,0 +1,125 @@
+"""
+Tests for walk-forward window resolution and resume.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.config import get_config
+from strategy_optimizer_v2.src.optimize import walk_forward
+from strategy_optimizer_v2.src.optimize.walk_forward import WalkForwardOptimizer
+from strategy_optimizer_v2.src.optimize.param_space import ParamSpace
+
+
+@pytest.fixture
+def wf_config(monkeypatch):
+    """Short rolling windows on hourly data."""
+    opt = get_config().optimization
+    monkeypatch.setattr(opt, 'wf_scheme', 'rolling')
+    monkeypatch.setattr(opt, 'train_windows', 3)
+    monkeypatch.setattr(opt, 'train_window_days', 10)
+    monkeypatch.setattr(opt, 'test_window_days', 5)
+    monkeypatch.setattr(opt, 'overlap_days', 0)
+    monkeypatch.setattr(opt, 'wf_warmup_bars', 48)
+    return opt
+
+
+@pytest.fixture
+def optimizer(tmp_path):
+    """WalkForwardOptimizer without a live data loader."""
+    wf = WalkForwardOptimizer.__new__(WalkForwardOptimizer)
+    wf.config = get_config()
+    wf.results = []
+    wf.search_stats = {}
+    wf.search_mode = 'grid'
+    wf.max_workers = 1
+    wf.resume_dir = tmp_path
+    wf.resumed_windows = 0
+    wf._grid_optimizer = None
+    return wf
+
+
+@pytest.fixture
+def data():
+    """40 days of hourly OHLCV data."""
+    n = 24 * 40
+    ts = pd.date_range(datetime(2024, 1, 1), periods=n, freq="h", tz="UTC")
+    close = np.linspace(100, 130, n)
+    return pd.DataFrame({
+        "open": close,
+        "high": close * 1.001,
+        "low": close * 0.999,
+        "close": close,
+        "volume": np.full(n, 1000.0),
+    }, index=ts)
+
+
+def test_windows_start_after_warmup(optimizer, wf_config, data):
+    windows = optimizer.resolve_windows(data)
+
+    assert [w['window_id'] for w in windows] == [0, 1, 2]
+    assert windows[0]['train_start'] == data.index[48]
+    assert windows[1]['train_start'] == windows[0]['test_start']
+    assert all(w['test_end'] <= data.index[-1] for w in windows)
+
+
+def test_window_signature_tracks_inputs(optimizer, wf_config, data, monkeypatch):
+    window = optimizer.resolve_windows(data)[0]
+    space = ParamSpace({'a': [1.5, 2.0], 'c': [7, 10]})
+
+    signature = optimizer._window_signature('BTC/USDT', '1h', data, window, space)
+    assert signature == optimizer._window_signature('BTC/USDT', '1h', data, window, space)
+    assert signature != optimizer._window_signature('BTC/USDT', '4h', data, window, space)
+    assert signature != optimizer._window_signature('BTC/USDT', '1h', data, window, space.take(0, 3))
+
+    # A corrected candle before the test end or a cost change invalidates the
+    # window; bars after it do not
+    corrected = data.copy()
+    corrected.iloc[100, corrected.columns.get_loc('close')] += 1.0
+    assert signature != optimizer._window_signature('BTC/USDT', '1h', corrected, window, space)
+    later = data.copy()
+    later.iloc[-1, later.columns.get_loc('close')] += 1.0
+    assert signature == optimizer._window_signature('BTC/USDT', '1h', later, window, space)
+    fee_bps = optimizer.config.strategy.fee_bps
+    monkeypatch.setattr(optimizer.config.strategy, 'fee_bps', fee_bps + 1)
+    assert signature != optimizer._window_signature('BTC/USDT', '1h', data, window, space)
+    monkeypatch.setattr(optimizer.config.strategy, 'fee_bps', fee_bps)
+
+    optimizer.search_mode = 'adaptive'
+    assert signature != optimizer._window_signature('BTC/USDT', '1h', data, window, space)
+
+
+def test_stored_windows_are_skipped(optimizer, wf_config, data, monkeypatch):
+    space = ParamSpace({'a': [1.5, 2.0], 'c': [7, 10]})
+    windows = optimizer.resolve_windows(data)
+
+    for window in windows:
+        signature = optimizer._window_signature('BTC/USDT', '1h', data, window, space)
+        optimizer._save_window('BTC/USDT', '1h', {
+            'window_id': window['window_id'],
+            'symbol': 'BTC/USDT',
+            'timeframe': '1h',
+            'best_params': {'a': 2.0, 'c': 10},
+            'test_metrics': {'profit_factor': 1.5},
+            'success': True,
+        }, signature)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("stored windows must not be recomputed")
+
+    monkeypatch.setattr(walk_forward, 'sweep_train_windows', fail)
+
+    results = optimizer.run_walk_forward('BTC/USDT', '1h', data, space)
+    assert [r['window_id'] for r in results] == [0, 1, 2]
+    assert optimizer.resumed_windows == 3
+
+    # A different parameter space invalidates the stored windows
+    with pytest.raises(AssertionError):
+        optimizer.run_walk_forward('BTC/USDT', '1h', data, space.take(0, 2))
@@ -0,0 +1,101 @@
+"""
+Tests for eagerly compiled kernels and optimizer worker warm-up.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import subprocess
+import numpy as np
+import pytest
+import sys
+import os
+
+# Add package root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from strategy_optimizer_v2.src.strategy import atr_st_core, volensy_macd_trend
+from strategy_optimizer_v2.src.strategy.backtester import _batch_kernel
+from strategy_optimizer_v2.src.optimize.warmup import (
+    init_worker, sequential_startup, start_workers, warm_up_kernels
+)
+from strategy_optimizer_v2.src.reporting.reporter import create_reporter
+
+
+KERNELS = [
+    atr_st_core.calculate_atr,
+    atr_st_core.calculate_ema,
+    atr_st_core.calculate_atr_trailing_stop,
+    atr_st_core.calculate_supertrend,
+    atr_st_core.detect_crossovers,
+    volensy_macd_trend.calculate_ema,
+    volensy_macd_trend.calculate_rsi,
+]
+
+
+@pytest.mark.parametrize("kernel", KERNELS, ids=lambda k: f"{k.py_func.__module__.rsplit('.', 1)[-1]}.{k.__name__}")
+def test_kernels_compiled_at_import(kernel):
+    assert len(kernel.signatures) == len(atr_st_core.PRICE_ARRAYS)
+    assert kernel.targetoptions.get("nopython")
+
+
+def test_cache_files_are_per_import_name():
+    # Loading the package's cached kernels under the CLI's ``src.`` name must
+    # not re-import them as ``strategy_optimizer_v2.src`` (not on the path there)
+    project = Path(__file__).resolve().parent.parent
+    script = "from src.strategy import atr_st_core; print(len(atr_st_core.calculate_atr.signatures))"
+    out = subprocess.run([sys.executable, "-c", script], cwd=project, capture_output=True, text=True,
+                         env={**os.environ, "PYTHONPATH": ""})
+
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == str(len(atr_st_core.PRICE_ARRAYS))
+
+
+def test_float32_and_read_only_inputs_use_compiled_signatures():
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, 200))
+    high, low = close + 1, close - 1
+    compiled = len(atr_st_core.calculate_atr.signatures)
+
+    expected = atr_st_core.calculate_atr(high, low, close, 14)
+    arrays32 = [a.astype(np.float32) for a in (high, low, close)]
+    for a in arrays32:
+        a.flags.writeable = False
+    atr32 = atr_st_core.calculate_atr(*arrays32, 14)
+    rsi32 = volensy_macd_trend.calculate_rsi(arrays32[2], 14)
+
+    assert atr32.dtype == np.float32
+    np.testing.assert_allclose(atr32, expected, rtol=1e-4)
+    np.testing.assert_allclose(rsi32, volensy_macd_trend.calculate_rsi(close, 14), rtol=1e-3, atol=1e-3)
+    assert len(atr_st_core.calculate_atr.signatures) == compiled
+
+
+def test_warm_up_compiles_backtest_kernel_once():
+    seconds = warm_up_kernels()
+
+    assert seconds > 0
+    assert _batch_kernel.signatures
+    assert warm_up_kernels() == seconds
+
+
+def test_start_workers_reports_pool_startup():
+    with ProcessPoolExecutor(max_workers=1, initializer=init_worker) as executor:
+        stats = start_workers(executor, 1)
+
+    assert stats["workers"] == 1
+    assert stats["pool_startup_seconds"] >= stats["kernel_warmup_seconds"] >= 0
+    assert stats["parent_warmup_seconds"] == warm_up_kernels()
+
+
+def test_startup_in_text_report(tmp_path):
+    search_stats = {
+        "total_combinations": 4,
+        "evaluated_combinations": 4,
+        "skipped_combinations": 0,
+        "skipped_pct": 0.0,
+        "startup": sequential_startup(),
+    }
+    reporter = create_reporter(str(tmp_path))
+    reporter._generate_text_report([], None, "report", search_stats)
+
+    text = (tmp_path / "report_summary.txt").read_text()
+    assert "Worker startup: 0 workers" in text